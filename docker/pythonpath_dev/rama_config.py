@@ -80,6 +80,7 @@ class CeleryConfig:
         "rama.tasks.scheduler",
         "rama.tasks.thumbnails",
         "rama.tasks.cache",
+        "rama.tasks.table_search",
     )
     result_backend = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_RESULTS_DB}"
     worker_prefetch_multiplier = 1
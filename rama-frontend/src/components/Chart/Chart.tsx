@@ -264,6 +264,8 @@ class Chart extends PureComponent<ChartProps, {}> {
           data-ui-anchor="chart"
           className="chart-container"
           data-test="chart-container"
+          data-chart-id={chartId}
+          data-chart-status="loading"
           height={height}
         >
           <Loading />
@@ -317,6 +319,7 @@ class Chart extends PureComponent<ChartProps, {}> {
 
   render() {
     const {
+      chartId,
       height,
       chartAlert,
       chartStatus,
@@ -332,8 +335,12 @@ class Chart extends PureComponent<ChartProps, {}> {
     const isLoading = chartStatus === 'loading';
 
     if (chartStatus === 'failed') {
-      return queriesResponse.map(item =>
-        this.renderErrorMessage(item as ChartErrorType),
+      return (
+        <div data-chart-id={chartId} data-chart-status={chartStatus}>
+          {queriesResponse.map(item =>
+            this.renderErrorMessage(item as ChartErrorType),
+          )}
+        </div>
       );
     }
 
@@ -383,6 +390,8 @@ class Chart extends PureComponent<ChartProps, {}> {
           data-ui-anchor="chart"
           className="chart-container"
           data-test="chart-container"
+          data-chart-id={chartId}
+          data-chart-status={chartStatus}
           height={height}
           width={width}
         >
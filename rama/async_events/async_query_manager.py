@@ -100,6 +100,9 @@ class AsyncQueryManager:
     STATUS_RUNNING = "running"
     STATUS_ERROR = "error"
     STATUS_DONE = "done"
+    QUERY_PROGRESS_PREFIX = "query_progress_"
+    QUERY_STOPPED_PREFIX = "query_stopped_"
+    QUERY_STATE_TIMEOUT = 24 * 60 * 60
 
     def __init__(self) -> None:
         super().__init__()
@@ -305,3 +308,60 @@ class AsyncQueryManager:
 
         self._cache.xadd(scoped_stream_name, event_data, "*", self._stream_limit)
         self._cache.xadd(full_stream_name, event_data, "*", self._stream_limit_firehose)
+
+    def set_query_progress(
+        self,
+        client_id: str,
+        progress: float,
+        job_metadata: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Store the progress of a running SQL Lab query, and publish it as an event
+        if the metadata of the job tracking the query is given.
+
+        :param client_id: The client ID of the query
+        :param progress: The progress of the query, from 0 to 100
+        :param job_metadata: The metadata of the job tracking the query
+        """
+        if not self._cache:
+            raise CacheBackendNotInitialized("Cache backend not initialized")
+
+        self._cache.set(
+            f"{self.QUERY_PROGRESS_PREFIX}{client_id}",
+            progress,
+            timeout=self.QUERY_STATE_TIMEOUT,
+        )
+        if job_metadata:
+            self.update_job(job_metadata, self.STATUS_RUNNING, progress=progress)
+
+    def get_queries_progress(self, client_ids: list[str]) -> dict[str, float]:
+        if not self._cache:
+            raise CacheBackendNotInitialized("Cache backend not initialized")
+
+        if not client_ids:
+            return {}
+
+        values = self._cache.get_many(
+            *[f"{self.QUERY_PROGRESS_PREFIX}{client_id}" for client_id in client_ids]
+        )
+        return {
+            client_id: progress
+            for client_id, progress in zip(client_ids, values, strict=True)
+            if progress is not None
+        }
+
+    def stop_query(self, client_id: str) -> None:
+        if not self._cache:
+            raise CacheBackendNotInitialized("Cache backend not initialized")
+
+        self._cache.set(
+            f"{self.QUERY_STOPPED_PREFIX}{client_id}",
+            True,
+            timeout=self.QUERY_STATE_TIMEOUT,
+        )
+
+    def is_query_stopped(self, client_id: str) -> bool:
+        if not self._cache:
+            raise CacheBackendNotInitialized("Cache backend not initialized")
+
+        return bool(self._cache.get(f"{self.QUERY_STOPPED_PREFIX}{client_id}"))
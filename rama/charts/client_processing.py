@@ -24,15 +24,19 @@ data they would see on Explore.
 In order to do that, we reproduce the post-processing in Python for these chart types.
 """
 
+from functools import partial
 from io import StringIO
-from typing import Any, Optional, TYPE_CHECKING, Union
+from typing import Any, Callable, Optional, TYPE_CHECKING, Union
 
 import numpy as np
 import pandas as pd
+from flask import current_app
 from flask_babel import gettext as __
 
 from rama.common.chart_data import ChartDataResultFormat
 from rama.extensions import event_logger
+from rama.utils import csv, excel
+from rama.utils.arrow import df_to_arrow_table
 from rama.utils.core import (
     extract_dataframe_dtypes,
     get_column_names,
@@ -295,20 +299,130 @@ post_processors = {
 }
 
 
+def get_client_processor(
+    form_data: Optional[dict[str, Any]],
+    datasource: Optional[Union["BaseDatasource", "Query"]] = None,
+    result_format: ChartDataResultFormat = ChartDataResultFormat.JSON,
+) -> Optional[Callable[[pd.DataFrame], dict[str, Any]]]:
+    """
+    Return a function post-processing the data frame of a query, if the chart
+    post-processes its data in the client.
+
+    The function is meant to run on the data frame before it's serialized, instead of
+    deserializing and serializing the data again in `apply_client_processing`.
+
+    :param form_data: The form data of the chart
+    :param datasource: The datasource of the chart
+    :param result_format: The format of the serialized data
+    :returns: A function returning the post-processed data and its metadata
+    """
+    if (form_data or {}).get("viz_type") not in post_processors:
+        return None
+
+    return partial(
+        apply_client_processing_to_df,
+        form_data=form_data,
+        datasource=datasource,
+        result_format=result_format,
+    )
+
+
 @event_logger.log_this
-def apply_client_processing(  # noqa: C901
+def apply_client_processing_to_df(
+    df: pd.DataFrame,
+    form_data: dict[str, Any],
+    datasource: Optional[Union["BaseDatasource", "Query"]] = None,
+    result_format: ChartDataResultFormat = ChartDataResultFormat.JSON,
+) -> dict[str, Any]:
+    """
+    Post-process the data frame of a query, and serialize it.
+
+    :param df: The data frame of the query
+    :param form_data: The form data of the chart
+    :param datasource: The datasource of the chart
+    :param result_format: The format of the serialized data
+    :returns: The serialized data, with its column and index names, column types and
+        row count
+    """
+    return _apply_client_processing_to_df(df, form_data, datasource, result_format)
+
+
+def _apply_client_processing_to_df(
+    df: pd.DataFrame,
+    form_data: dict[str, Any],
+    datasource: Optional[Union["BaseDatasource", "Query"]] = None,
+    result_format: ChartDataResultFormat = ChartDataResultFormat.JSON,
+) -> dict[str, Any]:
+    post_processor = post_processors[form_data["viz_type"]]
+
+    # convert all columns to verbose (label) name
+    if datasource:
+        df = df.rename(columns=datasource.data["verbose_map"])
+
+    processed_df = post_processor(df, form_data, datasource)
+
+    result = {
+        "colnames": list(processed_df.columns),
+        "indexnames": list(processed_df.index),
+        "coltypes": extract_dataframe_dtypes(processed_df, datasource),
+        "rowcount": len(processed_df.index),
+    }
+
+    # Flatten hierarchical columns/index since they are represented as
+    # `Tuple[str]`. Otherwise encoding to JSON later will fail because
+    # maps cannot have tuples as their keys in JSON.
+    processed_df.columns = [
+        (
+            " ".join(str(name) for name in column).strip()
+            if isinstance(column, tuple)
+            else column
+        )
+        for column in processed_df.columns
+    ]
+    processed_df.index = [
+        (
+            " ".join(str(name) for name in index).strip()
+            if isinstance(index, tuple)
+            else index
+        )
+        for index in processed_df.index
+    ]
+
+    if result_format == ChartDataResultFormat.JSON:
+        result["data"] = processed_df.to_dict()
+    elif result_format == ChartDataResultFormat.CSV:
+        result["data"] = csv.df_to_escaped_csv(
+            processed_df, **current_app.config["CSV_EXPORT"]
+        )
+    elif result_format == ChartDataResultFormat.XLSX:
+        excel.apply_column_types(processed_df, result["coltypes"])
+        result["data"] = excel.df_to_excel(
+            processed_df, **current_app.config["EXCEL_EXPORT"]
+        )
+    elif result_format == ChartDataResultFormat.ARROW:
+        result["data"] = df_to_arrow_table(processed_df, index=True)
+
+    return result
+
+
+@event_logger.log_this
+def apply_client_processing(
     result: dict[Any, Any],
     form_data: Optional[dict[str, Any]] = None,
     datasource: Optional[Union["BaseDatasource", "Query"]] = None,
 ) -> dict[Any, Any]:
+    """
+    Post-process the serialized data of the queries of a chart.
+
+    When the data frames are still available `get_client_processor` should be used
+    instead, since the data is deserialized and serialized again here.
+    """
     form_data = form_data or {}
 
     viz_type = form_data.get("viz_type")
     if viz_type not in post_processors:
         return result
 
-    post_processor = post_processors[viz_type]
-
     for query in result["queries"]:
         if query["result_format"] not in (rf.value for rf in ChartDataResultFormat):
             raise Exception(  # pylint: disable=broad-exception-raised
@@ -328,44 +442,16 @@ def apply_client_processing(  # noqa: C901
             df = pd.DataFrame.from_dict(data)
         elif query["result_format"] == ChartDataResultFormat.CSV:
             df = pd.read_csv(StringIO(data))
-
-        # convert all columns to verbose (label) name
-        if datasource:
-            df.rename(columns=datasource.data["verbose_map"], inplace=True)
-
-        processed_df = post_processor(df, form_data, datasource)
-
-        query["colnames"] = list(processed_df.columns)
-        query["indexnames"] = list(processed_df.index)
-        query["coltypes"] = extract_dataframe_dtypes(processed_df, datasource)
-        query["rowcount"] = len(processed_df.index)
-
-        # Flatten hierarchical columns/index since they are represented as
-        # `Tuple[str]`. Otherwise encoding to JSON later will fail because
-        # maps cannot have tuples as their keys in JSON.
-        processed_df.columns = [
-            (
-                " ".join(str(name) for name in column).strip()
-                if isinstance(column, tuple)
-                else column
-            )
-            for column in processed_df.columns
-        ]
-        processed_df.index = [
-            (
-                " ".join(str(name) for name in index).strip()
-                if isinstance(index, tuple)
-                else index
+        elif query["result_format"] == ChartDataResultFormat.ARROW:
+            df = data.to_pandas()
+
+        query.update(
+            _apply_client_processing_to_df(
+                df,
+                form_data,
+                datasource,
+                query["result_format"],
             )
-            for index in processed_df.index
-        ]
-
-        if query["result_format"] == ChartDataResultFormat.JSON:
-            query["data"] = processed_df.to_dict()
-        elif query["result_format"] == ChartDataResultFormat.CSV:
-            buf = StringIO()
-            processed_df.to_csv(buf)
-            buf.seek(0)
-            query["data"] = buf.getvalue()
+        )
 
     return result
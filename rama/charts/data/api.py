@@ -20,6 +20,7 @@ import contextlib
 import logging
 from typing import Any, TYPE_CHECKING
 
+import pyarrow as pa
 from flask import current_app, g, make_response, request, Response
 from flask_appbuilder.api import expose, protect
 from flask_babel import gettext as _
@@ -28,7 +29,10 @@ from marshmallow import ValidationError
 from rama import is_feature_enabled, security_manager
 from rama.async_events.async_query_manager import AsyncQueryTokenException
 from rama.charts.api import ChartRestApi
-from rama.charts.client_processing import apply_client_processing
+from rama.charts.client_processing import (
+    apply_client_processing,
+    get_client_processor,
+)
 from rama.charts.data.query_context_cache_loader import QueryContextCacheLoader
 from rama.charts.schemas import ChartDataQueryContextSchema
 from rama.commands.chart.data.create_async_job_command import (
@@ -46,6 +50,7 @@ from rama.exceptions import QueryObjectValidationError
 from rama.extensions import event_logger
 from rama.models.sql_lab import Query
 from rama.utils import json
+from rama.utils.arrow import arrow_table_to_ipc_bytes, stream_arrow_table
 from rama.utils.core import (
     create_zip,
     DatasourceType,
@@ -60,6 +65,14 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# result types whose queries return a data frame, which can be sent as Arrow
+ARROW_RESULT_TYPES = {
+    ChartDataResultType.DRILL_DETAIL,
+    ChartDataResultType.FULL,
+    ChartDataResultType.POST_PROCESSED,
+    ChartDataResultType.RESULTS,
+}
+
 
 class ChartDataRestApi(ChartRestApi):
     include_route_methods = {"get_data", "data", "data_from_cache"}
@@ -284,6 +297,11 @@ class ChartDataRestApi(ChartRestApi):
             schema:
               type: string
             name: cache_key
+          - in: query
+            name: format
+            description: The format in which the data should be returned
+            schema:
+              type: string
           responses:
             200:
               description: Query result
@@ -302,11 +320,22 @@ class ChartDataRestApi(ChartRestApi):
             500:
               $ref: '#/components/responses/500'
         """
+        result_format = request.args.get("format")
+        if result_format and result_format not in {
+            format_.value for format_ in ChartDataResultFormat
+        }:
+            return self.response_400(
+                message=_("Unsupported result format: %(format)s", format=result_format)
+            )
+
         try:
             cached_data = self._load_query_context_form_from_cache(cache_key)
             # Set form_data in Flask Global as it is used as a fallback
             # for async queries with jinja context
             g.form_data = cached_data
+            # the results of an async query can be fetched in a different format
+            if result_format:
+                cached_data = {**cached_data, "result_format": result_format}
             query_context = self._create_query_context_from_form(cached_data)
             command = ChartDataCommand(query_context)
             command.validate()
@@ -354,8 +383,12 @@ class ChartDataRestApi(ChartRestApi):
 
         # Post-process the data so it matches the data presented in the chart.
         # This is needed for sending reports based on text charts that do the
-        # post-processing of data, eg, the pivot table.
-        if result_type == ChartDataResultType.POST_PROCESSED:
+        # post-processing of data, eg, the pivot table. It's done on the data frames
+        # when the query context has a client processor.
+        if (
+            result_type == ChartDataResultType.POST_PROCESSED
+            and not result["query_context"].client_processor
+        ):
             result = apply_client_processing(result, form_data, datasource)
 
         if result_format in ChartDataResultFormat.table_like():
@@ -393,6 +426,21 @@ class ChartDataRestApi(ChartRestApi):
                 mimetype="application/zip",
             )
 
+        if result_format == ChartDataResultFormat.ARROW:
+            # Verify user has permission to export file
+            if not security_manager.can_access("can_csv", "Rama"):
+                return self.response_403()
+
+            if result_type not in ARROW_RESULT_TYPES:
+                return self.response_400(
+                    _(
+                        "Result type %(result_type)s can't be exported as Arrow",
+                        result_type=result_type,
+                    )
+                )
+
+            return self._send_arrow_response(result["queries"])
+
         if result_format == ChartDataResultFormat.JSON:
             queries = result["queries"]
             if security_manager.is_guest_user():
@@ -411,6 +459,47 @@ class ChartDataRestApi(ChartRestApi):
 
         return self.response_400(message=f"Unsupported result_format: {result_format}")
 
+    def _send_arrow_response(self, queries: list[dict[str, Any]]) -> Response:
+        """
+        Send the results as Arrow IPC streams.
+
+        The data of each query is sent as is, with the rest of its payload stored
+        as JSON in the schema metadata under the `rama` key. A single query is
+        streamed one record batch at a time, while multiple queries are bundled
+        as a zip file with one stream per query.
+        """
+        if not queries:
+            return self.response_400(_("Empty query result"))
+
+        streams = []
+        for query in queries:
+            if not isinstance(query.get("data"), pa.Table):
+                # eg, the query failed
+                return self.response_400(
+                    query.get("error") or _("Query result has no data")
+                )
+            metadata = {key: value for key, value in query.items() if key != "data"}
+            if security_manager.is_guest_user():
+                metadata.pop("query", None)
+            streams.append((query["data"], metadata))
+
+        if len(streams) == 1:
+            return Response(
+                stream_arrow_table(*streams[0]),
+                headers=generate_download_headers("arrow"),
+                mimetype="application/vnd.apache.arrow.stream",
+            )
+
+        files = {
+            f"query_{idx + 1}.arrow": arrow_table_to_ipc_bytes(table, metadata)
+            for idx, (table, metadata) in enumerate(streams)
+        }
+        return Response(
+            create_zip(files),
+            headers=generate_download_headers("zip"),
+            mimetype="application/zip",
+        )
+
     @event_logger.log_this
     def _get_data_response(
         self,
@@ -419,6 +508,14 @@ class ChartDataRestApi(ChartRestApi):
         form_data: dict[str, Any] | None = None,
         datasource: BaseDatasource | Query | None = None,
     ) -> Response:
+        query_context = command.query_context
+        if query_context.result_type == ChartDataResultType.POST_PROCESSED:
+            query_context.client_processor = get_client_processor(
+                form_data,
+                datasource,
+                query_context.result_format,
+            )
+
         try:
             result = command.run(force_cached=force_cached)
         except ChartDataCacheLoadError as exc:
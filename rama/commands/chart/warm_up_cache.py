@@ -26,6 +26,7 @@ from rama.commands.chart.exceptions import (
     ChartInvalidError,
     WarmUpCacheChartNotFoundError,
 )
+from rama.common.chart_data import ChartDataResultFormat
 from rama.extensions import db
 from rama.models.slice import Slice
 from rama.utils import json
@@ -40,10 +41,46 @@ class ChartWarmUpCacheCommand(BaseCommand):
         chart_or_id: Union[int, Slice],
         dashboard_id: Optional[int],
         extra_filters: Optional[str],
+        force: bool = True,
+        result_format: Optional[ChartDataResultFormat] = None,
     ):
+        """
+        :param chart_or_id: The chart, or the ID of the chart, to warm up
+        :param dashboard_id: The ID of the dashboard the chart is displayed on
+        :param extra_filters: The extra filters of the dashboard, as JSON
+        :param force: Whether to run the queries even if their results are cached
+        :param result_format: The format of the results of non-legacy charts, which
+            defaults to the format of the chart's query context
+        """
         self._chart_or_id = chart_or_id
         self._dashboard_id = dashboard_id
         self._extra_filters = extra_filters
+        self._force = force
+        self._result_format = result_format
+        # The results of the queries of the chart, once run
+        self.queries: list[dict[str, Any]] = []
+
+    def get_cache_keys(self) -> list[str]:
+        """
+        Return the cache keys of the queries of the chart, for the current user.
+
+        Legacy visualizations don't have a query context, so no keys are returned
+        for them.
+        """
+        self.validate()
+        chart: Slice = self._chart_or_id  # type: ignore
+        if chart.viz_type in viz_types:
+            return []
+
+        query_context = chart.get_query_context()
+        if not query_context:
+            return []
+
+        return [
+            cache_key
+            for query_obj in query_context.queries
+            if (cache_key := query_context.query_cache_key(query_obj))
+        ]
 
     def run(self) -> dict[str, Any]:
         self.validate()
@@ -69,9 +106,10 @@ class ChartWarmUpCacheCommand(BaseCommand):
                     datasource_type=chart.datasource.type,
                     datasource_id=chart.datasource.id,
                     form_data=form_data,
-                    force=True,
+                    force=self._force,
                 ).get_payload()
                 delattr(g, "form_data")
+                self.queries = [payload]
                 error = payload["errors"] or None
                 status = payload["status"]
             else:
@@ -81,10 +119,13 @@ class ChartWarmUpCacheCommand(BaseCommand):
                 if not query_context:
                     raise ChartInvalidError("Chart's query context does not exist")
 
-                query_context.force = True
+                query_context.force = self._force
+                if self._result_format:
+                    query_context.result_format = self._result_format
                 command = ChartDataCommand(query_context)
                 command.validate()
                 payload = command.run()
+                self.queries = payload["queries"]
 
                 # Report the first error.
                 for query in payload["queries"]:
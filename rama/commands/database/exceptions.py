@@ -22,6 +22,7 @@ from rama.commands.exceptions import (
     CommandInvalidError,
     CreateFailedError,
     DeleteFailedError,
+    ForbiddenError,
     ImportFailedError,
     UpdateFailedError,
 )
@@ -163,6 +164,14 @@ class DatabaseTablesUnexpectedError(CommandException):
     message = _("Unexpected error occurred, please check your logs for details")
 
 
+class DatabaseSearchTablesInvalidError(CommandInvalidError):
+    message = _("The search query can't be empty.")
+
+
+class DatabaseSearchTablesForbiddenError(ForbiddenError):
+    message = _("Refreshing the table index requires access to the database.")
+
+
 class NoValidatorConfigFoundError(RamaErrorException):
     status = 422
     message = _("no SQL validator is configured")
@@ -0,0 +1,96 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import logging
+from typing import Any, cast
+
+from flask import current_app
+
+from rama import security_manager
+from rama.commands.base import BaseCommand
+from rama.commands.database.exceptions import (
+    DatabaseNotFoundError,
+    DatabaseSearchTablesForbiddenError,
+    DatabaseSearchTablesInvalidError,
+    DatabaseTablesUnexpectedError,
+)
+from rama.daos.database import DatabaseDAO
+from rama.databases.table_search import search_tables
+from rama.exceptions import RamaException
+from rama.models.core import Database
+
+logger = logging.getLogger(__name__)
+
+
+class SearchTablesDatabaseCommand(BaseCommand):
+    """
+    Search the tables and views of all the catalogs and schemas of a database.
+    """
+
+    _model: Database
+
+    def __init__(
+        self,
+        db_id: int,
+        query: str,
+        limit: int | None = None,
+        force: bool = False,
+    ):
+        self._db_id = db_id
+        self._query = query
+        self._limit = limit
+        self._force = force
+
+    def run(self) -> dict[str, Any]:
+        self.validate()
+        try:
+            entries = search_tables(
+                self._model,
+                self._query,
+                limit=self._limit or current_app.config["TABLE_SEARCH_RESULT_LIMIT"],
+                force=self._force,
+            )
+        except RamaException:
+            raise
+        except Exception as ex:
+            raise DatabaseTablesUnexpectedError(str(ex)) from ex
+
+        return {
+            "count": len(entries),
+            "result": [
+                {
+                    "catalog": catalog,
+                    "schema": schema,
+                    "value": name,
+                    "type": type_,
+                }
+                for catalog, schema, name, type_ in entries
+            ],
+        }
+
+    def validate(self) -> None:
+        if not self._query.strip():
+            raise DatabaseSearchTablesInvalidError()
+
+        self._model = cast(Database, DatabaseDAO.find_by_id(self._db_id))
+        if not self._model:
+            raise DatabaseNotFoundError()
+
+        # refreshing the index lists every schema of the database
+        if self._force and not security_manager.can_access_database(self._model):
+            raise DatabaseSearchTablesForbiddenError()
@@ -30,6 +30,7 @@ from rama.commands.dataset.exceptions import (
 from rama.connectors.sqla.models import SqlaTable
 from rama.daos.dataset import DatasetDAO
 from rama.exceptions import RamaSecurityException
+from rama.sql_parse import Table
 from rama.utils.decorators import on_error, transaction
 
 logger = logging.getLogger(__name__)
@@ -44,6 +45,15 @@ class RefreshDatasetCommand(BaseCommand):
     def run(self) -> Model:
         self.validate()
         assert self._model
+        if not self._model.sql:
+            # an explicit refresh should always read the columns from the database
+            self._model.database.invalidate_table_metadata(
+                Table(
+                    self._model.table_name,
+                    self._model.schema or None,
+                    self._model.catalog,
+                )
+            )
         self._model.fetch_metadata()
         return self._model
 
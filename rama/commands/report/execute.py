@@ -76,7 +76,11 @@ from rama.utils.core import HeaderDataType, override_user
 from rama.utils.csv import get_chart_csv_data, get_chart_dataframe
 from rama.utils.decorators import logs_context, transaction
 from rama.utils.pdf import build_pdf_from_screenshots
-from rama.utils.screenshots import ChartScreenshot, DashboardScreenshot
+from rama.utils.screenshots import (
+    BaseScreenshot,
+    ChartScreenshot,
+    DashboardScreenshot,
+)
 from rama.utils.slack import get_channels_with_search, SlackChannelTypes
 from rama.utils.urls import get_url_path
 
@@ -98,6 +102,7 @@ class BaseReportState:
         self._scheduled_dttm = scheduled_dttm
         self._start_dttm = datetime.utcnow()
         self._execution_id = execution_id
+        self._chart_render_times: dict[str, Optional[float]] = {}
 
     def update_report_schedule_and_log(
         self,
@@ -171,6 +176,8 @@ class BaseReportState:
             report_schedule=self._report_schedule,
             uuid=self._execution_id,
         )
+        if self._chart_render_times:
+            log.set_extra_json_key("chart_render_times", self._chart_render_times)
         db.session.add(log)
         db.session.commit()  # pylint: disable=consider-using-transaction
 
@@ -336,10 +343,11 @@ class BaseReportState:
                 for url in urls
             ]
         try:
-            imges = []
-            for screenshot in screenshots:
-                if imge := screenshot.get_screenshot(user=user):
-                    imges.append(imge)
+            imges = [
+                imge
+                for imge in BaseScreenshot.get_screenshots(screenshots, user)
+                if imge
+            ]
         except SoftTimeLimitExceeded as ex:
             logger.warning("A timeout occurred while taking a screenshot.")
             raise ReportScheduleScreenshotTimeout() from ex
@@ -347,6 +355,9 @@ class BaseReportState:
             raise ReportScheduleScreenshotFailedError(
                 f"Failed taking a screenshot {str(ex)}"
             ) from ex
+        finally:
+            for screenshot in screenshots:
+                self._chart_render_times.update(screenshot.chart_render_times)
         if not imges:
             raise ReportScheduleScreenshotFailedError()
         return imges
@@ -34,6 +34,7 @@ from rama.exceptions import (
 )
 from rama.models.core import Database
 from rama.models.sql_lab import Query
+from rama.sqllab import query_progress
 from rama.sqllab.command_status import SqlJsonExecutionStatus
 from rama.sqllab.exceptions import (
     QueryIsForbiddenToAccessException,
@@ -142,6 +143,7 @@ class ExecuteSqlCommand(BaseCommand):
     def _run_sql_json_exec_from_scratch(self) -> SqlJsonExecutionStatus:
         self._execution_context.set_database(self._get_the_query_db())
         query = self._execution_context.create_query()
+        query_progress.set_channel(query)
         self._save_new_query(query)
         try:
             logger.info("Triggering query_id: %i", query.id)
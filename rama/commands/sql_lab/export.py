@@ -17,8 +17,10 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
 from typing import Any, cast, TypedDict
 
+import msgpack
 import pandas as pd
 from flask_babel import gettext as __
 
@@ -28,9 +30,13 @@ from rama.errors import ErrorLevel, RamaError, RamaErrorType
 from rama.exceptions import RamaErrorException, RamaSecurityException
 from rama.models.sql_lab import Query
 from rama.sql_parse import ParsedQuery
+from rama.sqllab import chunked_results
 from rama.sqllab.limiting_factor import LimitingFactor
 from rama.utils import core as utils, csv
-from rama.views.utils import _deserialize_results_payload
+from rama.views.utils import (
+    _deserialize_results_payload,
+    _load_msgpack_results_payload,
+)
 
 config = app.config
 
@@ -43,6 +49,12 @@ class SqlExportResult(TypedDict):
     data: list[Any]
 
 
+class SqlExportStreamResult(TypedDict):
+    query: Query
+    count: int | None
+    data: Iterator[str]
+
+
 class SqlResultExportCommand(BaseCommand):
     _client_id: str
     _query: Query
@@ -101,31 +113,12 @@ class SqlResultExportCommand(BaseCommand):
                 payload, self._query, cast(bool, results_backend_use_msgpack)
             )
 
-            df = pd.DataFrame(
-                data=obj["data"],
-                dtype=object,
-                columns=[c["name"] for c in obj["columns"]],
-            )
+            df = self._to_df(obj)
 
             logger.info("Using pandas to convert to CSV")
         else:
             logger.info("Running a query to turn into CSV")
-            if self._query.select_sql:
-                sql = self._query.select_sql
-                limit = None
-            else:
-                sql = self._query.executed_sql
-                limit = ParsedQuery(
-                    sql,
-                    engine=self._query.database.db_engine_spec.engine,
-                ).limit
-            if limit is not None and self._query.limiting_factor in {
-                LimitingFactor.QUERY,
-                LimitingFactor.DROPDOWN,
-                LimitingFactor.QUERY_AND_DROPDOWN,
-            }:
-                # remove extra row from `increased_limit`
-                limit -= 1
+            sql, limit = self._get_sql_and_limit()
             df = self._query.database.get_df(
                 sql,
                 self._query.catalog,
@@ -139,3 +132,91 @@ class SqlResultExportCommand(BaseCommand):
             "count": len(df.index),
             "data": csv_data,
         }
+
+    def stream(self) -> SqlExportStreamResult:
+        """
+        Export the results to CSV, a batch of rows at a time.
+
+        The rows are read one chunk at a time from the results backend when the results
+        are stored in chunks, or fetched from the cursor in batches when the query is
+        run again, so that neither the rows nor the CSV are held in memory all at once.
+        """
+        self.validate()
+        blob = None
+        if results_backend and self._query.results_key:
+            logger.info(
+                "Fetching CSV from results backend [%s]", self._query.results_key
+            )
+            blob = results_backend.get(self._query.results_key)
+        if blob:
+            count = self._query.rows
+            dfs = self._iter_results_backend_dfs(blob)
+        else:
+            logger.info("Running a query to turn into CSV")
+            sql, limit = self._get_sql_and_limit()
+            count = None
+            dfs = self._query.database.get_df_batches(
+                sql,
+                self._query.catalog,
+                self._query.schema,
+                limit,
+            )
+
+        return {
+            "query": self._query,
+            "count": count,
+            "data": csv.iter_escaped_csv(dfs, index=False, **config["CSV_EXPORT"]),
+        }
+
+    def _get_sql_and_limit(self) -> tuple[str, int | None]:
+        if self._query.select_sql:
+            sql = self._query.select_sql
+            limit = None
+        else:
+            sql = self._query.executed_sql
+            limit = ParsedQuery(
+                sql,
+                engine=self._query.database.db_engine_spec.engine,
+            ).limit
+        if limit is not None and self._query.limiting_factor in {
+            LimitingFactor.QUERY,
+            LimitingFactor.DROPDOWN,
+            LimitingFactor.QUERY_AND_DROPDOWN,
+        }:
+            # remove extra row from `increased_limit`
+            limit -= 1
+        return sql, limit
+
+    def _iter_results_backend_dfs(self, blob: bytes) -> Iterator[pd.DataFrame]:
+        use_msgpack = cast(bool, results_backend_use_msgpack)
+        payload = utils.zlib_decompress(blob, decode=not use_msgpack)
+        if not use_msgpack:
+            obj = _deserialize_results_payload(payload, self._query)
+        else:
+            ds_payload = msgpack.loads(payload, raw=False)
+            if manifest := chunked_results.get_manifest(ds_payload):
+                # read the results one chunk at a time
+                chunk_size = manifest["chunk_size"]
+                for offset in range(0, max(manifest["num_rows"], 1), chunk_size):
+                    obj = _load_msgpack_results_payload(
+                        {**ds_payload},
+                        self._query,
+                        offset,
+                        chunk_size,
+                    )
+                    yield self._to_df(obj)
+                return
+            obj = _load_msgpack_results_payload(ds_payload, self._query)
+
+        df = self._to_df(obj)
+        batch_size = config["CSV_EXPORT_BATCH_SIZE"]
+        for start in range(0, max(len(df.index), 1), batch_size):
+            yield df.iloc[start : start + batch_size]
+
+    @staticmethod
+    def _to_df(obj: dict[str, Any]) -> pd.DataFrame:
+        return pd.DataFrame(
+            data=obj["data"],
+            dtype=object,
+            columns=[c["name"] for c in obj["columns"]],
+        )
@@ -41,6 +41,8 @@ logger = logging.getLogger(__name__)
 class SqlExecutionResultsCommand(BaseCommand):
     _key: str
     _rows: int | None
+    _offset: int
+    _limit: int | None
     _blob: Any
     _query: Query
 
@@ -48,9 +50,13 @@ class SqlExecutionResultsCommand(BaseCommand):
         self,
         key: str,
         rows: int | None = None,
+        offset: int = 0,
+        limit: int | None = None,
     ) -> None:
         self._key = key
         self._rows = rows
+        self._offset = offset
+        self._limit = limit
 
     def validate(self) -> None:
         if not results_backend:
@@ -106,9 +112,17 @@ class SqlExecutionResultsCommand(BaseCommand):
         payload = utils.zlib_decompress(
             self._blob, decode=not results_backend_use_msgpack
         )
+        # rows past the display limit are never returned, so they're not read
+        limit = self._limit
+        if self._rows:
+            limit = self._rows if limit is None else min(limit, self._rows)
         try:
             obj = _deserialize_results_payload(
-                payload, self._query, cast(bool, results_backend_use_msgpack)
+                payload,
+                self._query,
+                cast(bool, results_backend_use_msgpack),
+                offset=self._offset,
+                limit=limit,
             )
         except SerializationError as ex:
             raise RamaErrorException(
@@ -104,10 +104,18 @@ def _get_full(
     df = payload["df"]
     status = payload["status"]
     if status != QueryStatus.FAILED:
-        payload["colnames"] = list(df.columns)
-        payload["indexnames"] = list(df.index)
-        payload["coltypes"] = extract_dataframe_dtypes(df, datasource)
-        payload["data"] = query_context.get_data(df, payload["coltypes"])
+        if (
+            result_type == ChartDataResultType.POST_PROCESSED
+            and query_context.client_processor
+            and not df.empty
+        ):
+            # post-process the data frame before it's serialized
+            payload.update(query_context.client_processor(df))
+        else:
+            payload["colnames"] = list(df.columns)
+            payload["indexnames"] = list(df.index)
+            payload["coltypes"] = extract_dataframe_dtypes(df, datasource)
+            payload["data"] = query_context.get_data(df, payload["coltypes"])
         payload["result_format"] = query_context.result_format
     del payload["df"]
 
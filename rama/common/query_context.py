@@ -17,7 +17,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, ClassVar, TYPE_CHECKING
+from typing import Any, Callable, ClassVar, TYPE_CHECKING
 
 import pandas as pd
 
@@ -58,6 +58,10 @@ class QueryContext:
 
     cache_values: dict[str, Any]
 
+    # post-processes the data frame of each query like the chart does in the client,
+    # for `POST_PROCESSED` results; see `rama.charts.client_processing`
+    client_processor: Callable[[pd.DataFrame], dict[str, Any]] | None = None
+
     _processor: QueryContextProcessor
 
     # TODO: Type datasource and query_object dictionary with TypedDict when it becomes
@@ -125,6 +129,9 @@ class QueryContext:
             force_cached=force_cached,
         )
 
+    def refresh_query_result(self, cache_key: str) -> None:
+        self._processor.refresh_query_result(cache_key)
+
     def get_query_result(self, query_object: QueryObject) -> QueryResult:
         return self._processor.get_query_result(query_object)
 
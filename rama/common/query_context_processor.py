@@ -19,11 +19,16 @@ from __future__ import annotations
 import copy
 import logging
 import re
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Any, cast, ClassVar, TYPE_CHECKING, TypedDict
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from flask_babel import gettext as _
 from pandas import DateOffset
 
@@ -41,7 +46,10 @@ from rama.connectors.sqla.models import BaseDatasource
 from rama.constants import CacheRegion, TimeGrain
 from rama.daos.annotation_layer import AnnotationLayerDAO
 from rama.daos.chart import ChartDAO
+from rama.daos.datasource import DatasourceDAO
+from rama.distributed_lock import KeyValueDistributedLock
 from rama.exceptions import (
+    CreateKeyValueDistributedLockFailedException,
     InvalidPostProcessingError,
     QueryObjectValidationError,
     RamaException,
@@ -49,8 +57,9 @@ from rama.exceptions import (
 from rama.extensions import cache_manager, security_manager
 from rama.models.helpers import QueryResult
 from rama.models.sql_lab import Query
-from rama.utils import csv, excel
+from rama.utils import arrow, csv, excel
 from rama.utils.cache import generate_cache_key, set_and_log_cache
+from rama.utils.concurrency import limit_concurrency, run_in_app_context
 from rama.utils.core import (
     DatasourceType,
     DateColumn,
@@ -62,6 +71,7 @@ from rama.utils.core import (
     get_column_names_from_columns,
     get_column_names_from_metrics,
     get_metric_names,
+    get_user_id,
     get_x_axis_label,
     normalize_dttm_col,
     TIME_COMPARISON,
@@ -101,6 +111,30 @@ AGGREGATED_JOIN_GRAINS = {
 # Right suffix used for joining offset results
 R_SUFFIX = "__right_suffix"
 
+# Namespace of the distributed lock held while a chart data cache key is populated
+SINGLE_FLIGHT_LOCK_NAMESPACE = "chart_data_cache"
+
+# Cache keys whose refresh was scheduled by this process, and until when (as per
+# `time.monotonic`) they're not scheduled again
+_refreshing: dict[str, float] = {}
+_refreshing_lock = threading.Lock()
+
+
+def get_single_flight_lock_expiration() -> timedelta:
+    """
+    Return how long the lock held while a cache key is populated lasts at most.
+
+    The lock has to outlive the query, otherwise another request or worker would take
+    it over and run the same query again.
+    """
+    return timedelta(
+        seconds=config["CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT"]
+        or max(
+            config["RAMA_WEBSERVER_TIMEOUT"],
+            config["CHART_DATA_SINGLE_FLIGHT_TIMEOUT"],
+        )
+    )
+
 
 class CachedTimeOffset(TypedDict):
     df: pd.DataFrame
@@ -108,6 +142,18 @@ class CachedTimeOffset(TypedDict):
     cache_keys: list[str | None]
 
 
+@dataclass
+class _PendingTimeOffsetQuery:
+    """A time offset query that missed the cache and still needs to be executed."""
+
+    index: int
+    offset: str
+    cache: QueryCacheManager
+    cache_key: str | None
+    query_object_dct: dict[str, Any]
+    metrics_mapping: dict[str, str]
+
+
 class QueryContextProcessor:
     """
     The query context contains the query object and additional fields necessary
@@ -136,40 +182,16 @@ class QueryContextProcessor:
             region=CacheRegion.DATA,
             force_query=force_query,
             force_cached=force_cached,
+            allow_stale=config["CHART_DATA_STALE_WHILE_REVALIDATE"] > 0,
         )
 
         if query_obj and cache_key and not cache.is_loaded:
-            try:
-                if invalid_columns := [
-                    col
-                    for col in get_column_names_from_columns(query_obj.columns)
-                    + get_column_names_from_metrics(query_obj.metrics or [])
-                    if (
-                        col not in self._qc_datasource.column_names
-                        and col != DTTM_ALIAS
-                    )
-                ]:
-                    raise QueryObjectValidationError(
-                        _(
-                            "Columns missing in dataset: %(invalid_columns)s",
-                            invalid_columns=invalid_columns,
-                        )
-                    )
-
-                query_result = self.get_query_result(query_obj)
-                annotation_data = self.get_annotation_data(query_obj)
-                cache.set_query_result(
-                    key=cache_key,
-                    query_result=query_result,
-                    annotation_data=annotation_data,
-                    force_query=force_query,
-                    timeout=self.get_cache_timeout(),
-                    datasource_uid=self._qc_datasource.uid,
-                    region=CacheRegion.DATA,
-                )
-            except QueryObjectValidationError as ex:
-                cache.error_message = str(ex)
-                cache.status = QueryStatus.FAILED
+            cache = self.load_query_result_single_flight(
+                query_obj, cache_key, cache, force_query
+            )
+        elif query_obj and cache_key and cache.is_stale:
+            stats_logger.incr("chart_data_stale_served")
+            self.refresh_query_result_in_background(cache_key)
 
         # the N-dimensional DataFrame has converted into flat DataFrame
         # by `flatten operator`, "comma" in the column is escaped by `escape_separator`
@@ -203,6 +225,181 @@ class QueryContextProcessor:
             "label_map": label_map,
         }
 
+    def load_query_result(
+        self,
+        query_obj: QueryObject,
+        cache_key: str,
+        cache: QueryCacheManager,
+        force_query: bool,
+    ) -> None:
+        """Runs the query and stores its result in the cache"""
+        try:
+            if invalid_columns := [
+                col
+                for col in get_column_names_from_columns(query_obj.columns)
+                + get_column_names_from_metrics(query_obj.metrics or [])
+                if (col not in self._qc_datasource.column_names and col != DTTM_ALIAS)
+            ]:
+                raise QueryObjectValidationError(
+                    _(
+                        "Columns missing in dataset: %(invalid_columns)s",
+                        invalid_columns=invalid_columns,
+                    )
+                )
+
+            query_result = self.get_query_result(query_obj)
+            annotation_data = self.get_annotation_data(query_obj)
+            cache.set_query_result(
+                key=cache_key,
+                query_result=query_result,
+                annotation_data=annotation_data,
+                force_query=force_query,
+                timeout=self.get_cache_timeout(),
+                datasource_uid=self._qc_datasource.uid,
+                region=CacheRegion.DATA,
+                stale_timeout=config["CHART_DATA_STALE_WHILE_REVALIDATE"],
+            )
+        except QueryObjectValidationError as ex:
+            cache.error_message = str(ex)
+            cache.status = QueryStatus.FAILED
+
+    def load_query_result_single_flight(
+        self,
+        query_obj: QueryObject,
+        cache_key: str,
+        cache: QueryCacheManager,
+        force_query: bool,
+    ) -> QueryCacheManager:
+        """
+        Runs the query for a cache miss, coalescing concurrent identical requests.
+
+        The first worker to miss the cache acquires a distributed lock on the cache
+        key and runs the query, while the others poll the cache until it has been
+        populated. If the lock is released without the result being cached (eg, the
+        query failed) the lock is acquired again, and after
+        `CHART_DATA_SINGLE_FLIGHT_TIMEOUT` seconds the waiting worker gives up and
+        runs the query itself.
+        """
+        if force_query or not config["CHART_DATA_SINGLE_FLIGHT_ENABLED"]:
+            self.load_query_result(query_obj, cache_key, cache, force_query)
+            return cache
+
+        deadline = time.monotonic() + config["CHART_DATA_SINGLE_FLIGHT_TIMEOUT"]
+        while True:
+            try:
+                with KeyValueDistributedLock(
+                    SINGLE_FLIGHT_LOCK_NAMESPACE,
+                    lock_expiration=get_single_flight_lock_expiration(),
+                    cache_key=cache_key,
+                ):
+                    self.load_query_result(query_obj, cache_key, cache, force_query)
+                return cache
+            except CreateKeyValueDistributedLockFailedException:
+                stats_logger.incr("chart_data_single_flight_wait")
+
+            if result := self._wait_for_query_result(cache_key, deadline):
+                return result
+            if time.monotonic() >= deadline:
+                break
+
+        logger.warning("Timed out waiting for cache key %s to be populated", cache_key)
+        stats_logger.incr("chart_data_single_flight_timeout")
+        self.load_query_result(query_obj, cache_key, cache, force_query)
+        return cache
+
+    @staticmethod
+    def _wait_for_query_result(
+        cache_key: str,
+        deadline: float,
+    ) -> QueryCacheManager | None:
+        """
+        Polls the cache until the query result is available, the lock held by the
+        worker running the query is released, or the deadline is reached.
+        """
+        # pylint: disable=import-outside-toplevel
+        from rama.commands.distributed_lock.get import GetDistributedLock
+
+        while time.monotonic() < deadline:
+            time.sleep(config["CHART_DATA_SINGLE_FLIGHT_POLL_INTERVAL"])
+            cache = QueryCacheManager.get(key=cache_key, region=CacheRegion.DATA)
+            if cache.is_loaded:
+                return cache
+            if not GetDistributedLock(
+                namespace=SINGLE_FLIGHT_LOCK_NAMESPACE,
+                params={"cache_key": cache_key},
+            ).run():
+                break
+        return None
+
+    def refresh_query_result_in_background(self, cache_key: str) -> None:
+        """
+        Schedules the refresh of a stale cache entry in a Celery worker.
+
+        The worker loads the query context again from its form data, as the current
+        user. Refreshes of the same cache key are scheduled once per process until the
+        lock held while refreshing it expires, and only one of them runs at any given
+        time, through the same distributed lock used for coalescing cache misses.
+        """
+        # pylint: disable=import-outside-toplevel
+        from rama.tasks.async_queries import refresh_chart_data_cache
+
+        now = time.monotonic()
+        with _refreshing_lock:
+            if _refreshing.get(cache_key, now) > now:
+                return
+            for key, expires in list(_refreshing.items()):
+                if expires <= now:
+                    del _refreshing[key]
+            _refreshing[cache_key] = (
+                now + get_single_flight_lock_expiration().total_seconds()
+            )
+
+        job_metadata: dict[str, Any] = {"user_id": get_user_id()}
+        if guest_user := security_manager.get_current_guest_user_if_guest():
+            job_metadata["guest_token"] = guest_user.guest_token
+
+        form_data = {
+            **self._query_context.cache_values,
+            "form_data": self._query_context.form_data,
+        }
+        try:
+            refresh_chart_data_cache.delay(job_metadata, form_data, cache_key)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning(
+                "Unable to schedule the refresh of cache key %s",
+                cache_key,
+                exc_info=True,
+            )
+            with _refreshing_lock:
+                _refreshing.pop(cache_key, None)
+
+    def refresh_query_result(self, cache_key: str) -> None:
+        """
+        Runs the query of the query context with the given cache key, and caches the
+        result, unless the cache key is already being populated elsewhere.
+        """
+        for query_obj in self._query_context.queries:
+            if self.query_cache_key(query_obj) == cache_key:
+                break
+        else:
+            logger.warning("No query found for cache key %s", cache_key)
+            return
+
+        try:
+            with KeyValueDistributedLock(
+                SINGLE_FLIGHT_LOCK_NAMESPACE,
+                lock_expiration=get_single_flight_lock_expiration(),
+                cache_key=cache_key,
+            ):
+                self.load_query_result(
+                    query_obj,
+                    cache_key,
+                    QueryCacheManager(),
+                    force_query=False,
+                )
+        except CreateKeyValueDistributedLockFailedException:
+            logger.debug("Cache key %s is already being refreshed", cache_key)
+
     def query_cache_key(self, query_obj: QueryObject, **kwargs: Any) -> str | None:
         """
         Returns a QueryObject cache key for objects in self.queries
@@ -412,7 +609,8 @@ class QueryContextProcessor:
         query_object_clone = copy.copy(query_object)
         queries: list[str] = []
         cache_keys: list[str | None] = []
-        offset_dfs: dict[str, pd.DataFrame] = {}
+        offset_dfs: dict[str, pd.DataFrame | None] = {}
+        pending: list[_PendingTimeOffsetQuery] = []
 
         outer_from_dttm, outer_to_dttm = get_since_until_from_query_object(query_object)
         if not outer_from_dttm or not outer_to_dttm:
@@ -519,6 +717,11 @@ class QueryContextProcessor:
                 continue
 
             query_object_clone_dct = query_object_clone.to_dict()
+            # the temporal filters above are shifted in place, so the filters are
+            # copied to keep this query intact until it's executed
+            query_object_clone_dct["filter"] = copy.deepcopy(
+                query_object_clone_dct["filter"]
+            )
             # rename metrics: SUM(value) => SUM(value) 1 year ago
             metrics_mapping = {
                 metric: TIME_COMPARISON.join([metric, original_offset])
@@ -532,20 +735,33 @@ class QueryContextProcessor:
                 query_object_clone_dct["row_limit"] = config["ROW_LIMIT"]
                 query_object_clone_dct["row_offset"] = 0
 
-            if isinstance(self._qc_datasource, Query):
-                result = self._qc_datasource.exc_query(query_object_clone_dct)
-            else:
-                result = self._qc_datasource.query(query_object_clone_dct)
-
-            queries.append(result.query)
+            # reserve the position of the offset, the query is executed below
+            offset_dfs[offset] = None
+            queries.append("")
             cache_keys.append(None)
+            pending.append(
+                _PendingTimeOffsetQuery(
+                    index=len(queries) - 1,
+                    offset=offset,
+                    cache=cache,
+                    cache_key=cache_key,
+                    query_object_dct=query_object_clone_dct,
+                    metrics_mapping=metrics_mapping,
+                )
+            )
+
+        results = self.run_time_offset_queries(
+            [item.query_object_dct for item in pending]
+        )
+        for item, result in zip(pending, results, strict=True):
+            queries[item.index] = result.query
 
             offset_metrics_df = result.df
             if offset_metrics_df.empty:
                 offset_metrics_df = pd.DataFrame(
                     {
                         col: [np.NaN]
-                        for col in join_keys + list(metrics_mapping.values())
+                        for col in join_keys + list(item.metrics_mapping.values())
                     }
                 )
             else:
@@ -555,32 +771,83 @@ class QueryContextProcessor:
                 )
 
                 # 2. rename extra query columns
-                offset_metrics_df = offset_metrics_df.rename(columns=metrics_mapping)
+                offset_metrics_df = offset_metrics_df.rename(
+                    columns=item.metrics_mapping
+                )
 
             # cache df and query
             value = {
                 "df": offset_metrics_df,
                 "query": result.query,
             }
-            cache.set(
-                key=cache_key,
+            item.cache.set(
+                key=item.cache_key,
                 value=value,
                 timeout=self.get_cache_timeout(),
                 datasource_uid=query_context.datasource.uid,
                 region=CacheRegion.DATA,
             )
-            offset_dfs[offset] = offset_metrics_df
+            offset_dfs[item.offset] = offset_metrics_df
 
         if offset_dfs:
             df = self.join_offset_dfs(
                 df,
-                offset_dfs,
+                cast(dict[str, pd.DataFrame], offset_dfs),
                 time_grain,
                 join_keys,
             )
 
         return CachedTimeOffset(df=df, queries=queries, cache_keys=cache_keys)
 
+    def run_time_offset_queries(
+        self, query_object_dcts: list[dict[str, Any]]
+    ) -> list[QueryResult]:
+        """
+        Execute the time offset queries against the datasource.
+
+        The queries are executed one after another unless
+        `TIME_OFFSET_QUERIES_MAX_WORKERS` is greater than 1, in which case they run
+        concurrently on a bounded thread pool, with at most
+        `TIME_OFFSET_QUERIES_PER_DATABASE_LIMIT` queries running against the same
+        database in this process at any given time.
+
+        :param query_object_dcts: The query objects of the time offsets, as dicts
+        :returns: The query results, in the same order as the query objects
+        """
+
+        def run_query(
+            datasource: BaseDatasource | Query,
+            query_object_dct: dict[str, Any],
+        ) -> QueryResult:
+            if isinstance(datasource, Query):
+                return datasource.exc_query(query_object_dct)
+            return datasource.query(query_object_dct)
+
+        max_workers = min(
+            config["TIME_OFFSET_QUERIES_MAX_WORKERS"], len(query_object_dcts)
+        )
+        if max_workers <= 1:
+            return [run_query(self._qc_datasource, dct) for dct in query_object_dcts]
+
+        datasource_type = self._qc_datasource.type
+        datasource_id = self._qc_datasource.id
+        database_id = getattr(self._qc_datasource, "database_id", None)
+        database_limit = config["TIME_OFFSET_QUERIES_PER_DATABASE_LIMIT"]
+
+        @run_in_app_context
+        def run_limited_query(query_object_dct: dict[str, Any]) -> QueryResult:
+            # ORM objects are bound to the session of the request thread, so each
+            # worker loads the datasource in its own session
+            datasource = DatasourceDAO.get_datasource(datasource_type, datasource_id)
+            with limit_concurrency(("time_offset", database_id), database_limit):
+                return run_query(datasource, query_object_dct)
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="time_offset",
+        ) as executor:
+            return list(executor.map(run_limited_query, query_object_dcts))
+
     def join_offset_dfs(
         self,
         df: pd.DataFrame,
@@ -694,7 +961,13 @@ class QueryContextProcessor:
 
     def get_data(
         self, df: pd.DataFrame, coltypes: list[GenericDataType]
-    ) -> str | list[dict[str, Any]]:
+    ) -> str | list[dict[str, Any]] | pa.Table:
+        if self._query_context.result_format == ChartDataResultFormat.ARROW:
+            return arrow.df_to_arrow_table(
+                df,
+                index=not isinstance(df.index, pd.RangeIndex),
+            )
+
         if self._query_context.result_format in ChartDataResultFormat.table_like():
             include_index = not isinstance(df.index, pd.RangeIndex)
             columns = list(df.columns)
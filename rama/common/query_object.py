@@ -45,7 +45,7 @@ from rama.utils.core import (
     is_adhoc_metric,
     QueryObjectFilterClause,
 )
-from rama.utils.hashing import md5_sha_from_dict
+from rama.utils.hashing import hash_from_dict
 from rama.utils.json import json_int_dttm_ser
 
 if TYPE_CHECKING:
@@ -416,7 +416,7 @@ class QueryObject:  # pylint: disable=too-many-instance-attributes
             # datasource or database do not exist
             pass
 
-        return md5_sha_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
+        return hash_from_dict(cache_dict, default=json_int_dttm_ser, ignore_nan=True)
 
     def exec_post_processing(self, df: DataFrame) -> DataFrame:
         """
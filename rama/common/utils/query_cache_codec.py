@@ -0,0 +1,190 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Encoding of query results stored in the data cache.
+
+By default the dataframe of a query result is stored as is, and pickled by
+Flask-Caching. When `DATA_CACHE_USE_ARROW` is enabled it's stored instead as an
+(optionally compressed) Arrow IPC file, which is much faster to serialize and
+deserialize than a pickled dataframe. Buffers larger than
+`DATA_CACHE_MAX_VALUE_SIZE` are split into chunks stored under their own keys, so
+that they don't exceed the value size limit of the cache backend (eg, 1MB in
+Memcached).
+
+The cached value keeps its shape, but has an `arrow_df` header instead of the `df`
+key; entries written in the previous format are still read as before.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, TypedDict
+
+import pyarrow as pa
+from flask_caching import Cache
+from pandas import DataFrame
+
+from rama.result_set import RamaResultSet
+
+logger = logging.getLogger(__name__)
+
+ARROW_DF_KEY = "arrow_df"
+VERSION = 1
+
+
+class ArrowDataFrameHeader(TypedDict):
+    version: int
+    size: int
+    num_chunks: int
+    # the buffer itself when it's not split into chunks
+    data: bytes | None
+
+
+def get_chunk_key(key: str, index: int) -> str:
+    return f"{key}__chunk_{index}"
+
+
+def serialize_df(df: DataFrame, compression: str | None = None) -> bytes:
+    """
+    Serialize a dataframe into an Arrow IPC file.
+
+    :param df: The dataframe to serialize
+    :param compression: The compression codec of the buffers, eg, "lz4" or "zstd"
+    :raises pa.ArrowException: If the dataframe can't be represented in Arrow
+    """
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def deserialize_df(data: bytes) -> DataFrame:
+    """
+    Deserialize an Arrow IPC file into a dataframe.
+
+    The file is read without copying the buffers (unless they're compressed).
+    """
+    with pa.ipc.open_file(pa.py_buffer(data)) as reader:
+        table = reader.read_all()
+    return RamaResultSet.convert_table_to_df(table)
+
+
+def encode_value(
+    key: str,
+    value: dict[str, Any],
+    compression: str | None = None,
+    max_value_size: int = 0,
+) -> tuple[dict[str, Any], dict[str, bytes]]:
+    """
+    Replace the dataframe of a cached query result with an Arrow header.
+
+    Dataframes that can't be represented in Arrow (eg, with columns holding
+    arbitrary Python objects) are left as is.
+
+    :param key: The cache key of the value
+    :param value: The value to be cached
+    :param compression: The compression codec of the Arrow buffers
+    :param max_value_size: The size above which the buffer is split into chunks, or
+        0 to never split it
+    :returns: The value to be cached, and the chunks to be cached alongside it
+    """
+    df = value.get("df")
+    if not isinstance(df, DataFrame):
+        return value, {}
+
+    try:
+        data = serialize_df(df, compression)
+    except (pa.ArrowException, TypeError, ValueError):
+        logger.debug("Unable to serialize dataframe to Arrow", exc_info=True)
+        return value, {}
+
+    chunks: dict[str, bytes] = {}
+    if max_value_size and len(data) > max_value_size:
+        chunks = {
+            get_chunk_key(key, i): data[offset : offset + max_value_size]
+            for i, offset in enumerate(range(0, len(data), max_value_size))
+        }
+
+    header: ArrowDataFrameHeader = {
+        "version": VERSION,
+        "size": len(data),
+        "num_chunks": len(chunks),
+        "data": None if chunks else data,
+    }
+    encoded = {k: v for k, v in value.items() if k != "df"}
+    encoded[ARROW_DF_KEY] = header
+    return encoded, chunks
+
+
+def decode_value(
+    cache: Cache,
+    key: str,
+    value: dict[str, Any],
+) -> dict[str, Any] | None:
+    """
+    Restore the dataframe of a cached query result.
+
+    :param cache: The cache holding the chunks of the value, if any
+    :param key: The cache key of the value
+    :param value: The cached value
+    :returns: The value with its dataframe, or None if it can't be restored (eg, if
+        one of its chunks has been evicted)
+    """
+    header: ArrowDataFrameHeader | None = value.get(ARROW_DF_KEY)
+    if header is None:
+        return value
+
+    if header["version"] != VERSION:
+        logger.warning("Unsupported version of cached value %s", key)
+        return None
+
+    if header["num_chunks"]:
+        chunks = cache.get_many(
+            *[get_chunk_key(key, i) for i in range(header["num_chunks"])]
+        )
+        if any(chunk is None for chunk in chunks):
+            logger.warning("Missing chunks for cached value %s", key)
+            return None
+        data = b"".join(chunks)
+    else:
+        data = header["data"] or b""
+
+    if len(data) != header["size"]:
+        logger.warning("Corrupted cached value %s", key)
+        return None
+
+    try:
+        df = deserialize_df(data)
+    except pa.ArrowException:
+        logger.warning("Unable to deserialize cached value %s", key, exc_info=True)
+        return None
+
+    decoded = {k: v for k, v in value.items() if k != ARROW_DF_KEY}
+    decoded["df"] = df
+    return decoded
+
+
+def get_chunk_keys(value: dict[str, Any] | None, key: str) -> list[str]:
+    """
+    Return the keys of the chunks of a cached value.
+    """
+    header: ArrowDataFrameHeader | None = (value or {}).get(ARROW_DF_KEY)
+    if header is None:
+        return []
+    return [get_chunk_key(key, i) for i in range(header["num_chunks"])]
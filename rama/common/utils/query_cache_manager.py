@@ -17,6 +17,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from flask_caching import Cache
@@ -24,6 +25,7 @@ from pandas import DataFrame
 
 from rama import app
 from rama.common.db_query_status import QueryStatus
+from rama.common.utils import query_cache_codec
 from rama.constants import CacheRegion
 from rama.exceptions import CacheLoadError
 from rama.extensions import cache_manager
@@ -65,6 +67,7 @@ class QueryCacheManager:
         cache_dttm: str | None = None,
         cache_value: dict[str, Any] | None = None,
         sql_rowcount: int | None = None,
+        is_stale: bool = False,
     ) -> None:
         self.df = df
         self.query = query
@@ -81,6 +84,7 @@ class QueryCacheManager:
         self.cache_dttm = cache_dttm
         self.cache_value = cache_value
         self.sql_rowcount = sql_rowcount
+        self.is_stale = is_stale
 
     # pylint: disable=too-many-arguments
     def set_query_result(
@@ -92,9 +96,14 @@ class QueryCacheManager:
         timeout: int | None = None,
         datasource_uid: str | None = None,
         region: CacheRegion = CacheRegion.DEFAULT,
+        stale_timeout: int = 0,
     ) -> None:
         """
         Set dataframe of query-result to specific cache region
+
+        When `stale_timeout` is set the value is kept in the cache for that many
+        seconds past its timeout, so that it can be served while it's being
+        refreshed. See `QueryCacheManager.get`.
         """
         try:
             self.status = query_result.status
@@ -122,6 +131,10 @@ class QueryCacheManager:
                 "annotation_data": self.annotation_data,
                 "sql_rowcount": self.sql_rowcount,
             }
+            if stale_timeout and timeout:
+                value["expires_at"] = time.time() + timeout
+                timeout += stale_timeout
+
             if self.is_loaded and key and self.status != QueryStatus.FAILED:
                 self.set(
                     key=key,
@@ -144,15 +157,31 @@ class QueryCacheManager:
         region: CacheRegion = CacheRegion.DEFAULT,
         force_query: bool | None = False,
         force_cached: bool | None = False,
+        allow_stale: bool = False,
     ) -> QueryCacheManager:
         """
         Initialize QueryCacheManager by query-cache key
+
+        Values that were stored with a `stale_timeout` and have expired are only
+        loaded when `allow_stale` is set, in which case `is_stale` is set on the
+        returned instance.
         """
         query_cache = cls()
         if not key or not _cache[region] or force_query:
             return query_cache
 
-        if cache_value := _cache[region].get(key):
+        cache_value = _cache[region].get(key)
+        if cache_value:
+            cache_value = query_cache_codec.decode_value(
+                _cache[region], key, cache_value
+            )
+        if cache_value and cls.is_expired(cache_value):
+            if allow_stale:
+                query_cache.is_stale = True
+            else:
+                cache_value = None
+
+        if cache_value:
             logger.debug("Cache key: %s", key)
             stats_logger.incr("loading_from_cache")
             try:
@@ -193,6 +222,15 @@ class QueryCacheManager:
             raise CacheLoadError("Error loading data from cache")
         return query_cache
 
+    @staticmethod
+    def is_expired(cache_value: dict[str, Any]) -> bool:
+        """
+        Whether a cached value is past its timeout, and only kept around to be
+        served while it's being refreshed.
+        """
+        expires_at = cache_value.get("expires_at")
+        return expires_at is not None and expires_at <= time.time()
+
     @staticmethod
     def set(
         key: str | None,
@@ -203,9 +241,38 @@ class QueryCacheManager:
     ) -> None:
         """
         set value to specify cache region, proxy for `set_and_log_cache`
+
+        When `DATA_CACHE_USE_ARROW` is enabled the dataframes stored in the data cache
+        are serialized to Arrow, see `query_cache_codec`.
         """
-        if key:
-            set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
+        if not key:
+            return
+
+        if region == CacheRegion.DATA and config["DATA_CACHE_USE_ARROW"]:
+            value, chunks = query_cache_codec.encode_value(
+                key,
+                value,
+                compression=config["DATA_CACHE_ARROW_COMPRESSION"],
+                max_value_size=config["DATA_CACHE_MAX_VALUE_SIZE"],
+            )
+            # chunks are stored first, so that the value is never read without them
+            if chunks:
+                try:
+                    _cache[region].set_many(
+                        chunks,
+                        timeout=(
+                            timeout
+                            if timeout is not None
+                            else config["CACHE_DEFAULT_TIMEOUT"]
+                        ),
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    logger.warning(
+                        "Could not cache chunks of key %s", key, exc_info=True
+                    )
+                    return
+
+        set_and_log_cache(_cache[region], key, value, timeout, datasource_uid)
 
     @staticmethod
     def delete(
@@ -213,7 +280,8 @@ class QueryCacheManager:
         region: CacheRegion = CacheRegion.DEFAULT,
     ) -> None:
         if key:
-            _cache[region].delete(key)
+            chunk_keys = query_cache_codec.get_chunk_keys(_cache[region].get(key), key)
+            _cache[region].delete_many(key, *chunk_keys)
 
     @staticmethod
     def has(
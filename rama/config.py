@@ -80,6 +80,9 @@ if TYPE_CHECKING:
 STATS_LOGGER = DummyStatsLogger()
 
 # By default will log events to the metadata database with `DBEventLogger`
+# Note that you can use `BufferedDBEventLogger` to write events to the metadata
+# database in batches from a background thread, instead of committing them in the
+# request thread
 # Note that you can use `StdOutEventLogger` for debugging
 # Note that you can write your own event logger by extending `AbstractEventLogger`
 # https://github.com/itsjpthakur/rama/blob/master/rama/utils/log.py
@@ -695,6 +698,22 @@ EXTRA_SEQUENTIAL_COLOR_SCHEMES: list[dict[str, Any]] = []
 # CACHE_WARMUP_EXECUTORS = [ExecutorType.OWNER, FixedExecutor("admin")]
 CACHE_WARMUP_EXECUTORS = [ExecutorType.OWNER]
 
+# Warm up the cache inside the Celery worker, running the warm up command of each
+# chart under the identity of its executor, instead of sending a request per chart
+# to the web server. Charts whose queries share cache keys are only warmed up once,
+# and the task returns a summary of the hits, misses and bytes cached.
+CACHE_WARMUP_IN_PROCESS = False
+
+# Number of charts warmed up concurrently by a warm up task running in process
+CACHE_WARMUP_MAX_WORKERS = 4
+
+# Maximum number of charts warmed up concurrently on a single database by a worker
+# process, so warming up the cache can't flood a warehouse. The limit of given
+# databases can be overridden by name, eg, {"examples": 2}. Set to 0 to disable
+# the limit.
+CACHE_WARMUP_PER_DATABASE_LIMIT = 1
+CACHE_WARMUP_PER_DATABASE_LIMITS: dict[str, int] = {}
+
 # ---------------------------------------------------
 # Thumbnail config (behind feature flag)
 # ---------------------------------------------------
@@ -744,6 +763,10 @@ SCREENSHOT_LOAD_WAIT = int(timedelta(minutes=1).total_seconds())
 SCREENSHOT_SELENIUM_RETRIES = 5
 # Give selenium an headstart, in seconds
 SCREENSHOT_SELENIUM_HEADSTART = 3
+# Instead of the headstart and of waiting for the "loading" elements to be gone, wait
+# (up to SCREENSHOT_LOAD_WAIT) for the frontend to report all the charts as rendered.
+# The time each chart took to render is recorded in the report execution log
+SCREENSHOT_WAIT_FOR_CHARTS_RENDERED = False
 # Wait for the chart animation, in seconds
 SCREENSHOT_SELENIUM_ANIMATION_WAIT = 5
 # Replace unexpected errors in screenshots with real error messages
@@ -760,6 +783,9 @@ SCREENSHOT_PLAYWRIGHT_WAIT_EVENT = "load"
 SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT = int(
     timedelta(seconds=30).total_seconds() * 1000
 )
+# Number of pages Playwright loads at the same time when taking the screenshots of
+# the tabs of a dashboard report. The pages are loaded in the same browser context
+SCREENSHOT_PLAYWRIGHT_MAX_CONCURRENT_PAGES = 1
 
 # ---------------------------------------------------
 # Image and file configuration
@@ -781,6 +807,16 @@ CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 # Cache for datasource metadata and query results
 DATA_CACHE_CONFIG: CacheConfig = {"CACHE_TYPE": "NullCache"}
 
+# Store the dataframes of chart data query results in the data cache as Arrow IPC
+# buffers instead of pickled dataframes, which are much faster to load. Buffers are
+# compressed with DATA_CACHE_ARROW_COMPRESSION ("lz4", "zstd" or None), and split
+# into chunks of at most DATA_CACHE_MAX_VALUE_SIZE bytes stored under their own
+# keys (set to 0 to never split them). Entries cached in the previous format are
+# still read.
+DATA_CACHE_USE_ARROW = False
+DATA_CACHE_ARROW_COMPRESSION: Literal["lz4", "zstd"] | None = "lz4"
+DATA_CACHE_MAX_VALUE_SIZE = 0
+
 # Cache for dashboard filter state. `CACHE_TYPE` defaults to `RamaMetastoreCache`
 # that stores the values in the key-value table in the Rama metastore, as it's
 # required for Rama to operate correctly, but can be replaced by any
@@ -812,6 +848,42 @@ EXPLORE_FORM_DATA_CACHE_CONFIG: CacheConfig = {
 # store cache keys by datasource UID (via CacheKey) for custom processing/invalidation
 STORE_CACHE_KEYS_IN_METADATA_DB = False
 
+# Cache keys of chart data are hashes of the JSON representation of the query. When
+# CACHE_KEY_LEGACY_FORMAT is enabled they're computed as in previous versions (MD5
+# of a sorted `simplejson` dump). Disable it to use a faster canonical encoding
+# (`orjson` when the `fast-hashing` extra is installed) hashed with
+# CACHE_KEY_HASH_ALGORITHM, one of "md5", "blake2b" or "xxhash" (also from the
+# `fast-hashing` extra). Changing either setting invalidates existing cache entries.
+CACHE_KEY_LEGACY_FORMAT = True
+CACHE_KEY_HASH_ALGORITHM: Literal["md5", "blake2b", "xxhash"] = "blake2b"
+
+# Coalesce concurrent chart data requests that miss the data cache for the same
+# cache key: the first request runs the query while holding a distributed lock on
+# the key, and the others poll the cache every
+# CHART_DATA_SINGLE_FLIGHT_POLL_INTERVAL seconds until it's populated. After
+# CHART_DATA_SINGLE_FLIGHT_TIMEOUT seconds a waiting request runs the query itself.
+# The lock expires after CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT seconds in case the
+# request holding it dies; it must be longer than the slowest query, otherwise other
+# requests take over the lock and run the query again. Defaults to the larger of
+# RAMA_WEBSERVER_TIMEOUT and CHART_DATA_SINGLE_FLIGHT_TIMEOUT.
+CHART_DATA_SINGLE_FLIGHT_ENABLED = False
+CHART_DATA_SINGLE_FLIGHT_TIMEOUT = RAMA_WEBSERVER_TIMEOUT
+CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT: int | None = None
+CHART_DATA_SINGLE_FLIGHT_POLL_INTERVAL = 0.5
+
+# Cache the row level security filters of a given set of roles and dataset in each
+# web server or worker process for this many seconds, on top of the per-request
+# cache. Changes to RLS filters invalidate the cache of the process where they're
+# made, but other processes keep using their cached filters until they expire, so
+# keep this short. Set to 0 to only cache filters within a request.
+RLS_FILTERS_CACHE_TIMEOUT = 0
+
+# Keep chart data in the data cache for this many seconds past its cache timeout.
+# During that window the expired result is served right away, while a single
+# background refresh repopulates the cache. The refresh runs in a Celery worker, as
+# the `refresh_chart_data_cache` task. Set to 0 to disable.
+CHART_DATA_STALE_WHILE_REVALIDATE = 0
+
 # CORS Options
 ENABLE_CORS = False
 CORS_OPTIONS: dict[Any, Any] = {}
@@ -857,6 +929,15 @@ ALLOWED_EXTENSIONS = {*EXCEL_EXTENSIONS, *CSV_EXTENSIONS, *COLUMNAR_EXTENSIONS}
 # note: index option should not be overridden
 CSV_EXPORT = {"encoding": "utf-8"}
 
+# Stream the CSV export of SQL Lab results to the client, a batch of rows at a time,
+# instead of building the whole file in memory. The rows are read one chunk at a time
+# from the results backend (see SQLLAB_RESULTS_CHUNK_SIZE), or fetched from the cursor
+# in batches when the query is run again.
+CSV_EXPORT_STREAMING = False
+
+# The number of rows converted to CSV at once when streaming a CSV export
+CSV_EXPORT_BATCH_SIZE = 10000
+
 # Excel Options: key/value pairs that will be passed as argument to DataFrame.to_excel
 # method.
 # note: index option should not be overridden
@@ -898,6 +979,18 @@ TIME_GRAIN_ADDON_EXPRESSIONS: dict[str, dict[str, str]] = {}
 # TIME_GRAIN_JOIN_COLUMN_PRODUCERS = {"P1F": join_producer}
 TIME_GRAIN_JOIN_COLUMN_PRODUCERS: dict[str, Callable[[Series, int], str]] = {}
 
+# The time comparison (time offset) queries of a chart are executed one after
+# another by default. Set this to a value greater than 1 to run the offset queries
+# of a chart concurrently on a thread pool of (at most) that size. Each result is
+# still cached under its own key.
+TIME_OFFSET_QUERIES_MAX_WORKERS = 1
+
+# Maximum number of time offset queries running concurrently against a single
+# database in a web server or worker process, so a chart with many time offsets
+# can't flood a warehouse. Only applies when TIME_OFFSET_QUERIES_MAX_WORKERS > 1.
+# Set to 0 to disable the limit.
+TIME_OFFSET_QUERIES_PER_DATABASE_LIMIT = 4
+
 # ---------------------------------------------------
 # List of viz_types not allowed in your environment
 # For example: Disable pivot table and treemap:
@@ -957,6 +1050,25 @@ QUERY_LOGGER = None
 # Set this API key to enable Mapbox visualizations
 MAPBOX_API_KEY = os.environ.get("MAPBOX_API_KEY", "")
 
+# Reuse SQLAlchemy engines, and their connection pools, across queries instead of
+# creating a new engine with a `NullPool` for every query. Engines are kept in a
+# process-local registry keyed by database, catalog, schema and effective user; the
+# least recently used engines are disposed of when the registry exceeds
+# ENGINE_REGISTRY_MAX_SIZE, as are engines idle for more than
+# ENGINE_REGISTRY_IDLE_TIMEOUT seconds. Engines of a database are also disposed of
+# when the database is modified. Databases behind an SSH tunnel are never pooled.
+# The pool can be configured through the `engine_params` of the database extra,
+# eg, `{"engine_params": {"pool_size": 5, "pool_recycle": 3600}}`.
+ENGINE_REGISTRY_ENABLED = False
+ENGINE_REGISTRY_MAX_SIZE = 32
+ENGINE_REGISTRY_IDLE_TIMEOUT = int(timedelta(minutes=5).total_seconds())
+
+# Fetch query results from the cursor in batches (see
+# `BaseEngineSpec.fetch_data_batches`) and convert each batch to Arrow as it's
+# fetched, instead of fetching all the rows before converting them. This reduces
+# the peak memory used by large results in SQL Lab and in `Database.get_df`.
+FETCH_DATA_IN_BATCHES = False
+
 # Maximum number of rows returned for any analytical database query
 SQL_MAX_ROW = 100000
 
@@ -995,6 +1107,20 @@ DASHBOARD_AUTO_REFRESH_INTERVALS = [
     [86400, "24 hours"],
 ]
 
+# Cache the datasets of dashboards, trimmed to the columns and metrics used by their
+# charts, in the cache configured by CACHE_CONFIG. Entries are keyed by the last time
+# the dashboard, its charts or its datasets were changed, so they are never stale.
+DASHBOARD_DATASETS_CACHE = False
+DASHBOARD_DATASETS_CACHE_TIMEOUT = int(timedelta(days=1).total_seconds())
+
+# Index the tables and views of each database across all its catalogs and schemas, for
+# the table search API. The index is kept in the cache configured by CACHE_CONFIG. It is
+# built by the `table_search.refresh_index` Celery task, which is scheduled by the first
+# search in a database and can also run periodically (see `CeleryConfig.beat_schedule`).
+TABLE_SEARCH_INDEX_TIMEOUT = int(timedelta(days=1).total_seconds())
+# The maximum number of tables returned by a search
+TABLE_SEARCH_RESULT_LIMIT = 100
+
 # This is used as a workaround for the alerts & reports scheduler task to get the time
 # celery beat triggered it, see https://github.com/celery/celery/issues/6974 for details
 CELERY_BEAT_SCHEDULER_EXPIRES = timedelta(weeks=1)
@@ -1011,6 +1137,7 @@ class CeleryConfig:  # pylint: disable=too-few-public-methods
         "rama.tasks.scheduler",
         "rama.tasks.thumbnails",
         "rama.tasks.cache",
+        "rama.tasks.table_search",
     )
     result_backend = "db+sqlite:///celery_results.sqlite"
     worker_prefetch_multiplier = 1
@@ -1036,6 +1163,11 @@ class CeleryConfig:  # pylint: disable=too-few-public-methods
         #     "schedule": crontab(minute=0, hour=0, day_of_month=1),
         #     "options": {"retention_period_days": 180},
         # },
+        # Uncomment to refresh the table search index of all the databases
+        # "table_search.refresh_index": {
+        #     "task": "table_search.refresh_index",
+        #     "schedule": crontab(minute=0, hour="*"),
+        # },
     }
 
 
@@ -1144,6 +1276,23 @@ RESULTS_BACKEND: BaseCache | None = None
 # in order to disable should breaking issues be discovered.
 RESULTS_BACKEND_USE_MSGPACK = True
 
+# Store the results of SQL Lab queries in the results backend as chunks of this many
+# rows, so that a page of the results can be read without fetching all of them.
+# Requires RESULTS_BACKEND_USE_MSGPACK. Set to 0 to store the results as a single
+# value.
+SQLLAB_RESULTS_CHUNK_SIZE = 0
+
+# The compression codec of the chunks of SQL Lab results, either "lz4", "zstd" or
+# None for no compression
+SQLLAB_RESULTS_CHUNK_COMPRESSION: Literal["lz4", "zstd"] | None = "lz4"
+
+# Report the progress of running SQL Lab queries on engines which poll their cursor
+# (Presto, Trino and Hive) through the async queries backend instead of the metadata
+# database, and signal stopped queries through it as well. The progress is published
+# as async events and returned by the queries API, and the query record is only
+# updated on state transitions. Requires the GLOBAL_ASYNC_QUERIES feature flag.
+SQLLAB_QUERY_PROGRESS_CHANNEL = False
+
 # The S3 bucket where you want to store your external hive tables created
 # from CSV files. For example, 'companyname-rama'
 CSV_TO_HIVE_UPLOAD_S3_BUCKET = None
@@ -1276,6 +1425,12 @@ DB_POLL_INTERVAL_SECONDS: dict[str, int] = {}
 # See here: https://github.com/dropbox/PyHive/blob/8eb0aeab8ca300f3024655419b93dad926c1a351/pyhive/presto.py#L93  # pylint: disable=line-too-long,useless-suppression  # noqa: E501
 PRESTO_POLL_INTERVAL = int(timedelta(seconds=1).total_seconds())
 
+# Timeout in seconds of the cache of the latest partitions of Presto, Trino and Hive
+# tables, used by the `latest_partition` Jinja macros and when selecting the first
+# rows of a table. The hits and misses are reported as `partition_cache.hit` and
+# `partition_cache.miss` to the stats logger. Set to 0 to disable the cache.
+PARTITION_CACHE_TIMEOUT = int(timedelta(minutes=1).total_seconds())
+
 # Allow list of custom authentications for each DB engine.
 # Example:
 # from your.module import AuthClass
@@ -1353,6 +1508,13 @@ DISALLOWED_SQL_FUNCTIONS: dict[str, set[str]] = {
     "mysql": {"version"},
 }
 
+# Maximum number of parsed SQL scripts kept in memory by each process, keyed by the
+# SQL, the engine and the parser. The same SQL is often parsed several times while
+# serving a single request (security checks, RLS, limits, etc.), and parsing is
+# expensive for large queries. Parsed statements are shared between callers, so any
+# code that modifies them must work on a copy. Set to 0 to disable the cache.
+SQL_PARSE_CACHE_SIZE = 1000
+
 
 # A function that intercepts the SQL to be executed and can alter it.
 # A common use case for this is around adding some sort of comment header to the SQL
@@ -1510,6 +1672,16 @@ WEBDRIVER_CONFIGURATION = {
 # Note: If using Chrome, you'll want to add the "--marionette" arg.
 WEBDRIVER_OPTION_ARGS = ["--headless"]
 
+# Keep the headless browsers alive between screenshots, instead of launching a new
+# browser for each of them. Each worker thread keeps its own browsers, and a new
+# browser context (Playwright) or a cleared session (Selenium) is used each time
+WEBDRIVER_POOL_ENABLED = False
+# Relaunch a pooled browser after it has loaded this many pages, 0 to never relaunch
+WEBDRIVER_POOL_MAX_PAGES = 100
+# Relaunch the pooled browsers when the memory (RSS) of the browser processes of a
+# worker exceeds this many MB, 0 to disable. Requires psutil
+WEBDRIVER_POOL_MAX_MEMORY_MB = 0
+
 # The base URL to query for accessing the user interface
 WEBDRIVER_BASEURL = "http://0.0.0.0:8080/"
 # The base URL for the email report hyperlinks.
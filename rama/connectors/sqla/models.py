@@ -25,6 +25,7 @@ from collections import defaultdict
 from collections.abc import Hashable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import chain
 from typing import Any, Callable, cast, Optional, Union
 
 import dateutil.parser
@@ -58,10 +59,12 @@ from sqlalchemy.orm import (
     backref,
     foreign,
     Mapped,
+    ORMExecuteState,
     Query,
     reconstructor,
     relationship,
     RelationshipProperty,
+    Session,
 )
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.schema import UniqueConstraint
@@ -71,7 +74,6 @@ from sqlalchemy.sql.expression import Label
 from sqlalchemy.sql.selectable import Alias, TableClause
 
 from rama import app, db, is_feature_enabled, security_manager
-from rama.commands.dataset.exceptions import DatasetNotFoundError
 from rama.common.db_query_status import QueryStatus
 from rama.connectors.sqla.utils import (
     get_columns_description,
@@ -104,6 +106,7 @@ from rama.models.helpers import (
     QueryResult,
 )
 from rama.models.slice import Slice
+from rama.security.rls_cache import rls_filters_cache
 from rama.sql_parse import Table
 from rama.rama_typing import (
     AdhocColumn,
@@ -444,21 +447,11 @@ class BaseDatasource(AuditMixinNullable, ImportExportMixin):  # pylint: disable=
                 if "column" in filter_config
             )
 
-            # for legacy dashboard imports which have the wrong query_context in them
-            try:
-                query_context = slc.get_query_context()
-            except DatasetNotFoundError:
-                query_context = None
-
             # legacy charts don't have query_context charts
-            if query_context:
+            query_context_columns = slc.get_query_context_columns()
+            if query_context_columns is not None:
                 column_names.update(
-                    [
-                        utils.get_column_name(column_)
-                        for query in query_context.queries
-                        for column_ in query.columns
-                    ]
-                    or []
+                    utils.get_column_name(column_) for column_ in query_context_columns
                 )
             else:
                 _columns = [
@@ -2128,3 +2121,50 @@ class RowLevelSecurityFilter(Model, AuditMixinNullable):
         backref="row_level_security_filters",
     )
     clause = Column(utils.MediumText(), nullable=False)
+
+
+def invalidate_rls_filters_cache(session: Session, flush_context: Any) -> None:
+    """
+    Invalidate the cache of RLS filters when a flush modifies filters, or the roles
+    and tables they're assigned to.
+
+    The assignments in `RLSFilterRoles` and `RLSFilterTables` can be modified from
+    either side of the relationships, and are removed when a role or a table is
+    deleted, so the filters are not always part of the flush.
+    """
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, RowLevelSecurityFilter):
+            modified = True
+        elif isinstance(obj, (security_manager.role_model, SqlaTable)):
+            filters = sa.inspect(obj).attrs.row_level_security_filters
+            modified = obj in session.deleted or filters.history.has_changes()
+        else:
+            modified = False
+
+        if modified:
+            rls_filters_cache.invalidate()
+            return
+
+
+def invalidate_rls_filters_cache_on_execute(orm_execute_state: ORMExecuteState) -> None:
+    """
+    Invalidate the cache of RLS filters when they're modified with DML statements,
+    bypassing the ORM.
+    """
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+
+    if getattr(orm_execute_state.statement, "table", None) in {
+        RLSFilterRoles,
+        RLSFilterTables,
+        RowLevelSecurityFilter.__table__,
+    }:
+        rls_filters_cache.invalidate()
+
+
+sa.event.listen(Session, "after_flush", invalidate_rls_filters_cache)
+sa.event.listen(Session, "do_orm_execute", invalidate_rls_filters_cache_on_execute)
@@ -131,6 +131,7 @@ MODEL_API_RW_METHOD_PERMISSION_MAP = {
     "related": "read",
     "related_objects": "read",
     "tables": "read",
+    "search_tables": "read",
     "schemas": "read",
     "catalogs": "read",
     "select_star": "read",
@@ -20,7 +20,7 @@ import logging
 from datetime import datetime
 from typing import Any
 
-from flask import g
+from flask import current_app, g
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 
 from rama import is_feature_enabled, security_manager
@@ -33,7 +33,7 @@ from rama.commands.dashboard.exceptions import (
 from rama.daos.base import BaseDAO
 from rama.dashboards.filters import DashboardAccessFilter, is_uuid
 from rama.exceptions import RamaSecurityException
-from rama.extensions import db
+from rama.extensions import cache_manager, db
 from rama.models.core import FavStar, FavStarClassName
 from rama.models.dashboard import Dashboard, id_or_slug_filter
 from rama.models.embedded_dashboard import EmbeddedDashboard
@@ -79,7 +79,30 @@ class DashboardDAO(BaseDAO[Dashboard]):
     @staticmethod
     def get_datasets_for_dashboard(id_or_slug: str) -> list[Any]:
         dashboard = DashboardDAO.get_by_id_or_slug(id_or_slug)
-        return dashboard.datasets_trimmed_for_slices()
+        if not current_app.config["DASHBOARD_DATASETS_CACHE"]:
+            return dashboard.datasets_trimmed_for_slices()
+
+        changed_on = max(
+            DashboardDAO.get_dashboard_and_slices_changed_on(dashboard),
+            DashboardDAO.get_dashboard_and_datasets_changed_on(dashboard),
+        )
+        cache_key = f"dashboard_datasets:{dashboard.id}:{changed_on.isoformat()}"
+        try:
+            if (datasets := cache_manager.cache.get(cache_key)) is not None:
+                return datasets
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Exception possibly due to cache backend.")
+
+        datasets = dashboard.datasets_trimmed_for_slices()
+        try:
+            cache_manager.cache.set(
+                cache_key,
+                datasets,
+                timeout=current_app.config["DASHBOARD_DATASETS_CACHE_TIMEOUT"],
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Exception possibly due to cache backend.")
+        return datasets
 
     @staticmethod
     def get_tabs_for_dashboard(id_or_slug: str) -> dict[str, Any]:
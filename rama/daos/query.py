@@ -18,6 +18,8 @@ import logging
 from datetime import datetime
 from typing import Any, Union
 
+from sqlalchemy import or_
+
 from rama import sql_lab
 from rama.common.db_query_status import QueryStatus
 from rama.daos.base import BaseDAO
@@ -26,6 +28,7 @@ from rama.extensions import db
 from rama.models.sql_lab import Query, SavedQuery
 from rama.queries.filters import QueryFilter
 from rama.queries.saved_queries.filters import SavedQueryFilter
+from rama.sqllab import query_progress
 from rama.utils.core import get_user_id
 from rama.utils.dates import now_as_float
 
@@ -50,9 +53,14 @@ class QueryDAO(BaseDAO[Query]):
         # UTC date time, same that is stored in the DB.
         last_updated_dt = datetime.utcfromtimestamp(last_updated_ms / 1000)
 
+        changed = Query.changed_on >= last_updated_dt
+        if query_progress.is_enabled():
+            # the progress of running queries is reported without updating them
+            changed = or_(changed, Query.status == QueryStatus.RUNNING)
+
         return (
             db.session.query(Query)
-            .filter(Query.user_id == get_user_id(), Query.changed_on >= last_updated_dt)
+            .filter(Query.user_id == get_user_id(), changed)
             .all()
         )
 
@@ -77,6 +85,7 @@ class QueryDAO(BaseDAO[Query]):
 
         query.status = QueryStatus.STOPPED
         query.end_time = now_as_float()
+        query_progress.stop(query)
 
 
 class SavedQueryDAO(BaseDAO[SavedQuery]):
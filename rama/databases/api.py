@@ -46,6 +46,7 @@ from rama.commands.database.exceptions import (
 )
 from rama.commands.database.export import ExportDatabasesCommand
 from rama.commands.database.importers.dispatcher import ImportDatabasesCommand
+from rama.commands.database.search_tables import SearchTablesDatabaseCommand
 from rama.commands.database.ssh_tunnel.delete import DeleteSSHTunnelCommand
 from rama.commands.database.ssh_tunnel.exceptions import (
     SSHTunnelDatabasePortError,
@@ -78,6 +79,7 @@ from rama.databases.schemas import (
     CatalogsResponseSchema,
     database_catalogs_query_schema,
     database_schemas_query_schema,
+    database_search_tables_query_schema,
     database_tables_query_schema,
     DatabaseConnectionSchema,
     DatabaseFunctionNamesResponse,
@@ -85,6 +87,7 @@ from rama.databases.schemas import (
     DatabasePutSchema,
     DatabaseRelatedObjectsResponse,
     DatabaseSchemaAccessForFileUploadResponse,
+    DatabaseSearchTablesResponse,
     DatabaseTablesResponse,
     DatabaseTestConnectionSchema,
     DatabaseValidateParametersSchema,
@@ -146,6 +149,7 @@ class DatabaseRestApi(BaseRamaModelRestApi):
         RouteMethod.IMPORT,
         RouteMethod.RELATED,
         "tables",
+        "search_tables",
         "table_metadata",
         "table_metadata_deprecated",
         "table_extra_metadata",
@@ -272,6 +276,7 @@ class DatabaseRestApi(BaseRamaModelRestApi):
         "database_catalogs_query_schema": database_catalogs_query_schema,
         "database_schemas_query_schema": database_schemas_query_schema,
         "database_tables_query_schema": database_tables_query_schema,
+        "database_search_tables_query_schema": database_search_tables_query_schema,
         "get_export_ids_schema": get_export_ids_schema,
     }
 
@@ -282,6 +287,7 @@ class DatabaseRestApi(BaseRamaModelRestApi):
         DatabaseFunctionNamesResponse,
         DatabaseSchemaAccessForFileUploadResponse,
         DatabaseRelatedObjectsResponse,
+        DatabaseSearchTablesResponse,
         DatabaseTablesResponse,
         DatabaseTestConnectionSchema,
         DatabaseValidateParametersSchema,
@@ -806,6 +812,76 @@ class DatabaseRestApi(BaseRamaModelRestApi):
         payload = command.run()
         return self.response(200, **payload)
 
+    @expose("/<int:pk>/search_tables/")
+    @protect()
+    @rison(database_search_tables_query_schema)
+    @statsd_metrics
+    @handle_api_exception
+    @event_logger.log_this_with_context(
+        action=lambda self, *args, **kwargs: f"{self.__class__.__name__}"
+        f".search_tables",
+        log_to_statsd=False,
+    )
+    def search_tables(self, pk: int, **kwargs: Any) -> FlaskResponse:
+        """Search the tables of all the catalogs and schemas of a database.
+        ---
+        get:
+          summary: Search the tables of all the catalogs and schemas of a database
+          description: >-
+            Tables are searched in an index of the database, which is kept in the
+            cache. The index is built in the background after the first search, which
+            returns no results. Pass `force` to refresh it in the background, which
+            requires access to the whole database.
+          parameters:
+          - in: path
+            schema:
+              type: integer
+            name: pk
+            description: The database id
+          - in: query
+            name: q
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/database_search_tables_query_schema'
+          responses:
+            200:
+              description: Tables list
+              content:
+                application/json:
+                  schema:
+                    type: object
+                    properties:
+                      count:
+                        type: integer
+                      result:
+                        description: >-
+                          A List of tables matching the search
+                        type: array
+                        items:
+                          $ref: '#/components/schemas/DatabaseSearchTablesResponse'
+            400:
+              $ref: '#/components/responses/400'
+            401:
+              $ref: '#/components/responses/401'
+            403:
+              $ref: '#/components/responses/403'
+            404:
+              $ref: '#/components/responses/404'
+            422:
+              $ref: '#/components/responses/422'
+            500:
+              $ref: '#/components/responses/500'
+        """
+        command = SearchTablesDatabaseCommand(
+            pk,
+            kwargs["rison"]["query"],
+            limit=kwargs["rison"].get("limit"),
+            force=kwargs["rison"].get("force", False),
+        )
+        payload = command.run()
+        return self.response(200, **payload)
+
     @expose("/<int:pk>/table/<path:table_name>/<schema_name>/", methods=("GET",))
     @protect()
     @check_table_access
@@ -0,0 +1,162 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+from flask import current_app
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class EngineKey(NamedTuple):
+    """
+    Identifies a pooled engine.
+
+    The fingerprint is a hash of the final SQLAlchemy URL and engine parameters, so
+    that changes in credentials, OAuth2 tokens, or connection mutators produce a
+    different engine.
+    """
+
+    database_id: int | None
+    catalog: str | None
+    schema: str | None
+    effective_username: str | None
+    fingerprint: str
+
+
+class _Entry(NamedTuple):
+    engine: Engine
+    last_used: float
+
+
+class EngineRegistry:
+    """
+    A process-local registry of SQLAlchemy engines, and their connection pools.
+
+    Creating an engine for every query means paying for dialect initialization and
+    for establishing (and authenticating) a new connection every time. The registry
+    keeps engines around so that connections can be reused across requests and
+    Celery tasks. It's bounded in size (least recently used engines are disposed
+    first), disposes of engines that have been idle for too long, and engines of a
+    given database can be invalidated when the database is modified.
+
+    Databases behind an SSH tunnel are not pooled, since the tunnel is closed once
+    the engine is no longer used.
+
+    Engines are never shared across processes: when a process is forked the
+    registry of the child process starts empty.
+    """
+
+    def __init__(self) -> None:
+        self._engines: OrderedDict[EngineKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get_engine(self, key: EngineKey, create: Callable[[], Engine]) -> Engine:
+        """
+        Return the engine for a given key, creating it if needed.
+
+        :param key: The key identifying the engine
+        :param create: A function that creates a new engine
+        :returns: A pooled engine
+        """
+        stats_logger = current_app.config["STATS_LOGGER"]
+        max_size = current_app.config["ENGINE_REGISTRY_MAX_SIZE"]
+        idle_timeout = current_app.config["ENGINE_REGISTRY_IDLE_TIMEOUT"]
+
+        with self._lock:
+            self._reset_after_fork()
+            self._evict_idle(idle_timeout)
+
+            if entry := self._engines.get(key):
+                self._engines[key] = entry._replace(last_used=time.monotonic())
+                self._engines.move_to_end(key)
+                stats_logger.incr("engine_registry.hit")
+                return entry.engine
+
+        stats_logger.incr("engine_registry.miss")
+        engine = create()
+
+        with self._lock:
+            # another thread might have created the engine in the meantime
+            if entry := self._engines.get(key):
+                engine.dispose()
+                return entry.engine
+
+            self._engines[key] = _Entry(engine, time.monotonic())
+            while len(self._engines) > max_size:
+                _, evicted = self._engines.popitem(last=False)
+                self._dispose(evicted.engine)
+
+            stats_logger.gauge("engine_registry.size", len(self._engines))
+
+        return engine
+
+    def invalidate(self, database_id: int | None) -> None:
+        """
+        Dispose of all the engines of a given database.
+        """
+        with self._lock:
+            for key in [key for key in self._engines if key.database_id == database_id]:
+                self._dispose(self._engines.pop(key).engine)
+
+    def clear(self) -> None:
+        """
+        Dispose of all the engines.
+        """
+        with self._lock:
+            while self._engines:
+                _, entry = self._engines.popitem()
+                self._dispose(entry.engine)
+
+    def _evict_idle(self, idle_timeout: int) -> None:
+        threshold = time.monotonic() - idle_timeout
+        for key in [
+            key for key, entry in self._engines.items() if entry.last_used < threshold
+        ]:
+            self._dispose(self._engines.pop(key).engine)
+
+    def _reset_after_fork(self) -> None:
+        # connections can't be shared with the parent process, so they're dropped
+        # without being closed
+        if (pid := os.getpid()) != self._pid:
+            self._engines.clear()
+            self._pid = pid
+
+    @staticmethod
+    def _dispose(engine: Engine) -> None:
+        current_app.config["STATS_LOGGER"].incr("engine_registry.evict")
+        try:
+            engine.dispose()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to dispose of engine", exc_info=True)
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._engines
+
+
+engine_registry = EngineRegistry()
@@ -83,6 +83,16 @@ database_tables_query_schema = {
     "required": ["schema_name"],
 }
 
+database_search_tables_query_schema = {
+    "type": "object",
+    "properties": {
+        "query": {"type": "string", "minLength": 1},
+        "limit": {"type": "integer", "minimum": 1},
+        "force": {"type": "boolean"},
+    },
+    "required": ["query"],
+}
+
 database_name_description = "A database name to identify this connection."
 port_description = "Port number for the database connection."
 cache_timeout_description = (
@@ -146,6 +156,8 @@ extra_description = markdown(
     "in seconds for metadata fetch of this database. Specify it as "
     '**"metadata_cache_timeout": {"schema_cache_timeout": 600, '
     '"table_cache_timeout": 600}**. '
+    "The ``table_cache_timeout`` also applies to the columns, indexes and "
+    "constraints of tables. "
     "If unset, cache will not be enabled for the functionality. "
     "A timeout of 0 indicates that the cache never expires.<br/>"
     "3. The ``schemas_allowed_for_file_upload`` is a comma separated list "
@@ -742,6 +754,15 @@ class DatabaseTablesResponse(Schema):
     value = fields.String(metadata={"description": "The table or view name"})
 
 
+class DatabaseSearchTablesResponse(Schema):
+    catalog = fields.String(
+        allow_none=True, metadata={"description": "The catalog of the table or view"}
+    )
+    schema = fields.String(metadata={"description": "The schema of the table or view"})
+    type = fields.String(metadata={"description": "table or view"})
+    value = fields.String(metadata={"description": "The table or view name"})
+
+
 class ValidateSQLRequest(Schema):
     sql = fields.String(
         required=True, metadata={"description": "SQL statement to validate"}
@@ -0,0 +1,264 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Search index of the tables and views of a database.
+
+Listing tables is done one catalog/schema at a time, so finding a table in a database
+with hundreds of schemas would require listing each one of them. Instead, the fully
+qualified names of all the tables and views of a database are kept in the cache, as a
+list of `(catalog, schema, name, type)` entries, and searched in memory.
+
+Listing every schema can take long, so the index is never built while serving a
+search: the first search in a database schedules the `table_search.refresh_index`
+Celery task and returns no results until the index is cached. The index expires after
+`TABLE_SEARCH_INDEX_TIMEOUT`, and the task can also be scheduled periodically to
+refresh it. Since the index is shared by all users, it contains every table, and the
+results of a search are filtered by the permissions of the user.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+from typing import Optional, TYPE_CHECKING
+
+from flask import current_app
+
+from rama import security_manager
+from rama.exceptions import OAuth2RedirectError
+from rama.extensions import cache_manager
+from rama.utils.core import DatasourceName
+
+if TYPE_CHECKING:
+    from rama.models.core import Database
+
+logger = logging.getLogger(__name__)
+
+# catalog, schema, name and type ("table" or "view")
+TableIndexEntry = tuple[Optional[str], str, str, str]
+
+# How long a scheduled refresh of the index prevents scheduling another one, in case
+# the task never runs
+REFRESH_SCHEDULED_TIMEOUT = 600
+
+
+def get_table_index_cache_key(database: Database) -> str:
+    return f"db:{database.id}:table_search_index"
+
+
+def get_table_index_refresh_cache_key(database: Database) -> str:
+    return f"db:{database.id}:table_search_index_refresh"
+
+
+def get_catalogs(database: Database, force: bool = False) -> list[str | None]:
+    """
+    Return the catalogs of a database that are shown to users.
+
+    :param database: The database
+    :param force: Whether to bypass the cache of catalog names
+    :returns: The catalogs, or `[None]` for databases without catalogs
+    """
+    if database.db_engine_spec.supports_catalog and database.allow_multi_catalog:
+        return sorted(
+            database.get_all_catalog_names(
+                cache=database.schema_cache_enabled,
+                cache_timeout=database.schema_cache_timeout,
+                force=force,
+            )
+        )
+
+    return [database.get_default_catalog()]
+
+
+def build_table_index(database: Database, force: bool = False) -> list[TableIndexEntry]:
+    """
+    Read the tables and views of all the catalogs and schemas of a database.
+
+    Catalogs and schemas that can't be read are logged and skipped, so that a single
+    broken schema doesn't prevent searching the others.
+
+    :param database: The database
+    :param force: Whether to bypass the caches of catalog, schema and table names
+    :returns: The entries of the index
+    """
+    index: list[TableIndexEntry] = []
+    for catalog in get_catalogs(database, force):
+        try:
+            schemas = database.get_all_schema_names(
+                catalog=catalog,
+                cache=database.schema_cache_enabled,
+                cache_timeout=database.schema_cache_timeout,
+                force=force,
+            )
+        except OAuth2RedirectError:
+            # the user needs to authenticate to the database first
+            raise
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to list schemas of catalog %s", catalog)
+            continue
+
+        for schema in sorted(schemas):
+            try:
+                for type_, names in (
+                    ("table", database.get_all_table_names_in_schema),
+                    ("view", database.get_all_view_names_in_schema),
+                ):
+                    index.extend(
+                        (catalog, schema, name, type_)
+                        for name, *_ in sorted(
+                            names(
+                                catalog=catalog,
+                                schema=schema,
+                                force=force,
+                                cache=database.table_cache_enabled,
+                                cache_timeout=database.table_cache_timeout,
+                            )
+                        )
+                    )
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to list tables of schema %s", schema)
+
+    return index
+
+
+def refresh_table_index(
+    database: Database,
+    force: bool = False,
+) -> list[TableIndexEntry]:
+    """
+    Build the index of a database and store it in the cache.
+
+    :param database: The database
+    :param force: Whether to bypass the caches of catalog, schema and table names
+    :returns: The entries of the index
+    """
+    index = build_table_index(database, force)
+    try:
+        cache_manager.cache.set(
+            get_table_index_cache_key(database),
+            index,
+            timeout=current_app.config["TABLE_SEARCH_INDEX_TIMEOUT"],
+        )
+        cache_manager.cache.delete(get_table_index_refresh_cache_key(database))
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Unable to cache the table index", exc_info=True)
+
+    return index
+
+
+def schedule_table_index_refresh(database: Database, force: bool = False) -> None:
+    """
+    Schedule the refresh of the index of a database in a Celery worker, unless a
+    refresh is already scheduled.
+
+    :param database: The database
+    :param force: Whether to bypass the caches of catalog, schema and table names
+    """
+    # pylint: disable=import-outside-toplevel
+    from rama.tasks.table_search import refresh_index
+
+    try:
+        if not cache_manager.cache.add(
+            get_table_index_refresh_cache_key(database),
+            True,
+            timeout=REFRESH_SCHEDULED_TIMEOUT,
+        ):
+            return
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Unable to cache the table index refresh", exc_info=True)
+
+    try:
+        refresh_index.delay(database.id, force=force)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Unable to schedule the table index refresh", exc_info=True)
+        with contextlib.suppress(Exception):
+            cache_manager.cache.delete(get_table_index_refresh_cache_key(database))
+
+
+def get_table_index(database: Database, force: bool = False) -> list[TableIndexEntry]:
+    """
+    Return the cached index of a database.
+
+    When the index is not in the cache, or when `force` is set, its refresh is
+    scheduled in the background, and the cached entries (if any) are returned.
+
+    :param database: The database
+    :param force: Whether to refresh the index
+    :returns: The entries of the index
+    """
+    try:
+        index = cache_manager.cache.get(get_table_index_cache_key(database))
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Unable to read the table index from cache", exc_info=True)
+        index = None
+
+    if index is None or force:
+        schedule_table_index_refresh(database, force)
+
+    return [tuple(entry) for entry in index or []]  # type: ignore
+
+
+def search_tables(
+    database: Database,
+    query: str,
+    limit: int | None = None,
+    force: bool = False,
+) -> list[TableIndexEntry]:
+    """
+    Search the tables and views of a database that the user can access.
+
+    The search is case insensitive, and matches the table name or its fully qualified
+    name. Tables whose name starts with the query are returned first.
+
+    :param database: The database
+    :param query: The search term
+    :param limit: The maximum number of results
+    :param force: Whether to refresh the index
+    :returns: The matching entries of the index
+    """
+    query = query.strip().lower()
+    entries = sorted(
+        (
+            entry
+            for entry in get_table_index(database, force)
+            if query in ".".join(part for part in entry[:3] if part).lower()
+        ),
+        # prefix matches first, then by name
+        key=lambda entry: (
+            not entry[2].lower().startswith(query),
+            entry[2],
+            entry[0] or "",
+            entry[1],
+        ),
+    )
+
+    accessible = set(
+        security_manager.filter_datasources_accessible_by_user(
+            database,
+            [
+                DatasourceName(name, schema, catalog)
+                for catalog, schema, name, _ in entries
+            ],
+        )
+    )
+    entries = [
+        entry
+        for entry in entries
+        if DatasourceName(entry[2], entry[1], entry[0]) in accessible
+    ]
+
+    return entries[:limit] if limit else entries
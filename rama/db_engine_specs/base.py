@@ -21,6 +21,7 @@ from __future__ import annotations
 import logging
 import re
 import warnings
+from collections.abc import Iterator
 from datetime import datetime
 from re import Match, Pattern
 from typing import (
@@ -37,6 +38,7 @@ from urllib.parse import urlencode, urljoin
 from uuid import uuid4
 
 import pandas as pd
+import pyarrow as pa
 import requests
 import sqlparse
 from apispec import APISpec
@@ -66,6 +68,7 @@ from rama.exceptions import DisallowedSQLFunction, OAuth2Error, OAuth2RedirectEr
 from rama.sql.parse import BaseSQLStatement, SQLScript, Table
 from rama.sql_parse import ParsedQuery
 from rama.rama_typing import (
+    DbapiDescription,
     OAuth2ClientConfig,
     OAuth2State,
     OAuth2TokenResponse,
@@ -394,6 +397,9 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
 
     force_column_alias_quotes = False
     arraysize = 0
+    # number of rows fetched at a time by ``fetch_data_batches`` when the engine spec
+    # doesn't define an ``arraysize``
+    fetch_batch_size = 10000
     max_column_name_length: int | None = None
     try_remove_schema_from_table_name = True  # pylint: disable=invalid-name
     run_multiple_statements_as_one = False
@@ -973,25 +979,10 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             if cls.limit_method == LimitMethod.FETCH_MANY and limit:
                 return cursor.fetchmany(limit)
             data = cursor.fetchall()
-            description = cursor.description or []
-            # Create a mapping between column name and a mutator function to normalize
-            # values with. The first two items in the description row are
-            # the column name and type.
-            column_mutators = {
-                row[0]: func
-                for row in description
-                if (
-                    func := cls.column_type_mutators.get(
-                        type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
-                    )
-                )
-            }
-            if column_mutators:
-                indexes = {row[0]: idx for idx, row in enumerate(description)}
+            if column_mutators := cls.get_column_mutators(cursor.description):
                 for row_idx, row in enumerate(data):
                     new_row = list(row)
-                    for col, func in column_mutators.items():
-                        col_idx = indexes[col]
+                    for col_idx, func in column_mutators.items():
                         new_row[col_idx] = func(row[col_idx])
                     data[row_idx] = tuple(new_row)
 
@@ -999,6 +990,79 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         except Exception as ex:
             raise cls.get_dbapi_mapped_exception(ex) from ex
 
+    @classmethod
+    def fetch_data_batches(
+        cls,
+        cursor: Any,
+        limit: int | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Fetch the results of a query as Arrow record batches.
+
+        Rows are pulled from the cursor with ``fetchmany``, ``arraysize`` rows at a
+        time, and converted to a record batch with the column type mutators applied
+        per column, so that memory doesn't grow with the whole result before rows are
+        converted. Rows are only fetched as the batches are consumed.
+
+        Engine specs with a custom ``fetch_data`` return all the rows from it in a
+        single batch. Engine specs whose DB API driver can return Arrow data natively
+        should override this method and return the batches without copying them.
+
+        :param cursor: Cursor instance
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator of record batches, one per fetch
+        """
+        # pylint: disable=import-outside-toplevel
+        from rama.result_set import get_column_names, RamaResultSet
+
+        if cls.fetch_data.__qualname__ != BaseEngineSpec.fetch_data.__qualname__:
+            data = cls.fetch_data(cursor, limit)
+            if data and (column_names := get_column_names(cursor.description)):
+                yield RamaResultSet.convert_rows(data, column_names)
+            return
+
+        if cls.arraysize:
+            cursor.arraysize = cls.arraysize
+        batch_size = cls.arraysize or cls.fetch_batch_size
+        try:
+            column_names = get_column_names(cursor.description)
+            if not column_names:
+                return
+
+            column_mutators = cls.get_column_mutators(cursor.description)
+            remaining = limit
+            while remaining is None or remaining > 0:
+                size = batch_size if remaining is None else min(batch_size, remaining)
+                if not (data := cursor.fetchmany(size)):
+                    break
+                if remaining is not None:
+                    remaining -= len(data)
+                yield RamaResultSet.convert_rows(data, column_names, column_mutators)
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
+    @classmethod
+    def get_column_mutators(
+        cls,
+        description: DbapiDescription | None,
+    ) -> dict[int, Callable[[Any], Any]]:
+        """
+        Return the functions used to normalize the values of each column.
+
+        :param description: The cursor description
+        :return: A mapping between the index of a column and its mutator function
+        """
+        # The first two items in the description row are the column name and type.
+        return {
+            idx: func
+            for idx, row in enumerate(description or [])
+            if (
+                func := cls.column_type_mutators.get(
+                    type(cls.get_sqla_column_type(cls.get_datatype(row[1])))
+                )
+            )
+        }
+
     @classmethod
     def expand_data(
         cls, columns: list[ResultSetColumnType], data: list[dict[Any, Any]]
@@ -1600,6 +1664,27 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             )
         )
 
+    @classmethod
+    def get_schema_columns(  # pylint: disable=unused-argument
+        cls,
+        database: Database,
+        inspector: Inspector,
+        schema: str,
+    ) -> dict[str, list[ResultSetColumnType]] | None:
+        """
+        Get the columns of all the tables in a schema, in a single query.
+
+        This is used to fill the table metadata cache of a database. Engines that
+        can't read the columns of a whole schema efficiently return `None`, and the
+        columns are read one table at a time with `get_columns`.
+
+        :param database: Database instance
+        :param inspector: SqlAlchemy Inspector instance
+        :param schema: The schema
+        :return: The columns of each table in the schema, or `None` if not supported
+        """
+        return None
+
     @classmethod
     def get_metrics(  # pylint: disable=unused-argument
         cls,
@@ -36,8 +36,6 @@ from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import URL
 from sqlalchemy.sql.expression import ColumnClause, Select
 
-from rama import db
-from rama.common.db_query_status import QueryStatus
 from rama.constants import TimeGrain
 from rama.databases.utils import make_url_safe
 from rama.db_engine_specs.base import BaseEngineSpec
@@ -46,6 +44,7 @@ from rama.exceptions import RamaException
 from rama.extensions import cache_manager
 from rama.models.sql_lab import Query
 from rama.sql_parse import Table
+from rama.sqllab.query_progress import QueryProgressTracker
 from rama.rama_typing import ResultSetColumnType
 
 if TYPE_CHECKING:
@@ -354,13 +353,10 @@ class HiveEngineSpec(PrestoEngineSpec):
         tracking_url = None
         job_id = None
         query_id = query.id
+        tracker = QueryProgressTracker(query)
         while polled.operationState in unfinished_states:
             # Queries don't terminate when user clicks the STOP button on SQL LAB.
-            # Refresh session so that the `query.status` modified in stop_query in
-            # views/core.py is reflected here.
-            db.session.refresh(query)
-            query = db.session.query(type(query)).filter_by(id=query_id).one()
-            if query.status == QueryStatus.STOPPED:
+            if tracker.is_stopped():
                 cursor.cancel()
                 break
 
@@ -377,10 +373,7 @@ class HiveEngineSpec(PrestoEngineSpec):
                 logger.info(
                     "Query %s: Progress total: %s", str(query_id), str(progress)
                 )
-                needs_commit = False
-                if progress > query.progress:
-                    query.progress = progress
-                    needs_commit = True
+                tracker.set_progress(progress)
                 if not tracking_url:
                     tracking_url = cls.get_tracking_url_from_logs(log_lines)
                     if tracking_url:
@@ -390,9 +383,8 @@ class HiveEngineSpec(PrestoEngineSpec):
                             str(query_id),
                             tracking_url,
                         )
-                        query.tracking_url = tracking_url
+                        tracker.set_tracking_url(tracking_url)
                         logger.info("Query %s: Job id: %s", str(query_id), str(job_id))
-                        needs_commit = True
                 if job_id and len(log_lines) > last_log_line:
                     # Wait for job id before logging things out
                     # this allows for prefixing all log lines and becoming
@@ -400,8 +392,6 @@ class HiveEngineSpec(PrestoEngineSpec):
                     for l in log_lines[last_log_line:]:  # noqa: E741
                         logger.info("Query %s: [%s] %s", str(query_id), str(job_id), l)
                     last_log_line = len(log_lines)
-                if needs_commit:
-                    db.session.commit()  # pylint: disable=consider-using-transaction
             if sleep_interval := current_app.config.get("HIVE_POLL_INTERVAL"):
                 logger.warning(
                     "HIVE_POLL_INTERVAL is deprecated and will be removed in 3.0. Please use DB_POLL_INTERVAL_SECONDS instead"  # noqa: E501
@@ -33,15 +33,14 @@ import pandas as pd
 from flask import current_app
 from flask_babel import gettext as __, lazy_gettext as _
 from packaging.version import Version
-from sqlalchemy import Column, literal_column, types
+from sqlalchemy import Column, literal_column, text, types
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.result import Row as ResultRow
 from sqlalchemy.engine.url import URL
 from sqlalchemy.sql.expression import ColumnClause, Select
 
-from rama import cache_manager, db, is_feature_enabled
-from rama.common.db_query_status import QueryStatus
+from rama import cache_manager, is_feature_enabled
 from rama.constants import TimeGrain
 from rama.databases.utils import make_url_safe
 from rama.db_engine_specs.base import BaseEngineSpec
@@ -59,6 +58,7 @@ from rama.models.sql_types.presto_sql_types import (
 )
 from rama.result_set import destringify
 from rama.rama_typing import ResultSetColumnType
+from rama.sqllab.query_progress import QueryProgressTracker
 from rama.utils import core as utils, json
 from rama.utils.core import GenericDataType
 
@@ -568,7 +568,107 @@ class PrestoBaseEngineSpec(BaseEngineSpec, metaclass=ABCMeta):
         return None
 
     @classmethod
-    @cache_manager.data_cache.memoize(timeout=60)
+    def _get_latest_partition_query(
+        cls,
+        table: Table,
+        indexes: list[dict[str, Any]],
+        database: Database,
+    ) -> str:
+        return cls._partition_query(
+            table,
+            indexes,
+            database,
+            limit=1,
+            order_by=[
+                (column_name, True) for column_name in indexes[0]["column_names"]
+            ],
+        )
+
+    @staticmethod
+    def _get_partition_cache_key(
+        database: Database, table: Table, **kwargs: Any
+    ) -> str:
+        key = f"partition:{database.id}:{table.catalog}:{table.schema}:{table.table}"
+        if kwargs:
+            key += ":" + json.dumps(kwargs, sort_keys=True, default=str)
+        return key
+
+    @staticmethod
+    def _get_cached_partition(key: str) -> Any:
+        if not current_app.config["PARTITION_CACHE_TIMEOUT"]:
+            return None
+
+        try:
+            return cache_manager.data_cache.get(key)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to read from the partition cache", exc_info=True)
+            return None
+
+    @staticmethod
+    def _set_cached_partition(key: str, value: Any) -> None:
+        if timeout := current_app.config["PARTITION_CACHE_TIMEOUT"]:
+            try:
+                cache_manager.data_cache.set(key, value, timeout=timeout)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to write to the partition cache", exc_info=True)
+
+    @classmethod
+    def cache_latest_partitions(cls, database: Database, tables: list[Table]) -> None:
+        """
+        Look up the latest partition of many tables at once and store them in the
+        partition cache, so that `latest_partition` finds them there.
+
+        The indexes of the tables in a schema are read with a single inspector, and
+        their partition queries are run on a single connection. Tables which are not
+        partitioned are skipped, and so are the tables of a schema whose lookup fails.
+
+        :param database: The database the queries will be run against
+        :param tables: The tables to look up
+        """
+        tables_by_schema: dict[tuple[str | None, str | None], list[Table]] = (
+            defaultdict(list)
+        )
+        for table in dict.fromkeys(tables):
+            key = cls._get_partition_cache_key(database, table)
+            if cls._get_cached_partition(key) is None:
+                tables_by_schema[(table.catalog, table.schema)].append(table)
+
+        for (catalog, schema), schema_tables in tables_by_schema.items():
+            try:
+                column_names: dict[Table, list[str]] = {}
+                sqls = []
+                with database.get_inspector(
+                    catalog=catalog,
+                    schema=schema,
+                ) as inspector:
+                    for table in schema_tables:
+                        indexes = cls.get_indexes(database, inspector, table)
+                        if indexes and indexes[0]["column_names"]:
+                            column_names[table] = indexes[0]["column_names"]
+                            sqls.append(
+                                cls._get_latest_partition_query(
+                                    table,
+                                    indexes,
+                                    database,
+                                )
+                            )
+
+                dfs = database.get_dfs(sqls, catalog=catalog, schema=schema)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Unable to look up the latest partitions of %s",
+                    schema_tables,
+                    exc_info=True,
+                )
+                continue
+
+            for (table, names), df in zip(column_names.items(), dfs, strict=True):
+                cls._set_cached_partition(
+                    cls._get_partition_cache_key(database, table),
+                    (names, cls._latest_partition_from_df(df)),
+                )
+
+    @classmethod
     def latest_partition(
         cls,
         database: Database,
@@ -578,6 +678,9 @@ class PrestoBaseEngineSpec(BaseEngineSpec, metaclass=ABCMeta):
     ) -> tuple[list[str], list[str] | None]:
         """Returns col name and the latest (max) partition value for a table
 
+        The result is kept in the partition cache for `PARTITION_CACHE_TIMEOUT`
+        seconds.
+
         :param table: the table instance
         :param database: database query will be run against
         :type database: models.Database
@@ -589,42 +692,45 @@ class PrestoBaseEngineSpec(BaseEngineSpec, metaclass=ABCMeta):
         >>> latest_partition('foo_table')
         (['ds'], ('2018-01-01',))
         """
-        if indexes is None:
-            indexes = database.get_indexes(table)
+        stats_logger = current_app.config["STATS_LOGGER"]
+        key = cls._get_partition_cache_key(database, table)
+        if (cached := cls._get_cached_partition(key)) is not None:
+            stats_logger.incr("partition_cache.hit")
+            column_names, values = cached
+        else:
+            stats_logger.incr("partition_cache.miss")
+            if indexes is None:
+                indexes = database.get_indexes(table)
+
+            if not indexes:
+                raise RamaTemplateException(
+                    f"Error getting partition for {table}. "
+                    "Verify that this table has a partition."
+                )
 
-        if not indexes:
-            raise RamaTemplateException(
-                f"Error getting partition for {table}. "
-                "Verify that this table has a partition."
-            )
+            if len(indexes[0]["column_names"]) < 1:
+                raise RamaTemplateException(
+                    "The table should have one partitioned field"
+                )
 
-        if len(indexes[0]["column_names"]) < 1:
-            raise RamaTemplateException(
-                "The table should have one partitioned field"
+            column_names = indexes[0]["column_names"]
+            values = cls._latest_partition_from_df(
+                df=database.get_df(
+                    sql=cls._get_latest_partition_query(table, indexes, database),
+                    catalog=table.catalog,
+                    schema=table.schema,
+                )
             )
+            cls._set_cached_partition(key, (column_names, values))
 
-        if not show_first and len(indexes[0]["column_names"]) > 1:
+        if not show_first and len(column_names) > 1:
             raise RamaTemplateException(
                 "The table should have a single partitioned field "
                 "to use this function. You may want to use "
                 "`presto.latest_sub_partition`"
             )
 
-        column_names = indexes[0]["column_names"]
-
-        return column_names, cls._latest_partition_from_df(
-            df=database.get_df(
-                sql=cls._partition_query(
-                    table,
-                    indexes,
-                    database,
-                    limit=1,
-                    order_by=[(column_name, True) for column_name in column_names],
-                ),
-                catalog=table.catalog,
-                schema=table.schema,
-            )
-        )
+        return column_names, values
 
     @classmethod
     def latest_sub_partition(
@@ -655,6 +761,13 @@ class PrestoBaseEngineSpec(BaseEngineSpec, metaclass=ABCMeta):
         >>> latest_sub_partition('sub_partition_table', event_type='click')
         '2018-01-01'
         """
+        stats_logger = current_app.config["STATS_LOGGER"]
+        key = cls._get_partition_cache_key(database, table, **kwargs)
+        if (cached := cls._get_cached_partition(key)) is not None:
+            stats_logger.incr("partition_cache.hit")
+            return cached
+
+        stats_logger.incr("partition_cache.miss")
         indexes = database.get_indexes(table)
         part_fields = indexes[0]["column_names"]
         for k in kwargs.keys():  # pylint: disable=consider-iterating-dictionary
@@ -681,9 +794,9 @@ class PrestoBaseEngineSpec(BaseEngineSpec, metaclass=ABCMeta):
             filters=kwargs,
         )
         df = database.get_df(sql, table.catalog, table.schema)
-        if df.empty:
-            return ""
-        return df.to_dict()[field_to_return][0]
+        partition = "" if df.empty else df.to_dict()[field_to_return][0]
+        cls._set_cached_partition(key, partition)
+        return partition
 
     @classmethod
     def _show_columns(
@@ -734,7 +847,15 @@ class PrestoBaseEngineSpec(BaseEngineSpec, metaclass=ABCMeta):
         :return: a list of results that contain column info
                 (i.e. column name and data type)
         """
-        columns = cls._show_columns(inspector, table)
+        return cls._parse_columns(cls._show_columns(inspector, table))
+
+    @classmethod
+    def _parse_columns(cls, columns: list[ResultRow]) -> list[ResultSetColumnType]:
+        """
+        Parse columns read with `SHOW COLUMNS` or from the information schema
+        :param columns: rows with the `Column` and `Type` of each column
+        :return: a list of results that contain column info
+        """
         result: list[ResultSetColumnType] = []
         for column in columns:
             # parse column if it is a row or array
@@ -1059,6 +1180,41 @@ class PrestoEngineSpec(PrestoBaseEngineSpec):
             results = cursor.fetchall()
             return {row[0] for row in results}
 
+    @classmethod
+    def get_schema_columns(
+        cls,
+        database: Database,
+        inspector: Inspector,
+        schema: str,
+    ) -> dict[str, list[ResultSetColumnType]] | None:
+        """
+        Get the columns of all the tables in a schema from the information schema,
+        instead of running `SHOW COLUMNS` for each table.
+
+        :param database: The database to inspect
+        :param inspector: The SQLAlchemy inspector
+        :param schema: The schema to inspect
+        :returns: The columns of each table in the schema
+        """
+        sql = dedent(
+            """
+            SELECT table_name, column_name AS "Column", data_type AS "Type"
+            FROM information_schema.columns
+            WHERE table_schema = :schema
+            ORDER BY table_name, ordinal_position
+            """
+        ).strip()
+        rows = inspector.bind.execute(text(sql), schema=schema).fetchall()
+
+        columns: dict[str, list[ResultRow]] = defaultdict(list)
+        for row in rows:
+            columns[row.table_name].append(row)
+
+        return {
+            table_name: cls._parse_columns(table_columns)
+            for table_name, table_columns in columns.items()
+        }
+
     @classmethod
     def _is_column_name_quoted(cls, column_name: str) -> bool:
         """
@@ -1322,9 +1478,9 @@ class PrestoEngineSpec(PrestoBaseEngineSpec):
     @classmethod
     def handle_cursor(cls, cursor: Cursor, query: Query) -> None:
         """Updates progress information"""
+        tracker = QueryProgressTracker(query)
         if tracking_url := cls.get_tracking_url(cursor):
-            query.tracking_url = tracking_url
-            db.session.commit()
+            tracker.set_tracking_url(tracking_url)
 
         query_id = query.id
         poll_interval = query.database.connect_args.get(
@@ -1340,8 +1496,7 @@ class PrestoEngineSpec(PrestoBaseEngineSpec):
             # Update the object and wait for the kill signal.
             stats = polled.get("stats", {})
 
-            query = db.session.query(type(query)).filter_by(id=query_id).one()
-            if query.status in [QueryStatus.STOPPED, QueryStatus.TIMED_OUT]:
+            if tracker.is_stopped():
                 cursor.cancel()
                 break
 
@@ -1362,8 +1517,7 @@ class PrestoEngineSpec(PrestoBaseEngineSpec):
                         completed_splits,
                         total_splits,
                     )
-                    query.progress = max(query.progress, progress)
-                    db.session.commit()
+                    tracker.set_progress(progress)
             time.sleep(poll_interval)
             logger.info("Query %i: Polling the cursor for progress", query_id)
             polled = cursor.poll()
@@ -16,11 +16,13 @@
 # under the License.
 import logging
 import re
+from collections.abc import Iterator
 from datetime import datetime
 from re import Pattern
 from typing import Any, Optional, TYPE_CHECKING, TypedDict
 from urllib import parse
 
+import pyarrow as pa
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from cryptography.hazmat.backends import default_backend
@@ -245,6 +247,50 @@ class SnowflakeEngineSpec(PostgresBaseEngineSpec):
         extra["engine_params"] = engine_params
         database.extra = json.dumps(extra)
 
+    @classmethod
+    def fetch_data_batches(
+        cls,
+        cursor: Any,
+        limit: Optional[int] = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Fetch the results as Arrow record batches straight from the cursor.
+
+        The Snowflake connector downloads results in the Arrow format, so the batches
+        are returned without converting the values to Python objects. When the results
+        are not in the Arrow format (eg, if ``python_connector_query_result_format`` is
+        set to JSON) the rows are fetched with the default implementation.
+
+        :param cursor: Cursor instance
+        :param limit: Maximum number of rows to be returned by the cursor
+        :return: Iterator of record batches
+        """
+        # pylint: disable=import-outside-toplevel
+        from snowflake.connector.errors import NotSupportedError
+
+        from rama.result_set import get_column_names
+
+        try:
+            tables = cursor.fetch_arrow_batches()
+        except NotSupportedError:
+            yield from super().fetch_data_batches(cursor, limit)
+            return
+
+        column_names = get_column_names(cursor.description)
+        remaining = limit
+        try:
+            for table in tables:
+                for batch in table.to_batches():
+                    if remaining is not None:
+                        if remaining <= 0:
+                            return
+                        batch = batch.slice(0, remaining)
+                        remaining -= batch.num_rows
+                    # use the deduped column names, without copying the data
+                    yield pa.RecordBatch.from_arrays(batch.columns, names=column_names)
+        except Exception as ex:
+            raise cls.get_dbapi_mapped_exception(ex) from ex
+
     @classmethod
     def get_cancel_query_id(cls, cursor: Any, query: Query) -> Optional[str]:
         """
@@ -41,6 +41,7 @@ from rama.db_engine_specs.exceptions import (
 from rama.db_engine_specs.presto import PrestoBaseEngineSpec
 from rama.models.sql_lab import Query
 from rama.sql_parse import Table
+from rama.sqllab import query_progress
 from rama.rama_typing import ResultSetColumnType
 from rama.utils import core as utils, json
 
@@ -228,6 +229,21 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
         super().handle_cursor(cursor=cursor, query=query)
 
+    @classmethod
+    def get_progress(cls, cursor: Cursor) -> float | None:
+        """
+        Return the progress of the query running on a cursor, from its statistics.
+
+        :param cursor: The Trino cursor
+        :returns: The progress of the query, from 0 to 100, if it's known
+        """
+        stats = getattr(cursor, "stats", None) or {}
+        completed_splits = stats.get("completedSplits")
+        total_splits = stats.get("totalSplits")
+        if not completed_splits or not total_splits:
+            return None
+        return 100 * (float(completed_splits) / float(total_splits))
+
     @classmethod
     def execute_with_cursor(
         cls,
@@ -297,6 +313,15 @@ class TrinoEngineSpec(PrestoBaseEngineSpec):
 
         # Block until the query completes; same behaviour as the client itself
         logger.debug("Query %d: Waiting for query to complete", query_id)
+        if query_progress.is_enabled():
+            # the progress is only reported when it doesn't go through the query
+            tracker = query_progress.QueryProgressTracker(query)
+            poll_interval = query_database.connect_args.get(
+                "poll_interval", current_app.config["PRESTO_POLL_INTERVAL"]
+            )
+            while not execute_event.wait(poll_interval):
+                if (progress := cls.get_progress(cursor)) is not None:
+                    tracker.set_progress(progress)
         execute_event.wait()
 
         # Unfortunately we'll mangle the stack trace due to the thread, but
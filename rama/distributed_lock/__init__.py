@@ -38,6 +38,7 @@ RESOURCE = KeyValueResource.LOCK
 @contextmanager
 def KeyValueDistributedLock(  # pylint: disable=invalid-name  # noqa: N802
     namespace: str,
+    lock_expiration: timedelta = LOCK_EXPIRATION,
     **kwargs: Any,
 ) -> Iterator[uuid.UUID]:
     """
@@ -49,6 +50,8 @@ def KeyValueDistributedLock(  # pylint: disable=invalid-name  # noqa: N802
     store.
 
     :param namespace: The namespace for which the lock is to be acquired.
+    :param lock_expiration: How long the lock is held at most, in case it's not
+        released (eg, the process holding it dies).
     :param kwargs: Additional keyword arguments.
     :yields: A unique identifier (UUID) for the acquired lock (the KV key).
     :raises CreateKeyValueDistributedLockFailedException: If the lock is taken.
@@ -67,11 +70,17 @@ def KeyValueDistributedLock(  # pylint: disable=invalid-name  # noqa: N802
 
     logger.debug("Acquiring lock on namespace %s for key %s", namespace, key)
     try:
-        CreateDistributedLock(namespace=namespace, params=kwargs).run()
+        CreateDistributedLock(
+            namespace=namespace,
+            params=kwargs,
+            lock_expiration=lock_expiration,
+        ).run()
     except CreateKeyValueDistributedLockFailedException as ex:
         logger.debug("Lock on namespace %s for key %s already taken", namespace, key)
         raise CreateKeyValueDistributedLockFailedException("Lock already taken") from ex
 
-    yield key
-    DeleteDistributedLock(namespace=namespace, params=kwargs).run()
+    try:
+        yield key
+    finally:
+        DeleteDistributedLock(namespace=namespace, params=kwargs).run()
     logger.debug("Removed lock on namespace %s for key %s", namespace, key)
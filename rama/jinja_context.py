@@ -27,7 +27,7 @@ from typing import Any, Callable, cast, Optional, TYPE_CHECKING, TypedDict, Unio
 import dateutil
 from flask import current_app, g, has_request_context, request
 from flask_babel import gettext as _
-from jinja2 import DebugUndefined, Environment, nodes
+from jinja2 import DebugUndefined, Environment, nodes, TemplateError
 from jinja2.nodes import Call, Node
 from jinja2.sandbox import SandboxedEnvironment
 from sqlalchemy.engine.interfaces import Dialect
@@ -72,6 +72,8 @@ ALLOWED_TYPES = (
     "TimeFilter",
 )
 COLLECTION_TYPES = ("list", "dict", "tuple", "set")
+# macros of the Presto context which look up the latest partition of a table
+PARTITION_MACROS = ("first_latest_partition", "latest_partitions", "latest_partition")
 
 
 @lru_cache(maxsize=LRU_CACHE_MAX_SIZE)
@@ -699,6 +701,47 @@ class PrestoTemplateProcessor(JinjaTemplateProcessor):
             schema, table_name = table_name.split(".")
         return table_name, schema
 
+    def process_template(self, sql: str, **kwargs: Any) -> str:
+        self._cache_latest_partitions(sql)
+        return super().process_template(sql, **kwargs)
+
+    def _cache_latest_partitions(self, sql: str) -> None:
+        """
+        Look up the latest partitions of the tables referenced in a template at once,
+        instead of one at a time while rendering it.
+
+        :param sql: The Jinjafied SQL statement
+        """
+        # pylint: disable=import-outside-toplevel
+        from rama.db_engine_specs.presto import PrestoEngineSpec
+
+        try:
+            template = self.env.parse(sql)
+        except TemplateError:
+            # the error is raised when rendering the template
+            return
+
+        tables = []
+        for node in template.find_all(nodes.Call):
+            if (
+                isinstance(node.node, nodes.Getattr)
+                and node.node.attr in PARTITION_MACROS
+                and len(node.args) == 1
+            ):
+                try:
+                    table_name = node.args[0].as_const()
+                except nodes.Impossible:
+                    continue
+                if isinstance(table_name, str):
+                    tables.append(
+                        Table(*self._schema_table(table_name.strip(), self._schema))
+                    )
+
+        if len(set(tables)) > 1:
+            cast(
+                PrestoEngineSpec, self._database.db_engine_spec
+            ).cache_latest_partitions(self._database, tables)
+
     def first_latest_partition(self, table_name: str) -> Optional[str]:
         """
         Gets the first value in the array of all latest partitions
@@ -750,6 +793,7 @@ class SparkTemplateProcessor(HiveTemplateProcessor):
     engine = "spark"
 
     def process_template(self, sql: str, **kwargs: Any) -> str:
+        self._cache_latest_partitions(sql)
         template = self.env.from_string(sql)
         kwargs.update(self._context)
 
@@ -763,6 +807,7 @@ class TrinoTemplateProcessor(PrestoTemplateProcessor):
     engine = "trino"
 
     def process_template(self, sql: str, **kwargs: Any) -> str:
+        self._cache_latest_partitions(sql)
         template = self.env.from_string(sql)
         kwargs.update(self._context)
 
@@ -0,0 +1,43 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""add extra_json to report execution log
+
+Revision ID: d16ad2d4bb4b
+Revises: 74ad1125881c
+Create Date: 2026-10-18 10:12:31.482016
+
+"""
+
+import sqlalchemy as sa
+
+from rama.migrations.shared.utils import add_columns, drop_columns
+from rama.utils.core import MediumText
+
+# revision identifiers, used by Alembic.
+revision = "d16ad2d4bb4b"
+down_revision = "74ad1125881c"
+
+
+def upgrade():
+    add_columns(
+        "report_execution_log",
+        sa.Column("extra_json", MediumText(), nullable=True, default="{}"),
+    )
+
+
+def downgrade():
+    drop_columns("report_execution_log", "extra_json")
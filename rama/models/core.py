@@ -25,15 +25,17 @@ import builtins
 import logging
 import textwrap
 from ast import literal_eval
+from collections.abc import Iterator
 from contextlib import closing, contextmanager, nullcontext, suppress
 from copy import deepcopy
-from datetime import datetime
+from datetime import datetime, timedelta
 from functools import lru_cache
 from inspect import signature
 from typing import Any, Callable, cast, TYPE_CHECKING
 
 import numpy
 import pandas as pd
+import pyarrow as pa
 import sqlalchemy as sqla
 import sshtunnel
 from flask import g, request
@@ -56,6 +58,7 @@ from sqlalchemy.engine.url import URL
 from sqlalchemy.exc import NoSuchModuleError
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.pool import NullPool
 from sqlalchemy.schema import UniqueConstraint
 from sqlalchemy.sql import ColumnElement, expression, Select
@@ -63,6 +66,7 @@ from sqlalchemy.sql import ColumnElement, expression, Select
 from rama import app, db, db_engine_specs, is_feature_enabled
 from rama.commands.database.exceptions import DatabaseInvalidError
 from rama.constants import LRU_CACHE_MAX_SIZE, PASSWORD_MASK
+from rama.databases.engine_registry import EngineKey, engine_registry
 from rama.databases.utils import make_url_safe
 from rama.db_engine_specs.base import MetricType, TimeGrain
 from rama.extensions import (
@@ -73,7 +77,7 @@ from rama.extensions import (
     ssh_manager_factory,
 )
 from rama.models.helpers import AuditMixinNullable, ImportExportMixin, UUIDMixin
-from rama.result_set import RamaResultSet
+from rama.result_set import get_column_names, RamaResultSet
 from rama.sql.parse import SQLScript
 from rama.sql_parse import Table
 from rama.rama_typing import (
@@ -84,6 +88,7 @@ from rama.rama_typing import (
 from rama.utils import cache as cache_util, core as utils, json
 from rama.utils.backports import StrEnum
 from rama.utils.core import get_username
+from rama.utils.hashing import md5_sha_from_dict
 from rama.utils.oauth2 import (
     check_for_oauth2,
     get_oauth2_access_token,
@@ -97,6 +102,9 @@ log_query = config["QUERY_LOGGER"]
 metadata = Model.metadata  # pylint: disable=no-member
 logger = logging.getLogger(__name__)
 
+# per-table metadata cached by the database, see `Database.get_columns`
+TABLE_METADATA_KINDS = ("columns", "indexes", "pk_constraint", "foreign_keys")
+
 if TYPE_CHECKING:
     from rama.databases.ssh_tunnel.models import SSHTunnel
     from rama.models.sql_lab import Query
@@ -462,6 +470,7 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                         nullpool=nullpool,
                         source=source,
                         sqlalchemy_uri=sqlalchemy_uri,
+                        reuse_engine=ssh_tunnel is None,
                     )
 
     def _get_sqla_engine(  # pylint: disable=too-many-locals  # noqa: C901
@@ -471,15 +480,22 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         nullpool: bool = True,
         source: utils.QuerySource | None = None,
         sqlalchemy_uri: str | None = None,
+        reuse_engine: bool = False,
     ) -> Engine:
         sqlalchemy_url = make_url_safe(
             sqlalchemy_uri if sqlalchemy_uri else self.sqlalchemy_uri_decrypted
         )
         self.db_engine_spec.validate_database_uri(sqlalchemy_url)
 
+        # when the engine registry is enabled engines are reused, together with their
+        # connection pool, instead of creating a new engine with a `NullPool`
+        use_registry = reuse_engine and config["ENGINE_REGISTRY_ENABLED"]
+
         extra = self.get_extra()
         params = extra.get("engine_params", {})
-        if nullpool:
+        if use_registry:
+            params.setdefault("pool_pre_ping", True)
+        elif nullpool:
             params["poolclass"] = NullPool
         connect_args = params.get("connect_args", {})
 
@@ -551,10 +567,32 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
                 security_manager,
                 source,
             )
-        try:
-            return create_engine(sqlalchemy_url, **params)
-        except Exception as ex:
-            raise self.db_engine_spec.get_dbapi_mapped_exception(ex) from ex
+
+        def create() -> Engine:
+            try:
+                return create_engine(sqlalchemy_url, **params)
+            except Exception as ex:
+                raise self.db_engine_spec.get_dbapi_mapped_exception(ex) from ex
+
+        if not use_registry:
+            return create()
+
+        url = make_url_safe(sqlalchemy_url)
+        key = EngineKey(
+            database_id=self.id,
+            catalog=catalog,
+            schema=schema,
+            effective_username=effective_username,
+            fingerprint=md5_sha_from_dict(
+                {
+                    "url": url.render_as_string(hide_password=False),
+                    "params": params,
+                    "changed_on": self.changed_on,
+                },
+                default=str,
+            ),
+        )
+        return engine_registry.get_engine(key, create)
 
     def add_database_to_signature(
         self,
@@ -671,6 +709,31 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
             )
         return sql_
 
+    def _execute_statement(
+        self,
+        cursor: Any,
+        sql: str,
+        engine_url: URL,
+        schema: str | None,
+    ) -> None:
+        """
+        Run a single statement, after applying the SQL mutator and logging it.
+
+        :param cursor: The cursor to run the statement in
+        :param sql: The SQL statement
+        :param engine_url: The URL of the engine, for the query logger
+        :param schema: The schema the statement runs in, for the query logger
+        """
+        sql = self.mutate_sql_based_on_config(sql, is_split=True)
+        if log_query:
+            log_query(engine_url, sql, schema, __name__, security_manager)
+        with event_logger.log_context(
+            action="execute_sql",
+            database=self,
+            object_ref=__name__,
+        ):
+            self.db_engine_spec.execute(cursor, sql, self)
+
     def get_df(
         self,
         sql: str,
@@ -682,29 +745,11 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         with self.get_sqla_engine(catalog=catalog, schema=schema) as engine:
             engine_url = engine.url
 
-        def _log_query(sql: str) -> None:
-            if log_query:
-                log_query(
-                    engine_url,
-                    sql,
-                    schema,
-                    __name__,
-                    security_manager,
-                )
-
         with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
             cursor = conn.cursor()
             df = None
             for i, sql_ in enumerate(sqls):
-                sql_ = self.mutate_sql_based_on_config(sql_, is_split=True)
-                _log_query(sql_)
-                with event_logger.log_context(
-                    action="execute_sql",
-                    database=self,
-                    object_ref=__name__,
-                ):
-                    self.db_engine_spec.execute(cursor, sql_, self)
-
+                self._execute_statement(cursor, sql_, engine_url, schema)
                 rows = self.fetch_rows(cursor, i == len(sqls) - 1)
                 if rows is not None:
                     df = self.load_into_dataframe(cursor.description, rows)
@@ -714,20 +759,136 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
             return self.post_process_df(df)
 
-    @event_logger.log_this
-    def fetch_rows(self, cursor: Any, last: bool) -> list[tuple[Any, ...]] | None:
-        if not last:
-            cursor.fetchall()
-            return None
+    def get_dfs(
+        self,
+        sqls: list[str],
+        catalog: str | None = None,
+        schema: str | None = None,
+    ) -> list[pd.DataFrame]:
+        """
+        Run many single statement queries on a single connection.
+
+        :param sqls: The SQL statements to run
+        :param catalog: The catalog to run the SQL in
+        :param schema: The schema to run the SQL in
+        :returns: The results of each statement
+        """
+        with self.get_sqla_engine(catalog=catalog, schema=schema) as engine:
+            engine_url = engine.url
+
+        dfs = []
+        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
+            cursor = conn.cursor()
+            for sql in sqls:
+                self._execute_statement(cursor, sql, engine_url, schema)
+                rows = self.fetch_rows(cursor, True)
+                df = self.load_into_dataframe(cursor.description, rows)
+                dfs.append(self.post_process_df(df))
+
+        return dfs
+
+    def get_df_batches(
+        self,
+        sql: str,
+        catalog: str | None = None,
+        schema: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Run a query, and return its results as dataframes of a batch of rows each.
+
+        Rows are fetched from the cursor as the dataframes are consumed (see
+        `BaseEngineSpec.fetch_data_batches`), so that the results are never held in
+        memory all at once. A single empty dataframe is returned when the query has no
+        rows, so that the columns are always known.
+
+        :param sql: The SQL to run; only the results of its last statement are returned
+        :param catalog: The catalog to run the SQL in
+        :param schema: The schema to run the SQL in
+        :param limit: The maximum number of rows to return
+        """
+        sqls = self.db_engine_spec.parse_sql(sql)
+        with self.get_sqla_engine(catalog=catalog, schema=schema) as engine:
+            engine_url = engine.url
+
+        with self.get_raw_connection(catalog=catalog, schema=schema) as conn:
+            cursor = conn.cursor()
+            for i, sql_ in enumerate(sqls):
+                self._execute_statement(cursor, sql_, engine_url, schema)
+                if i < len(sqls) - 1:
+                    cursor.fetchall()
+
+            empty = True
+            for batch in self.db_engine_spec.fetch_data_batches(cursor, limit):
+                empty = False
+                result_set = RamaResultSet.from_record_batches(
+                    [batch],
+                    cursor.description,
+                    self.db_engine_spec,
+                )
+                yield self.post_process_df(result_set.to_pandas_df())
+
+            if empty:
+                yield pd.DataFrame(columns=get_column_names(cursor.description))
+
+    def fetch_rows(
+        self,
+        cursor: Any,
+        last: bool,
+    ) -> list[tuple[Any, ...]] | Iterator[pa.RecordBatch] | None:
+        if config["FETCH_DATA_IN_BATCHES"] and last:
+            # rows are pulled from the cursor as the batches are consumed, so the
+            # fetch is logged once the batches are exhausted
+            return self._log_fetch_batches(
+                self.db_engine_spec.fetch_data_batches(cursor)
+            )
+
+        with event_logger.log_context(
+            action="fetch_rows",
+            object_ref=Database.fetch_rows.__qualname__,
+        ):
+            if not last:
+                cursor.fetchall()
+                return None
 
-        return self.db_engine_spec.fetch_data(cursor)
+            return self.db_engine_spec.fetch_data(cursor)
+
+    @staticmethod
+    def _log_fetch_batches(
+        batches: Iterator[pa.RecordBatch],
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Log the time spent fetching the batches, excluding the time spent by the
+        consumer processing them.
+        """
+        duration = timedelta()
+        while True:
+            start = datetime.now()
+            batch = next(batches, None)
+            duration += datetime.now() - start
+            if batch is None:
+                break
+            yield batch
+
+        event_logger.log_with_context(
+            action="fetch_rows",
+            duration=duration,
+            object_ref=Database.fetch_rows.__qualname__,
+        )
 
     @event_logger.log_this
     def load_into_dataframe(
         self,
         description: DbapiDescription,
-        data: list[tuple[Any, ...]],
+        data: list[tuple[Any, ...]] | Iterator[pa.RecordBatch],
     ) -> pd.DataFrame:
+        if isinstance(data, Iterator):
+            return RamaResultSet.from_record_batches(
+                data,
+                description,
+                self.db_engine_spec,
+            ).to_pandas_df()
+
         result_set = RamaResultSet(
             data,
             description,
@@ -990,11 +1151,117 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         ) as inspector:
             return self.db_engine_spec.get_table_comment(inspector, table)
 
-    def get_columns(self, table: Table) -> list[ResultSetColumnType]:
+    def _get_table_metadata_cache_key(self, table: Table, kind: str) -> str:
+        return (
+            f"db:{self.id}:catalog:{table.catalog}:schema:{table.schema}:"
+            f"table:{table.table}:{kind}"
+        )
+
+    def _get_cached_table_metadata(
+        self,
+        table: Table,
+        kind: str,
+        fetch: Callable[[], Any],
+        force: bool = False,
+    ) -> Any:
+        """
+        Return metadata of a table from the cache, fetching it on a miss.
+
+        Like the table and view names, the metadata is only cached when the database
+        has a ``table_cache_timeout``, which is also used as its TTL.
+
+        :param table: The table
+        :param kind: The kind of metadata, eg, ``columns``
+        :param fetch: A function that reads the metadata from the database
+        :param force: Whether to bypass and refresh the cache
+        :returns: The metadata
+        """
+        if not self.table_cache_enabled:
+            return fetch()
+
+        cache_key = self._get_table_metadata_cache_key(table, kind)
+        if not force:
+            try:
+                value = cache_manager.cache.get(cache_key)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Unable to read key %s from cache", cache_key)
+                value = None
+            if value is not None:
+                return value
+
+        value = fetch()
+        self._set_cached_table_metadata({cache_key: value})
+        return value
+
+    def _set_cached_table_metadata(self, values: dict[str, Any]) -> None:
+        try:
+            cache_manager.cache.set_many(values, timeout=self.table_cache_timeout)
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to cache table metadata", exc_info=True)
+
+    def invalidate_table_metadata(self, table: Table) -> None:
+        """
+        Remove the cached columns, indexes and constraints of a table.
+
+        :param table: The table
+        """
+        try:
+            cache_manager.cache.delete_many(
+                *[
+                    self._get_table_metadata_cache_key(table, kind)
+                    for kind in TABLE_METADATA_KINDS
+                ]
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to invalidate table metadata", exc_info=True)
+
+    def get_columns(
+        self,
+        table: Table,
+        force: bool = False,
+    ) -> list[ResultSetColumnType]:
+        return self._get_cached_table_metadata(
+            table,
+            "columns",
+            lambda: self._fetch_columns(table),
+            force,
+        )
+
+    def _fetch_columns(self, table: Table) -> list[ResultSetColumnType]:
         with self.get_inspector(
             catalog=table.catalog,
             schema=table.schema,
         ) as inspector:
+            # when the metadata is cached, engines that support it read the columns
+            # of the whole schema at once, so that other tables are cache hits
+            if self.table_cache_enabled and table.schema:
+                try:
+                    schema_columns = self.db_engine_spec.get_schema_columns(
+                        self,
+                        inspector,
+                        table.schema,
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    # fall back to inspecting the table
+                    logger.warning(
+                        "Unable to read the columns of schema %s",
+                        table.schema,
+                        exc_info=True,
+                    )
+                    schema_columns = None
+                if schema_columns and table.table in schema_columns:
+                    self._set_cached_table_metadata(
+                        {
+                            self._get_table_metadata_cache_key(
+                                Table(table_name, table.schema, table.catalog),
+                                "columns",
+                            ): columns
+                            for table_name, columns in schema_columns.items()
+                            if table_name != table.table
+                        }
+                    )
+                    return schema_columns[table.table]
+
             return self.db_engine_spec.get_columns(
                 inspector, table, self.schema_options
             )
@@ -1009,19 +1276,33 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
         ) as inspector:
             return self.db_engine_spec.get_metrics(self, inspector, table)
 
-    def get_indexes(self, table: Table) -> list[dict[str, Any]]:
-        with self.get_inspector(
-            catalog=table.catalog,
-            schema=table.schema,
-        ) as inspector:
-            return self.db_engine_spec.get_indexes(self, inspector, table)
+    def get_indexes(
+        self,
+        table: Table,
+        force: bool = False,
+    ) -> list[dict[str, Any]]:
+        def fetch() -> list[dict[str, Any]]:
+            with self.get_inspector(
+                catalog=table.catalog,
+                schema=table.schema,
+            ) as inspector:
+                return self.db_engine_spec.get_indexes(self, inspector, table)
 
-    def get_pk_constraint(self, table: Table) -> dict[str, Any]:
-        with self.get_inspector(
-            catalog=table.catalog,
-            schema=table.schema,
-        ) as inspector:
-            pk_constraint = inspector.get_pk_constraint(table.table, table.schema) or {}
+        return self._get_cached_table_metadata(table, "indexes", fetch, force)
+
+    def get_pk_constraint(
+        self,
+        table: Table,
+        force: bool = False,
+    ) -> dict[str, Any]:
+        def fetch() -> dict[str, Any]:
+            with self.get_inspector(
+                catalog=table.catalog,
+                schema=table.schema,
+            ) as inspector:
+                pk_constraint = (
+                    inspector.get_pk_constraint(table.table, table.schema) or {}
+                )
 
             def _convert(value: Any) -> Any:
                 try:
@@ -1031,12 +1312,21 @@ class Database(Model, AuditMixinNullable, ImportExportMixin):  # pylint: disable
 
             return {key: _convert(value) for key, value in pk_constraint.items()}
 
-    def get_foreign_keys(self, table: Table) -> list[dict[str, Any]]:
-        with self.get_inspector(
-            catalog=table.catalog,
-            schema=table.schema,
-        ) as inspector:
-            return inspector.get_foreign_keys(table.table, table.schema)
+        return self._get_cached_table_metadata(table, "pk_constraint", fetch, force)
+
+    def get_foreign_keys(
+        self,
+        table: Table,
+        force: bool = False,
+    ) -> list[dict[str, Any]]:
+        def fetch() -> list[dict[str, Any]]:
+            with self.get_inspector(
+                catalog=table.catalog,
+                schema=table.schema,
+            ) as inspector:
+                return inspector.get_foreign_keys(table.table, table.schema)
+
+        return self._get_cached_table_metadata(table, "foreign_keys", fetch, force)
 
     def get_schema_access_for_file_upload(  # pylint: disable=invalid-name
         self,
@@ -1181,6 +1471,19 @@ sqla.event.listen(Database, "after_update", security_manager.database_after_upda
 sqla.event.listen(Database, "after_delete", security_manager.database_after_delete)
 
 
+def invalidate_database_engines(
+    mapper: Mapper,  # pylint: disable=unused-argument
+    connection: Connection,  # pylint: disable=unused-argument
+    target: Database,
+) -> None:
+    """Dispose of the pooled engines of a database when it's modified."""
+    engine_registry.invalidate(target.id)
+
+
+sqla.event.listen(Database, "after_update", invalidate_database_engines)
+sqla.event.listen(Database, "after_delete", invalidate_database_engines)
+
+
 class DatabaseUserOAuth2Tokens(Model, AuditMixinNullable):
     """
     Store OAuth2 tokens, for authenticating to DBs using user personal tokens.
@@ -19,6 +19,7 @@ from __future__ import annotations
 import logging
 import uuid
 from collections import defaultdict, deque
+from collections.abc import Iterable
 from typing import Any, Callable
 
 import sqlalchemy as sqla
@@ -37,7 +38,7 @@ from sqlalchemy import (
     UniqueConstraint,
 )
 from sqlalchemy.engine.base import Connection
-from sqlalchemy.orm import relationship, subqueryload
+from sqlalchemy.orm import joinedload, relationship, selectinload, subqueryload
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.sql.elements import BinaryExpression
 
@@ -274,19 +275,45 @@ class Dashboard(AuditMixinNullable, ImportExportMixin, Model):
         for slc in self.slices:
             slices_by_datasource[(slc.cls_model, slc.datasource_id)].add(slc)
 
+        datasources = self._load_datasources(slices_by_datasource)
         result: list[dict[str, Any]] = []
 
-        for (cls_model, datasource_id), slices in slices_by_datasource.items():
-            datasource = (
-                db.session.query(cls_model).filter_by(id=datasource_id).one_or_none()
-            )
-
-            if datasource:
+        for key, slices in slices_by_datasource.items():
+            if datasource := datasources.get(key):
                 # Filter out unneeded fields from the datasource payload
                 result.append(datasource.data_for_slices(slices))
 
         return result
 
+    @staticmethod
+    def _load_datasources(
+        keys: Iterable[tuple[type[BaseDatasource], int]],
+    ) -> dict[tuple[type[BaseDatasource], int], BaseDatasource]:
+        """
+        Load datasources in bulk, with a query per type of datasource.
+
+        The columns, metrics, owners and database of datasets are eagerly loaded,
+        so the number of queries doesn't grow with the number of datasets.
+        """
+        ids_by_cls_model: dict[type[BaseDatasource], set[int]] = defaultdict(set)
+        for cls_model, datasource_id in keys:
+            ids_by_cls_model[cls_model].add(datasource_id)
+
+        datasources: dict[tuple[type[BaseDatasource], int], BaseDatasource] = {}
+        for cls_model, datasource_ids in ids_by_cls_model.items():
+            query = db.session.query(cls_model).filter(cls_model.id.in_(datasource_ids))
+            if cls_model is SqlaTable:
+                query = query.options(
+                    selectinload(SqlaTable.columns),
+                    selectinload(SqlaTable.metrics),
+                    selectinload(SqlaTable.owners),
+                    joinedload(SqlaTable.database),
+                )
+            for datasource in query.all():
+                datasources[(cls_model, datasource.id)] = datasource
+
+        return datasources
+
     @property
     def params(self) -> str:
         return self.json_metadata
@@ -68,10 +68,10 @@ from rama.exceptions import (
 )
 from rama.extensions import feature_flag_manager
 from rama.jinja_context import BaseTemplateProcessor
-from rama.sql.parse import SQLScript
+from rama.sql.parse import RLSMethod, SQLScript
 from rama.sql_parse import (
+    apply_rls,
     has_table_query,
-    insert_rls_in_predicate,
     sanitize_clause,
 )
 from rama.rama_typing import (
@@ -141,12 +141,19 @@ def validate_adhoc_subquery(
                         level=ErrorLevel.ERROR,
                     )
                 )
-            # TODO (betodealmeida): reimplement with sqlglot
-            statement = insert_rls_in_predicate(statement, database_id, default_schema)
-
-        statements.append(statement)
+            statements.append(
+                apply_rls(
+                    str(statement),
+                    database_id,
+                    engine,
+                    default_schema,
+                    RLSMethod.AS_PREDICATE,
+                )
+            )
+        else:
+            statements.append(str(statement))
 
-    return ";\n".join(str(statement) for statement in statements)
+    return ";\n".join(statements)
 
 
 def json_to_dict(json_str: str) -> dict[Any, Any]:
@@ -35,6 +35,7 @@ from rama.queries.schemas import (
     StopQuerySchema,
 )
 from rama.rama_typing import FlaskResponse
+from rama.sqllab import query_progress
 from rama.views.base_api import (
     BaseRamaModelRestApi,
     RelatedFieldFilter,
@@ -216,6 +217,12 @@ class QueryRestApi(BaseRamaModelRestApi):
             last_updated_ms = kwargs["rison"].get("last_updated_ms", 0)
             queries = QueryDAO.get_queries_changed_after(last_updated_ms)
             payload = [q.to_dict() for q in queries]
+            if progress := query_progress.get_progress(queries):
+                for query in payload:
+                    if query["id"] in progress:
+                        query["progress"] = max(
+                            query["progress"] or 0, progress[query["id"]]
+                        )
             return self.response(200, result=payload)
         except RamaException as ex:
             return self.response(ex.status, message=ex.message)
@@ -58,6 +58,7 @@ class ReportExecutionLogRestApi(BaseRamaModelRestApi):
         "state",
         "error_message",
         "uuid",
+        "extra_json",
     ]
     list_columns = [
         "id",
@@ -69,6 +70,7 @@ class ReportExecutionLogRestApi(BaseRamaModelRestApi):
         "state",
         "error_message",
         "uuid",
+        "extra_json",
     ]
     order_columns = [
         "state",
@@ -207,7 +207,7 @@ class ReportRecipients(Model, AuditMixinNullable):
     )
 
 
-class ReportExecutionLog(Model):  # pylint: disable=too-few-public-methods
+class ReportExecutionLog(ExtraJSONMixin, Model):  # pylint: disable=too-few-public-methods
     """
     Report Execution Log, hold the result of the report execution with timestamps,
     last observation and possible error messages
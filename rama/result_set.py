@@ -16,9 +16,13 @@
 # under the License.
 """Rama wrapper around pyarrow.Table."""
 
+from __future__ import annotations
+
 import datetime
 import logging
-from typing import Any, Optional
+from collections.abc import Iterable, Sequence
+from operator import itemgetter
+from typing import Any, Callable, Optional
 
 import numpy as np
 import pandas as pd
@@ -99,100 +103,194 @@ def convert_to_string(value: Any) -> str:
     return str(value)
 
 
+def get_column_names(cursor_description: DbapiDescription) -> list[str]:
+    """
+    Return the deduped list of column names of a cursor description.
+    """
+    if not cursor_description:
+        return []
+    return dedup([convert_to_string(col[0]) for col in cursor_description])
+
+
+def concat_record_batches(batches: list[pa.RecordBatch]) -> pa.Table:
+    """
+    Concatenate record batches that were converted independently into a table.
+
+    Since each batch is converted on its own the type of a column can differ between
+    batches, eg, when a batch only has nulls, or when its values had to be stringified.
+    Types are promoted when possible, otherwise the column is stringified in every
+    batch.
+    """
+    tables = [pa.Table.from_batches([batch]) for batch in batches]
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.lib.ArrowInvalid, pa.lib.ArrowTypeError):
+        pass
+
+    for i in range(tables[0].num_columns):
+        types = {
+            table.schema.types[i]
+            for table in tables
+            if not pa.types.is_null(table.schema.types[i])
+        }
+        if len(types) > 1:
+            tables = [
+                table.set_column(
+                    i,
+                    table.schema.names[i],
+                    table.column(i).cast(pa.string()),
+                )
+                for table in tables
+            ]
+
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
 class RamaResultSet:
-    def __init__(  # pylint: disable=too-many-locals  # noqa: C901
+    def __init__(
         self,
         data: DbapiResult,
         cursor_description: DbapiDescription,
         db_engine_spec: type[BaseEngineSpec],
     ):
-        self.db_engine_spec = db_engine_spec
         data = data or []
-        column_names: list[str] = []
-        pa_data: list[pa.Array] = []
-        deduped_cursor_desc: list[tuple[Any, ...]] = []
-        numpy_dtype: list[tuple[str, ...]] = []
-        stringified_arr: NDArray[Any]
-
-        if cursor_description:
-            # get deduped list of column names
-            column_names = dedup(
-                [convert_to_string(col[0]) for col in cursor_description]
+        column_names = get_column_names(cursor_description)
+
+        # transpose the rows into columns, referencing the values returned by the
+        # cursor instead of copying them into an intermediate numpy array
+        batches = (
+            [self.convert_rows(data, column_names)] if data and column_names else []
+        )
+        self._load(batches, cursor_description, db_engine_spec)
+
+    @classmethod
+    def from_record_batches(
+        cls,
+        batches: Iterable[pa.RecordBatch],
+        cursor_description: DbapiDescription,
+        db_engine_spec: type[BaseEngineSpec],
+    ) -> RamaResultSet:
+        """
+        Build a result set from Arrow record batches.
+
+        The batches are usually produced by ``BaseEngineSpec.fetch_data_batches``,
+        which pulls rows from the cursor as the batches are consumed, so that rows are
+        never held in memory as Python objects all at once.
+        """
+        result_set = cls([], cursor_description, db_engine_spec)
+        result_set._load(list(batches), cursor_description, db_engine_spec)
+        return result_set
+
+    def _load(
+        self,
+        batches: list[pa.RecordBatch],
+        cursor_description: DbapiDescription,
+        db_engine_spec: type[BaseEngineSpec],
+    ) -> None:
+        self.db_engine_spec = db_engine_spec
+        # fix cursor descriptor with the deduped names
+        deduped_cursor_desc: list[tuple[Any, ...]] = [
+            tuple([column_name, *list(description)[1:]])  # noqa: C409
+            for column_name, description in zip(
+                get_column_names(cursor_description),
+                cursor_description or [],
+                strict=False,
             )
+        ]
 
-            # fix cursor descriptor with the deduped names
-            deduped_cursor_desc = [
-                tuple([column_name, *list(description)[1:]])  # noqa: C409
-                for column_name, description in zip(
-                    column_names, cursor_description, strict=False
-                )
-            ]
-
-            # generate numpy structured array dtype
-            numpy_dtype = [(column_name, "object") for column_name in column_names]
-
-        # only do expensive recasting if datatype is not standard list of tuples
-        if data and (not isinstance(data, list) or not isinstance(data[0], tuple)):
-            data = [tuple(row) for row in data]
-        array = np.array(data, dtype=numpy_dtype)
-        if array.size > 0:
-            for column in column_names:
-                try:
-                    pa_data.append(pa.array(array[column].tolist()))
-                except (
-                    pa.lib.ArrowInvalid,
-                    pa.lib.ArrowTypeError,
-                    pa.lib.ArrowNotImplementedError,
-                    ValueError,
-                    TypeError,  # this is super hackey,
-                    # https://issues.apache.org/jira/browse/ARROW-7855
-                ):
-                    # attempt serialization of values as strings
-                    stringified_arr = stringify_values(array[column])
-                    pa_data.append(pa.array(stringified_arr.tolist()))
-
-        if pa_data:  # pylint: disable=too-many-nested-blocks
-            for i, column in enumerate(column_names):
-                if pa.types.is_nested(pa_data[i].type):
-                    # TODO: revisit nested column serialization once nested types
-                    #  are added as a natively supported column type in Rama
-                    #  (rama.utils.core.GenericDataType).
-                    stringified_arr = stringify_values(array[column])
-                    pa_data[i] = pa.array(stringified_arr.tolist())
-
-                elif pa.types.is_temporal(pa_data[i].type):
-                    # workaround for bug converting
-                    # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
-                    # related: https://issues.apache.org/jira/browse/ARROW-5248
-                    sample = self.first_nonempty(array[column])
-                    if sample and isinstance(sample, datetime.datetime):
-                        try:
-                            if sample.tzinfo:
-                                tz = sample.tzinfo
-                                series = pd.Series(array[column])
-                                series = pd.to_datetime(series)
-                                pa_data[i] = pa.Array.from_pandas(
-                                    series,
-                                    type=pa.timestamp("ns", tz=tz),
-                                )
-                        except Exception as ex:  # pylint: disable=broad-except
-                            logger.exception(ex)
-
-        if not pa_data:
-            column_names = []
-
-        self.table = pa.Table.from_arrays(pa_data, names=column_names)
+        self.table = (
+            concat_record_batches(batches)
+            if batches
+            else pa.Table.from_arrays([], names=[])
+        )
         self._type_dict: dict[str, Any] = {}
         try:
             # The driver may not be passing a cursor.description
             self._type_dict = {
                 col: db_engine_spec.get_datatype(deduped_cursor_desc[i][1])
-                for i, col in enumerate(column_names)
+                for i, col in enumerate(self.table.column_names)
                 if deduped_cursor_desc
             }
         except Exception as ex:  # pylint: disable=broad-except
             logger.exception(ex)
 
+    @classmethod
+    def convert_rows(
+        cls,
+        data: DbapiResult,
+        column_names: list[str],
+        column_mutators: dict[int, Callable[[Any], Any]] | None = None,
+    ) -> pa.RecordBatch:
+        """
+        Convert rows, as returned by the cursor, to an Arrow record batch.
+
+        :param data: The rows returned by the cursor
+        :param column_names: The deduped names of the columns
+        :param column_mutators: Functions normalizing the values of some columns, by
+            column index
+        :returns: A record batch with one array per column
+        """
+        column_mutators = column_mutators or {}
+        arrays = []
+        for i in range(len(column_names)):
+            values = list(map(itemgetter(i), data))
+            if func := column_mutators.get(i):
+                values = list(map(func, values))
+            arrays.append(cls.convert_column(values))
+
+        return pa.RecordBatch.from_arrays(arrays, names=column_names)
+
+    @classmethod
+    def convert_column(cls, values: Sequence[Any]) -> pa.Array:
+        """
+        Convert the values of a column, as returned by the cursor, to an Arrow array.
+
+        Values that can't be converted, as well as nested values, are stringified.
+        """
+        try:
+            pa_array = pa.array(values)
+        except (
+            pa.lib.ArrowInvalid,
+            pa.lib.ArrowTypeError,
+            pa.lib.ArrowNotImplementedError,
+            ValueError,
+            TypeError,  # this is super hackey,
+            # https://issues.apache.org/jira/browse/ARROW-7855
+        ):
+            # attempt serialization of values as strings
+            return pa.array(stringify_values(cls.to_object_array(values)).tolist())
+
+        if pa.types.is_nested(pa_array.type):
+            # TODO: revisit nested column serialization once nested types
+            #  are added as a natively supported column type in Rama
+            #  (rama.utils.core.GenericDataType).
+            return pa.array(stringify_values(cls.to_object_array(values)).tolist())
+
+        if pa.types.is_temporal(pa_array.type):
+            # workaround for bug converting
+            # `psycopg2.tz.FixedOffsetTimezone` tzinfo values.
+            # related: https://issues.apache.org/jira/browse/ARROW-5248
+            sample = cls.first_nonempty(values)
+            if sample and isinstance(sample, datetime.datetime):
+                try:
+                    if sample.tzinfo:
+                        tz = sample.tzinfo
+                        series = pd.Series(values)
+                        series = pd.to_datetime(series)
+                        pa_array = pa.Array.from_pandas(
+                            series,
+                            type=pa.timestamp("ns", tz=tz),
+                        )
+                except Exception as ex:  # pylint: disable=broad-except
+                    logger.exception(ex)
+
+        return pa_array
+
+    @staticmethod
+    def to_object_array(values: Sequence[Any]) -> NDArray[Any]:
+        # ``np.array`` would build a multidimensional array out of nested values
+        return np.fromiter(values, dtype=object, count=len(values))
+
     @staticmethod
     def convert_pa_dtype(pa_dtype: pa.DataType) -> Optional[str]:
         if pa.types.is_boolean(pa_dtype):
@@ -215,7 +313,7 @@ class RamaResultSet:
             return table.to_pandas(integer_object_nulls=True, timestamp_as_object=True)
 
     @staticmethod
-    def first_nonempty(items: NDArray[Any]) -> Any:
+    def first_nonempty(items: Iterable[Any]) -> Any:
         return next((i for i in items if i), None)
 
     def is_temporal(self, db_type_str: Optional[str]) -> bool:
@@ -66,6 +66,7 @@ from rama.security.guest_token import (
     GuestTokenUser,
     GuestUser,
 )
+from rama.security.rls_cache import rls_filters_cache, RLSFiltersKey
 from rama.sql_parse import extract_tables_from_jinja_sql, Table
 from rama.tasks.utils import get_current_user
 from rama.utils import json
@@ -954,6 +955,71 @@ class RamaSecurityManager(  # pylint: disable=too-many-public-methods
             if datasource in user_datasources
         ]
 
+    def filter_datasources_accessible_by_user(  # pylint: disable=invalid-name
+        self,
+        database: "Database",
+        datasource_names: list[DatasourceName],
+    ) -> list[DatasourceName]:
+        """
+        Filter list of SQL tables from any catalog and schema to the ones accessible by
+        the user.
+
+        Unlike `get_datasources_accessible_by_user` the tables don't need to be in the
+        same catalog/schema: the catalog and schema permissions are checked once per
+        catalog/schema, and the dataset permissions are read in a single query.
+
+        :param database: The SQL database
+        :param datasource_names: The list of eligible SQL tables w/ catalog and schema
+        :returns: The list of accessible SQL tables, in the original order
+        """
+        # pylint: disable=import-outside-toplevel
+        from rama.connectors.sqla.models import SqlaTable
+
+        if self.can_access_database(database):
+            return datasource_names
+
+        default_catalog = database.get_default_catalog()
+        schema_access: dict[tuple[Optional[str], str], bool] = {}
+
+        def can_access_schema(datasource: DatasourceName) -> bool:
+            catalog = datasource.catalog or default_catalog
+            key = (catalog, datasource.schema)
+            if key not in schema_access:
+                schema_perm = self.get_schema_perm(
+                    database.database_name,
+                    catalog,
+                    datasource.schema,
+                )
+                schema_access[key] = bool(
+                    (catalog and self.can_access_catalog(database, catalog))
+                    or (schema_perm and self.can_access("schema_access", schema_perm))
+                )
+            return schema_access[key]
+
+        user_datasources: set[DatasourceName] = set()
+        if not all(can_access_schema(name) for name in datasource_names):
+            user_datasources = {
+                DatasourceName(
+                    table.table_name,
+                    table.schema,
+                    table.catalog or default_catalog,
+                )
+                for table in SqlaTable.query_datasources_by_permissions(
+                    database,
+                    self.user_view_menu_names("datasource_access"),
+                    self.user_view_menu_names("catalog_access"),
+                    self.user_view_menu_names("schema_access"),
+                )
+            }
+
+        return [
+            datasource
+            for datasource in datasource_names
+            if can_access_schema(datasource)
+            or datasource._replace(catalog=datasource.catalog or default_catalog)
+            in user_datasources
+        ]
+
     def merge_perm(self, permission_name: str, view_menu_name: str) -> None:
         """
         Add the FAB permission/view-menu.
@@ -2454,6 +2520,28 @@ class RamaSecurityManager(  # pylint: disable=too-many-public-methods
         if not (hasattr(g, "user") and g.user is not None):
             return []
 
+        user_roles = sorted(role.id for role in self.get_user_roles(g.user))
+        if table.id is None:
+            return self._get_rls_filters(user_roles, table.id)
+
+        return rls_filters_cache.get(
+            RLSFiltersKey(tuple(user_roles), table.id),
+            lambda: self._get_rls_filters(user_roles, table.id),
+        )
+
+    def _get_rls_filters(
+        self,
+        user_roles: list[int],
+        table_id: Optional[int],
+    ) -> list[SqlaQuery]:
+        """
+        Retrieves the row level security filters for a set of roles and a table from
+        the metadata database.
+
+        :param user_roles: The IDs of the roles of the user
+        :param table_id: The ID of the table to check against
+        :returns: A list of filters
+        """
         # pylint: disable=import-outside-toplevel
         from rama.connectors.sqla.models import (
             RLSFilterRoles,
@@ -2461,7 +2549,6 @@ class RamaSecurityManager(  # pylint: disable=too-many-public-methods
             RowLevelSecurityFilter,
         )
 
-        user_roles = [role.id for role in self.get_user_roles(g.user)]
         regular_filter_roles = (
             self.get_session.query(RLSFilterRoles.c.rls_filter_id)
             .join(RowLevelSecurityFilter)
@@ -2479,7 +2566,7 @@ class RamaSecurityManager(  # pylint: disable=too-many-public-methods
             .filter(RLSFilterRoles.c.role_id.in_(user_roles))
         )
         filter_tables = self.get_session.query(RLSFilterTables.c.rls_filter_id).filter(
-            RLSFilterTables.c.table_id == table.id
+            RLSFilterTables.c.table_id == table_id
         )
         query = (
             self.get_session.query(
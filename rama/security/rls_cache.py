@@ -0,0 +1,129 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from flask import current_app, g
+
+# upper bound on the number of entries of the shared layer, to keep memory bounded
+MAX_ENTRIES = 10000
+
+
+class RLSFiltersKey(NamedTuple):
+    role_ids: tuple[int, ...]
+    table_id: int
+
+
+class RLSFiltersCache:
+    """
+    A cache for the row level security filters of a given set of roles and table.
+
+    Resolving the RLS filters takes a few subqueries against the metadata database,
+    and they're needed multiple times for each chart query (to compute the cache key,
+    to build the SQL, and for each time offset). The cache has two layers:
+
+    - A request-scoped layer, stored in `g`, which is always enabled.
+    - A process-wide layer whose entries expire after `RLS_FILTERS_CACHE_TIMEOUT`
+      seconds, and which is disabled when the timeout is 0.
+
+    Both layers are invalidated when RLS filters, or their roles and tables, are
+    modified in the current process (see the SQLAlchemy session listeners registered
+    next to `RowLevelSecurityFilter`); changes made by other processes are picked up
+    once the entries expire.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[RLSFiltersKey, tuple[float, list[Any]]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def get(self, key: RLSFiltersKey, load: Callable[[], list[Any]]) -> list[Any]:
+        """
+        Return the RLS filters for a given key, loading them if needed.
+
+        :param key: The roles of the user and the table
+        :param load: A function that returns the filters from the metadata database
+        :returns: A copy of the list of filters
+        """
+        generation, request_entries = getattr(g, "_rls_filters_cache", (None, None))
+        if generation != self._generation or request_entries is None:
+            request_entries = {}
+            g._rls_filters_cache = (  # pylint: disable=protected-access
+                self._generation,
+                request_entries,
+            )
+
+        if key in request_entries:
+            return list(request_entries[key])
+
+        timeout = current_app.config["RLS_FILTERS_CACHE_TIMEOUT"]
+        filters = self._get_shared(key) if timeout else None
+        if filters is None:
+            generation = self._generation
+            filters = load()
+            if timeout:
+                self._set_shared(key, filters, timeout, generation)
+
+        request_entries[key] = filters
+        return list(filters)
+
+    def invalidate(self, *args: Any) -> None:
+        """
+        Invalidate all the entries.
+
+        Accepts any arguments so it can be used as a SQLAlchemy event listener.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _get_shared(self, key: RLSFiltersKey) -> list[Any] | None:
+        with self._lock:
+            if entry := self._entries.get(key):
+                expires_at, filters = entry
+                if expires_at > time.monotonic():
+                    return filters
+                del self._entries[key]
+        return None
+
+    def _set_shared(
+        self,
+        key: RLSFiltersKey,
+        filters: list[Any],
+        timeout: int,
+        generation: int,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            # the filters were modified while they were being loaded
+            if generation != self._generation:
+                return
+
+            if len(self._entries) >= MAX_ENTRIES:
+                self._entries = {
+                    k: entry for k, entry in self._entries.items() if entry[0] > now
+                }
+                if len(self._entries) >= MAX_ENTRIES:
+                    self._entries.clear()
+
+            self._entries[key] = (now + timeout, filters)
+
+
+rls_filters_cache = RLSFiltersCache()
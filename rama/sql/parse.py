@@ -21,14 +21,17 @@ import copy
 import enum
 import logging
 import re
+import threading
 import urllib.parse
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from typing import Any, Generic, TypeVar
 
 import sqlglot
 import sqlparse
 from deprecation import deprecated
+from flask import current_app, has_app_context
 from sqlglot import exp
 from sqlglot.dialects.dialect import Dialect, Dialects
 from sqlglot.errors import ParseError
@@ -37,6 +40,7 @@ from sqlglot.optimizer.scope import Scope, ScopeType, traverse_scope
 
 from rama.exceptions import RamaParseError
 from rama.sql.dialects.firebolt import Firebolt
+from rama.utils.dates import now_as_float
 
 logger = logging.getLogger(__name__)
 
@@ -98,6 +102,99 @@ SQLGLOT_DIALECTS = {
 }
 
 
+T = TypeVar("T")
+
+
+class ParseCache:
+    """
+    A bounded LRU cache of parsed SQL, keyed by the parser, the engine (and dialect)
+    and the SQL.
+
+    Parsed statements are shared between everyone who parses the same SQL, so they
+    must be treated as immutable: code that modifies a statement (optimizations, RLS,
+    limits, etc.) has to copy it first.
+    """
+
+    default_size = 1000
+
+    def __init__(self, size: int | None = None) -> None:
+        self._size = size
+        self._entries: OrderedDict[tuple[Any, ...], tuple[Any, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        if self._size is not None:
+            return self._size
+        if has_app_context():
+            return current_app.config.get("SQL_PARSE_CACHE_SIZE", self.default_size)
+        return self.default_size
+
+    def get_or_parse(
+        self,
+        parser: str,
+        sql: str,
+        engine: str,
+        parse: Callable[[], Iterable[T]],
+        dialect: Any = None,
+    ) -> tuple[T, ...]:
+        """
+        Return the parsed SQL, parsing it only if it's not in the cache.
+
+        :param parser: The name of the parser, eg, `sqlglot`
+        :param sql: The SQL to parse
+        :param engine: The engine of the SQL
+        :param parse: A function that parses the SQL
+        :param dialect: The dialect used to parse the SQL, if it's not implied by the
+            engine
+        :returns: The parsed statements, which should not be modified
+        """
+        size = self.size
+        key = (parser, engine, dialect, sql)
+        if size > 0:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+            if entry is not None:
+                self._incr(f"sql_parse_cache.{parser}.hit")
+                return entry
+
+        start = now_as_float()
+        entry = tuple(parse())
+        self._incr(f"sql_parse_cache.{parser}.miss")
+        self._timing(f"sql_parse_cache.{parser}.parse_time", now_as_float() - start)
+
+        if size > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > size:
+                    self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _incr(key: str) -> None:
+        if has_app_context():
+            current_app.config["STATS_LOGGER"].incr(key)
+
+    @staticmethod
+    def _timing(key: str, value: float) -> None:
+        if has_app_context():
+            current_app.config["STATS_LOGGER"].timing(key, value)
+
+
+parse_cache = ParseCache()
+
+
 @dataclass(eq=True, frozen=True)
 class Table:
     """
@@ -260,8 +357,28 @@ class SQLStatement(BaseSQLStatement[exp.Expression]):
     def _parse(cls, script: str, engine: str) -> list[exp.Expression]:
         """
         Parse helper.
+
+        The ASTs come from the parse cache and are shared, so they must not be modified
+        in place.
         """
         dialect = SQLGLOT_DIALECTS.get(engine)
+        return list(
+            parse_cache.get_or_parse(
+                "sqlglot",
+                script,
+                engine,
+                lambda: cls._parse_uncached(script, engine, dialect),
+                dialect=dialect,
+            )
+        )
+
+    @classmethod
+    def _parse_uncached(
+        cls,
+        script: str,
+        engine: str,
+        dialect: Dialects | type[Dialect] | None,
+    ) -> list[exp.Expression]:
         try:
             return sqlglot.parse(script, dialect=dialect)
         except sqlglot.errors.ParseError as ex:
@@ -399,9 +516,11 @@ class SQLStatement(BaseSQLStatement[exp.Expression]):
         if self._dialect:
             try:
                 write = Dialect.get_or_raise(self._dialect)
+                # the generator modifies the AST in place, and it's shared through the
+                # parse cache
                 return write.generate(
                     self._parsed,
-                    copy=False,
+                    copy=True,
                     comments=comments,
                     pretty=True,
                 )
@@ -448,11 +567,198 @@ class SQLStatement(BaseSQLStatement[exp.Expression]):
         if not self._dialect:
             return SQLStatement(self._sql, self.engine, self._parsed.copy())
 
-        optimized = pushdown_predicates(self._parsed, dialect=self._dialect)
+        # the AST might be shared through the parse cache, so optimize a copy of it
+        optimized = pushdown_predicates(self._parsed.copy(), dialect=self._dialect)
         sql = optimized.sql(dialect=self._dialect)
 
         return SQLStatement(sql, self.engine, optimized)
 
+    @classmethod
+    def parse_predicate(cls, predicate: str, engine: str) -> exp.Expression:
+        """
+        Parse a predicate, eg, the clause of a RLS filter.
+
+        The AST might be shared through the parse cache, so it must be copied before
+        being modified.
+        """
+        asts = cls._parse(predicate, engine)
+        if len(asts) != 1 or asts[0] is None:
+            raise RamaParseError(
+                predicate,
+                engine,
+                message="The predicate should have exactly one expression",
+            )
+
+        return asts[0]
+
+    def get_source_tables(
+        self,
+        catalog: str | None,
+        schema: str | None,
+    ) -> set[Table]:
+        """
+        Return the fully qualified tables read by the statement.
+
+        These are the tables that RLS is applied to by `apply_rls`.
+
+        :param catalog: The default catalog of the statement
+        :param schema: The default schema of the statement
+        :returns: The tables, qualified with the default catalog and schema
+        """
+        return {
+            qualify_table(node, catalog, schema)
+            for node in get_source_table_nodes(self._parsed)
+        }
+
+    def apply_rls(
+        self,
+        catalog: str | None,
+        schema: str | None,
+        predicates: dict[Table, list[exp.Expression]],
+        method: RLSMethod,
+    ) -> SQLStatement:
+        """
+        Return a new statement with the RLS predicates applied to the tables it reads.
+
+        All the tables are rewritten in a single pass over the AST.
+
+        :param catalog: The default catalog of the statement
+        :param schema: The default schema of the statement
+        :param predicates: The RLS predicates of each table, from `get_source_tables`
+        :param method: How the predicates are applied
+        :returns: The statement with RLS applied
+        """
+        ast = self._parsed.copy()
+        for node in get_source_table_nodes(ast):
+            if table_predicates := predicates.get(qualify_table(node, catalog, schema)):
+                if method == RLSMethod.AS_SUBQUERY:
+                    apply_rls_as_subquery(node, table_predicates)
+                else:
+                    apply_rls_as_predicate(node, table_predicates)
+
+        return SQLStatement(ast.sql(dialect=self._dialect), self.engine, ast)
+
+
+class RLSMethod(enum.Enum):
+    """
+    Methods for enforcing RLS.
+    """
+
+    # wrap the table in a subquery that applies the predicates; safer, but not
+    # supported by all databases
+    AS_SUBQUERY = enum.auto()
+
+    # add the predicates to the `WHERE` clause or, for joins, to the `ON` clause
+    AS_PREDICATE = enum.auto()
+
+
+def qualify_table(node: exp.Table, catalog: str | None, schema: str | None) -> Table:
+    """
+    Return the fully qualified table of a table node.
+    """
+    return Table(node.name, node.db or schema, node.catalog or catalog)
+
+
+def get_source_table_nodes(ast: exp.Expression) -> list[exp.Table]:
+    """
+    Return the nodes of the physical tables read by a statement, ignoring CTEs.
+
+    Adhoc expressions (eg, `SUM(x) + (SELECT ...)`) are not queries, so the scopes of
+    the top-level queries inside them are traversed instead.
+    """
+    if isinstance(ast, (exp.Query, exp.DDL, exp.DML)):
+        roots = [ast]
+    else:
+        roots = [
+            node
+            for node in ast.find_all(exp.Query)
+            if node.find_ancestor(exp.Query) is None
+        ]
+
+    return [
+        node
+        for root in roots
+        for scope in traverse_scope(root)
+        for node in scope.tables
+        if node.db or node.name not in scope.cte_sources
+    ]
+
+
+def qualify_predicate(
+    predicates: list[exp.Expression],
+    table: exp.Identifier,
+) -> exp.Expression:
+    """
+    Return a copy of the predicates ANDed together, with any unqualified columns
+    qualified with the table name.
+    """
+    predicate = exp.and_(*predicates)
+    for column in predicate.find_all(exp.Column):
+        if not column.table:
+            column.set("table", table.copy())
+
+    return predicate
+
+
+def apply_rls_as_subquery(node: exp.Table, predicates: list[exp.Expression]) -> None:
+    """
+    Replace a table with a subquery applying the RLS predicates:
+
+        before: SELECT * FROM some_table WHERE 1=1
+        after:  SELECT * FROM (
+                  SELECT * FROM some_table WHERE some_table.id=42
+                ) AS some_table
+                WHERE 1=1
+
+    """
+    alias = node.args.get("alias") or exp.TableAlias(this=node.this.copy())
+    table = node.copy()
+    table.set("alias", None)
+
+    subquery = (
+        exp.select("*")
+        .from_(table, copy=False)
+        .where(qualify_predicate(predicates, node.this), copy=False)
+        .subquery(alias.copy(), copy=False)
+    )
+    node.replace(subquery)
+
+
+def apply_rls_as_predicate(node: exp.Table, predicates: list[exp.Expression]) -> None:
+    """
+    Add the RLS predicates of a table to the `ON` clause of its join or, otherwise, to
+    the `WHERE` clause of its query:
+
+        before: SELECT * FROM some_table WHERE 1=1
+        after:  SELECT * FROM some_table WHERE (1=1) AND some_table.id=42
+
+    Existing predicates are wrapped in parenthesis, since AND has higher precedence than
+    OR; otherwise `WHERE TRUE OR FALSE` would bypass the RLS.
+
+    :raises RamaParseError: If the table is not read by a `SELECT`
+    """
+    alias = node.args.get("alias")
+    predicate = qualify_predicate(predicates, alias.this if alias else node.this)
+
+    parent = node.parent
+    if isinstance(parent, exp.Join) and (on := parent.args.get("on")):
+        # for joins the predicates are applied to the `ON` clause, which prevents
+        # leaking information about the number of rows on outer joins
+        parent.set("on", exp.and_(predicate, exp.Paren(this=on), copy=False))
+        return
+
+    select = parent.parent if isinstance(parent, (exp.From, exp.Join)) else None
+    if not isinstance(select, exp.Select):
+        # the table can't be left unfiltered, eg, `SELECT * FROM (some_table)`
+        raise RamaParseError(
+            node.root().sql(),
+            message=f"Unable to apply RLS predicates to table {node.name}",
+        )
+
+    if where := select.args.get("where"):
+        predicate = exp.and_(exp.Paren(this=where.this), predicate, copy=False)
+    select.set("where", exp.Where(this=predicate))
+
 
 class KQLSplitState(enum.Enum):
     """
@@ -17,12 +17,12 @@
 # pylint: disable=consider-using-transaction
 import dataclasses
 import logging
-import sys
 import uuid
+from collections.abc import Iterator
 from contextlib import closing
 from datetime import datetime
 from sys import getsizeof
-from typing import Any, cast, Optional, Union
+from typing import Any, cast, NoReturn, Optional, Union
 
 import backoff
 import msgpack
@@ -53,13 +53,9 @@ from rama.extensions import celery_app, event_logger
 from rama.models.core import Database
 from rama.models.sql_lab import Query
 from rama.result_set import RamaResultSet
-from rama.sql.parse import SQLStatement, Table
-from rama.sql_parse import (
-    CtasMethod,
-    insert_rls_as_subquery,
-    insert_rls_in_predicate,
-    ParsedQuery,
-)
+from rama.sql.parse import RLSMethod, SQLStatement, Table
+from rama.sql_parse import apply_rls, CtasMethod, ParsedQuery
+from rama.sqllab import chunked_results
 from rama.sqllab.limiting_factor import LimitingFactor
 from rama.sqllab.utils import write_ipc_buffer
 from rama.utils import json
@@ -80,6 +76,8 @@ SQLLAB_CTAS_NO_LIMIT = config["SQLLAB_CTAS_NO_LIMIT"]
 log_query = config["QUERY_LOGGER"]
 logger = logging.getLogger(__name__)
 BYTES_IN_MB = 1024 * 1024
+# number of rows encoded at once when measuring the size of a JSON payload
+JSON_SERIALIZATION_BATCH_SIZE = 10000
 
 
 class SqlLabException(Exception):  # noqa: N818
@@ -213,21 +211,21 @@ def execute_sql_statement(  # pylint: disable=too-many-statements, too-many-loca
         # There are two ways to insert RLS: either replacing the table with a subquery
         # that has the RLS, or appending the RLS to the ``WHERE`` clause. The former is
         # safer, but not supported in all databases.
-        insert_rls = (
-            insert_rls_as_subquery
+        method = (
+            RLSMethod.AS_SUBQUERY
             if database.db_engine_spec.allows_subqueries
             and database.db_engine_spec.allows_alias_in_select
-            else insert_rls_in_predicate
+            else RLSMethod.AS_PREDICATE
         )
 
         # Insert any applicable RLS predicates
         parsed_query = ParsedQuery(
-            str(
-                insert_rls(
-                    parsed_query._parsed[0],  # pylint: disable=protected-access
-                    database.id,
-                    query.schema,
-                )
+            apply_rls(
+                parsed_query.stripped(),
+                database.id,
+                db_engine_spec.engine,
+                query.schema,
+                method,
             ),
             engine=db_engine_spec.engine,
         )
@@ -312,6 +310,19 @@ def execute_sql_statement(  # pylint: disable=too-many-statements, too-many-loca
                     query.id,
                     str(query.to_dict()),
                 )
+                if config["FETCH_DATA_IN_BATCHES"]:
+                    result_set = RamaResultSet.from_record_batches(
+                        db_engine_spec.fetch_data_batches(cursor, increased_limit),
+                        cursor.description,
+                        db_engine_spec,
+                    )
+                    if query.limit is None or result_set.size <= query.limit:
+                        query.limiting_factor = LimitingFactor.NOT_LIMITED
+                    else:
+                        # return 1 row less than increased_query
+                        result_set.table = result_set.table.slice(0, query.limit)
+                    return result_set
+
                 data = db_engine_spec.fetch_data(cursor, increased_limit)
                 if query.limit is None or len(data) <= query.limit:
                     query.limiting_factor = LimitingFactor.NOT_LIMITED
@@ -375,6 +386,76 @@ def _serialize_payload(
     return json.dumps(payload, default=json.json_iso_dttm_ser, ignore_nan=True)
 
 
+def _raise_payload_too_large(size: int, max_mb: int) -> NoReturn:
+    logger.info("Result size exceeds the allowed limit.")
+    raise RamaErrorException(
+        RamaError(
+            message=f"Result size ({size / BYTES_IN_MB:.2f} MB) exceeds the allowed limit of {max_mb} MB.",  # noqa: E501
+            error_type=RamaErrorType.RESULT_TOO_LARGE_ERROR,
+            level=ErrorLevel.ERROR,
+        )
+    )
+
+
+def _check_payload_size(size: int) -> None:
+    max_mb = config.get("SQLLAB_PAYLOAD_MAX_MB")
+    if max_mb and size > max_mb * BYTES_IN_MB:
+        _raise_payload_too_large(size, max_mb)
+
+
+def _iter_json_payload(payload: dict[Any, Any]) -> Iterator[str]:
+    """
+    Serialize a payload to JSON, a batch of rows at a time.
+
+    Each batch is encoded in one go (by the C encoder of simplejson), so this is as
+    fast as encoding the whole payload, while letting the caller measure the output
+    as it's produced.
+    """
+    data = payload.get("data")
+    if not isinstance(data, list):
+        yield json.dumps(payload, default=json.json_iso_dttm_ser, ignore_nan=True)
+        return
+
+    # the rows are spliced in the empty list, at the end of the object
+    head = json.dumps(
+        {**{k: v for k, v in payload.items() if k != "data"}, "data": []},
+        default=json.json_iso_dttm_ser,
+        ignore_nan=True,
+    )
+    yield head[:-2]
+    for start in range(0, len(data), JSON_SERIALIZATION_BATCH_SIZE):
+        batch = json.dumps(
+            data[start : start + JSON_SERIALIZATION_BATCH_SIZE],
+            default=json.json_iso_dttm_ser,
+            ignore_nan=True,
+        )
+        yield ("," if start else "") + batch[1:-1]
+    yield "]}"
+
+
+def _serialize_json_payload(payload: dict[Any, Any], keep: bool = True) -> str:
+    """
+    Serialize a payload to JSON, enforcing `SQLLAB_PAYLOAD_MAX_MB`.
+
+    The size is checked while the payload is encoded, so that the encoding stops as
+    soon as it exceeds the limit.
+
+    :param payload: The payload to serialize
+    :param keep: Whether to return the serialized payload, or only check its size
+    :raises RamaErrorException: If the payload is too large
+    """
+    max_mb = config.get("SQLLAB_PAYLOAD_MAX_MB")
+    parts: list[str] = []
+    size = 0
+    for part in _iter_json_payload(payload):
+        size += len(part)
+        if max_mb and size > max_mb * BYTES_IN_MB:
+            _raise_payload_too_large(size, max_mb)
+        if keep:
+            parts.append(part)
+    return "".join(parts)
+
+
 def _serialize_and_expand_data(
     result_set: RamaResultSet,
     db_engine_spec: BaseEngineSpec,
@@ -574,9 +655,21 @@ def execute_sql_statements(  # noqa: C901
     query.end_time = now_as_float()
 
     use_arrow_data = store_results and cast(bool, results_backend_use_msgpack)
-    data, selected_columns, all_columns, expanded_columns = _serialize_and_expand_data(
-        result_set, db_engine_spec, use_arrow_data, expand_data
-    )
+    # the data is then stored separately, in chunks
+    chunk_size = config["SQLLAB_RESULTS_CHUNK_SIZE"] if use_arrow_data else 0
+    if chunk_size:
+        data = None
+        selected_columns = all_columns = result_set.columns
+        expanded_columns = []
+    else:
+        (
+            data,
+            selected_columns,
+            all_columns,
+            expanded_columns,
+        ) = _serialize_and_expand_data(
+            result_set, db_engine_spec, use_arrow_data, expand_data
+        )
 
     # TODO: data should be saved separately from metadata (likely in Parquet)
     payload.update(
@@ -591,6 +684,7 @@ def execute_sql_statements(  # noqa: C901
     )
     payload["query"]["state"] = QueryStatus.SUCCESS
 
+    payload_size_checked = False
     if store_results and results_backend:
         key = str(uuid.uuid4())
         payload["query"]["resultsKey"] = key
@@ -601,24 +695,27 @@ def execute_sql_statements(  # noqa: C901
             with stats_timing(
                 "sqllab.query.results_backend_write_serialization", stats_logger
             ):
-                serialized_payload = _serialize_payload(
-                    payload, cast(bool, results_backend_use_msgpack)
-                )
-
-                # Check the size of the serialized payload
-                if sql_lab_payload_max_mb := config.get("SQLLAB_PAYLOAD_MAX_MB"):
-                    serialized_payload_size = sys.getsizeof(serialized_payload)
-                    max_bytes = sql_lab_payload_max_mb * BYTES_IN_MB
-
-                    if serialized_payload_size > max_bytes:
-                        logger.info("Result size exceeds the allowed limit.")
-                        raise RamaErrorException(
-                            RamaError(
-                                message=f"Result size ({serialized_payload_size / BYTES_IN_MB:.2f} MB) exceeds the allowed limit of {sql_lab_payload_max_mb} MB.",  # noqa: E501
-                                error_type=RamaErrorType.RESULT_TOO_LARGE_ERROR,
-                                level=ErrorLevel.ERROR,
-                            )
-                        )
+                chunks: dict[str, bytes] = {}
+                if chunk_size:
+                    manifest, chunks = chunked_results.serialize_table(
+                        result_set.pa_table,
+                        key,
+                        chunk_size,
+                        config["SQLLAB_RESULTS_CHUNK_COMPRESSION"],
+                    )
+                    serialized_payload = _serialize_payload(
+                        {**payload, chunked_results.MANIFEST_KEY: manifest}, True
+                    )
+                    _check_payload_size(
+                        len(serialized_payload)
+                        + sum(len(chunk) for chunk in chunks.values())
+                    )
+                elif results_backend_use_msgpack:
+                    serialized_payload = _serialize_payload(payload, True)
+                    _check_payload_size(len(serialized_payload))
+                else:
+                    serialized_payload = _serialize_json_payload(payload)
+                    payload_size_checked = True
 
             cache_timeout = database.cache_timeout
             if cache_timeout is None:
@@ -629,6 +726,8 @@ def execute_sql_statements(  # noqa: C901
                 "*** serialized payload size: %i", getsizeof(serialized_payload)
             )
             logger.debug("*** compressed payload size: %i", getsizeof(compressed))
+            if chunks:
+                results_backend.set_many(chunks, cache_timeout)
             results_backend.set(key, compressed, cache_timeout)
         query.results_key = key
 
@@ -654,23 +753,10 @@ def execute_sql_statements(  # noqa: C901
                     "expanded_columns": expanded_columns,
                 }
             )
-        # Check the size of the serialized payload (opt-in logic for return_results)
-        if sql_lab_payload_max_mb := config.get("SQLLAB_PAYLOAD_MAX_MB"):
-            serialized_payload = _serialize_payload(
-                payload, cast(bool, results_backend_use_msgpack)
-            )
-            serialized_payload_size = sys.getsizeof(serialized_payload)
-            max_bytes = sql_lab_payload_max_mb * BYTES_IN_MB
-
-            if serialized_payload_size > max_bytes:
-                logger.info("Result size exceeds the allowed limit.")
-                raise RamaErrorException(
-                    RamaError(
-                        message=f"Result size ({serialized_payload_size / BYTES_IN_MB:.2f} MB) exceeds the allowed limit of {sql_lab_payload_max_mb} MB.",  # noqa: E501
-                        error_type=RamaErrorType.RESULT_TOO_LARGE_ERROR,
-                        level=ErrorLevel.ERROR,
-                    )
-                )
+        # Check the size of the serialized payload (opt-in logic for return_results),
+        # unless the same payload was already measured when it was stored
+        if config.get("SQLLAB_PAYLOAD_MAX_MB") and not payload_size_checked:
+            _serialize_json_payload(payload, keep=False)
         return payload
 
     return None
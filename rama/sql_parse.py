@@ -19,6 +19,7 @@
 
 from __future__ import annotations
 
+import copy
 import logging
 import re
 from collections.abc import Iterator
@@ -27,7 +28,8 @@ from typing import Any, cast, TYPE_CHECKING
 import sqlparse
 from flask_babel import gettext as __
 from jinja2 import nodes, Template
-from sqlalchemy import and_
+from sqlalchemy import and_, or_
+from sqlglot import exp
 from sqlparse import keywords
 from sqlparse.lexer import Lexer
 from sqlparse.sql import (
@@ -36,6 +38,7 @@ from sqlparse.sql import (
     IdentifierList,
     Parenthesis,
     remove_quotes,
+    Statement,
     Token,
     TokenList,
     Where,
@@ -62,6 +65,8 @@ from rama.exceptions import (
 )
 from rama.sql.parse import (
     extract_tables_from_statement,
+    parse_cache,
+    RLSMethod,
     SQLGLOT_DIALECTS,
     SQLScript,
     SQLStatement,
@@ -201,6 +206,21 @@ def strip_comments_from_sql(statement: str, engine: str = "base") -> str:
     )
 
 
+def copy_token(token: Token) -> Token:
+    """
+    Return a copy of a sqlparse token that can be modified in place.
+
+    Note that `copy.deepcopy` can't be used, since it would also copy the token types,
+    which are compared by identity.
+    """
+    copied = copy.copy(token)
+    if isinstance(token, TokenList):
+        copied.tokens = [copy_token(child) for child in token.tokens]
+        for child in copied.tokens:
+            child.parent = copied
+    return copied
+
+
 class ParsedQuery:
     def __init__(
         self,
@@ -219,10 +239,24 @@ class ParsedQuery:
         self._limit: int | None = None
 
         logger.debug("Parsing with sqlparse statement: %s", self.sql)
-        self._parsed = sqlparse.parse(self.stripped())
+        self._parsed = self._parse(self.stripped())
         for statement in self._parsed:
             self._limit = _extract_limit_from_query(statement)
 
+    def _parse(self, sql: str) -> tuple[Statement, ...]:
+        """
+        Parse the SQL with sqlparse, going through the parse cache.
+
+        The statements are shared with other instances parsing the same SQL, so they
+        must be copied before being modified.
+        """
+        return parse_cache.get_or_parse(
+            "sqlparse",
+            sql,
+            self._engine,
+            lambda: sqlparse.parse(sql),
+        )
+
     @property
     def tables(self) -> set[Table]:
         if not self._tables:
@@ -320,7 +354,7 @@ class ParsedQuery:
 
     def is_select(self) -> bool:  # noqa: C901
         # make sure we strip comments; prevents a bug with comments in the CTE
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = self._parse(self.strip_comments())
         seen_select = False
 
         for statement in parsed:
@@ -386,11 +420,11 @@ class ParsedQuery:
         return None
 
     def is_valid_ctas(self) -> bool:
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = self._parse(self.strip_comments())
         return parsed[-1].get_type() == "SELECT"
 
     def is_valid_cvas(self) -> bool:
-        parsed = sqlparse.parse(self.strip_comments())
+        parsed = self._parse(self.strip_comments())
         return len(parsed) == 1 and parsed[0].get_type() == "SELECT"
 
     def is_explain(self) -> bool:
@@ -510,7 +544,8 @@ class ParsedQuery:
         if not self._limit:
             return f"{self.stripped()}\nLIMIT {new_limit}"
         limit_pos = None
-        statement = self._parsed[0]
+        # the statement is shared through the parse cache, so modify a copy of it
+        statement = copy_token(self._parsed[0])
         # Add all items to before_str until there is a limit
         for pos, item in enumerate(statement.tokens):
             if item.ttype in Keyword and item.value.lower() == "limit":
@@ -661,6 +696,94 @@ def get_rls_for_table(
     return rls
 
 
+def get_rls_predicates(
+    tables: set[Table],
+    database_id: int,
+    engine: str,
+) -> dict[Table, list[exp.Expression]]:
+    """
+    Return the RLS predicates associated with a set of tables.
+
+    The datasets of all the tables are loaded in a single query, instead of one query
+    per table reference.
+    """
+    # pylint: disable=import-outside-toplevel
+    from rama import db
+    from rama.connectors.sqla.models import SqlaTable
+
+    if not tables:
+        return {}
+
+    datasets = {
+        (dataset.schema, dataset.table_name): dataset
+        for dataset in db.session.query(SqlaTable).filter(
+            and_(
+                SqlaTable.database_id == database_id,
+                or_(
+                    *[
+                        and_(
+                            SqlaTable.schema == table.schema,
+                            SqlaTable.table_name == table.table,
+                        )
+                        for table in tables
+                    ]
+                ),
+            )
+        )
+    }
+
+    predicates: dict[Table, list[exp.Expression]] = {}
+    for table in tables:
+        if dataset := datasets.get((table.schema, table.table)):
+            if filters := dataset.get_sqla_row_level_filters():
+                predicates[table] = [
+                    SQLStatement.parse_predicate(str(filter_), engine)
+                    for filter_ in filters
+                ]
+
+    return predicates
+
+
+def apply_rls(
+    sql: str,
+    database_id: int,
+    engine: str,
+    default_schema: str | None,
+    method: RLSMethod,
+) -> str:
+    """
+    Apply any RLS predicates associated with the tables read by a SQL script.
+
+    The SQL is returned unmodified when none of the tables have RLS predicates.
+
+    :param sql: The SQL script
+    :param database_id: The ID of the database the script runs on
+    :param engine: The engine of the database
+    :param default_schema: The schema of unqualified tables
+    :param method: How the predicates are applied
+    :returns: The SQL script with RLS applied
+    """
+    statements = SQLStatement.split_script(sql, engine)
+    tables = {
+        table
+        for statement in statements
+        for table in statement.get_source_tables(None, default_schema)
+    }
+    predicates = get_rls_predicates(tables, database_id, engine)
+    if not predicates:
+        return sql
+
+    return ";\n".join(
+        statement.apply_rls(
+            None,
+            default_schema,
+            predicates,
+            method,
+        )._sql  # pylint: disable=protected-access
+        for statement in statements
+    )
+
+
 def insert_rls_as_subquery(
     token_list: TokenList,
     database_id: int,
@@ -18,7 +18,7 @@ import logging
 from typing import Any, cast, Optional
 from urllib import parse
 
-from flask import request, Response
+from flask import request, Response, stream_with_context
 from flask_appbuilder import permission_name
 from flask_appbuilder.api import expose, protect, rison, safe
 from flask_appbuilder.models.sqla.interface import SQLAInterface
@@ -271,9 +271,15 @@ class SqlLabRestApi(BaseRamaApi):
             500:
               $ref: '#/components/responses/500'
         """
-        result = SqlResultExportCommand(client_id=client_id).run()
-
-        query, data, row_count = result["query"], result["data"], result["count"]
+        command = SqlResultExportCommand(client_id=client_id)
+        if app.config["CSV_EXPORT_STREAMING"]:
+            # the rows are fetched and converted as the response is sent
+            stream_result = command.stream()
+            query, row_count = stream_result["query"], stream_result["count"]
+            data: Any = stream_with_context(stream_result["data"])
+        else:
+            result = command.run()
+            query, data, row_count = result["query"], result["data"], result["count"]
 
         quoted_csv_name = parse.quote(query.name)
         response = CsvResponse(
@@ -339,7 +345,12 @@ class SqlLabRestApi(BaseRamaApi):
         params = kwargs["rison"]
         key = params.get("key")
         rows = params.get("rows")
-        result = SqlExecutionResultsCommand(key=key, rows=rows).run()
+        result = SqlExecutionResultsCommand(
+            key=key,
+            rows=rows,
+            offset=params.get("offset", 0),
+            limit=params.get("limit"),
+        ).run()
 
         # Using pessimistic json serialization since some database drivers can return
         # unserializeable types at times
@@ -0,0 +1,130 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Chunked storage of SQL Lab results in the results backend.
+
+When `SQLLAB_RESULTS_CHUNK_SIZE` is set the rows of a result are split into chunks
+of that many rows, each stored under its own key as an (optionally compressed)
+Arrow IPC stream. The payload stored under the results key keeps its shape, but
+instead of the data it holds a manifest describing the chunks, so that a page of
+the results can be read by fetching only the chunks that overlap it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, TypedDict
+
+import pyarrow as pa
+from flask_caching.backends.base import BaseCache
+
+from rama.exceptions import SerializationError
+
+MANIFEST_KEY = "chunks"
+VERSION = 1
+
+
+class ChunkedResultsManifest(TypedDict):
+    version: int
+    num_rows: int
+    chunk_size: int
+    num_chunks: int
+
+
+def get_chunk_key(key: str, index: int) -> str:
+    return f"{key}__chunk_{index}"
+
+
+def get_manifest(payload: dict[str, Any]) -> ChunkedResultsManifest | None:
+    """
+    Return the manifest of a stored payload, or None if it holds the data itself.
+    """
+    return payload.get(MANIFEST_KEY)
+
+
+def serialize_table(
+    table: pa.Table,
+    key: str,
+    chunk_size: int,
+    compression: str | None = None,
+) -> tuple[ChunkedResultsManifest, dict[str, bytes]]:
+    """
+    Split a table into chunks of serialized Arrow IPC streams.
+
+    :param table: The results of the query
+    :param key: The key of the results in the results backend
+    :param chunk_size: The number of rows in each chunk
+    :param compression: The compression codec of the buffers, eg, "lz4" or "zstd"
+    :returns: The manifest to store with the payload, and the chunks by key
+    """
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    chunks: dict[str, bytes] = {}
+    # tables without rows still get a chunk, so that the schema is preserved
+    for index, offset in enumerate(range(0, max(table.num_rows, 1), chunk_size)):
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table.slice(offset, chunk_size))
+        chunks[get_chunk_key(key, index)] = sink.getvalue().to_pybytes()
+
+    manifest: ChunkedResultsManifest = {
+        "version": VERSION,
+        "num_rows": table.num_rows,
+        "chunk_size": chunk_size,
+        "num_chunks": len(chunks),
+    }
+    return manifest, chunks
+
+
+def read_table(
+    cache: BaseCache,
+    key: str,
+    manifest: ChunkedResultsManifest,
+    offset: int = 0,
+    limit: int | None = None,
+) -> pa.Table:
+    """
+    Read a page of the results, fetching only the chunks it spans.
+
+    :param cache: The results backend
+    :param key: The key of the results in the results backend
+    :param manifest: The manifest stored with the payload
+    :param offset: The index of the first row of the page
+    :param limit: The maximum number of rows of the page, or None for all the rows
+    :returns: The rows of the page
+    :raises SerializationError: If the chunks are missing or can't be read
+    """
+    if manifest["version"] != VERSION:
+        raise SerializationError("Unsupported version of chunked results")
+
+    chunk_size = manifest["chunk_size"]
+    end = manifest["num_rows"] if limit is None else offset + limit
+    first = min(offset // chunk_size, manifest["num_chunks"] - 1)
+    last = max(first, min((end - 1) // chunk_size, manifest["num_chunks"] - 1))
+    indexes = range(first, last + 1)
+
+    chunks = cache.get_many(*[get_chunk_key(key, index) for index in indexes])
+    if any(chunk is None for chunk in chunks):
+        raise SerializationError("Missing chunks of the results")
+
+    try:
+        table = pa.concat_tables(
+            pa.ipc.open_stream(pa.py_buffer(chunk)).read_all() for chunk in chunks
+        )
+    except pa.ArrowException as ex:
+        raise SerializationError("Unable to deserialize table") from ex
+
+    start = offset - first * chunk_size
+    return table.slice(max(start, 0), None if limit is None else limit)
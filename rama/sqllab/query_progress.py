@@ -0,0 +1,171 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Progress and cancellation of running SQL Lab queries.
+
+Engines which poll their cursor while a query runs (Presto, Trino and Hive) report
+the progress of the query and check whether it was stopped on every poll. By
+default both go through the `Query` row in the metadata database, which means a
+read and a commit per poll and per running query.
+
+When `SQLLAB_QUERY_PROGRESS_CHANNEL` is set (and global async queries are enabled)
+they go through the async queries backend instead: the progress is kept in the
+cache and published as an event on the async channel of the user who ran the
+query, and stopping a query raises a flag in the cache. The `Query` row is then
+only written on state transitions.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, TYPE_CHECKING
+
+from flask import current_app, has_request_context, session
+
+from rama import db, is_feature_enabled
+from rama.async_events.async_query_manager import build_job_metadata
+from rama.common.db_query_status import QueryStatus
+from rama.extensions import async_query_manager
+
+if TYPE_CHECKING:
+    from rama.models.sql_lab import Query
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_ID_KEY = "progress_channel_id"
+
+
+def is_enabled() -> bool:
+    return bool(
+        current_app.config["SQLLAB_QUERY_PROGRESS_CHANNEL"]
+        and is_feature_enabled("GLOBAL_ASYNC_QUERIES")
+    )
+
+
+def set_channel(query: Query) -> None:
+    """
+    Record the async channel of the current user on a new query, so that its
+    progress can be published to them.
+
+    :param query: The SQL Lab query
+    """
+    if is_enabled() and has_request_context():
+        if channel_id := session.get("async_channel_id"):
+            query.set_extra_json_key(CHANNEL_ID_KEY, channel_id)
+
+
+def stop(query: Query) -> None:
+    """
+    Signal the worker running a query that it was stopped.
+
+    :param query: The SQL Lab query
+    """
+    if is_enabled():
+        async_query_manager.stop_query(query.client_id)
+
+
+def get_progress(queries: list[Query]) -> dict[str, float]:
+    """
+    Return the progress of the running queries reported through the channel.
+
+    :param queries: The SQL Lab queries
+    :returns: The progress of the running queries by client ID
+    """
+    client_ids = [
+        query.client_id for query in queries if query.status == QueryStatus.RUNNING
+    ]
+    if not is_enabled() or not client_ids:
+        return {}
+
+    try:
+        return async_query_manager.get_queries_progress(client_ids)
+    except Exception:  # pylint: disable=broad-except
+        logger.warning("Unable to read the progress of queries", exc_info=True)
+        return {}
+
+
+class QueryProgressTracker:
+    """
+    Track the progress and the cancellation of a query while its cursor is polled.
+    """
+
+    def __init__(self, query: Query) -> None:
+        self.query = query
+        self.progress = query.progress or 0
+        self.channel = is_enabled()
+        self._job_metadata: dict[str, Any] | None = None
+        if self.channel and (channel_id := query.extra.get(CHANNEL_ID_KEY)):
+            self._job_metadata = build_job_metadata(
+                channel_id,
+                query.client_id,
+                user_id=query.user_id,
+            )
+
+    def is_stopped(self) -> bool:
+        """
+        Return whether the query was stopped or timed out.
+
+        If the channel can't be read the query is assumed to be running, so that it's
+        not cancelled because of an unrelated error.
+        """
+        if self.channel:
+            try:
+                return async_query_manager.is_query_stopped(self.query.client_id)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Unable to read whether a query was stopped", exc_info=True
+                )
+                return False
+
+        # the query might have been stopped in another process, so read it again
+        db.session.refresh(self.query)
+        return self.query.status in (QueryStatus.STOPPED, QueryStatus.TIMED_OUT)
+
+    def set_progress(self, progress: float) -> None:
+        """
+        Report the progress of the query, if it made any.
+
+        :param progress: The progress of the query, from 0 to 100
+        """
+        if progress <= self.progress:
+            return
+
+        self.progress = progress
+        if self.channel:
+            try:
+                async_query_manager.set_query_progress(
+                    self.query.client_id,
+                    progress,
+                    self._job_metadata,
+                )
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Unable to publish the progress of a query", exc_info=True
+                )
+            return
+
+        self.query.progress = progress
+        db.session.commit()  # pylint: disable=consider-using-transaction
+
+    def set_tracking_url(self, tracking_url: str) -> None:
+        """
+        Record the tracking URL of the query, which is always written to the query.
+
+        :param tracking_url: The URL of the query in the UI of the engine
+        """
+        self.query.tracking_url = tracking_url
+        db.session.commit()  # pylint: disable=consider-using-transaction
@@ -113,6 +113,32 @@ def load_chart_data_into_cache(
             raise
 
 
+@celery_app.task(name="refresh_chart_data_cache", soft_time_limit=query_timeout)
+def refresh_chart_data_cache(
+    job_metadata: dict[str, Any],
+    form_data: dict[str, Any],
+    cache_key: str,
+) -> None:
+    """
+    Refresh a stale chart data cache entry served while it's revalidated.
+
+    :param job_metadata: The user who requested the chart data
+    :param form_data: The query context of the request
+    :param cache_key: The cache key of the query to refresh
+    """
+    with override_user(_load_user_from_job_metadata(job_metadata), force=False):
+        try:
+            set_form_data(form_data)
+            query_context = _create_query_context_from_form(form_data)
+            query_context.raise_for_access()
+            query_context.refresh_query_result(cache_key)
+        except SoftTimeLimitExceeded as ex:
+            logger.warning("A timeout occurred while refreshing chart data: %s", ex)
+            raise
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Unable to refresh cache key %s", cache_key, exc_info=True)
+
+
 @celery_app.task(name="load_explore_json_into_cache", soft_time_limit=query_timeout)
 def load_explore_json_into_cache(  # pylint: disable=too-many-locals
     job_metadata: dict[str, Any],
@@ -17,6 +17,12 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import chain, zip_longest
 from typing import Any, Optional, TypedDict, Union
 from urllib import request
 from urllib.error import URLError
@@ -24,17 +30,23 @@ from urllib.error import URLError
 from celery.beat import SchedulingError
 from celery.utils.log import get_task_logger
 from flask import current_app
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, or_
 
 from rama import db, security_manager
-from rama.extensions import celery_app
-from rama.models.core import Log
+from rama.commands.chart.warm_up_cache import ChartWarmUpCacheCommand
+from rama.common.chart_data import ChartDataResultFormat
+from rama.connectors.sqla.models import SqlaTable
+from rama.extensions import cache_manager, celery_app
+from rama.models.cache import CacheKey
+from rama.models.core import Database, Log
 from rama.models.dashboard import Dashboard
 from rama.models.slice import Slice
 from rama.tags.models import Tag, TaggedObject
 from rama.tasks.exceptions import ExecutorNotFoundError, InvalidExecutorError
 from rama.tasks.utils import fetch_csrf_token, get_executor
 from rama.utils import json
+from rama.utils.concurrency import limit_concurrency, run_in_app_context
+from rama.utils.core import override_user
 from rama.utils.date_parser import parse_human_datetime
 from rama.utils.machine_auth import MachineAuthProvider
 from rama.utils.urls import get_url_path, is_secure_url
@@ -53,6 +65,17 @@ class CacheWarmupTask(TypedDict):
     username: str | None
 
 
+class CacheWarmupSummary(TypedDict):
+    strategy: str
+    charts: int
+    deduplicated: int
+    hits: int
+    misses: int
+    errors: list[str]
+    duration: float
+    bytes: int
+
+
 def get_task(chart: Slice, dashboard: Optional[Dashboard] = None) -> CacheWarmupTask:
     """Return task for warming up a given chart/table cache."""
     executors = current_app.config["CACHE_WARMUP_EXECUTORS"]
@@ -233,7 +256,328 @@ class DashboardTagsStrategy(Strategy):  # pylint: disable=too-few-public-methods
         return tasks
 
 
-strategies = [DummyStrategy, TopNDashboardsStrategy, DashboardTagsStrategy]
+class ExpiringCacheStrategy(Strategy):  # pylint: disable=too-few-public-methods
+    """
+    Refresh the cached charts of the dashboards about to be opened, just before
+    their cache expires.
+
+    The dashboard views logged around the same time of day over the last `days`
+    days are used to predict which dashboards will be opened in the next `horizon`
+    seconds. The query cache keys of their charts are computed for the executor of
+    each chart, and a chart is only refreshed if one of its keys expires in the
+    next `lead_time` seconds, according to the cache keys stored in the metadata
+    database (see `STORE_CACHE_KEYS_IN_METADATA_DB`), or is missing from the cache.
+    Charts are returned from the most viewed dashboards to the least viewed ones,
+    and from the soonest expiring to the latest expiring.
+
+    The strategy should be scheduled every `lead_time` seconds:
+
+        beat_schedule = {
+            'cache-warmup-expiring': {
+                'task': 'cache-warmup',
+                'schedule': crontab(minute='*/15'),
+                'kwargs': {
+                    'strategy_name': 'expiring_cache',
+                    'days': 7,
+                    'horizon': 3600,
+                    'lead_time': 900,
+                },
+            },
+        }
+
+    Legacy charts, whose cache keys can't be computed upfront, are not refreshed.
+    """
+
+    name = "expiring_cache"
+
+    def __init__(
+        self,
+        days: int = 7,
+        horizon: int = 3600,
+        lead_time: int = 900,
+        min_views: int = 1,
+    ) -> None:
+        super().__init__()
+        self.days = days
+        self.horizon = timedelta(seconds=horizon)
+        self.lead_time = timedelta(seconds=lead_time)
+        self.min_views = min_views
+
+    def get_tasks(self) -> list[CacheWarmupTask]:
+        views = self._get_predicted_views()
+        dashboards = sorted(
+            db.session.query(Dashboard).filter(Dashboard.id.in_(views)).all(),
+            key=lambda dashboard: views[dashboard.id],
+            reverse=True,
+        )
+
+        charts: list[tuple[int, CacheWarmupTask, list[str]]] = []
+        chart_ids: set[int] = set()
+        for dashboard in dashboards:
+            for chart in dashboard.slices:
+                if chart.id in chart_ids:
+                    continue
+                chart_ids.add(chart.id)
+                task = get_task(chart, dashboard)
+                if cache_keys := self._get_cache_keys(chart, task["username"]):
+                    charts.append((views[dashboard.id], task, cache_keys))
+
+        expiries = self._get_expiries(
+            [cache_key for _, _, cache_keys in charts for cache_key in cache_keys]
+        )
+        deadline = datetime.now() + self.lead_time
+        candidates = []
+        for dashboard_views, task, cache_keys in charts:
+            expires_on = min(
+                (expiries[key] for key in cache_keys if expiries[key] is not None),
+                default=None,
+            )
+            if expires_on is not None and expires_on <= deadline:
+                candidates.append((-dashboard_views, expires_on, task))
+
+        candidates.sort(key=lambda candidate: candidate[:2])
+        return [task for _, _, task in candidates]
+
+    def _get_predicted_views(self) -> dict[int, int]:
+        """
+        Return the number of views of each dashboard in the same window of time as
+        the next `horizon` seconds, on each of the last `days` days.
+        """
+        now = datetime.utcnow()
+        windows = [
+            Log.dttm.between(
+                now - timedelta(days=day),
+                now - timedelta(days=day) + self.horizon,
+            )
+            for day in range(1, self.days + 1)
+        ]
+        records = (
+            db.session.query(Log.dashboard_id, func.count(Log.dashboard_id))
+            .filter(and_(Log.dashboard_id.isnot(None), or_(*windows)))
+            .group_by(Log.dashboard_id)
+            .all()
+        )
+        return {
+            dashboard_id: count
+            for dashboard_id, count in records
+            if count >= self.min_views
+        }
+
+    @staticmethod
+    def _get_cache_keys(chart: Slice, username: str | None) -> list[str]:
+        if not username:
+            return []
+
+        user = security_manager.get_user_by_username(username)
+        with override_user(user):
+            try:
+                return ChartWarmUpCacheCommand(chart, None, None).get_cache_keys()
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Could not compute the cache keys of chart %s",
+                    chart.id,
+                    exc_info=True,
+                )
+                return []
+
+    @staticmethod
+    def _get_expiries(cache_keys: list[str]) -> dict[str, datetime | None]:
+        """
+        Return when each cache key expires, or None if that's unknown.
+
+        Keys missing from the cache are already expired, keys which never expire
+        or were cached without being stored in the metadata database are unknown.
+        """
+        created: dict[str, tuple[datetime, int | None]] = {}
+        for cache_key, created_on, cache_timeout in (
+            db.session.query(
+                CacheKey.cache_key,
+                CacheKey.created_on,
+                CacheKey.cache_timeout,
+            )
+            .filter(CacheKey.cache_key.in_(set(cache_keys)))
+            .all()
+        ):
+            if cache_key not in created or created[cache_key][0] < created_on:
+                created[cache_key] = (created_on, cache_timeout)
+
+        now = datetime.now()
+        default_timeout = current_app.config["CACHE_DEFAULT_TIMEOUT"]
+        expiries: dict[str, datetime | None] = {}
+        for cache_key in cache_keys:
+            try:
+                is_cached = cache_manager.data_cache.has(cache_key)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Could not check cache key %s", cache_key)
+                is_cached = False
+
+            if not is_cached:
+                expiries[cache_key] = now
+            elif cache_key in created:
+                created_on, cache_timeout = created[cache_key]
+                timeout = (
+                    cache_timeout if cache_timeout is not None else default_timeout
+                )
+                expiries[cache_key] = (
+                    created_on + timedelta(seconds=timeout) if timeout else None
+                )
+            else:
+                expiries[cache_key] = None
+
+        return expiries
+
+
+strategies = [
+    DummyStrategy,
+    TopNDashboardsStrategy,
+    DashboardTagsStrategy,
+    ExpiringCacheStrategy,
+]
+
+
+class CacheWarmupEngine:
+    """
+    Warm up the cache of charts inside the worker.
+
+    Instead of sending a request per chart to the web server, each chart is warmed
+    up by running `ChartWarmUpCacheCommand` under the identity of the executor of
+    its task. Charts whose queries resolve to cache keys that were already warmed
+    up are skipped, and charts are warmed up concurrently, interleaving databases
+    and capping the number of charts warmed up at once on each database.
+
+    The results are fetched as Arrow tables, so they are not serialized to JSON
+    only to be thrown away, and their size is reported as the bytes cached.
+    """
+
+    def __init__(self, strategy_name: str, force: bool = True) -> None:
+        """
+        :param strategy_name: The name of the strategy the tasks come from
+        :param force: Whether to run the queries even if their results are cached
+        """
+        self._force = force
+        self._cache_keys: set[str] = set()
+        self._lock = threading.Lock()
+        self._summary: CacheWarmupSummary = {
+            "strategy": strategy_name,
+            "charts": 0,
+            "deduplicated": 0,
+            "hits": 0,
+            "misses": 0,
+            "errors": [],
+            "duration": 0.0,
+            "bytes": 0,
+        }
+
+    def run(self, tasks: list[CacheWarmupTask]) -> CacheWarmupSummary:
+        start = time.monotonic()
+        tasks = self._interleave_databases(tasks)
+        max_workers = min(current_app.config["CACHE_WARMUP_MAX_WORKERS"], len(tasks))
+        if max_workers <= 1:
+            for task, database in tasks:
+                self._warm_up(task, database)
+        else:
+            with ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="cache_warmup",
+            ) as executor:
+                futures = [
+                    executor.submit(run_in_app_context(self._warm_up), task, database)
+                    for task, database in tasks
+                ]
+                for future in futures:
+                    future.result()
+
+        self._summary["duration"] = round(time.monotonic() - start, 3)
+        return self._summary
+
+    @staticmethod
+    def _interleave_databases(
+        tasks: list[CacheWarmupTask],
+    ) -> list[tuple[CacheWarmupTask, str | None]]:
+        """
+        Pair each task with the name of the database of its chart, alternating
+        between databases so a busy database doesn't hold up the others.
+        """
+        chart_ids = {task["payload"]["chart_id"] for task in tasks}
+        databases = dict(
+            db.session.query(Slice.id, Database.database_name)
+            .join(
+                SqlaTable,
+                and_(
+                    Slice.datasource_id == SqlaTable.id,
+                    Slice.datasource_type == "table",
+                ),
+            )
+            .join(Database, SqlaTable.database_id == Database.id)
+            .filter(Slice.id.in_(chart_ids))
+            .all()
+        )
+
+        groups: dict[str | None, list[tuple[CacheWarmupTask, str | None]]]
+        groups = defaultdict(list)
+        for task in tasks:
+            database = databases.get(task["payload"]["chart_id"])
+            groups[database].append((task, database))
+
+        return [
+            item
+            for item in chain.from_iterable(zip_longest(*groups.values()))
+            if item is not None
+        ]
+
+    def _claim(self, cache_keys: list[str]) -> bool:
+        """
+        Claim the cache keys of a chart, returning whether any of them was not
+        already warmed up by another chart.
+        """
+        with self._lock:
+            if self._cache_keys.issuperset(cache_keys):
+                return False
+            self._cache_keys.update(cache_keys)
+            return True
+
+    def _warm_up(self, task: CacheWarmupTask, database: str | None) -> None:
+        config = current_app.config
+        limit = config["CACHE_WARMUP_PER_DATABASE_LIMITS"].get(
+            database, config["CACHE_WARMUP_PER_DATABASE_LIMIT"]
+        )
+        payload = task["payload"]
+        user = security_manager.get_user_by_username(task["username"])
+        command = ChartWarmUpCacheCommand(
+            payload["chart_id"],
+            payload.get("dashboard_id"),
+            None,
+            force=self._force,
+            result_format=ChartDataResultFormat.ARROW,
+        )
+        with override_user(user):
+            try:
+                cache_keys = command.get_cache_keys()
+                if cache_keys and not self._claim(cache_keys):
+                    logger.info("Skipping %s, already warmed up", payload)
+                    with self._lock:
+                        self._summary["deduplicated"] += 1
+                    return
+
+                with limit_concurrency(("cache_warmup", database), limit):
+                    result = command.run()
+                # persist the cache keys stored in the metadata database
+                db.session.commit()  # pylint: disable=consider-using-transaction
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error warming up cache for %s", payload)
+                result = {"viz_error": True}
+
+        with self._lock:
+            self._summary["charts"] += 1
+            if result["viz_error"]:
+                self._summary["errors"].append(json.dumps(payload))
+            for query in command.queries:
+                if query.get("is_cached"):
+                    self._summary["hits"] += 1
+                else:
+                    self._summary["misses"] += 1
+                if nbytes := getattr(query.get("data"), "nbytes", None):
+                    self._summary["bytes"] += nbytes
 
 
 @celery_app.task(name="fetch_url")
@@ -280,12 +624,15 @@ def fetch_url(data: str, headers: dict[str, str]) -> dict[str, str]:
 
 @celery_app.task(name="cache-warmup")
 def cache_warmup(
-    strategy_name: str, *args: Any, **kwargs: Any
-) -> Union[dict[str, list[str]], str]:
+    strategy_name: str, *args: Any, force: bool = True, **kwargs: Any
+) -> Union[dict[str, list[str]], CacheWarmupSummary, str]:
     """
     Warm up cache.
 
-    This task periodically hits charts to warm up the cache.
+    This task periodically hits charts to warm up the cache. When
+    `CACHE_WARMUP_IN_PROCESS` is set, the charts are warmed up inside the worker
+    and a summary of the warm up is returned; `force` can then be unset to skip
+    the queries whose results are still cached.
 
     """
     logger.info("Loading strategy")
@@ -307,25 +654,33 @@ def cache_warmup(
         logger.exception(message)
         return message
 
-    results: dict[str, list[str]] = {"scheduled": [], "errors": []}
+    tasks = []
     for task in strategy.get_tasks():
-        username = task["username"]
-        payload = json.dumps(task["payload"])
-        if username:
-            try:
-                user = security_manager.get_user_by_username(username)
-                cookies = MachineAuthProvider.get_auth_cookies(user)
-                headers = {
-                    "Cookie": f"session={cookies.get('session', '')}",
-                    "Content-Type": "application/json",
-                }
-                logger.info("Scheduling %s", payload)
-                fetch_url.delay(payload, headers)
-                results["scheduled"].append(payload)
-            except SchedulingError:
-                logger.exception("Error scheduling fetch_url for payload: %s", payload)
-                results["errors"].append(payload)
+        if task["username"]:
+            tasks.append(task)
         else:
-            logger.warn("Executor not found for %s", payload)
+            logger.warn("Executor not found for %s", json.dumps(task["payload"]))
+
+    if current_app.config["CACHE_WARMUP_IN_PROCESS"]:
+        summary = CacheWarmupEngine(strategy_name, force).run(tasks)
+        logger.info("Warmed up cache: %s", summary)
+        return summary
+
+    results: dict[str, list[str]] = {"scheduled": [], "errors": []}
+    for task in tasks:
+        payload = json.dumps(task["payload"])
+        try:
+            user = security_manager.get_user_by_username(task["username"])
+            cookies = MachineAuthProvider.get_auth_cookies(user)
+            headers = {
+                "Cookie": f"session={cookies.get('session', '')}",
+                "Content-Type": "application/json",
+            }
+            logger.info("Scheduling %s", payload)
+            fetch_url.delay(payload, headers)
+            results["scheduled"].append(payload)
+        except SchedulingError:
+            logger.exception("Error scheduling fetch_url for payload: %s", payload)
+            results["errors"].append(payload)
 
     return results
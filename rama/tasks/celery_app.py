@@ -22,11 +22,12 @@ it needs to call create_app() in order to initialize things properly
 
 from typing import Any
 
-from celery.signals import task_postrun, worker_process_init
+from celery.signals import task_postrun, worker_process_init, worker_process_shutdown
 
 # Rama framework imports
 from rama import create_app
-from rama.extensions import celery_app, db
+from rama.extensions import celery_app, db, event_logger
+from rama.utils.log import BufferedDBEventLogger
 
 # Init the Flask app / configure everything
 flask_app = create_app()
@@ -34,6 +35,8 @@ flask_app = create_app()
 # Need to import late, as the celery_app will have been setup by "create_app()"
 # ruff: noqa: E402, F401
 # pylint: disable=wrong-import-position, unused-import
+from rama.utils.browser_pool import browser_pool
+
 from . import cache, scheduler
 
 # Export the celery app globally for Celery (as run on the cmd line) to find
@@ -47,6 +50,19 @@ def reset_db_connection_pool(**kwargs: Any) -> None:  # pylint: disable=unused-a
         db.engine.dispose()
 
 
+@worker_process_shutdown.connect
+def close_browser_pool(**kwargs: Any) -> None:  # pylint: disable=unused-argument
+    browser_pool.close_all()
+
+
+@worker_process_shutdown.connect
+def flush_event_logger(**kwargs: Any) -> None:  # pylint: disable=unused-argument
+    # pool processes exit without running atexit handlers, which would lose the
+    # records still buffered by the process
+    if isinstance(event_logger, BufferedDBEventLogger):
+        event_logger.shutdown()
+
+
 @task_postrun.connect
 def teardown(  # pylint: disable=unused-argument
     retval: Any,
@@ -0,0 +1,55 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import logging
+
+from celery.utils.log import get_task_logger
+
+from rama import db
+from rama.databases.table_search import refresh_table_index
+from rama.extensions import celery_app
+from rama.models.core import Database
+
+logger = get_task_logger(__name__)
+logger.setLevel(logging.INFO)
+
+
+@celery_app.task(name="table_search.refresh_index")
+def refresh_index(database_id: int | None = None, force: bool = True) -> None:
+    """
+    Refresh the table search index of a database, or of all the databases exposed in
+    SQL Lab.
+
+    :param database_id: The ID of the database, or `None` for all the databases
+    :param force: Whether to bypass the caches of catalog, schema and table names
+    """
+    query = db.session.query(Database)
+    if database_id is None:
+        query = query.filter(Database.expose_in_sqllab.is_(True))
+    else:
+        query = query.filter(Database.id == database_id)
+
+    for database in query.all():
+        logger.info("Refreshing table search index of %s", database.database_name)
+        try:
+            refresh_table_index(database, force=force)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception(
+                "Unable to refresh table search index of %s",
+                database.database_name,
+            )
@@ -0,0 +1,117 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import io
+from collections.abc import Iterator
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+
+from rama.utils import json
+
+# number of rows in each record batch of an IPC stream
+DEFAULT_BATCH_SIZE = 65536
+
+# schema metadata key holding the (JSON encoded) payload of a chart data query
+METADATA_KEY = b"rama"
+
+
+def df_to_arrow_table(df: pd.DataFrame, index: bool = False) -> pa.Table:
+    """
+    Convert a dataframe to an Arrow table.
+
+    Numeric and temporal columns are converted without copying the data when
+    possible. Columns with values that can't be represented in Arrow (eg, mixed
+    types) are converted to strings.
+
+    :param df: The dataframe to convert
+    :param index: Whether to include the index of the dataframe as columns
+    :returns: An Arrow table
+    """
+    if index:
+        df = df.reset_index()
+
+    names: list[str] = []
+    arrays: list[pa.Array] = []
+    for name, series in df.items():
+        try:
+            array = pa.Array.from_pandas(series)
+        except (pa.ArrowException, TypeError, ValueError):
+            array = pa.array(
+                [None if value is None else str(value) for value in series],
+                type=pa.string(),
+            )
+        names.append(str(name))
+        arrays.append(array)
+
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def stream_arrow_table(
+    table: pa.Table,
+    metadata: dict[str, Any] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Serialize an Arrow table into an IPC stream, one record batch at a time.
+
+    Each chunk yielded can be sent to the client right away, so that the whole
+    stream is never held in memory.
+
+    :param table: The table to serialize
+    :param metadata: A payload stored as JSON in the schema metadata
+    :param batch_size: The maximum number of rows in each record batch
+    """
+    if metadata is not None:
+        table = table.replace_schema_metadata(
+            {
+                **(table.schema.metadata or {}),
+                METADATA_KEY: json.dumps(
+                    metadata,
+                    default=json.json_int_dttm_ser,
+                    ignore_nan=True,
+                ),
+            }
+        )
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=batch_size):
+            writer.write_batch(batch)
+            yield _drain(sink)
+
+    # end of stream marker
+    yield _drain(sink)
+
+
+def arrow_table_to_ipc_bytes(
+    table: pa.Table,
+    metadata: dict[str, Any] | None = None,
+) -> bytes:
+    """
+    Serialize an Arrow table into a single IPC stream buffer.
+    """
+    return b"".join(stream_arrow_table(table, metadata))
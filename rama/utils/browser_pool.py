@@ -0,0 +1,178 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Long-lived headless browsers for screenshots, thumbnails and reports.
+
+Launching a browser takes a few seconds, which used to be paid for every
+screenshot. When `WEBDRIVER_POOL_ENABLED` is set each worker thread keeps its
+browsers alive between screenshots, and leases them for the duration of a
+screenshot (or of the screenshots of all the tabs of a dashboard). Browsers are kept
+per thread since the Playwright sync API can't be used across threads.
+
+A browser is recycled after it has loaded `WEBDRIVER_POOL_MAX_PAGES` pages, when the
+browser processes of the worker use more than `WEBDRIVER_POOL_MAX_MEMORY_MB`, and
+when it fails its health check before being leased or after an error.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, TypeVar
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ModuleNotFoundError:
+    psutil = None
+
+T = TypeVar("T")
+
+BYTES_IN_MB = 1024 * 1024
+
+
+@dataclass(eq=False)
+class PooledBrowser(Generic[T]):
+    browser: T
+    close: Callable[[], None]
+    is_healthy: Callable[[], bool]
+    # number of pages loaded by the browser since it was launched
+    pages: int = 0
+
+
+def get_browser_processes_memory() -> int:
+    """
+    Return the memory (RSS) in bytes of the browser processes, ie, of the child
+    processes of the current process.
+    """
+    if psutil is None:
+        logger.warning("psutil is required to recycle browsers on memory usage")
+        return 0
+
+    memory = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            memory += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return memory
+
+
+class BrowserPool:
+    """
+    A pool of browsers, with at most one idle browser per thread and kind of browser.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._browsers: list[PooledBrowser[Any]] = []
+
+    def _idle(self) -> dict[str, PooledBrowser[Any]]:
+        if not hasattr(self._local, "idle"):
+            self._local.idle = {}
+        return self._local.idle
+
+    @contextmanager
+    def lease(
+        self,
+        key: str,
+        create: Callable[[], PooledBrowser[T]],
+    ) -> Iterator[PooledBrowser[T]]:
+        """
+        Lease a browser, launching one if there's no healthy idle browser.
+
+        :param key: The kind of browser, eg, "playwright" or "firefox"
+        :param create: A function that launches a new browser
+        """
+        idle = self._idle()
+        pooled = idle.pop(key, None)
+        if pooled is not None and not self._is_healthy(pooled):
+            logger.info("Recycling unhealthy %s browser", key)
+            self._close(pooled)
+            pooled = None
+
+        if pooled is None:
+            logger.debug("Launching %s browser", key)
+            pooled = create()
+            with self._lock:
+                self._browsers.append(pooled)
+
+        try:
+            yield pooled
+        except BaseException:
+            # the error may have left the browser unusable
+            if not self._is_healthy(pooled):
+                self._close(pooled)
+                raise
+            self._release(key, pooled)
+            raise
+        self._release(key, pooled)
+
+    def _release(self, key: str, pooled: PooledBrowser[Any]) -> None:
+        idle = self._idle()
+        if key in idle or self._should_recycle(pooled):
+            logger.debug("Recycling %s browser after %i pages", key, pooled.pages)
+            self._close(pooled)
+        else:
+            idle[key] = pooled
+
+    @staticmethod
+    def _should_recycle(pooled: PooledBrowser[Any]) -> bool:
+        max_pages = current_app.config["WEBDRIVER_POOL_MAX_PAGES"]
+        if max_pages and pooled.pages >= max_pages:
+            return True
+
+        max_memory = current_app.config["WEBDRIVER_POOL_MAX_MEMORY_MB"]
+        return bool(
+            max_memory and get_browser_processes_memory() > max_memory * BYTES_IN_MB
+        )
+
+    @staticmethod
+    def _is_healthy(pooled: PooledBrowser[Any]) -> bool:
+        try:
+            return pooled.is_healthy()
+        except Exception:  # pylint: disable=broad-except
+            return False
+
+    def _close(self, pooled: PooledBrowser[Any]) -> None:
+        with self._lock:
+            if pooled in self._browsers:
+                self._browsers.remove(pooled)
+        try:
+            pooled.close()
+        except Exception:  # pylint: disable=broad-except
+            logger.warning("Failed to close browser", exc_info=True)
+
+    def close_all(self) -> None:
+        """
+        Close all the browsers, eg, when the worker process shuts down.
+        """
+        with self._lock:
+            browsers = list(self._browsers)
+        for pooled in browsers:
+            self._close(pooled)
+        self._local = threading.local()
+
+
+browser_pool = BrowserPool()
@@ -30,7 +30,7 @@ from werkzeug.wrappers import Response
 from rama import db
 from rama.extensions import cache_manager
 from rama.models.cache import CacheKey
-from rama.utils.hashing import md5_sha_from_dict
+from rama.utils.hashing import hash_from_dict
 from rama.utils.json import json_int_dttm_ser
 
 if TYPE_CHECKING:
@@ -42,7 +42,7 @@ logger = logging.getLogger(__name__)
 
 
 def generate_cache_key(values_dict: dict[str, Any], key_prefix: str = "") -> str:
-    hash_str = md5_sha_from_dict(values_dict, default=json_int_dttm_ser)
+    hash_str = hash_from_dict(values_dict, default=json_int_dttm_ser)
     return f"{key_prefix}{hash_str}"
 
 
@@ -0,0 +1,92 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import annotations
+
+import threading
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+from flask import current_app, g, has_request_context
+from flask.globals import request_ctx
+
+T = TypeVar("T")
+
+_semaphores: dict[Hashable, threading.BoundedSemaphore] = {}
+_semaphores_lock = threading.Lock()
+
+
+def run_in_app_context(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Wrap a function so it can be executed in a worker thread.
+
+    Flask contexts are local to the thread handling the request, so every call of the
+    wrapped function pushes a new application context (and a new copy of the request
+    context, if there is one) and copies over the current `g` object, which holds the
+    logged in user among other things. Since each call has its own contexts, the
+    function can run concurrently in many threads, which can finish in any order. The
+    SQLAlchemy session is scoped to the worker thread and removed when the
+    application context is torn down, so ORM objects of the caller must be loaded
+    again in the function.
+
+    Must be called from within an application context.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    g_copy = g._get_current_object()  # pylint: disable=protected-access
+    request_context = (
+        request_ctx._get_current_object()  # pylint: disable=protected-access
+        if has_request_context()
+        else None
+    )
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        with app.app_context():
+            for key, value in g_copy.__dict__.items():
+                setattr(g, key, value)
+            with request_context.copy() if request_context else nullcontext():
+                return func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def limit_concurrency(key: Hashable, limit: int) -> Iterator[None]:
+    """
+    Limit the number of threads in this process running a block for a given key.
+
+    A bounded semaphore is lazily created for each key and limit, so callers can cap
+    the load put on a shared resource, eg, the number of concurrent queries sent to a
+    given database. When the limit of a key changes, eg, when the configuration is
+    reloaded, the new limit is enforced with a new semaphore. A limit lower than 1
+    disables the check.
+
+    :param key: The resource being protected, eg, ``("time_offset", database_id)``
+    :param limit: The maximum number of concurrent holders for the key
+    """
+    if limit < 1:
+        yield
+        return
+
+    with _semaphores_lock:
+        semaphore = _semaphores.get((key, limit))
+        if semaphore is None:
+            semaphore = _semaphores[(key, limit)] = threading.BoundedSemaphore(limit)
+
+    with semaphore:
+        yield
@@ -17,6 +17,7 @@
 import logging
 import re
 import urllib.request
+from collections.abc import Iterable, Iterator
 from typing import Any, Optional, Union
 from urllib.error import URLError
 
@@ -64,23 +65,65 @@ def escape_value(value: str) -> str:
     return value
 
 
+def escape_values(series: pd.Series) -> pd.Series:
+    """
+    Escapes the string values of a column, see `escape_value`.
+
+    The values are matched and escaped with the vectorized string methods of pandas,
+    instead of one at a time.
+    """
+    if series.dtype != np.dtype(object):
+        return series
+
+    try:
+        values = series.str
+    except AttributeError:
+        # no string values
+        return series
+
+    needs_escaping = values.match(problematic_chars_re).eq(True)
+    is_negative_number = values.match(negative_number_re).eq(True)
+    mask = needs_escaping & ~is_negative_number
+    if not mask.any():
+        return series
+
+    series = series.copy()
+    series[mask] = "'" + series[mask].str.replace("|", "\\|", regex=False)
+    return series
+
+
 def df_to_escaped_csv(df: pd.DataFrame, **kwargs: Any) -> Any:
-    def escape_values(v: Any) -> Union[str, Any]:
+    def escape_header(v: Any) -> Union[str, Any]:
         return escape_value(v) if isinstance(v, str) else v
 
     # Escape csv headers
-    df = df.rename(columns=escape_values)
+    df = df.rename(columns=escape_header)
 
     # Escape csv values
-    for name, column in df.items():
-        if column.dtype == np.dtype(object):
-            for idx, value in enumerate(column.values):
-                if isinstance(value, str):
-                    df.at[idx, name] = escape_value(value)
+    for idx, (_, column) in enumerate(df.items()):
+        escaped = escape_values(column)
+        if escaped is not column:
+            df.isetitem(idx, escaped)
 
     return df.to_csv(escapechar="\\", **kwargs)
 
 
+def iter_escaped_csv(dfs: Iterable[pd.DataFrame], **kwargs: Any) -> Iterator[str]:
+    """
+    Convert batches of rows to CSV, one batch at a time.
+
+    The header is only written for the first batch, so that the chunks yielded can be
+    concatenated (or streamed to the client) as a single CSV file.
+
+    :param dfs: The batches of rows, with the same columns
+    :param kwargs: The arguments passed to `DataFrame.to_csv`
+    """
+    header = kwargs.pop("header", True)
+    for df in dfs:
+        yield df_to_escaped_csv(df, header=header, **kwargs)
+        header = False
+
+
 def get_chart_csv_data(
     chart_url: str, auth_cookies: Optional[dict[str, str]] = None
 ) -> Optional[bytes]:
@@ -15,10 +15,26 @@
 # specific language governing permissions and limitations
 # under the License.
 import hashlib
+import json as stdlib_json
+import logging
 from typing import Any, Callable, Optional
 
+from flask import current_app, has_app_context
+
 from rama.utils import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
 
 def md5_sha_from_str(val: str) -> str:
     return hashlib.md5(val.encode("utf-8")).hexdigest()  # noqa: S324
@@ -34,3 +50,91 @@ def md5_sha_from_dict(
     )
 
     return md5_sha_from_str(json_data)
+
+
+def canonical_json(
+    obj: Any,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """
+    Serialize an object into a compact JSON representation with sorted keys.
+
+    Uses `orjson` when it's installed (see the `fast-hashing` extra), and the
+    standard library otherwise. The output is the same for strings, integers,
+    booleans, lists and dictionaries, but not for every float: `orjson` serializes
+    NaN and infinity as `null` while the standard library writes `NaN` and
+    `Infinity`, and large or small floats are written differently (eg, `1e16` and
+    `1e+16`). Processes sharing a cache should have the same dependencies installed.
+
+    :param obj: The object to serialize
+    :param default: A function returning a serializable version of unsupported
+        objects, including dates and datetimes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=default,
+                option=orjson.OPT_SORT_KEYS
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            # eg, integers that don't fit in 64 bits
+            logger.debug("Unable to serialize object with orjson", exc_info=True)
+
+    return stdlib_json.dumps(
+        obj,
+        default=default,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def hash_from_bytes(val: bytes, algorithm: str = "md5") -> str:
+    """
+    Return the hex digest of a buffer.
+
+    :param val: The buffer to hash
+    :param algorithm: One of "md5", "blake2b" or "xxhash"; all of them produce 128
+        bit digests
+    """
+    if algorithm == "xxhash":
+        if xxhash is not None:
+            return xxhash.xxh3_128_hexdigest(val)
+        logger.warning("xxhash is not installed, falling back to blake2b")
+        algorithm = "blake2b"
+
+    if algorithm == "blake2b":
+        return hashlib.blake2b(val, digest_size=16).hexdigest()
+
+    return hashlib.md5(val).hexdigest()  # noqa: S324
+
+
+def hash_from_dict(
+    obj: dict[Any, Any],
+    ignore_nan: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """
+    Return a stable hash of a dictionary, to be used in cache keys.
+
+    When `CACHE_KEY_LEGACY_FORMAT` is enabled (the default) the hash is the same
+    as the one returned by `md5_sha_from_dict`, so that existing cache entries are
+    still used. Otherwise the dictionary is serialized with `canonical_json`, which
+    is significantly faster, and hashed with `CACHE_KEY_HASH_ALGORITHM`.
+
+    :param obj: The dictionary to hash
+    :param ignore_nan: Whether to serialize NaN as null; only used by the legacy
+        format, the other one serializes NaN as `canonical_json` does
+    :param default: A function returning a serializable version of unsupported
+        objects
+    """
+    if not has_app_context() or current_app.config["CACHE_KEY_LEGACY_FORMAT"]:
+        return md5_sha_from_dict(obj, ignore_nan=ignore_nan, default=default)
+
+    return hash_from_bytes(
+        canonical_json(obj, default=default),
+        current_app.config["CACHE_KEY_HASH_ALGORITHM"],
+    )
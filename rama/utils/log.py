@@ -16,17 +16,22 @@
 # under the License.
 from __future__ import annotations
 
+import atexit
 import functools
 import inspect
 import logging
+import os
+import queue
 import textwrap
+import threading
+import time
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Any, Callable, cast, Literal, TYPE_CHECKING
 
-from flask import g, request
+from flask import current_app, Flask, g, request
 from flask_appbuilder.const import API_URI_RIS_KEY
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -409,6 +414,172 @@ class DBEventLogger(AbstractEventLogger):
             logging.exception(ex)
 
 
+class BufferedDBEventLogger(DBEventLogger):
+    """
+    Event logger that commits logs to Rama DB in batches, from a background thread
+
+    Records are queued in memory, and written to the database with a single insert
+    every `flush_interval` seconds, or as soon as `batch_size` records are queued,
+    so that requests don't have to wait for a commit to the metadata database. When
+    the queue holds `max_queue_size` records, logging a new record blocks for up to
+    `block_timeout` seconds before the record is dropped (and counted in the
+    `event_logger.dropped` metric). Queued records are flushed when the process
+    exits.
+
+    To use it, set in your config:
+
+        EVENT_LOGGER = BufferedDBEventLogger()
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        block_timeout: float = 0.0,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+        self._app: Flask | None = None
+
+    def log(  # pylint: disable=too-many-arguments
+        self,
+        user_id: int | None,
+        action: str,
+        dashboard_id: int | None,
+        duration_ms: int | None,
+        slice_id: int | None,
+        referrer: str | None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self._start()
+
+        dttm = datetime.utcnow()
+        for record in kwargs.get("records", []):
+            json_string: str | None
+            try:
+                json_string = json.dumps(record)
+            except Exception:  # pylint: disable=broad-except
+                json_string = None
+            row = {
+                "action": action,
+                "json": json_string,
+                "dashboard_id": dashboard_id,
+                "slice_id": slice_id,
+                "duration_ms": duration_ms,
+                "referrer": referrer,
+                "user_id": user_id,
+                "dttm": dttm,
+            }
+            try:
+                self._queue.put(
+                    row,
+                    block=self.block_timeout > 0,
+                    timeout=self.block_timeout or None,
+                )
+            except queue.Full:
+                stats_logger_manager.instance.incr("event_logger.dropped")
+
+    def flush(self) -> None:
+        """
+        Write all the queued records to the database.
+        """
+        while batch := self._get_batch(timeout=0):
+            self._write(batch)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Stop the background thread, and write the queued records.
+        """
+        if self._pid != os.getpid():
+            # nothing was logged by this process, and the records queued by the
+            # parent process it was forked from are flushed by the parent
+            return
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._app is not None:
+            self.flush()
+
+    def _start(self) -> None:
+        if self._pid == os.getpid() and not self._stopped.is_set():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid() and not self._stopped.is_set():
+                return
+
+            if self._pid is None:
+                atexit.register(self.shutdown)
+            elif self._pid != os.getpid():
+                # the records queued by the parent process are flushed by it
+                self._queue = queue.Queue(maxsize=self.max_queue_size)
+
+            self._app = current_app._get_current_object()  # pylint: disable=protected-access
+            self._stopped.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="BufferedDBEventLogger",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if batch := self._get_batch(timeout=self.flush_interval):
+                self._write(batch)
+
+    def _get_batch(self, timeout: float) -> list[dict[str, Any]]:
+        """
+        Return up to `batch_size` records, waiting for at most `timeout` seconds.
+        """
+        batch: list[dict[str, Any]] = []
+        deadline = time.monotonic() + timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    # wake up regularly to return early on shutdown
+                    batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                if remaining <= 0 or self._stopped.is_set():
+                    break
+        return batch
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        # pylint: disable=import-outside-toplevel
+        from rama import db
+        from rama.models.core import Log
+
+        with cast(Flask, self._app).app_context():
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(Log.__table__.insert(), batch)
+            except SQLAlchemyError:
+                logger.exception(
+                    "BufferedDBEventLogger failed to log %d event(s)",
+                    len(batch),
+                )
+                stats_logger_manager.instance.incr("event_logger.failed")
+            stats_logger_manager.instance.gauge(
+                "event_logger.queue_size",
+                self._queue.qsize(),
+            )
+
+
 class StdOutEventLogger(AbstractEventLogger):
     """Event logger that prints to stdout for debugging purposes"""
 
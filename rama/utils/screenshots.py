@@ -17,6 +17,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
 from datetime import datetime
 from enum import Enum
 from io import BytesIO
@@ -159,6 +160,7 @@ class BaseScreenshot:
         self.digest = digest
         self.url = url
         self.screenshot = None
+        self.chart_render_times: dict[str, float | None] = {}
 
     def driver(self, window_size: WindowSize | None = None) -> WebDriver:
         window_size = window_size or self.window_size
@@ -170,9 +172,37 @@ class BaseScreenshot:
         self, user: User, window_size: WindowSize | None = None
     ) -> bytes | None:
         driver = self.driver(window_size)
-        self.screenshot = driver.get_screenshot(self.url, self.element, user)
+        try:
+            self.screenshot = driver.get_screenshot(self.url, self.element, user)
+        finally:
+            self.chart_render_times = driver.chart_render_times
         return self.screenshot
 
+    @staticmethod
+    def get_screenshots(
+        screenshots: Sequence[BaseScreenshot], user: User
+    ) -> list[bytes | None]:
+        """
+        Take several screenshots of the same kind (eg, of the tabs of a dashboard)
+        with a single webdriver, so that the pages can be loaded concurrently.
+        """
+        if len(screenshots) <= 1:
+            return [screenshot.get_screenshot(user) for screenshot in screenshots]
+
+        first = screenshots[0]
+        driver = first.driver()
+        try:
+            images = driver.get_screenshots(
+                [screenshot.url for screenshot in screenshots], first.element, user
+            )
+        finally:
+            # the charts of all the screenshots are timed together
+            for screenshot in screenshots:
+                screenshot.chart_render_times = driver.chart_render_times
+        for screenshot, image in zip(screenshots, images, strict=True):
+            screenshot.screenshot = image
+        return images
+
     def get_cache_key(
         self,
         window_size: bool | WindowSize | None = None,
@@ -20,8 +20,8 @@ from __future__ import annotations
 import logging
 from abc import ABC, abstractmethod
 from enum import Enum
-from time import sleep
-from typing import TYPE_CHECKING
+from time import monotonic, sleep
+from typing import Any, Callable, TYPE_CHECKING
 
 from flask import current_app
 from packaging import version
@@ -40,6 +40,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 
 from rama import feature_flag_manager
 from rama.extensions import machine_auth_provider_factory
+from rama.utils.browser_pool import browser_pool, PooledBrowser
 from rama.utils.retries import retry_call
 
 WindowSize = tuple[int, int]
@@ -50,6 +51,7 @@ if TYPE_CHECKING:
 
 if feature_flag_manager.is_feature_enabled("PLAYWRIGHT_REPORTS_AND_THUMBNAILS"):
     from playwright.sync_api import (
+        Browser,
         BrowserContext,
         Error as PlaywrightError,
         Locator,
@@ -59,6 +61,30 @@ if feature_flag_manager.is_feature_enabled("PLAYWRIGHT_REPORTS_AND_THUMBNAILS"):
     )
 
 
+# statuses set by the frontend in the `data-chart-status` attribute of the charts
+# once they're done loading
+CHART_READY_STATUSES = {"rendered", "failed", "stopped"}
+
+# the statuses of the charts of the page, the number of charts expected in the page,
+# and the time since it started loading; the charts of a dashboard are only known
+# once its grid is rendered, while other pages have a single chart
+CHART_STATUSES_SCRIPT = """
+const grid = document.querySelector(".dashboard-grid");
+return {
+  elapsed: performance.now(),
+  expected: grid
+    ? document.querySelectorAll(".dashboard-component-chart-holder").length
+    : 1,
+  charts: Array.from(document.querySelectorAll("[data-chart-status]")).map(
+    (element) => [element.dataset.chartId, element.dataset.chartStatus],
+  ),
+};
+"""
+
+# seconds between checks of the statuses of the charts
+CHART_STATUSES_POLL_INTERVAL = 0.1
+
+
 class DashboardStandaloneMode(Enum):
     HIDE_NAV = 1
     HIDE_NAV_AND_TITLE = 2
@@ -77,6 +103,9 @@ class WebDriverProxy(ABC):
         self._window: WindowSize = window or (800, 600)
         self._screenshot_locate_wait = current_app.config["SCREENSHOT_LOCATE_WAIT"]
         self._screenshot_load_wait = current_app.config["SCREENSHOT_LOAD_WAIT"]
+        # the seconds it took each chart to render since the page started loading,
+        # or None if it didn't render in time
+        self.chart_render_times: dict[str, float | None] = {}
 
     @abstractmethod
     def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:
@@ -84,6 +113,51 @@ class WebDriverProxy(ABC):
         Run webdriver and return a screenshot
         """
 
+    def get_screenshots(
+        self, urls: list[str], element_name: str, user: User
+    ) -> list[bytes | None]:
+        """
+        Run webdriver and return a screenshot of each url
+        """
+        return [self.get_screenshot(url, element_name, user) for url in urls]
+
+    def wait_for_charts_rendered(
+        self,
+        get_statuses: Callable[[], dict[str, Any]],
+        wait: Callable[[float], None],
+    ) -> bool:
+        """
+        Wait for the frontend to report all the charts of the page as done loading.
+
+        Charts are only reported once they're mounted, so the page is not done until
+        it has as many charts as expected.
+
+        :param get_statuses: A function running `CHART_STATUSES_SCRIPT` in the page
+        :param wait: A function waiting for a number of seconds
+        :returns: Whether the charts were rendered before `SCREENSHOT_LOAD_WAIT`
+        """
+        deadline = monotonic() + self._screenshot_load_wait
+        while True:
+            statuses = get_statuses()
+            pending = [
+                chart_id
+                for chart_id, status in statuses["charts"]
+                if status not in CHART_READY_STATUSES
+            ]
+            for chart_id, status in statuses["charts"]:
+                if status in CHART_READY_STATUSES and chart_id is not None:
+                    self.chart_render_times.setdefault(
+                        str(chart_id), round(statuses["elapsed"] / 1000, 3)
+                    )
+            if not pending and len(statuses["charts"]) >= statuses["expected"]:
+                return True
+            if monotonic() >= deadline:
+                for chart_id in pending:
+                    if chart_id is not None:
+                        self.chart_render_times.setdefault(str(chart_id), None)
+                return False
+            wait(CHART_STATUSES_POLL_INTERVAL)
+
 
 class WebDriverPlaywright(WebDriverProxy):
     @staticmethod
@@ -136,113 +210,201 @@ class WebDriverPlaywright(WebDriverProxy):
 
         return error_messages
 
-    def get_screenshot(  # pylint: disable=too-many-locals, too-many-statements  # noqa: C901
-        self, url: str, element_name: str, user: User
-    ) -> bytes | None:
-        with sync_playwright() as playwright:
-            browser_args = current_app.config["WEBDRIVER_OPTION_ARGS"]
-            browser = playwright.chromium.launch(args=browser_args)
-            pixel_density = current_app.config["WEBDRIVER_WINDOW"].get(
-                "pixel_density", 1
-            )
-            context = browser.new_context(
-                bypass_csp=True,
-                viewport={
-                    "height": self._window[1],
-                    "width": self._window[0],
-                },
-                device_scale_factor=pixel_density,
+    @staticmethod
+    def create_pooled() -> PooledBrowser[Browser]:
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.launch(
+                args=current_app.config["WEBDRIVER_OPTION_ARGS"]
             )
+        except Exception:
+            playwright.stop()
+            raise
+
+        def close() -> None:
+            try:
+                browser.close()
+            finally:
+                playwright.stop()
+
+        return PooledBrowser(browser, close, browser.is_connected)
+
+    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:
+        return self.get_screenshots([url], element_name, user)[0]
+
+    def get_screenshots(
+        self, urls: list[str], element_name: str, user: User
+    ) -> list[bytes | None]:
+        if not current_app.config["WEBDRIVER_POOL_ENABLED"]:
+            with sync_playwright() as playwright:
+                browser_args = current_app.config["WEBDRIVER_OPTION_ARGS"]
+                browser = playwright.chromium.launch(args=browser_args)
+                return self._get_screenshots(browser, urls, element_name, user)
+
+        with browser_pool.lease("playwright", self.create_pooled) as pooled:
+            pooled.pages += len(urls)
+            return self._get_screenshots(pooled.browser, urls, element_name, user)
+
+    def _get_screenshots(
+        self, browser: Browser, urls: list[str], element_name: str, user: User
+    ) -> list[bytes | None]:
+        pixel_density = current_app.config["WEBDRIVER_WINDOW"].get("pixel_density", 1)
+        context = browser.new_context(
+            bypass_csp=True,
+            viewport={
+                "height": self._window[1],
+                "width": self._window[0],
+            },
+            device_scale_factor=pixel_density,
+        )
+        try:
             context.set_default_timeout(
                 current_app.config["SCREENSHOT_PLAYWRIGHT_DEFAULT_TIMEOUT"]
             )
             self.auth(user, context)
-            page = context.new_page()
+
+            # the pages of a batch are loaded concurrently, and then captured in turn
+            batch_size = max(
+                current_app.config["SCREENSHOT_PLAYWRIGHT_MAX_CONCURRENT_PAGES"], 1
+            )
+            images: list[bytes | None] = []
+            for i in range(0, len(urls), batch_size):
+                batch = urls[i : i + batch_size]
+                pages = [self.load_page(context, url) for url in batch]
+                for page, url in zip(pages, batch, strict=False):
+                    self.wait_for_load(page, url)
+
+                if not current_app.config["SCREENSHOT_WAIT_FOR_CHARTS_RENDERED"]:
+                    selenium_headstart = current_app.config[
+                        "SCREENSHOT_SELENIUM_HEADSTART"
+                    ]
+                    logger.debug("Sleeping for %i seconds", selenium_headstart)
+                    pages[0].wait_for_timeout(selenium_headstart * 1000)
+
+                for page, url in zip(pages, batch, strict=False):
+                    try:
+                        images.append(
+                            self.take_screenshot(page, url, element_name, user)
+                        )
+                    finally:
+                        page.close()
+            return images
+        finally:
+            context.close()
+
+    @staticmethod
+    def load_page(context: BrowserContext, url: str) -> Page:
+        """
+        Open a page and start loading the url, without waiting for it to load.
+        """
+        page = context.new_page()
+        try:
+            page.goto(url, wait_until="commit")
+        except PlaywrightTimeout:
+            logger.exception("Timed out requesting url %s", url)
+        return page
+
+    @staticmethod
+    def wait_for_load(page: Page, url: str) -> None:
+        wait_event = current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"]
+        if wait_event == "commit":
+            return
+        try:
+            page.wait_for_load_state(wait_event)
+        except PlaywrightTimeout:
+            logger.exception(
+                "Web event %s not detected. Page %s might not have been fully loaded",  # noqa: E501
+                wait_event,
+                url,
+            )
+
+    @staticmethod
+    def wait_for_charts_loaded(page: Page, url: str) -> None:
+        try:
+            # chart containers didn't render
+            logger.debug("Wait for chart containers to draw at url: %s", url)
+            slice_container_locator = page.locator(".chart-container")
+            slice_container_locator.first.wait_for()
+            for slice_container_elem in slice_container_locator.all():
+                slice_container_elem.wait_for()
+        except PlaywrightTimeout:
+            logger.exception(
+                "Timed out waiting for chart containers to draw at url %s",
+                url,
+            )
+            raise
+        try:
+            # charts took too long to load
+            logger.debug(
+                "Wait for loading element of charts to be gone at url: %s", url
+            )
+            for loading_element in page.locator(".loading").all():
+                loading_element.wait_for(state="detached")
+        except PlaywrightTimeout:
+            logger.exception("Timed out waiting for charts to load at url %s", url)
+            raise
+
+    def take_screenshot(  # pylint: disable=too-many-statements
+        self, page: Page, url: str, element_name: str, user: User
+    ) -> bytes | None:
+        img: bytes | None = None
+        element: Locator
+        try:
             try:
-                page.goto(
-                    url,
-                    wait_until=current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"],
+                # page didn't load
+                logger.debug(
+                    "Wait for the presence of %s at url: %s", element_name, url
                 )
+                element = page.locator(f".{element_name}")
+                element.wait_for()
             except PlaywrightTimeout:
-                logger.exception(
-                    "Web event %s not detected. Page %s might not have been fully loaded",  # noqa: E501
-                    current_app.config["SCREENSHOT_PLAYWRIGHT_WAIT_EVENT"],
-                    url,
-                )
+                logger.exception("Timed out requesting url %s", url)
+                raise
 
-            img: bytes | None = None
-            selenium_headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
-            logger.debug("Sleeping for %i seconds", selenium_headstart)
-            page.wait_for_timeout(selenium_headstart * 1000)
-            element: Locator
-            try:
-                try:
-                    # page didn't load
-                    logger.debug(
-                        "Wait for the presence of %s at url: %s", element_name, url
+            if current_app.config["SCREENSHOT_WAIT_FOR_CHARTS_RENDERED"]:
+                # charts took too long to render
+                logger.debug("Wait for charts to render at url: %s", url)
+                if not self.wait_for_charts_rendered(
+                    lambda: page.evaluate(f"() => {{{CHART_STATUSES_SCRIPT}}}"),
+                    lambda seconds: page.wait_for_timeout(seconds * 1000),
+                ):
+                    logger.error(
+                        "Timed out waiting for charts to render at url %s", url
+                    )
+                    raise PlaywrightTimeout(
+                        f"Timed out waiting for charts to render at url {url}"
                     )
-                    element = page.locator(f".{element_name}")
-                    element.wait_for()
-                except PlaywrightTimeout:
-                    logger.exception("Timed out requesting url %s", url)
-                    raise
+            else:
+                self.wait_for_charts_loaded(page, url)
 
-                try:
-                    # chart containers didn't render
-                    logger.debug("Wait for chart containers to draw at url: %s", url)
-                    slice_container_locator = page.locator(".chart-container")
-                    slice_container_locator.first.wait_for()
-                    for slice_container_elem in slice_container_locator.all():
-                        slice_container_elem.wait_for()
-                except PlaywrightTimeout:
-                    logger.exception(
-                        "Timed out waiting for chart containers to draw at url %s",
+            selenium_animation_wait = current_app.config[
+                "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
+            ]
+            logger.debug("Wait %i seconds for chart animation", selenium_animation_wait)
+            page.wait_for_timeout(selenium_animation_wait * 1000)
+            logger.debug(
+                "Taking a PNG screenshot of url %s as user %s",
+                url,
+                user.username,
+            )
+            if current_app.config["SCREENSHOT_REPLACE_UNEXPECTED_ERRORS"]:
+                unexpected_errors = WebDriverPlaywright.find_unexpected_errors(page)
+                if unexpected_errors:
+                    logger.warning(
+                        "%i errors found in the screenshot. URL: %s. Errors are: %s",  # noqa: E501
+                        len(unexpected_errors),
                         url,
+                        unexpected_errors,
                     )
-                    raise
-                try:
-                    # charts took too long to load
-                    logger.debug(
-                        "Wait for loading element of charts to be gone at url: %s", url
-                    )
-                    for loading_element in page.locator(".loading").all():
-                        loading_element.wait_for(state="detached")
-                except PlaywrightTimeout:
-                    logger.exception(
-                        "Timed out waiting for charts to load at url %s", url
-                    )
-                    raise
-
-                selenium_animation_wait = current_app.config[
-                    "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
-                ]
-                logger.debug(
-                    "Wait %i seconds for chart animation", selenium_animation_wait
-                )
-                page.wait_for_timeout(selenium_animation_wait * 1000)
-                logger.debug(
-                    "Taking a PNG screenshot of url %s as user %s",
-                    url,
-                    user.username,
-                )
-                if current_app.config["SCREENSHOT_REPLACE_UNEXPECTED_ERRORS"]:
-                    unexpected_errors = WebDriverPlaywright.find_unexpected_errors(page)
-                    if unexpected_errors:
-                        logger.warning(
-                            "%i errors found in the screenshot. URL: %s. Errors are: %s",  # noqa: E501
-                            len(unexpected_errors),
-                            url,
-                            unexpected_errors,
-                        )
-                img = element.screenshot()
-            except PlaywrightTimeout:
-                # raise again for the finally block, but handled above
-                pass
-            except PlaywrightError:
-                logger.exception(
-                    "Encountered an unexpected error when requesting url %s", url
-                )
-            return img
+            img = element.screenshot()
+        except PlaywrightTimeout:
+            # raise again for the finally block, but handled above
+            pass
+        except PlaywrightError:
+            logger.exception(
+                "Encountered an unexpected error when requesting url %s", url
+            )
+        return img
 
 
 class WebDriverSelenium(WebDriverProxy):
@@ -380,14 +542,87 @@ class WebDriverSelenium(WebDriverProxy):
 
         return error_messages
 
-    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:  # noqa: C901
-        driver = self.auth(user)
+    def create_pooled(self) -> PooledBrowser[WebDriver]:
+        driver = self.create()
+        return PooledBrowser(
+            driver,
+            lambda: self.destroy(
+                driver, current_app.config["SCREENSHOT_SELENIUM_RETRIES"]
+            ),
+            lambda: driver.title is not None,
+        )
+
+    def get_screenshot(self, url: str, element_name: str, user: User) -> bytes | None:
+        if not current_app.config["WEBDRIVER_POOL_ENABLED"]:
+            driver = self.auth(user)
+            try:
+                return self.take_screenshot(driver, url, element_name, user)
+            finally:
+                self.destroy(driver, current_app.config["SCREENSHOT_SELENIUM_RETRIES"])
+
+        with browser_pool.lease(self._driver_type, self.create_pooled) as pooled:
+            pooled.pages += 1
+            driver = machine_auth_provider_factory.instance.authenticate_webdriver(
+                pooled.browser, user
+            )
+            try:
+                return self.take_screenshot(driver, url, element_name, user)
+            finally:
+                # don't leave the session of the user to the next screenshot
+                driver.delete_all_cookies()
+
+    def wait_for_charts_loaded(self, driver: WebDriver, url: str) -> None:
+        try:
+            # chart containers didn't render
+            logger.debug("Wait for chart containers to draw at url: %s", url)
+            WebDriverWait(driver, self._screenshot_locate_wait).until(
+                EC.visibility_of_all_elements_located(
+                    (By.CLASS_NAME, "chart-container")
+                )
+            )
+        except TimeoutException:
+            logger.info("Timeout Exception caught")
+            # Fallback to allow a screenshot of an empty dashboard
+            try:
+                WebDriverWait(driver, 0).until(
+                    EC.visibility_of_all_elements_located(
+                        (By.CLASS_NAME, "grid-container")
+                    )
+                )
+            except:
+                logger.exception(
+                    "Selenium timed out waiting for dashboard to draw at url %s",
+                    url,
+                )
+                raise
+
+        try:
+            # charts took too long to load
+            logger.debug(
+                "Wait for loading element of charts to be gone at url: %s", url
+            )
+            WebDriverWait(driver, self._screenshot_load_wait).until_not(
+                EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
+            )
+        except TimeoutException:
+            logger.exception(
+                "Selenium timed out waiting for charts to load at url %s", url
+            )
+            raise
+
+    def take_screenshot(  # noqa: C901
+        self, driver: WebDriver, url: str, element_name: str, user: User
+    ) -> bytes | None:
         driver.set_window_size(*self._window)
         driver.get(url)
         img: bytes | None = None
-        selenium_headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
-        logger.debug("Sleeping for %i seconds", selenium_headstart)
-        sleep(selenium_headstart)
+        wait_for_charts_rendered = current_app.config[
+            "SCREENSHOT_WAIT_FOR_CHARTS_RENDERED"
+        ]
+        if not wait_for_charts_rendered:
+            selenium_headstart = current_app.config["SCREENSHOT_SELENIUM_HEADSTART"]
+            logger.debug("Sleeping for %i seconds", selenium_headstart)
+            sleep(selenium_headstart)
 
         try:
             try:
@@ -402,43 +637,22 @@ class WebDriverSelenium(WebDriverProxy):
                 logger.exception("Selenium timed out requesting url %s", url)
                 raise
 
-            try:
-                # chart containers didn't render
-                logger.debug("Wait for chart containers to draw at url: %s", url)
-                WebDriverWait(driver, self._screenshot_locate_wait).until(
-                    EC.visibility_of_all_elements_located(
-                        (By.CLASS_NAME, "chart-container")
-                    )
-                )
-            except TimeoutException:
-                logger.info("Timeout Exception caught")
-                # Fallback to allow a screenshot of an empty dashboard
-                try:
-                    WebDriverWait(driver, 0).until(
-                        EC.visibility_of_all_elements_located(
-                            (By.CLASS_NAME, "grid-container")
-                        )
-                    )
-                except:
-                    logger.exception(
-                        "Selenium timed out waiting for dashboard to draw at url %s",
+            if wait_for_charts_rendered:
+                # charts took too long to render
+                logger.debug("Wait for charts to render at url: %s", url)
+                if not self.wait_for_charts_rendered(
+                    lambda: driver.execute_script(CHART_STATUSES_SCRIPT),
+                    sleep,
+                ):
+                    logger.error(
+                        "Selenium timed out waiting for charts to render at url %s",
                         url,
                     )
-                    raise
-
-            try:
-                # charts took too long to load
-                logger.debug(
-                    "Wait for loading element of charts to be gone at url: %s", url
-                )
-                WebDriverWait(driver, self._screenshot_load_wait).until_not(
-                    EC.presence_of_all_elements_located((By.CLASS_NAME, "loading"))
-                )
-            except TimeoutException:
-                logger.exception(
-                    "Selenium timed out waiting for charts to load at url %s", url
-                )
-                raise
+                    raise TimeoutException(
+                        f"Timed out waiting for charts to render at url {url}"
+                    )
+            else:
+                self.wait_for_charts_loaded(driver, url)
 
             selenium_animation_wait = current_app.config[
                 "SCREENSHOT_SELENIUM_ANIMATION_WAIT"
@@ -479,6 +693,4 @@ class WebDriverSelenium(WebDriverProxy):
                 "Encountered an unexpected error when requesting url %s", url
             )
             raise
-        finally:
-            self.destroy(driver, current_app.config["SCREENSHOT_SELENIUM_RETRIES"])
         return img
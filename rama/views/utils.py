@@ -29,7 +29,7 @@ from flask_babel import _
 from sqlalchemy.exc import NoResultFound
 from werkzeug.wrappers.response import Response
 
-from rama import app, dataframe, db, result_set, viz
+from rama import app, dataframe, db, result_set, results_backend, viz
 from rama.common.db_query_status import QueryStatus
 from rama.daos.datasource import DatasourceDAO
 from rama.errors import ErrorLevel, RamaError, RamaErrorType
@@ -46,6 +46,7 @@ from rama.models.dashboard import Dashboard
 from rama.models.slice import Slice
 from rama.models.sql_lab import Query
 from rama.rama_typing import FormData
+from rama.sqllab import chunked_results
 from rama.utils import json
 from rama.utils.core import DatasourceType
 from rama.utils.decorators import stats_timing
@@ -498,42 +499,91 @@ def check_datasource_perms(
     viz_obj.raise_for_access()
 
 
-def _deserialize_results_payload(
-    payload: Union[bytes, str], query: Query, use_msgpack: Optional[bool] = False
+def _load_msgpack_results_payload(
+    ds_payload: dict[str, Any],
+    query: Query,
+    offset: int = 0,
+    limit: Optional[int] = None,
 ) -> dict[str, Any]:
-    logger.debug("Deserializing from msgpack: %r", use_msgpack)
-    if use_msgpack:
-        with stats_timing(
-            "sqllab.query.results_backend_msgpack_deserialize", stats_logger
-        ):
-            ds_payload = msgpack.loads(payload, raw=False)
+    """
+    Load the data of a results payload unpacked with msgpack.
 
-        with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
+    :param ds_payload: The unpacked payload, which is modified in place
+    :param query: The query of the results
+    :param offset: The index of the first row to return
+    :param limit: The maximum number of rows to return, or None for all the rows
+    """
+    with stats_timing("sqllab.query.results_backend_pa_deserialize", stats_logger):
+        if manifest := chunked_results.get_manifest(ds_payload):
+            # only the chunks holding the requested rows are fetched
+            pa_table = chunked_results.read_table(
+                results_backend,
+                query.results_key,
+                manifest,
+                offset,
+                limit,
+            )
+            del ds_payload[chunked_results.MANIFEST_KEY]
+        else:
             try:
                 reader = pa.BufferReader(ds_payload["data"])
                 pa_table = pa.ipc.open_stream(reader).read_all()
             except pa.ArrowSerializationError as ex:
                 raise SerializationError("Unable to deserialize table") from ex
+            if offset or limit is not None:
+                pa_table = pa_table.slice(offset, limit)
 
-        df = result_set.RamaResultSet.convert_table_to_df(pa_table)
-        ds_payload["data"] = dataframe.df_to_records(df) or []
+    df = result_set.RamaResultSet.convert_table_to_df(pa_table)
+    ds_payload["data"] = dataframe.df_to_records(df) or []
 
-        for column in ds_payload["selected_columns"]:
-            if "name" in column:
-                column["column_name"] = column.get("name")
+    for column in ds_payload["selected_columns"]:
+        if "name" in column:
+            column["column_name"] = column.get("name")
 
-        db_engine_spec = query.database.db_engine_spec
-        all_columns, data, expanded_columns = db_engine_spec.expand_data(
-            ds_payload["selected_columns"], ds_payload["data"]
-        )
-        ds_payload.update(
-            {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
-        )
+    db_engine_spec = query.database.db_engine_spec
+    all_columns, data, expanded_columns = db_engine_spec.expand_data(
+        ds_payload["selected_columns"], ds_payload["data"]
+    )
+    ds_payload.update(
+        {"data": data, "columns": all_columns, "expanded_columns": expanded_columns}
+    )
+
+    return ds_payload
 
-        return ds_payload
+
+def _deserialize_results_payload(
+    payload: Union[bytes, str],
+    query: Query,
+    use_msgpack: Optional[bool] = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Deserialize the results of a query stored in the results backend.
+
+    :param payload: The decompressed payload stored under the results key
+    :param query: The query of the results
+    :param use_msgpack: Whether the payload is serialized with msgpack
+    :param offset: The index of the first row to return
+    :param limit: The maximum number of rows to return, or None for all the rows
+    """
+    logger.debug("Deserializing from msgpack: %r", use_msgpack)
+    if use_msgpack:
+        with stats_timing(
+            "sqllab.query.results_backend_msgpack_deserialize", stats_logger
+        ):
+            ds_payload = msgpack.loads(payload, raw=False)
+
+        return _load_msgpack_results_payload(ds_payload, query, offset, limit)
 
     with stats_timing("sqllab.query.results_backend_json_deserialize", stats_logger):
-        return json.loads(payload)
+        ds_payload = json.loads(payload)
+
+    if offset or limit is not None:
+        end = None if limit is None else offset + limit
+        ds_payload["data"] = ds_payload["data"][offset:end]
+
+    return ds_payload
 
 
 def get_cta_schema_name(
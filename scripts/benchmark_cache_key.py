@@ -0,0 +1,151 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the computation of cache keys from form data.
+
+Compares the throughput, in keys per second, of the legacy cache keys
+(``md5_sha_from_dict``) with the canonical ones (``canonical_json`` hashed with
+each of the installed algorithms), on form data payloads of different sizes. The
+canonical keys are measured with ``orjson`` when it's installed (see the
+``fast-hashing`` extra) and with the standard library fallback.
+
+    python scripts/benchmark_cache_key.py --duration 2
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+import click
+
+from rama.utils import hashing
+from rama.utils.json import json_int_dttm_ser
+
+
+def generate_form_data(filters: int) -> dict[str, Any]:
+    """
+    Return the form data of a time series chart with a number of filters.
+    """
+    return {
+        "datasource": "12__table",
+        "viz_type": "echarts_timeseries_line",
+        "columns": [{"label": "country", "sqlExpression": "country"}],
+        "metrics": [
+            {
+                "aggregate": "SUM",
+                "column": {"column_name": f"num_{i}", "type": "BIGINT", "id": i},
+                "expressionType": "SIMPLE",
+                "label": f"SUM(num_{i})",
+                "hasCustomLabel": False,
+            }
+            for i in range(3)
+        ],
+        "filter": [
+            {"col": f"col_{i}", "op": "IN", "val": [f"value_{j}" for j in range(10)]}
+            for i in range(filters)
+        ]
+        + [{"col": "ds", "op": "TEMPORAL_RANGE", "val": "Last year"}],
+        "extras": {"having": "", "where": "", "time_grain_sqla": "P1D"},
+        "row_limit": 10000,
+        "order_desc": True,
+        "orderby": [[{"label": "SUM(num_0)"}, False]],
+        "post_processing": [
+            {
+                "operation": "pivot",
+                "options": {
+                    "index": ["__timestamp"],
+                    "columns": ["country"],
+                    "aggregates": {"SUM(num_0)": {"operator": "mean"}},
+                },
+            },
+            {"operation": "flatten"},
+        ],
+        "time_range": "Last year",
+        "rls": ["gender = 'boy'-gender"],
+        "changed_on": datetime(2024, 1, 1),
+        "annotation_layers": [],
+    }
+
+
+PAYLOADS = {
+    "small": generate_form_data(1),
+    "medium": generate_form_data(10),
+    "large": generate_form_data(100),
+}
+
+
+def legacy(form_data: dict[str, Any]) -> str:
+    return hashing.md5_sha_from_dict(form_data, default=json_int_dttm_ser)
+
+
+def canonical(algorithm: str) -> Callable[[dict[str, Any]], str]:
+    def key(form_data: dict[str, Any]) -> str:
+        return hashing.hash_from_bytes(
+            hashing.canonical_json(form_data, default=json_int_dttm_ser),
+            algorithm,
+        )
+
+    return key
+
+
+def measure(func: Callable[[], Any], duration: float) -> float:
+    """
+    Return the number of calls per second of a function.
+    """
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        func()
+        calls += 1
+    return calls / elapsed
+
+
+@click.command()
+@click.option("--duration", default=1.0, help="Seconds spent measuring each case.")
+def main(duration: float) -> None:
+    algorithms = ["md5", "blake2b"]
+    if hashing.xxhash is not None:
+        algorithms.append("xxhash")
+
+    implementations: dict[str, Callable[[dict[str, Any]], str]] = {"legacy": legacy}
+    for algorithm in algorithms:
+        implementations[f"canonical {algorithm}"] = canonical(algorithm)
+
+    json_libraries = ["stdlib"]
+    if hashing.orjson is not None:
+        json_libraries.insert(0, "orjson")
+    orjson = hashing.orjson
+
+    print(f"Computing cache keys for {duration}s per case (keys/s)\n")
+    print(f"{'implementation':<28}" + "".join(f"{name:>12}" for name in PAYLOADS))
+    for json_library in json_libraries:
+        hashing.orjson = orjson if json_library == "orjson" else None
+        for name, key in implementations.items():
+            if name == "legacy" and json_library != json_libraries[0]:
+                # the legacy keys don't use orjson
+                continue
+            label = name if name == "legacy" else f"{name} ({json_library})"
+            rates = [
+                measure(lambda: key(form_data), duration)  # noqa: B023
+                for form_data in PAYLOADS.values()
+            ]
+            print(f"{label:<28}" + "".join(f"{rate:>12,.0f}" for rate in rates))
+    hashing.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -0,0 +1,126 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Benchmark the construction of ``RamaResultSet`` from DB API rows.
+
+Compares the columnar ingestion of ``RamaResultSet`` with the previous
+implementation, which copied the rows into an object-dtype numpy structured array
+before converting each column to Arrow. Each run happens in a fresh process so that
+the peak RSS of one implementation doesn't affect the other.
+
+    python scripts/benchmark_result_set.py --rows 1000000
+"""
+
+import multiprocessing
+import resource
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+import click
+import numpy as np
+import pyarrow as pa
+
+
+def generate_rows(rows: int) -> list[tuple[Any, ...]]:
+    start = datetime(2024, 1, 1)
+    return [
+        (
+            i,
+            i * 1.5,
+            f"name_{i % 1000}",
+            start + timedelta(seconds=i),
+            None if i % 10 == 0 else i % 7,
+        )
+        for i in range(rows)
+    ]
+
+
+DESCRIPTION = [
+    ("id", "INTEGER", None, None, None, None, True),
+    ("value", "FLOAT", None, None, None, None, True),
+    ("name", "VARCHAR", None, None, None, None, True),
+    ("ts", "TIMESTAMP", None, None, None, None, True),
+    ("nullable", "INTEGER", None, None, None, None, True),
+]
+
+
+def build_legacy(data: list[tuple[Any, ...]]) -> pa.Table:
+    """
+    The previous implementation, without the fallbacks that don't apply here.
+    """
+    column_names = [col[0] for col in DESCRIPTION]
+    numpy_dtype = [(column_name, "object") for column_name in column_names]
+    array = np.array(data, dtype=numpy_dtype)
+    pa_data = [pa.array(array[column].tolist()) for column in column_names]
+    return pa.Table.from_arrays(pa_data, names=column_names)
+
+
+def build_current(data: list[tuple[Any, ...]]) -> pa.Table:
+    # pylint: disable=import-outside-toplevel
+    from rama.db_engine_specs.base import BaseEngineSpec
+    from rama.result_set import RamaResultSet
+
+    return RamaResultSet(data, DESCRIPTION, BaseEngineSpec).pa_table
+
+
+IMPLEMENTATIONS: dict[str, Callable[[list[tuple[Any, ...]]], pa.Table]] = {
+    "legacy": build_legacy,
+    "current": build_current,
+}
+
+
+def run(name: str, rows: int, queue: multiprocessing.Queue) -> None:
+    build = IMPLEMENTATIONS[name]
+    # warm up imports before measuring
+    build(generate_rows(10))
+
+    data = generate_rows(rows)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    table = build(data)
+    duration = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    assert table.num_rows == rows
+    # ``ru_maxrss`` is in kilobytes on Linux
+    queue.put((duration, (peak - baseline) / 1024))
+
+
+@click.command()
+@click.option("--rows", default=1_000_000, help="Number of rows to convert.")
+@click.option("--repeat", default=3, help="Number of runs per implementation.")
+def main(rows: int, repeat: int) -> None:
+    context = multiprocessing.get_context("spawn")
+    print(f"Building result sets of {rows} rows ({repeat} runs each)\n")
+    print(f"{'implementation':<16}{'wall time (s)':>16}{'peak RSS (MiB)':>16}")
+    for name in IMPLEMENTATIONS:
+        durations: list[float] = []
+        peaks: list[float] = []
+        for _ in range(repeat):
+            queue = context.Queue()
+            process = context.Process(target=run, args=(name, rows, queue))
+            process.start()
+            duration, peak = queue.get()
+            process.join()
+            durations.append(duration)
+            peaks.append(peak)
+        print(f"{name:<16}{min(durations):>16.2f}{max(peaks):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()  # pylint: disable=no-value-for-parameter
@@ -47,6 +47,7 @@ from tests.integration_tests.fixtures.energy_dashboard import (
     load_energy_table_with_slice,  # noqa: F401
     load_energy_table_data,  # noqa: F401
 )
+import pyarrow as pa
 import pytest
 from rama.models.slice import Slice
 
@@ -381,6 +382,59 @@ class TestPostChartDataApi(BaseTestChartDataApi):
         assert rv.status_code == 200
         assert rv.mimetype == mimetype
 
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_arrow_result_format(self):
+        """
+        Chart data API: Test chart data with Arrow result format
+        """
+        self.query_context_payload["result_format"] = "arrow"
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 200
+        assert rv.mimetype == "application/vnd.apache.arrow.stream"
+        with pa.ipc.open_stream(rv.data) as reader:
+            table = reader.read_all()
+        metadata = json.loads(table.schema.metadata[b"rama"])
+        assert metadata["rowcount"] == table.num_rows
+        assert metadata["colnames"] == table.column_names
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_multi_query_arrow_result_format(self):
+        """
+        Chart data API: Test chart data with multi-query Arrow result format
+        """
+        self.query_context_payload["result_format"] = "arrow"
+        self.query_context_payload["queries"].append(
+            self.query_context_payload["queries"][0]
+        )
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 200
+        assert rv.mimetype == "application/zip"
+        zipfile = ZipFile(BytesIO(rv.data), "r")
+        assert zipfile.namelist() == ["query_1.arrow", "query_2.arrow"]
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_arrow_result_format_and_columns_result_type__400(self):
+        """
+        Chart data API: Test chart data with Arrow result format and a result type
+        without data frame
+        """
+        self.query_context_payload["result_format"] = "arrow"
+        self.query_context_payload["result_type"] = "columns"
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 400
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_with_arrow_result_format_when_actor_not_permitted_for_csv__403(self):
+        """
+        Chart data API: Test chart data with Arrow result format
+        """
+        self.logout()
+        self.login(GAMMA_NO_CSV_USERNAME)
+        self.query_context_payload["result_format"] = "arrow"
+
+        rv = self.post_assert_metric(CHART_DATA_URI, self.query_context_payload, "data")
+        assert rv.status_code == 403
+
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_with_multi_query_csv_result_format(self):
         """
@@ -1228,6 +1282,22 @@ class TestGetChartDataApi(BaseTestChartDataApi):
 
         assert rv.status_code == 401
 
+    @with_feature_flags(GLOBAL_ASYNC_QUERIES=True)
+    @mock.patch("rama.charts.data.api.QueryContextCacheLoader")
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_chart_data_cache_unsupported_format(self, cache_loader):
+        """
+        Chart data cache API: Test chart data async cache request in an unknown format
+        """
+        app._got_first_request = False
+        async_query_manager_factory.init_app(app)
+        cache_loader.load.return_value = self.query_context_payload
+        rv = self.get_assert_metric(
+            f"{CHART_DATA_URI}/test-cache-key?format=parquet", "data_from_cache"
+        )
+
+        assert rv.status_code == 400
+
     @with_feature_flags(GLOBAL_ASYNC_QUERIES=True)
     def test_chart_data_cache_key_error(self):
         """
@@ -17,8 +17,11 @@
 # isort:skip_file
 import copy
 import time
+from datetime import datetime, timedelta
 from unittest.mock import patch
 import pytest
+from cachelib import SimpleCache
+from sqlalchemy import event
 
 import tests.integration_tests.test_app  # pylint: disable=unused-import  # noqa: F401
 from rama import db, security_manager
@@ -71,6 +74,59 @@ class TestDashboardDAO(RamaTestCase):
             DashboardDAO.set_dash_metadata(dashboard, original_data)
             db.session.commit()
 
+    @pytest.mark.usefixtures("load_world_bank_dashboard_with_slices")
+    @patch("rama.daos.dashboard.cache_manager")
+    @patch("rama.utils.core.g")
+    @patch("rama.security.manager.g")
+    def test_get_datasets_for_dashboard_cached(
+        self, mock_sm_g, mock_g, mock_cache_manager
+    ):
+        mock_g.user = mock_sm_g.user = security_manager.find_user("admin")
+        mock_cache_manager.cache = SimpleCache()
+        self.app.config["DASHBOARD_DATASETS_CACHE"] = True
+
+        datasets = DashboardDAO.get_datasets_for_dashboard("world_health")
+        with patch.object(Dashboard, "datasets_trimmed_for_slices") as trimmed:
+            assert DashboardDAO.get_datasets_for_dashboard("world_health") == datasets
+            trimmed.assert_not_called()
+
+            # the cache is bypassed once one of the datasets is changed
+            dashboard = Dashboard.get("world_health")
+            datasource = next(iter(dashboard.datasources))
+            changed_on = datasource.changed_on
+            datasource.changed_on = datetime.now() + timedelta(days=1)
+            db.session.commit()
+            DashboardDAO.get_datasets_for_dashboard("world_health")
+            trimmed.assert_called_once()
+
+        datasource.changed_on = changed_on
+        db.session.commit()
+        self.app.config["DASHBOARD_DATASETS_CACHE"] = False
+
+    @pytest.mark.usefixtures("load_world_bank_dashboard_with_slices")
+    def test_datasets_trimmed_for_slices_queries(self):
+        dashboard = Dashboard.get("world_health")
+        keys = {(slc.cls_model, slc.datasource_id) for slc in dashboard.slices}
+        statements = []
+
+        def count_statement(*args, **kwargs):
+            statements.append(args[2])
+
+        db.session.expire_all()
+        event.listen(db.engine, "before_cursor_execute", count_statement)
+        try:
+            datasources = Dashboard._load_datasources(keys)
+            for datasource in datasources.values():
+                assert datasource.columns
+                assert datasource.metrics
+                assert datasource.database
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_statement)
+
+        assert len(datasources) == len(keys)
+        # the datasets and their columns, metrics and owners
+        assert len(statements) == 4
+
     @pytest.mark.usefixtures("load_world_bank_dashboard_with_slices")
     @patch("rama.daos.dashboard.g")
     def test_copy_dashboard(self, mock_g):
@@ -27,6 +27,7 @@ from freezegun import freeze_time
 from rama import security_manager
 from rama.utils.log import (
     AbstractEventLogger,
+    BufferedDBEventLogger,
     DBEventLogger,
     get_event_logger_from_cfg_value,
 )
@@ -230,3 +231,33 @@ class TestEventLogger(unittest.TestCase):
             )
 
         assert logger.records[0]["user_id"] == None  # noqa: E711
+
+    def test_buffered_db_event_logger(self):
+        from rama import db
+        from rama.models.core import Log
+
+        event_logger = BufferedDBEventLogger(flush_interval=60)
+        with app.app_context():
+            event_logger.log(
+                None,
+                "test_buffered_db_event_logger",
+                None,
+                10,
+                None,
+                None,
+                records=[{"a": 1}, {"a": 2}],
+            )
+            # records are written in the background
+            event_logger.shutdown()
+
+            logs = (
+                db.session.query(Log)
+                .filter_by(action="test_buffered_db_event_logger")
+                .all()
+            )
+            assert sorted(log.json for log in logs) == ['{"a": 1}', '{"a": 2}']
+            assert all(log.dttm is not None for log in logs)
+
+            for log in logs:
+                db.session.delete(log)
+            db.session.commit()
@@ -375,6 +375,19 @@ class TestDatabaseModel(RamaTestCase):
             df = main_db.get_df("USE rama; SELECT ';';", None, None)
             assert df.iat[0, 0] == ";"
 
+    def test_get_df_batches(self):
+        main_db = get_example_database()
+        sql = "SELECT 1 AS a UNION ALL SELECT 2 UNION ALL SELECT 3"
+
+        with mock.patch.object(main_db.db_engine_spec, "fetch_batch_size", 2):
+            dfs = list(main_db.get_df_batches(sql))
+        assert [df["a"].tolist() for df in dfs] == [[1, 2], [3]]
+
+        dfs = list(main_db.get_df_batches("SELECT 1 AS a WHERE 1 = 0"))
+        assert len(dfs) == 1
+        assert dfs[0].empty
+        assert dfs[0].columns.tolist() == ["a"]
+
     @mock.patch("rama.models.core.create_engine")
     def test_get_sqla_engine(self, mocked_create_engine):
         model = Database(
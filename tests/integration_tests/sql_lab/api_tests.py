@@ -457,3 +457,41 @@ class TestSqlLabApi(RamaTestCase):
         assert list(expected_data) == list(data)
         db.session.delete(query_obj)
         db.session.commit()
+
+    @mock.patch("rama.models.sql_lab.Query.raise_for_access", lambda _: None)  # noqa: PT008
+    @mock.patch("rama.commands.sql_lab.export.results_backend", None)
+    @mock.patch("rama.models.core.Database.get_df_batches")
+    @mock.patch.dict(app.config, {"CSV_EXPORT_STREAMING": True})
+    def test_export_results_streaming(self, get_df_batches_mock: mock.Mock) -> None:
+        self.login(ADMIN_USERNAME)
+
+        database = get_example_database()
+        query_obj = Query(
+            client_id="test",
+            database=database,
+            tab_name="test_tab",
+            sql_editor_id="test_editor_id",
+            sql="select * from bar",
+            select_sql=None,
+            executed_sql="select * from bar limit 2",
+            limit=100,
+            select_as_cta=False,
+            rows=104,
+            error_message="none",
+            results_key="test_abc",
+        )
+
+        db.session.add(query_obj)
+        db.session.commit()
+
+        get_df_batches_mock.return_value = iter(
+            [pd.DataFrame({"foo": [1]}), pd.DataFrame({"foo": [2]})]
+        )
+
+        resp = self.client.get("/api/v1/sqllab/export/test/")
+        assert resp.is_streamed
+        assert resp.mimetype == "text/csv"
+        assert resp.data.decode("utf-8") == "foo\n1\n2\n"
+
+        db.session.delete(query_obj)
+        db.session.commit()
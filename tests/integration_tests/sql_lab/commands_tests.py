@@ -18,8 +18,10 @@ from unittest import mock
 from unittest.mock import Mock, patch
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 from flask_babel import gettext as __
+from flask_caching.backends.simplecache import SimpleCache
 
 from rama import app, db, sql_lab
 from rama.commands.sql_lab import estimate, export, results
@@ -33,6 +35,7 @@ from rama.exceptions import (
 )
 from rama.models.core import Database  # noqa: F401
 from rama.models.sql_lab import Query
+from rama.sqllab import chunked_results
 from rama.sqllab.limiting_factor import LimitingFactor
 from rama.sqllab.schemas import EstimateQueryCostSchema
 from rama.utils import core as utils
@@ -247,6 +250,86 @@ class TestSqlResultExportCommand(RamaTestCase):
         assert result["count"] == 5
         assert result["query"].client_id == "test"
 
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("rama.models.sql_lab.Query.raise_for_access", lambda _: None)
+    @patch("rama.commands.sql_lab.export.results_backend", None)
+    @patch("rama.models.core.Database.get_df_batches")
+    def test_stream_no_results_backend(self, get_df_batches_mock: Mock) -> None:
+        query_obj = db.session.query(Query).filter_by(client_id="test").one()
+        query_obj.executed_sql = "select * from bar limit 2"
+        query_obj.select_sql = None
+        db.session.commit()
+
+        command = export.SqlResultExportCommand("test")
+
+        get_df_batches_mock.return_value = iter(
+            [pd.DataFrame({"foo": ["=1"]}), pd.DataFrame({"foo": ["2"]})]
+        )
+        result = command.stream()
+
+        assert list(result["data"]) == ["foo\n'=1\n", "2\n"]
+        assert result["count"] is None
+        get_df_batches_mock.assert_called_once_with(
+            "select * from bar limit 2", None, None, 2
+        )
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("rama.models.sql_lab.Query.raise_for_access", lambda _: None)
+    @patch("rama.commands.sql_lab.export.results_backend_use_msgpack", False)
+    @patch.dict("rama.commands.sql_lab.export.config", {"CSV_EXPORT_BATCH_SIZE": 2})
+    def test_stream_with_results_backend(self) -> None:
+        command = export.SqlResultExportCommand("test")
+
+        data = [{"foo": i} for i in range(5)]
+        payload = {
+            "columns": [{"name": "foo"}],
+            "data": data,
+        }
+        serialized_payload = sql_lab._serialize_payload(payload, False)
+        compressed = utils.zlib_compress(serialized_payload)
+
+        with patch.object(export, "results_backend") as results_backend:
+            results_backend.get.return_value = compressed
+            result = command.stream()
+            chunks = list(result["data"])
+
+        assert chunks == ["foo\n0\n1\n", "2\n3\n", "4\n"]
+        assert result["count"] == 104
+        assert result["query"].client_id == "test"
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("rama.models.sql_lab.Query.raise_for_access", lambda _: None)
+    @patch("rama.commands.sql_lab.export.results_backend_use_msgpack", True)
+    def test_stream_with_chunked_results_backend(self) -> None:
+        command = export.SqlResultExportCommand("test")
+
+        table = pa.table({"foo": list(range(5))})
+        manifest, chunks = chunked_results.serialize_table(table, "abc_query", 2)
+        payload = {
+            "data": None,
+            "selected_columns": [{"name": "foo", "type": "INTEGER"}],
+            chunked_results.MANIFEST_KEY: manifest,
+        }
+        cache = SimpleCache()
+        cache.set_many(chunks)
+        cache.set(
+            "abc_query",
+            utils.zlib_compress(sql_lab._serialize_payload(payload, True)),
+        )
+        get_many = mock.Mock(side_effect=cache.get_many)
+
+        with (
+            patch.object(export, "results_backend", cache),
+            patch("rama.views.utils.results_backend", cache),
+            patch.object(cache, "get_many", get_many),
+        ):
+            result = command.stream()
+            csv_chunks = list(result["data"])
+
+        assert csv_chunks == ["foo\n0\n1\n", "2\n3\n", "4\n"]
+        # one chunk at a time
+        assert get_many.call_count == 3
+
 
 class TestSqlExecutionResultsCommand(RamaTestCase):
     @pytest.fixture
@@ -367,3 +450,44 @@ class TestSqlExecutionResultsCommand(RamaTestCase):
         assert result.get("status") == "success"
         assert result["query"].get("rows") == 104
         assert result.get("data") == data
+
+    @pytest.mark.usefixtures("create_database_and_query")
+    @patch("rama.commands.sql_lab.results.results_backend_use_msgpack", True)
+    def test_run_succeeds_chunked(self) -> None:
+        table = pa.table({"col_0": list(range(104))})
+        manifest, chunks = chunked_results.serialize_table(table, "abc_query", 10)
+        payload = {
+            "status": QueryStatus.SUCCESS,
+            "query": {"rows": 104},
+            "data": None,
+            "selected_columns": [{"name": "col_0", "type": "INTEGER"}],
+            chunked_results.MANIFEST_KEY: manifest,
+        }
+        cache = SimpleCache()
+        cache.set_many(chunks)
+        cache.set(
+            "abc_query",
+            utils.zlib_compress(sql_lab._serialize_payload(payload, True)),
+        )
+        get_many = mock.Mock(side_effect=cache.get_many)
+
+        with (
+            patch.object(results, "results_backend", cache),
+            patch("rama.views.utils.results_backend", cache),
+            patch.object(cache, "get_many", get_many),
+        ):
+            command = results.SqlExecutionResultsCommand(
+                "abc_query",
+                1000,
+                offset=25,
+                limit=10,
+            )
+            result = command.run()
+
+        assert result["query"]["rows"] == 104
+        assert result["data"] == [{"col_0": i} for i in range(25, 35)]
+        assert chunked_results.MANIFEST_KEY not in result
+        get_many.assert_called_once_with(
+            "abc_query__chunk_2",
+            "abc_query__chunk_3",
+        )
@@ -17,7 +17,7 @@
 # isort:skip_file
 """Unit tests for Rama cache warmup"""
 
-from unittest.mock import MagicMock  # noqa: F401
+from unittest.mock import MagicMock, patch  # noqa: F401
 from tests.integration_tests.fixtures.birth_names_dashboard import (
     load_birth_names_dashboard_with_slices,  # noqa: F401
     load_birth_names_data,  # noqa: F401
@@ -25,6 +25,8 @@ from tests.integration_tests.fixtures.birth_names_dashboard import (
 
 from sqlalchemy import String, Date, Float  # noqa: F401
 
+from datetime import datetime, timedelta
+
 import pytest
 import pandas as pd  # noqa: F401
 
@@ -35,10 +37,18 @@ from rama import db
 
 from rama.models.core import Log
 from rama.tags.models import get_tag, ObjectType, TaggedObject, TagType
+from rama.commands.chart.warm_up_cache import ChartWarmUpCacheCommand
+from rama.extensions import cache_manager
+from rama.models.cache import CacheKey
 from rama.tasks.cache import (
+    CacheWarmupEngine,
     DashboardTagsStrategy,
+    ExpiringCacheStrategy,
     TopNDashboardsStrategy,
 )
+from rama.tasks.types import FixedExecutor
+from rama.utils import json
+from rama.utils.core import override_user
 from rama.utils.urls import get_url_host  # noqa: F401
 
 from tests.integration_tests.base_tests import RamaTestCase
@@ -71,6 +81,28 @@ mock_positions = {
 }
 
 
+def get_chart_with_query_context() -> Slice:
+    chart = db.session.query(Slice).filter_by(slice_name="Genders").one()
+    chart.query_context = json.dumps(
+        {
+            "datasource": {"id": chart.table.id, "type": "table"},
+            "force": False,
+            "queries": [
+                {
+                    "time_range": "No filter",
+                    "columns": ["gender"],
+                    "metrics": ["sum__num"],
+                    "row_limit": 100,
+                }
+            ],
+            "result_format": "json",
+            "result_type": "full",
+        }
+    )
+    db.session.commit()
+    return chart
+
+
 class TestCacheWarmUp(RamaTestCase):
     @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
     def test_top_n_dashboards_strategy(self):
@@ -144,3 +176,95 @@ class TestCacheWarmUp(RamaTestCase):
         strategy = DashboardTagsStrategy(["tag1", "tag2"])
 
         assert len(strategy.get_tasks()) == len(tag1_payloads + tag2_payloads)
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_cache_warmup_engine(self):
+        chart = get_chart_with_query_context()
+        dash = self.get_dash_by_slug("births")
+        tasks = [
+            {"payload": {"chart_id": chart.id}, "username": ADMIN_USERNAME},
+            {
+                "payload": {"chart_id": chart.id, "dashboard_id": dash.id},
+                "username": ADMIN_USERNAME,
+            },
+        ]
+
+        # SQLite doesn't support concurrent writes from the worker threads
+        with patch.dict(self.app.config, {"CACHE_WARMUP_MAX_WORKERS": 1}):
+            summary = CacheWarmupEngine("dummy").run(tasks)
+
+        assert summary["strategy"] == "dummy"
+        assert summary["charts"] == 1
+        assert summary["deduplicated"] == 1
+        assert summary["errors"] == []
+        assert summary["hits"] == 0
+        assert summary["misses"] == 1
+        assert summary["bytes"] > 0
+
+        chart.query_context = None
+        db.session.commit()
+
+    @pytest.mark.usefixtures("load_birth_names_dashboard_with_slices")
+    def test_expiring_cache_strategy(self):
+        db.session.query(Log).delete()
+        chart = get_chart_with_query_context()
+        dash = self.get_dash_by_slug("births")
+        # the dashboard was opened a bit later in the day yesterday
+        db.session.add(
+            Log(
+                action="log",
+                dashboard_id=dash.id,
+                dttm=datetime.utcnow() - timedelta(days=1, minutes=-10),
+            )
+        )
+        with override_user(self.get_user(ADMIN_USERNAME)):
+            (cache_key,) = ChartWarmUpCacheCommand(chart, None, None).get_cache_keys()
+        # the chart was cached 50 minutes ago, for an hour
+        cache_key_record = CacheKey(
+            cache_key=cache_key,
+            cache_timeout=3600,
+            datasource_uid=chart.table.uid,
+            created_on=datetime.now() - timedelta(minutes=50),
+        )
+        db.session.add(cache_key_record)
+        db.session.commit()
+
+        try:
+            with patch.dict(
+                self.app.config,
+                {"CACHE_WARMUP_EXECUTORS": [FixedExecutor(ADMIN_USERNAME)]},
+            ):
+                strategy = ExpiringCacheStrategy(horizon=3600, lead_time=900)
+                expected = [
+                    {
+                        "payload": {"chart_id": chart.id, "dashboard_id": dash.id},
+                        "username": ADMIN_USERNAME,
+                    }
+                ]
+                with patch.object(cache_manager.data_cache, "has", return_value=True):
+                    assert strategy.get_tasks() == expected
+
+                    # the chart was just cached
+                    cache_key_record.created_on = datetime.now()
+                    db.session.commit()
+                    assert strategy.get_tasks() == []
+
+                    # the dashboard is not opened around this time of day
+                    assert (
+                        ExpiringCacheStrategy(horizon=60, lead_time=900).get_tasks()
+                        == []
+                    )
+
+                # the chart was evicted from the cache
+                with patch.object(
+                    cache_manager.data_cache,
+                    "has",
+                    side_effect=lambda key: key != cache_key,
+                ):
+                    assert strategy.get_tasks() == expected
+        finally:
+            db.session.rollback()
+            db.session.delete(cache_key_record)
+            db.session.query(Log).delete()
+            chart.query_context = None
+            db.session.commit()
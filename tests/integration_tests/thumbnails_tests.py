@@ -187,6 +187,58 @@ class TestWebDriverSelenium(RamaTestCase):
         webdriver.get_screenshot(url, "chart-container", user=user)
         assert mock_sleep.call_args_list[1] == call(4)
 
+    @patch("rama.utils.webdriver.WebDriverWait")
+    @patch("rama.utils.webdriver.firefox")
+    @patch("rama.utils.webdriver.sleep")
+    def test_screenshot_selenium_wait_for_charts_rendered(
+        self, mock_sleep, mock_webdriver, mock_webdriver_wait
+    ):
+        driver = mock_webdriver.webdriver.WebDriver.return_value
+        driver.execute_script.side_effect = [
+            {"elapsed": 150, "expected": 1, "charts": [["1", "loading"]]},
+            {"elapsed": 300, "expected": 1, "charts": [["1", "rendered"]]},
+        ]
+        with patch.dict(
+            app.config,
+            {
+                "SCREENSHOT_WAIT_FOR_CHARTS_RENDERED": True,
+                "SCREENSHOT_SELENIUM_ANIMATION_WAIT": 4,
+            },
+        ):
+            webdriver = WebDriverSelenium("firefox")
+            user = security_manager.get_user_by_username(ADMIN_USERNAME)
+            url = get_url_path("Rama.slice", slice_id=1, standalone="true")
+            webdriver.get_screenshot(url, "chart-container", user=user)
+
+        # no headstart, a poll of the chart statuses, and the animation wait
+        assert mock_sleep.call_args_list == [call(0.1), call(4)]
+        assert webdriver.chart_render_times == {"1": 0.3}
+
+    @patch("rama.utils.webdriver.WebDriverWait")
+    @patch("rama.utils.webdriver.firefox")
+    @patch("rama.utils.webdriver.sleep")
+    def test_screenshot_selenium_pool(
+        self, mock_sleep, mock_webdriver, mock_webdriver_wait
+    ):
+        from rama.utils.browser_pool import browser_pool
+
+        app.config["WEBDRIVER_POOL_ENABLED"] = True
+        webdriver = WebDriverSelenium("firefox")
+        user = security_manager.get_user_by_username(ADMIN_USERNAME)
+        url = get_url_path("Rama.slice", slice_id=1, standalone="true")
+        webdriver.get_screenshot(url, "chart-container", user=user)
+        webdriver.get_screenshot(url, "chart-container", user=user)
+
+        # the driver is only created once, and the session is cleared after each use
+        driver = mock_webdriver.webdriver.WebDriver.return_value
+        mock_webdriver.webdriver.WebDriver.assert_called_once()
+        assert driver.delete_all_cookies.call_count == 2
+        driver.quit.assert_not_called()
+
+        browser_pool.close_all()
+        driver.quit.assert_called_once()
+        app.config["WEBDRIVER_POOL_ENABLED"] = False
+
 
 class TestThumbnails(RamaTestCase):
     mock_image = b"bytes mock image"
@@ -0,0 +1,152 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from pytest_mock import MockerFixture
+
+from rama.common.chart_data import ChartDataResultFormat, ChartDataResultType
+from rama.utils.arrow import df_to_arrow_table
+
+
+def test_data_from_cache_unsupported_format(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+) -> None:
+    """
+    Test that fetching the results of an async query in an unknown format fails.
+    """
+    cache_loader = mocker.patch("rama.charts.data.api.QueryContextCacheLoader")
+
+    response = client.get("/api/v1/chart/data/test-cache-key?format=parquet")
+
+    assert response.status_code == 400
+    assert response.json == {"message": "Unsupported result format: parquet"}
+    cache_loader.load.assert_not_called()
+
+
+def mock_chart_data_command(
+    mocker: MockerFixture,
+    result_type: ChartDataResultType,
+    queries: list[dict[str, Any]],
+) -> None:
+    mocker.patch("rama.charts.data.api.QueryContextCacheLoader")
+    mocker.patch(
+        "rama.charts.data.api.ChartDataRestApi._create_query_context_from_form"
+    )
+    mocker.patch(
+        "rama.charts.data.api.ChartDataCommand"
+    ).return_value.run.return_value = {
+        "query_context": MagicMock(
+            result_type=result_type,
+            result_format=ChartDataResultFormat.ARROW,
+        ),
+        "queries": queries,
+    }
+
+
+@pytest.mark.parametrize(
+    "result_type, query",
+    [
+        (ChartDataResultType.COLUMNS, {"data": [{"column_name": "a"}]}),
+        (ChartDataResultType.QUERY, {"query": "SELECT 1", "language": "sql"}),
+        (ChartDataResultType.SAMPLES, {"data": [{"a": 1}]}),
+    ],
+)
+def test_data_from_cache_arrow_result_type_without_frame(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+    result_type: ChartDataResultType,
+    query: dict[str, Any],
+) -> None:
+    """
+    Test that result types without a data frame can't be sent as Arrow.
+    """
+    mock_chart_data_command(mocker, result_type, [query])
+
+    response = client.get("/api/v1/chart/data/test-cache-key?format=arrow")
+
+    assert response.status_code == 400
+    assert response.json == {
+        "message": f"Result type {result_type} can't be exported as Arrow"
+    }
+
+
+def test_data_from_cache_arrow_failed_query(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+) -> None:
+    """
+    Test that a failed query returns its error instead of an Arrow stream.
+    """
+    mock_chart_data_command(
+        mocker,
+        ChartDataResultType.FULL,
+        [{"status": "failed", "error": "Column doesn't exist"}],
+    )
+
+    response = client.get("/api/v1/chart/data/test-cache-key?format=arrow")
+
+    assert response.status_code == 400
+    assert response.json == {"message": "Column doesn't exist"}
+
+
+def test_data_from_cache_arrow(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+) -> None:
+    mock_chart_data_command(
+        mocker,
+        ChartDataResultType.FULL,
+        [{"data": df_to_arrow_table(pd.DataFrame({"a": [1, 2]})), "rowcount": 2}],
+    )
+
+    response = client.get("/api/v1/chart/data/test-cache-key?format=arrow")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/vnd.apache.arrow.stream"
+
+
+def test_data_from_cache_arrow_not_permitted(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+) -> None:
+    """
+    Test that exporting Arrow requires the same permission as exporting CSV.
+    """
+    mock_chart_data_command(
+        mocker,
+        ChartDataResultType.FULL,
+        [{"data": df_to_arrow_table(pd.DataFrame({"a": [1, 2]}))}],
+    )
+    can_access = mocker.patch(
+        "rama.charts.data.api.security_manager.can_access",
+        return_value=False,
+    )
+
+    response = client.get("/api/v1/chart/data/test-cache-key?format=arrow")
+
+    assert response.status_code == 403
+    can_access.assert_called_with("can_csv", "Rama")
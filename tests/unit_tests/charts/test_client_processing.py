@@ -16,12 +16,20 @@
 # under the License.
 
 
+from io import BytesIO
+
 import pandas as pd
+import pyarrow as pa
 import pytest
 from flask_babel import lazy_gettext as _
 from sqlalchemy.orm.session import Session
 
-from rama.charts.client_processing import apply_client_processing, pivot_df, table
+from rama.charts.client_processing import (
+    apply_client_processing,
+    get_client_processor,
+    pivot_df,
+    table,
+)
 from rama.common.chart_data import ChartDataResultFormat
 from rama.utils.core import GenericDataType
 
@@ -2499,3 +2507,88 @@ def test_apply_client_processing_verbose_map(session: Session):
             }
         ]
     }
+
+
+def test_apply_client_processing_arrow_format():
+    """
+    It should process the data of an Arrow result, and return an Arrow table.
+    """
+    result = {
+        "queries": [
+            {
+                "result_format": ChartDataResultFormat.ARROW,
+                "data": pa.table({"count": [4725]}),
+            }
+        ]
+    }
+    form_data = {
+        "viz_type": "pivot_table_v2",
+        "groupbyColumns": [],
+        "groupbyRows": [],
+        "metrics": ["count"],
+        "metricsLayout": "COLUMNS",
+        "rowOrder": "key_a_to_z",
+        "colOrder": "key_a_to_z",
+        "result_format": "arrow",
+        "result_type": "results",
+    }
+
+    query = apply_client_processing(result, form_data)["queries"][0]
+    assert query["rowcount"] == 1
+    assert query["data"].to_pydict() == {
+        "index": ["Total (Sum)"],
+        "count": [4725],
+    }
+
+
+def test_get_client_processor() -> None:
+    """
+    It should post-process a data frame the same way as the serialized data.
+    """
+    form_data = {
+        "viz_type": "pivot_table_v2",
+        "groupbyColumns": [],
+        "groupbyRows": [],
+        "metrics": ["count"],
+        "metricsLayout": "COLUMNS",
+        "rowOrder": "key_a_to_z",
+        "colOrder": "key_a_to_z",
+    }
+    df = pd.DataFrame({"count": [4725]})
+
+    assert get_client_processor({"viz_type": "echarts_timeseries"}) is None
+
+    processor = get_client_processor(form_data, result_format=ChartDataResultFormat.CSV)
+    assert processor(df) == {
+        "data": ",count\nTotal (Sum),4725\n",
+        "colnames": [("count",)],
+        "indexnames": [("Total (Sum)",)],
+        "coltypes": [GenericDataType.NUMERIC],
+        "rowcount": 1,
+    }
+    # the data frame should be left untouched
+    assert list(df.columns) == ["count"]
+
+    processor = get_client_processor(
+        form_data, result_format=ChartDataResultFormat.XLSX
+    )
+    processed = processor(df)
+    assert processed["rowcount"] == 1
+    assert pd.read_excel(BytesIO(processed["data"]), index_col=0).to_dict() == {
+        "count": {"Total (Sum)": 4725}
+    }
+
+
+def test_get_client_processor_csv_escaped() -> None:
+    """
+    It should escape formulas in the post-processed CSV, like other CSV exports.
+    """
+    form_data = {
+        "viz_type": "table",
+        "query_mode": "raw",
+        "all_columns": ["link"],
+    }
+    df = pd.DataFrame({"link": ['=HYPERLINK("http://example.com")']})
+
+    processor = get_client_processor(form_data, result_format=ChartDataResultFormat.CSV)
+    assert processor(df)["data"] == ',link\n0,"\'=HYPERLINK(""http://example.com"")"\n'
@@ -0,0 +1,140 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+from pytest_mock import MockerFixture
+
+from rama import security_manager
+from rama.commands.database.exceptions import (
+    DatabaseNotFoundError,
+    DatabaseSearchTablesForbiddenError,
+    DatabaseSearchTablesInvalidError,
+    DatabaseTablesUnexpectedError,
+)
+from rama.commands.database.search_tables import SearchTablesDatabaseCommand
+
+
+def test_search_tables(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that the matching tables are returned with their catalog and schema.
+    """
+    DatabaseDAO = mocker.patch(  # noqa: N806
+        "rama.commands.database.search_tables.DatabaseDAO"
+    )
+    search_tables = mocker.patch(
+        "rama.commands.database.search_tables.search_tables",
+        return_value=[
+            ("catalog1", "public", "orders", "table"),
+            ("catalog1", "sales", "orders_view", "view"),
+        ],
+    )
+
+    payload = SearchTablesDatabaseCommand(1, "orders").run()
+    assert payload == {
+        "count": 2,
+        "result": [
+            {
+                "catalog": "catalog1",
+                "schema": "public",
+                "value": "orders",
+                "type": "table",
+            },
+            {
+                "catalog": "catalog1",
+                "schema": "sales",
+                "value": "orders_view",
+                "type": "view",
+            },
+        ],
+    }
+    search_tables.assert_called_once_with(
+        DatabaseDAO.find_by_id.return_value,
+        "orders",
+        limit=100,
+        force=False,
+    )
+
+
+def test_search_tables_not_found(mocker: MockerFixture) -> None:
+    """
+    Test that searching the tables of a missing database fails.
+    """
+    DatabaseDAO = mocker.patch(  # noqa: N806
+        "rama.commands.database.search_tables.DatabaseDAO"
+    )
+    DatabaseDAO.find_by_id.return_value = None
+
+    with pytest.raises(DatabaseNotFoundError):
+        SearchTablesDatabaseCommand(1, "orders").run()
+
+
+def test_search_tables_empty_query(mocker: MockerFixture) -> None:
+    """
+    Test that the search query can't be empty.
+    """
+    DatabaseDAO = mocker.patch(  # noqa: N806
+        "rama.commands.database.search_tables.DatabaseDAO"
+    )
+
+    with pytest.raises(DatabaseSearchTablesInvalidError):
+        SearchTablesDatabaseCommand(1, "  ").run()
+    DatabaseDAO.find_by_id.assert_not_called()
+
+
+def test_search_tables_force_forbidden(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that only users with access to the database can refresh its index.
+    """
+    DatabaseDAO = mocker.patch(  # noqa: N806
+        "rama.commands.database.search_tables.DatabaseDAO"
+    )
+    can_access_database = mocker.patch.object(
+        security_manager,
+        "can_access_database",
+        return_value=False,
+    )
+    search_tables = mocker.patch(
+        "rama.commands.database.search_tables.search_tables",
+        return_value=[],
+    )
+
+    with pytest.raises(DatabaseSearchTablesForbiddenError):
+        SearchTablesDatabaseCommand(1, "orders", force=True).run()
+    can_access_database.assert_called_once_with(DatabaseDAO.find_by_id.return_value)
+    search_tables.assert_not_called()
+
+    # searching without refreshing the index only requires access to the tables
+    SearchTablesDatabaseCommand(1, "orders").run()
+    search_tables.assert_called_once()
+
+
+def test_search_tables_error(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that unexpected errors are wrapped.
+    """
+    mocker.patch("rama.commands.database.search_tables.DatabaseDAO")
+    mocker.patch.object(security_manager, "can_access_database", return_value=True)
+    mocker.patch(
+        "rama.commands.database.search_tables.search_tables",
+        side_effect=Exception("Unable to connect"),
+    )
+
+    with pytest.raises(DatabaseTablesUnexpectedError):
+        SearchTablesDatabaseCommand(1, "orders", limit=10, force=True).run()
@@ -17,6 +17,7 @@
 
 import json
 from datetime import datetime
+from typing import Any
 from unittest.mock import patch
 from uuid import UUID
 
@@ -31,6 +32,7 @@ from rama.reports.models import (
     ReportSchedule,
     ReportScheduleType,
     ReportSourceFormat,
+    ReportState,
 )
 from rama.utils.core import HeaderDataType
 from rama.utils.screenshots import ChartScreenshot
@@ -480,3 +482,40 @@ def test_screenshot_width_calculation(
                     f"Test {test_id}: Expected width {expected_width}, "
                     f"but got {kwargs['window_size'][0]}"
                 )
+
+
+def test_chart_render_times_in_log(app: RamaApp, mocker: MockerFixture) -> None:
+    """
+    Test that the render times of the charts of the screenshots are logged.
+    """
+    mocker.patch.dict(app.config, {"ALERT_REPORTS_EXECUTORS": {}})
+    report_schedule = create_report_schedule(mocker)
+    report_schedule.last_state = ReportState.SUCCESS
+    report_state = BaseReportState(
+        report_schedule=report_schedule,
+        scheduled_dttm=datetime.now(),
+        execution_id=UUID("084e7ee6-5557-4ecd-9632-b7f39c9ec524"),
+    )
+    mocker.patch("rama.commands.report.execute.security_manager")
+    mocker.patch(
+        "rama.commands.report.execute.get_executor",
+        return_value=("executor", "username"),
+    )
+    mocker.patch.object(report_state, "_get_url", return_value="http://example.com")
+
+    def take_screenshot(self: ChartScreenshot, user: Any) -> bytes:
+        self.chart_render_times = {"1": 1.5, "2": None}
+        return b"screenshot bytes"
+
+    mocker.patch(
+        "rama.utils.screenshots.ChartScreenshot.get_screenshot",
+        autospec=True,
+        side_effect=take_screenshot,
+    )
+    db = mocker.patch("rama.commands.report.execute.db")
+
+    assert report_state._get_screenshots() == [b"screenshot bytes"]
+    report_state.create_log()
+
+    log = db.session.add.call_args[0][0]
+    assert log.extra == {"chart_render_times": {"1": 1.5, "2": None}}
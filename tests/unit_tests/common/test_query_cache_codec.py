@@ -0,0 +1,146 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from pytest_mock import MockerFixture
+
+from rama.common.utils.query_cache_codec import (
+    ARROW_DF_KEY,
+    decode_value,
+    encode_value,
+    get_chunk_keys,
+)
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["a", "b", None] * 100,
+            "value": [1.5, 2.5, None] * 100,
+            "count": [1, None, 3] * 100,
+            "ds": [datetime(2024, 1, 1), datetime(2024, 1, 2), None] * 100,
+        }
+    )
+
+
+def get_cache(chunks: dict[str, Any]) -> MagicMock:
+    cache = MagicMock()
+    cache.get_many.side_effect = lambda *keys: [chunks.get(key) for key in keys]
+    return cache
+
+
+@pytest.mark.parametrize("compression", [None, "lz4", "zstd"])
+def test_encode_decode(df: pd.DataFrame, compression: str | None) -> None:
+    value = {"df": df, "query": "SELECT 1"}
+
+    encoded, chunks = encode_value("key", value, compression=compression)
+
+    assert chunks == {}
+    assert "df" not in encoded
+    assert encoded[ARROW_DF_KEY]["num_chunks"] == 0
+    assert encoded["query"] == "SELECT 1"
+
+    decoded = decode_value(get_cache({}), "key", encoded)
+    assert decoded is not None
+    assert ARROW_DF_KEY not in decoded
+    pd.testing.assert_frame_equal(decoded["df"], df)
+
+
+def test_encode_decode_chunks(df: pd.DataFrame) -> None:
+    encoded, chunks = encode_value("key", {"df": df}, max_value_size=1000)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 1000 for chunk in chunks.values())
+    assert encoded[ARROW_DF_KEY]["data"] is None
+    assert get_chunk_keys(encoded, "key") == list(chunks)
+
+    decoded = decode_value(get_cache(chunks), "key", encoded)
+    assert decoded is not None
+    pd.testing.assert_frame_equal(decoded["df"], df)
+
+
+def test_decode_missing_chunk(df: pd.DataFrame) -> None:
+    encoded, chunks = encode_value("key", {"df": df}, max_value_size=1000)
+    del chunks[next(iter(chunks))]
+
+    assert decode_value(get_cache(chunks), "key", encoded) is None
+
+
+def test_legacy_value(df: pd.DataFrame) -> None:
+    """
+    Test that values cached in the previous format are read as is.
+    """
+    value = {"df": df, "query": "SELECT 1"}
+
+    assert decode_value(get_cache({}), "key", value) is value
+    assert get_chunk_keys(value, "key") == []
+
+
+def test_encode_unsupported_df() -> None:
+    """
+    Test that dataframes that can't be represented in Arrow are not encoded.
+    """
+    value = {"df": pd.DataFrame({"a": [object(), 1]})}
+
+    assert encode_value("key", value) == (value, {})
+
+
+def test_query_cache_manager_set(df: pd.DataFrame, mocker: MockerFixture) -> None:
+    from rama.common.utils.query_cache_manager import QueryCacheManager
+    from rama.constants import CacheRegion
+
+    mocker.patch.dict(
+        "rama.common.utils.query_cache_manager.config",
+        {
+            "DATA_CACHE_USE_ARROW": True,
+            "DATA_CACHE_ARROW_COMPRESSION": "lz4",
+            "DATA_CACHE_MAX_VALUE_SIZE": 1000,
+        },
+    )
+    cache = MagicMock()
+    mocker.patch.dict(
+        "rama.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+    set_and_log_cache = mocker.patch(
+        "rama.common.utils.query_cache_manager.set_and_log_cache"
+    )
+
+    QueryCacheManager.set(
+        "key", {"df": df, "query": "SELECT 1"}, timeout=60, region=CacheRegion.DATA
+    )
+
+    chunks = cache.set_many.call_args[0][0]
+    assert cache.set_many.call_args[1] == {"timeout": 60}
+    value = set_and_log_cache.call_args[0][2]
+    assert value[ARROW_DF_KEY]["num_chunks"] == len(chunks)
+
+    # reading the value back
+    cache.get.return_value = {**value, "dttm": "2024-01-01T00:00:00"}
+    cache.get_many.side_effect = lambda *keys: [chunks[key] for key in keys]
+    query_cache = QueryCacheManager.get("key", region=CacheRegion.DATA)
+    assert query_cache.is_loaded
+    pd.testing.assert_frame_equal(query_cache.df, df)
+
+    QueryCacheManager.delete("key", region=CacheRegion.DATA)
+    cache.delete_many.assert_called_once_with("key", *chunks)
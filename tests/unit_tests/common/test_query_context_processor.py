@@ -15,6 +15,7 @@
 # specific language governing permissions and limitations
 # under the License.
 
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -22,7 +23,11 @@ import pandas as pd
 import pytest
 
 from rama.common.chart_data import ChartDataResultFormat
-from rama.common.query_context_processor import QueryContextProcessor
+from rama.common.query_context_processor import (
+    get_single_flight_lock_expiration,
+    QueryContextProcessor,
+)
+from rama.exceptions import CreateKeyValueDistributedLockFailedException
 from rama.utils.core import GenericDataType
 
 
@@ -100,6 +105,16 @@ def test_get_data_json(processor, mock_query_context):
     assert result == expected
 
 
+def test_get_data_arrow(processor, mock_query_context):
+    df = pd.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
+    coltypes = [GenericDataType.NUMERIC, GenericDataType.STRING]
+    mock_query_context.result_format = ChartDataResultFormat.ARROW
+
+    result = processor.get_data(df, coltypes)
+    assert result.column_names == ["col1", "col2"]
+    assert result.to_pydict() == {"col1": [1, 2, 3], "col2": ["a", "b", "c"]}
+
+
 def test_get_data_invalid_dataframe(processor, mock_query_context):
     df = pd.DataFrame({"col1": [1, 2, 3], "col2": ["a", "b", "c"]})
     coltypes = [GenericDataType.NUMERIC, GenericDataType.STRING]
@@ -236,3 +251,310 @@ def test_get_data_xlsx_apply_column_types_error(
     mock_query_context.result_format = ChartDataResultFormat.XLSX
     with pytest.raises(ValueError, match="Conversion error"):
         processor.get_data(df, coltypes)
+
+
+def test_run_time_offset_queries_sequential(processor, mocker):
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {"TIME_OFFSET_QUERIES_MAX_WORKERS": 1},
+    )
+    executor = mocker.patch("rama.common.query_context_processor.ThreadPoolExecutor")
+    processor._qc_datasource = MagicMock()
+    processor._qc_datasource.query.side_effect = lambda dct: dct["row_limit"]
+
+    results = processor.run_time_offset_queries([{"row_limit": 1}, {"row_limit": 2}])
+
+    assert results == [1, 2]
+    executor.assert_not_called()
+
+
+def test_run_time_offset_queries_concurrent(processor, mocker):
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {
+            "TIME_OFFSET_QUERIES_MAX_WORKERS": 4,
+            "TIME_OFFSET_QUERIES_PER_DATABASE_LIMIT": 2,
+        },
+    )
+    limit_concurrency = mocker.patch(
+        "rama.common.query_context_processor.limit_concurrency",
+    )
+    processor._qc_datasource = MagicMock(type="table", id=1, database_id=42)
+    get_datasource = mocker.patch(
+        "rama.common.query_context_processor.DatasourceDAO.get_datasource"
+    )
+    get_datasource.return_value.query.side_effect = lambda dct: dct["row_limit"]
+
+    results = processor.run_time_offset_queries(
+        [{"row_limit": 1}, {"row_limit": 2}, {"row_limit": 3}]
+    )
+
+    # results are returned in the order of the queries
+    assert results == [1, 2, 3]
+    assert limit_concurrency.call_count == 3
+    limit_concurrency.assert_called_with(("time_offset", 42), 2)
+    # the datasource is loaded again in each worker, instead of sharing the ORM
+    # object of the request
+    assert get_datasource.call_count == 3
+    get_datasource.assert_called_with("table", 1)
+    processor._qc_datasource.query.assert_not_called()
+
+
+def test_load_query_result_single_flight_disabled(processor, mocker):
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {"CHART_DATA_SINGLE_FLIGHT_ENABLED": False},
+    )
+    lock = mocker.patch("rama.common.query_context_processor.KeyValueDistributedLock")
+    load_query_result = mocker.patch.object(processor, "load_query_result")
+    cache = MagicMock()
+
+    assert (
+        processor.load_query_result_single_flight(MagicMock(), "key", cache, False)
+        is cache
+    )
+    load_query_result.assert_called_once()
+    lock.assert_not_called()
+
+
+def test_load_query_result_single_flight_leader(processor, mocker):
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {
+            "CHART_DATA_SINGLE_FLIGHT_ENABLED": True,
+            "CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT": 300,
+        },
+    )
+    lock = mocker.patch("rama.common.query_context_processor.KeyValueDistributedLock")
+    load_query_result = mocker.patch.object(processor, "load_query_result")
+    query_obj = MagicMock()
+    cache = MagicMock()
+
+    assert (
+        processor.load_query_result_single_flight(query_obj, "key", cache, False)
+        is cache
+    )
+    lock.assert_called_once_with(
+        "chart_data_cache",
+        lock_expiration=timedelta(seconds=300),
+        cache_key="key",
+    )
+    load_query_result.assert_called_once_with(query_obj, "key", cache, False)
+
+
+def test_load_query_result_single_flight_follower(processor, mocker):
+    """
+    Test that a request waits for the result of an identical running query.
+    """
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {
+            "CHART_DATA_SINGLE_FLIGHT_ENABLED": True,
+            "CHART_DATA_SINGLE_FLIGHT_TIMEOUT": 30,
+            "CHART_DATA_SINGLE_FLIGHT_POLL_INTERVAL": 0,
+        },
+    )
+    mocker.patch(
+        "rama.common.query_context_processor.KeyValueDistributedLock",
+        side_effect=CreateKeyValueDistributedLockFailedException("Lock already taken"),
+    )
+    mocker.patch(
+        "rama.commands.distributed_lock.get.GetDistributedLock"
+    ).return_value.run.return_value = {"value": True}
+    pending = MagicMock(is_loaded=False)
+    cached = MagicMock(is_loaded=True)
+    get = mocker.patch(
+        "rama.common.query_context_processor.QueryCacheManager.get",
+        side_effect=[pending, cached],
+    )
+    load_query_result = mocker.patch.object(processor, "load_query_result")
+
+    assert (
+        processor.load_query_result_single_flight(
+            MagicMock(), "key", MagicMock(), False
+        )
+        is cached
+    )
+    assert get.call_count == 2
+    load_query_result.assert_not_called()
+
+
+def test_load_query_result_single_flight_leader_failed(processor, mocker):
+    """
+    Test that a waiting request runs the query if the lock is released without the
+    result being cached.
+    """
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {
+            "CHART_DATA_SINGLE_FLIGHT_ENABLED": True,
+            "CHART_DATA_SINGLE_FLIGHT_TIMEOUT": 30,
+            "CHART_DATA_SINGLE_FLIGHT_POLL_INTERVAL": 0,
+        },
+    )
+    lock = mocker.patch(
+        "rama.common.query_context_processor.KeyValueDistributedLock",
+        side_effect=[
+            CreateKeyValueDistributedLockFailedException("Lock already taken"),
+            MagicMock(),
+        ],
+    )
+    mocker.patch(
+        "rama.commands.distributed_lock.get.GetDistributedLock"
+    ).return_value.run.return_value = None
+    mocker.patch(
+        "rama.common.query_context_processor.QueryCacheManager.get",
+        return_value=MagicMock(is_loaded=False),
+    )
+    load_query_result = mocker.patch.object(processor, "load_query_result")
+    cache = MagicMock()
+
+    assert (
+        processor.load_query_result_single_flight(MagicMock(), "key", cache, False)
+        is cache
+    )
+    assert lock.call_count == 2
+    load_query_result.assert_called_once()
+
+
+def test_get_single_flight_lock_expiration(mocker):
+    """
+    Test that the lock outlives the longest a request can wait for the query.
+    """
+    config = mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {
+            "CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT": None,
+            "CHART_DATA_SINGLE_FLIGHT_TIMEOUT": 30,
+            "RAMA_WEBSERVER_TIMEOUT": 60,
+        },
+    )
+    assert get_single_flight_lock_expiration() == timedelta(seconds=60)
+
+    config["CHART_DATA_SINGLE_FLIGHT_TIMEOUT"] = 90
+    assert get_single_flight_lock_expiration() == timedelta(seconds=90)
+
+    config["CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT"] = 600
+    assert get_single_flight_lock_expiration() == timedelta(seconds=600)
+
+
+def test_refresh_query_result_in_background(processor, mocker):
+    """
+    Test that a stale cache key is refreshed by a Celery task, once per process.
+    """
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {"CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT": 60},
+    )
+    mocker.patch("rama.common.query_context_processor._refreshing", {})
+    mocker.patch("rama.common.query_context_processor.get_user_id", return_value=1)
+    mocker.patch(
+        "rama.common.query_context_processor.security_manager",
+        MagicMock(**{"get_current_guest_user_if_guest.return_value": None}),
+    )
+    monotonic = mocker.patch(
+        "rama.common.query_context_processor.time.monotonic",
+        return_value=1000,
+    )
+    task = mocker.patch("rama.tasks.async_queries.refresh_chart_data_cache")
+    processor._query_context.cache_values = {"datasource": {"id": 1}, "queries": []}
+    processor._query_context.form_data = {"slice_id": 1}
+
+    processor.refresh_query_result_in_background("key")
+    # the refresh of the key was already scheduled
+    processor.refresh_query_result_in_background("key")
+
+    task.delay.assert_called_once_with(
+        {"user_id": 1},
+        {"datasource": {"id": 1}, "queries": [], "form_data": {"slice_id": 1}},
+        "key",
+    )
+
+    # the lock of the previous refresh has expired
+    monotonic.return_value = 1061
+    processor.refresh_query_result_in_background("key")
+    assert task.delay.call_count == 2
+
+
+def test_refresh_query_result_in_background_error(processor, mocker):
+    """
+    Test that a refresh that can't be scheduled is retried on the next request.
+    """
+    mocker.patch("rama.common.query_context_processor._refreshing", {})
+    mocker.patch("rama.common.query_context_processor.get_user_id", return_value=1)
+    mocker.patch(
+        "rama.common.query_context_processor.security_manager",
+        MagicMock(**{"get_current_guest_user_if_guest.return_value": None}),
+    )
+    task = mocker.patch("rama.tasks.async_queries.refresh_chart_data_cache")
+    task.delay.side_effect = [Exception("Broker is down"), None]
+    processor._query_context.cache_values = {}
+    processor._query_context.form_data = None
+
+    processor.refresh_query_result_in_background("key")
+    processor.refresh_query_result_in_background("key")
+
+    assert task.delay.call_count == 2
+
+
+def test_refresh_query_result(processor, mocker):
+    mocker.patch.dict(
+        "rama.common.query_context_processor.config",
+        {"CHART_DATA_SINGLE_FLIGHT_LOCK_TIMEOUT": 60},
+    )
+    lock = mocker.patch("rama.common.query_context_processor.KeyValueDistributedLock")
+    load_query_result = mocker.patch.object(processor, "load_query_result")
+    mocker.patch.object(
+        processor, "query_cache_key", side_effect=lambda query_obj: query_obj.key
+    )
+    query_obj = MagicMock(key="key")
+    processor._query_context.queries = [MagicMock(key="other"), query_obj]
+
+    processor.refresh_query_result("key")
+
+    lock.assert_called_once_with(
+        "chart_data_cache",
+        lock_expiration=timedelta(seconds=60),
+        cache_key="key",
+    )
+    load_query_result.assert_called_once()
+    assert load_query_result.call_args[0][:2] == (query_obj, "key")
+
+
+def test_refresh_query_result_already_refreshing(processor, mocker):
+    mocker.patch(
+        "rama.common.query_context_processor.KeyValueDistributedLock",
+        side_effect=CreateKeyValueDistributedLockFailedException("Lock already taken"),
+    )
+    load_query_result = mocker.patch.object(processor, "load_query_result")
+    mocker.patch.object(processor, "query_cache_key", return_value="key")
+    processor._query_context.queries = [MagicMock()]
+
+    processor.refresh_query_result("key")
+
+    load_query_result.assert_not_called()
+
+
+def test_query_cache_manager_stale(mocker):
+    from rama.common.utils.query_cache_manager import QueryCacheManager
+    from rama.constants import CacheRegion
+
+    cache = MagicMock()
+    cache.get.return_value = {
+        "df": pd.DataFrame(),
+        "query": "SELECT 1",
+        "dttm": "2024-01-01T00:00:00",
+        "expires_at": 1,
+    }
+    mocker.patch.dict(
+        "rama.common.utils.query_cache_manager._cache",
+        {CacheRegion.DATA: cache},
+    )
+
+    assert not QueryCacheManager.get("key", region=CacheRegion.DATA).is_loaded
+
+    query_cache = QueryCacheManager.get(
+        "key", region=CacheRegion.DATA, allow_stale=True
+    )
+    assert query_cache.is_loaded
+    assert query_cache.is_stale
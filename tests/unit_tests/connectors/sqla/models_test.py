@@ -290,3 +290,63 @@ def test_normalize_prequery_result_type_custom_sql() -> None:
         sqla_table._normalize_prequery_result_type(row, dimension, columns_by_name)
         == "Car"
     )
+
+
+def test_data_for_slices_query_context(mocker: MockerFixture) -> None:
+    """
+    Test that `data_for_slices` reads the columns from the query context of the
+    charts without building it.
+    """
+    from rama.connectors.sqla.models import SqlMetric
+    from rama.models.slice import Slice
+    from rama.utils import json
+
+    sqla_table = SqlaTable(
+        id=1,
+        table_name="t",
+        columns=[
+            TableColumn(column_name="ds", is_dttm=True),
+            TableColumn(column_name="name"),
+            TableColumn(column_name="state"),
+            TableColumn(column_name="num"),
+        ],
+        metrics=[SqlMetric(metric_name="count", expression="COUNT(*)")],
+        database=Database(database_name="db", sqlalchemy_uri="sqlite://"),
+    )
+    slc = Slice(
+        datasource_id=1,
+        datasource_type="table",
+        params=json.dumps({"metrics": ["count"]}),
+        query_context=json.dumps(
+            {
+                "datasource": {"id": 1, "type": "table"},
+                "form_data": {"x_axis": "ds"},
+                "queries": [
+                    {
+                        "columns": [
+                            "ds",
+                            {"label": "name", "sqlExpression": "name"},
+                        ],
+                        "granularity": "state",
+                    },
+                ],
+            }
+        ),
+    )
+    get_query_context = mocker.patch.object(Slice, "get_query_context")
+
+    data = sqla_table.data_for_slices([slc])
+
+    get_query_context.assert_not_called()
+    assert [column["column_name"] for column in data["columns"]] == [
+        "ds",
+        "name",
+        "state",
+    ]
+    assert [metric["metric_name"] for metric in data["metrics"]] == ["count"]
+
+    # query contexts of another dataset are ignored
+    slc.datasource_id = 2
+    slc.params = json.dumps({"metrics": ["count"], "groupby": ["num"]})
+    data = sqla_table.data_for_slices([slc])
+    assert [column["column_name"] for column in data["columns"]] == ["num"]
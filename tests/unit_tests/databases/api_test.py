@@ -2284,3 +2284,48 @@ def test_schemas_with_oauth2(
             }
         ]
     }
+
+
+def test_search_tables(
+    mocker: MockerFixture,
+    client: Any,
+    full_api_access: None,
+) -> None:
+    """
+    Test the `search_tables` endpoint.
+    """
+    SearchTablesDatabaseCommand = mocker.patch(  # noqa: N806
+        "rama.databases.api.SearchTablesDatabaseCommand"
+    )
+    SearchTablesDatabaseCommand.return_value.run.return_value = {
+        "count": 1,
+        "result": [
+            {
+                "catalog": None,
+                "schema": "public",
+                "value": "orders",
+                "type": "table",
+            },
+        ],
+    }
+
+    response = client.get("/api/v1/database/1/search_tables/?q=(query:ord,limit:10)")
+    assert response.status_code == 200
+    assert response.json == {
+        "count": 1,
+        "result": [
+            {
+                "catalog": None,
+                "schema": "public",
+                "value": "orders",
+                "type": "table",
+            },
+        ],
+    }
+    SearchTablesDatabaseCommand.assert_called_with(1, "ord", limit=10, force=False)
+
+    response = client.get("/api/v1/database/1/search_tables/")
+    assert response.status_code == 400
+
+    response = client.get("/api/v1/database/1/search_tables/?q=(query:'')")
+    assert response.status_code == 400
@@ -0,0 +1,115 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from pytest_mock import MockerFixture
+
+from rama.databases.engine_registry import EngineKey, EngineRegistry
+
+
+def make_key(database_id: int, schema: str | None = None) -> EngineKey:
+    return EngineKey(
+        database_id=database_id,
+        catalog=None,
+        schema=schema,
+        effective_username=None,
+        fingerprint="abc",
+    )
+
+
+def test_get_engine(mocker: MockerFixture) -> None:
+    """
+    Test that engines are created once per key.
+    """
+    stats_logger = mocker.MagicMock()
+    mocker.patch.dict(
+        "flask.current_app.config",
+        {"STATS_LOGGER": stats_logger},
+    )
+    registry = EngineRegistry()
+    create = mocker.MagicMock(side_effect=lambda: mocker.MagicMock())
+
+    engine = registry.get_engine(make_key(1), create)
+    assert registry.get_engine(make_key(1), create) is engine
+    assert registry.get_engine(make_key(1, "other"), create) is not engine
+    assert create.call_count == 2
+
+    stats_logger.incr.assert_any_call("engine_registry.hit")
+    stats_logger.incr.assert_any_call("engine_registry.miss")
+
+
+def test_get_engine_max_size(mocker: MockerFixture) -> None:
+    """
+    Test that the least recently used engine is disposed of.
+    """
+    mocker.patch.dict(
+        "flask.current_app.config",
+        {"STATS_LOGGER": mocker.MagicMock(), "ENGINE_REGISTRY_MAX_SIZE": 2},
+    )
+    registry = EngineRegistry()
+    engines = [mocker.MagicMock() for _ in range(3)]
+
+    registry.get_engine(make_key(1), lambda: engines[0])
+    registry.get_engine(make_key(2), lambda: engines[1])
+    registry.get_engine(make_key(1), lambda: engines[0])
+    registry.get_engine(make_key(3), lambda: engines[2])
+
+    assert len(registry) == 2
+    assert make_key(2) not in registry
+    engines[1].dispose.assert_called_once()
+    engines[0].dispose.assert_not_called()
+
+
+def test_get_engine_idle_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that idle engines are disposed of.
+    """
+    mocker.patch.dict(
+        "flask.current_app.config",
+        {"STATS_LOGGER": mocker.MagicMock(), "ENGINE_REGISTRY_IDLE_TIMEOUT": 60},
+    )
+    monotonic = mocker.patch(
+        "rama.databases.engine_registry.time.monotonic",
+        return_value=0,
+    )
+    registry = EngineRegistry()
+    engine = mocker.MagicMock()
+    registry.get_engine(make_key(1), lambda: engine)
+
+    monotonic.return_value = 61
+    registry.get_engine(make_key(2), mocker.MagicMock)
+
+    assert make_key(1) not in registry
+    engine.dispose.assert_called_once()
+
+
+def test_invalidate(mocker: MockerFixture) -> None:
+    """
+    Test that all the engines of a database are disposed of on invalidation.
+    """
+    mocker.patch.dict(
+        "flask.current_app.config",
+        {"STATS_LOGGER": mocker.MagicMock()},
+    )
+    registry = EngineRegistry()
+    registry.get_engine(make_key(1), mocker.MagicMock)
+    registry.get_engine(make_key(1, "other"), mocker.MagicMock)
+    registry.get_engine(make_key(2), mocker.MagicMock)
+
+    registry.invalidate(1)
+
+    assert len(registry) == 1
+    assert make_key(2) in registry
@@ -0,0 +1,211 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=redefined-outer-name, unused-argument
+
+from unittest.mock import MagicMock
+
+import pytest
+from flask_caching.backends import SimpleCache
+from pytest_mock import MockerFixture
+
+from rama.databases.table_search import (
+    build_table_index,
+    get_table_index,
+    refresh_table_index,
+    search_tables,
+)
+
+
+@pytest.fixture
+def database(mocker: MockerFixture) -> MagicMock:
+    """
+    A database with two catalogs, one of which has a broken schema.
+    """
+    database = mocker.MagicMock(id=1)
+    database.db_engine_spec.supports_catalog = True
+    database.allow_multi_catalog = True
+    database.get_all_catalog_names.return_value = {"catalog1", "catalog2"}
+    database.get_all_schema_names.side_effect = lambda catalog, **kwargs: (
+        {"public", "sales"} if catalog == "catalog1" else {"broken"}
+    )
+
+    def get_table_names(catalog, schema, **kwargs):  # type: ignore
+        if schema == "broken":
+            raise Exception("Unable to list tables")
+        return {
+            (f"{schema}_orders", schema, catalog),
+            (f"{schema}_customers", schema, catalog),
+        }
+
+    database.get_all_table_names_in_schema.side_effect = get_table_names
+    database.get_all_view_names_in_schema.side_effect = (
+        lambda catalog, schema, **kwargs: {(f"{schema}_orders_view", schema, catalog)}
+    )
+
+    return database
+
+
+@pytest.fixture
+def cache(mocker: MockerFixture) -> SimpleCache:
+    cache_manager = mocker.patch("rama.databases.table_search.cache_manager")
+    cache_manager.cache = SimpleCache()
+    return cache_manager.cache
+
+
+def test_build_table_index(database: MagicMock) -> None:
+    """
+    Test that the index has the tables and views of all the catalogs and schemas, and
+    that schemas that can't be read are skipped.
+    """
+    assert build_table_index(database) == [
+        ("catalog1", "public", "public_customers", "table"),
+        ("catalog1", "public", "public_orders", "table"),
+        ("catalog1", "public", "public_orders_view", "view"),
+        ("catalog1", "sales", "sales_customers", "table"),
+        ("catalog1", "sales", "sales_orders", "table"),
+        ("catalog1", "sales", "sales_orders_view", "view"),
+    ]
+
+
+def test_build_table_index_default_catalog(database: MagicMock) -> None:
+    """
+    Test that only the default catalog is indexed when multiple catalogs are disabled.
+    """
+    database.allow_multi_catalog = False
+    database.get_default_catalog.return_value = "catalog2"
+
+    assert build_table_index(database) == []
+    database.get_all_catalog_names.assert_not_called()
+    database.get_all_schema_names.assert_called_once_with(
+        catalog="catalog2",
+        cache=database.schema_cache_enabled,
+        cache_timeout=database.schema_cache_timeout,
+        force=False,
+    )
+
+
+def test_get_table_index(
+    mocker: MockerFixture,
+    app_context: None,
+    database: MagicMock,
+    cache: SimpleCache,
+) -> None:
+    """
+    Test that a missing index is refreshed once in the background, and then read from
+    the cache.
+    """
+    refresh_index = mocker.patch("rama.tasks.table_search.refresh_index")
+    refresh_index.delay.side_effect = lambda database_id, force: refresh_table_index(
+        database, force
+    )
+    build_table_index = mocker.patch(
+        "rama.databases.table_search.build_table_index",
+        return_value=[("catalog1", "public", "orders", "table")],
+    )
+
+    assert get_table_index(database) == []
+    refresh_index.delay.assert_called_once_with(1, force=False)
+
+    for _ in range(2):
+        assert get_table_index(database) == [("catalog1", "public", "orders", "table")]
+    build_table_index.assert_called_once_with(database, False)
+
+    assert get_table_index(database, force=True) == [
+        ("catalog1", "public", "orders", "table")
+    ]
+    refresh_index.delay.assert_called_with(1, force=True)
+    build_table_index.assert_called_with(database, True)
+
+
+def test_get_table_index_refresh_scheduled(
+    mocker: MockerFixture,
+    app_context: None,
+    database: MagicMock,
+    cache: SimpleCache,
+) -> None:
+    """
+    Test that the refresh of a missing index is only scheduled once.
+    """
+    refresh_index = mocker.patch("rama.tasks.table_search.refresh_index")
+
+    for _ in range(2):
+        assert get_table_index(database) == []
+    refresh_index.delay.assert_called_once_with(1, force=False)
+    database.get_all_catalog_names.assert_not_called()
+
+
+def test_get_table_index_refresh_error(
+    mocker: MockerFixture,
+    app_context: None,
+    database: MagicMock,
+    cache: SimpleCache,
+) -> None:
+    """
+    Test that a refresh that couldn't be scheduled is scheduled by the next search.
+    """
+    refresh_index = mocker.patch("rama.tasks.table_search.refresh_index")
+    refresh_index.delay.side_effect = [Exception("Broker is down"), None]
+
+    for _ in range(2):
+        assert get_table_index(database) == []
+    assert refresh_index.delay.call_count == 2
+
+
+def test_search_tables(
+    mocker: MockerFixture,
+    app_context: None,
+    database: MagicMock,
+    cache: SimpleCache,
+) -> None:
+    """
+    Test that tables are searched across schemas, prefix matches first, and filtered
+    by the permissions of the user in bulk.
+    """
+    refresh_table_index(database)
+    filter_datasources_accessible_by_user = mocker.patch(
+        "rama.databases.table_search.security_manager"
+        ".filter_datasources_accessible_by_user",
+        side_effect=lambda database, names: [
+            name for name in names if name.table != "public_customers"
+        ],
+    )
+
+    assert search_tables(database, "CUSTOMERS") == [
+        ("catalog1", "sales", "sales_customers", "table"),
+    ]
+    filter_datasources_accessible_by_user.assert_called_once()
+    assert len(filter_datasources_accessible_by_user.call_args[0][1]) == 2
+
+    assert search_tables(database, "s") == [
+        ("catalog1", "sales", "sales_customers", "table"),
+        ("catalog1", "sales", "sales_orders", "table"),
+        ("catalog1", "sales", "sales_orders_view", "view"),
+        ("catalog1", "public", "public_orders", "table"),
+        ("catalog1", "public", "public_orders_view", "view"),
+    ]
+    assert search_tables(database, "s", limit=1) == [
+        ("catalog1", "sales", "sales_customers", "table"),
+    ]
+
+    # the qualified name is searched too
+    assert search_tables(database, "public.public_orders") == [
+        ("catalog1", "public", "public_orders", "table"),
+        ("catalog1", "public", "public_orders_view", "view"),
+    ]
+
+    # the index is only read from the cache
+    assert database.get_all_catalog_names.call_count == 1
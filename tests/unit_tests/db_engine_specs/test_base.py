@@ -382,3 +382,51 @@ def test_unmask_encrypted_extra() -> None:
             },
         }
     )
+
+
+def test_fetch_data_batches(mocker: MockerFixture) -> None:
+    """
+    Test that rows are fetched in batches, applying the column mutators.
+    """
+    from rama.db_engine_specs.base import BaseEngineSpec
+
+    class CustomEngineSpec(BaseEngineSpec):
+        fetch_batch_size = 2
+        column_type_mutators = {types.String: str.upper}
+
+    rows = [(1, "a"), (2, "b"), (3, "c"), (4, "d"), (5, "e")]
+    cursor = mocker.MagicMock()
+    cursor.description = [("id", "INTEGER"), ("name", "VARCHAR")]
+    cursor.fetchmany.side_effect = lambda size: [
+        rows.pop(0) for _ in range(min(size, len(rows)))
+    ]
+
+    batches = list(CustomEngineSpec.fetch_data_batches(cursor, limit=3))
+
+    assert [batch.num_rows for batch in batches] == [2, 1]
+    assert [batch.to_pylist() for batch in batches] == [
+        [{"id": 1, "name": "A"}, {"id": 2, "name": "B"}],
+        [{"id": 3, "name": "C"}],
+    ]
+    cursor.fetchmany.assert_has_calls([mocker.call(2), mocker.call(1)])
+
+
+def test_fetch_data_batches_custom_fetch_data(mocker: MockerFixture) -> None:
+    """
+    Test that engine specs with a custom `fetch_data` return a single batch.
+    """
+    from rama.db_engine_specs.base import BaseEngineSpec
+
+    class CustomEngineSpec(BaseEngineSpec):
+        @classmethod
+        def fetch_data(cls, cursor: Any, limit: int | None = None) -> list[Any]:
+            return [(1,), (2,)]
+
+    cursor = mocker.MagicMock()
+    cursor.description = [("id", "INTEGER")]
+
+    batches = list(CustomEngineSpec.fetch_data_batches(cursor))
+
+    assert len(batches) == 1
+    assert batches[0].to_pydict() == {"id": [1, 2]}
+    cursor.fetchmany.assert_not_called()
@@ -18,9 +18,13 @@ from datetime import datetime
 from typing import Any, Optional
 from unittest import mock
 
+import pandas as pd
 import pytest
 import pytz
+from cachelib import SimpleCache
+from flask import current_app
 from pyhive.sqlalchemy_presto import PrestoDialect
+from pytest_mock import MockerFixture
 from sqlalchemy import column, sql, text, types
 from sqlalchemy.engine.url import make_url
 
@@ -303,3 +307,110 @@ def test_timegrain_expressions(time_grain: str, expected_result: str) -> None:
         spec.get_timestamp_expr(col=column("col"), pdf=None, time_grain=time_grain)
     )
     assert actual == expected_result
+
+
+@pytest.fixture
+def partition_cache(mocker: MockerFixture) -> SimpleCache:
+    cache = SimpleCache()
+    mocker.patch("rama.db_engine_specs.presto.cache_manager").data_cache = cache
+    return cache
+
+
+def test_latest_partition_cache(
+    mocker: MockerFixture,
+    partition_cache: SimpleCache,
+) -> None:
+    """
+    Test that the latest partition of a table is only looked up once.
+    """
+    from rama.db_engine_specs.presto import PrestoEngineSpec
+
+    stats_logger = mocker.patch.dict(
+        current_app.config, {"STATS_LOGGER": mocker.MagicMock()}
+    )["STATS_LOGGER"]
+    database = mocker.MagicMock(id=1)
+    database.get_extra.return_value = {}
+    database.get_indexes.return_value = [{"column_names": ["ds"]}]
+    database.get_df.return_value = pd.DataFrame({"ds": ["2024-01-01"]})
+
+    for _ in range(2):
+        assert PrestoEngineSpec.latest_partition(database, Table("t", "s")) == (
+            ["ds"],
+            ("2024-01-01",),
+        )
+
+    database.get_indexes.assert_called_once()
+    database.get_df.assert_called_once()
+    stats_logger.incr.assert_has_calls(
+        [mock.call("partition_cache.miss"), mock.call("partition_cache.hit")]
+    )
+
+
+def test_cache_latest_partitions(
+    mocker: MockerFixture,
+    partition_cache: SimpleCache,
+) -> None:
+    """
+    Test that the latest partitions of many tables are looked up at once.
+    """
+    from rama.db_engine_specs.presto import PrestoEngineSpec
+
+    database = mocker.MagicMock(id=1)
+    database.get_extra.return_value = {}
+    mocker.patch.object(
+        PrestoEngineSpec,
+        "get_indexes",
+        side_effect=lambda database, inspector, table: (
+            [] if table.table == "unpartitioned" else [{"column_names": ["ds"]}]
+        ),
+    )
+    database.get_dfs.return_value = [
+        pd.DataFrame({"ds": ["2024-01-01"]}),
+        pd.DataFrame({"ds": ["2024-01-02"]}),
+    ]
+
+    PrestoEngineSpec.cache_latest_partitions(
+        database,
+        [
+            Table("a", "s"),
+            Table("b", "s"),
+            Table("a", "s"),
+            Table("unpartitioned", "s"),
+        ],
+    )
+
+    database.get_inspector.assert_called_once_with(catalog=None, schema="s")
+    database.get_dfs.assert_called_once()
+    assert len(database.get_dfs.call_args[0][0]) == 2
+    assert PrestoEngineSpec.latest_partition(database, Table("b", "s")) == (
+        ["ds"],
+        ("2024-01-02",),
+    )
+    database.get_df.assert_not_called()
+
+
+def test_get_schema_columns(mocker: MockerFixture) -> None:
+    """
+    Test that the columns of all the tables in a schema are read in one query.
+    """
+    from collections import namedtuple
+
+    from rama.db_engine_specs.presto import PrestoEngineSpec
+
+    Row = namedtuple("Row", ["table_name", "Column", "Type"])  # noqa: N806
+    inspector = mocker.MagicMock()
+    inspector.bind.execute.return_value.fetchall.return_value = [
+        Row("a", "ds", "varchar"),
+        Row("a", "value", "bigint"),
+        Row("b", "id", "integer"),
+    ]
+
+    columns = PrestoEngineSpec.get_schema_columns(mocker.MagicMock(), inspector, "s")
+
+    inspector.bind.execute.assert_called_once()
+    assert inspector.bind.execute.call_args[1] == {"schema": "s"}
+    assert {
+        table: [column["column_name"] for column in table_columns]
+        for table, table_columns in columns.items()
+    } == {"a": ["ds", "value"], "b": ["id"]}
+    assert columns["a"][1]["type"] == "BIGINT"
@@ -396,3 +396,33 @@ def test_unmask_encrypted_extra() -> None:
             },
         }
     )
+
+
+def test_fetch_data_batches(mocker: MockerFixture) -> None:
+    """
+    Test that Arrow batches are returned straight from the cursor.
+    """
+    import pyarrow as pa
+
+    from rama.db_engine_specs.snowflake import SnowflakeEngineSpec
+
+    mocker.patch.dict(
+        "sys.modules",
+        {"snowflake.connector.errors": mocker.MagicMock(NotSupportedError=KeyError)},
+    )
+    cursor = mocker.MagicMock()
+    cursor.description = [("ID", 0), ("ID", 0)]
+    cursor.fetch_arrow_batches.return_value = iter(
+        [
+            pa.table({"ID": [1, 2], "ID_": [3, 4]}),
+            pa.table({"ID": [5, 6], "ID_": [7, 8]}),
+        ]
+    )
+
+    batches = list(SnowflakeEngineSpec.fetch_data_batches(cursor, limit=3))
+
+    assert [batch.to_pydict() for batch in batches] == [
+        {"ID": [1, 2], "ID__1": [3, 4]},
+        {"ID": [5], "ID__1": [7]},
+    ]
+    cursor.fetchmany.assert_not_called()
@@ -910,3 +910,19 @@ def test_timegrain_expressions(time_grain: str, expected_result: str) -> None:
         spec.get_timestamp_expr(col=column("col"), pdf=None, time_grain=time_grain)
     )
     assert actual == expected_result
+
+
+@pytest.mark.parametrize(
+    "stats,expected",
+    [
+        (None, None),
+        ({"completedSplits": 0, "totalSplits": 0}, None),
+        ({"completedSplits": 1, "totalSplits": 4}, 25.0),
+    ],
+)
+def test_get_progress(stats: Optional[dict[str, int]], expected: Optional[float]):
+    from rama.db_engine_specs.trino import TrinoEngineSpec
+
+    cursor = Mock(stats=stats)
+
+    assert TrinoEngineSpec.get_progress(cursor) == expected
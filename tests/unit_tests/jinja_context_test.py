@@ -33,12 +33,14 @@ from rama.jinja_context import (
     dataset_macro,
     ExtraCache,
     metric_macro,
+    PrestoTemplateProcessor,
     safe_proxy,
     TimeFilter,
     WhereInMacro,
 )
 from rama.models.core import Database
 from rama.models.slice import Slice
+from rama.sql_parse import Table
 from rama.utils import json
 
 
@@ -1211,3 +1213,40 @@ def test_get_time_filter(
         assert cache.get_time_filter(*args, **kwargs) == time_filter, description
         assert cache.removed_filters == removed_filters
         assert cache.applied_filters == applied_filters
+
+
+def test_presto_cache_latest_partitions(mocker: MockerFixture) -> None:
+    """
+    Test that the latest partitions of the tables in a template are looked up at once.
+    """
+    from rama.db_engine_specs.presto import PrestoEngineSpec
+
+    cache_latest_partitions = mocker.patch.object(
+        PrestoEngineSpec,
+        "cache_latest_partitions",
+    )
+    mocker.patch.object(
+        PrestoEngineSpec,
+        "latest_partition",
+        return_value=(["ds"], ["2024-01-01"]),
+    )
+    database = Database(
+        database_name="my_database",
+        sqlalchemy_uri="presto://localhost/hive",
+    )
+    processor = PrestoTemplateProcessor(
+        database=database,
+        table=SqlaTable(table_name="a", schema="s", database=database),
+    )
+
+    sql = processor.process_template(
+        "SELECT * FROM a JOIN b "
+        "WHERE a.ds = '{{ presto.latest_partition('a') }}' "
+        "AND b.ds = '{{ presto.latest_partition('other.b') }}'"
+    )
+
+    assert "'2024-01-01'" in sql
+    cache_latest_partitions.assert_called_once_with(
+        database,
+        [Table("a", "s"), Table("b", "other")],
+    )
@@ -164,3 +164,48 @@ def test_timezone_series(mocker: MockerFixture) -> None:
         [pd.Timestamp("2023-01-01 00:00:00+0000", tz="UTC")]
     ]
     logger.exception.assert_not_called()
+
+
+def test_convert_column() -> None:
+    """
+    Test that columns that can't be converted to Arrow directly are stringified.
+    """
+    assert RamaResultSet.convert_column([1, None, 3]).to_pylist() == [1, None, 3]
+    assert RamaResultSet.convert_column([1, "a", 2.5]).to_pylist() == [
+        "1",
+        "a",
+        "2.5",
+    ]
+    assert RamaResultSet.convert_column([[1, 2], [3]]).to_pylist() == [
+        "[1, 2]",
+        "[3]",
+    ]
+
+
+def test_from_record_batches() -> None:
+    """
+    Test building a result set from batches with different types in a column.
+    """
+    description = [("id", "INTEGER"), ("value", "VARCHAR")]
+    column_names = ["id", "value"]
+    batches = [
+        RamaResultSet.convert_rows([(1, None), (2, None)], column_names),
+        RamaResultSet.convert_rows([(3, 1), (4, 2)], column_names),
+        RamaResultSet.convert_rows([(5, "a"), (6, "b")], column_names),
+    ]
+
+    result_set = RamaResultSet.from_record_batches(
+        iter(batches),
+        description,  # type: ignore
+        BaseEngineSpec,
+    )
+
+    assert result_set.size == 6
+    assert result_set.to_pandas_df().to_dict(orient="list") == {
+        "id": [1, 2, 3, 4, 5, 6],
+        "value": [None, None, "1", "2", "a", "b"],
+    }
+    assert [column["type"] for column in result_set.columns] == [
+        "INTEGER",
+        "VARCHAR",
+    ]
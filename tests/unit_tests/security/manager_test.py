@@ -1143,6 +1143,61 @@ def test_get_datasources_accessible_by_user_schema_access(
     )
 
 
+def test_filter_datasources_accessible_by_user(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that `filter_datasources_accessible_by_user` checks tables from different
+    catalogs and schemas, reading the dataset permissions only once.
+    """
+    sm = RamaSecurityManager(appbuilder)
+    mocker.patch.object(sm, "can_access_database", return_value=False)
+    mocker.patch.object(
+        sm,
+        "can_access_catalog",
+        side_effect=lambda database, catalog: catalog == "catalog2",
+    )
+    can_access = mocker.patch.object(
+        sm,
+        "can_access",
+        side_effect=lambda permission, view_menu: (
+            view_menu == "[db1].[catalog1].[schema1]"
+        ),
+    )
+    mocker.patch.object(sm, "user_view_menu_names", return_value=set())
+    query_datasources_by_permissions = mocker.patch(
+        "rama.connectors.sqla.models.SqlaTable.query_datasources_by_permissions",
+        return_value=[
+            mocker.MagicMock(table_name="table3", schema="schema2", catalog=None)
+        ],
+    )
+
+    database = mocker.MagicMock()
+    database.database_name = "db1"
+    database.get_default_catalog.return_value = "catalog1"
+
+    assert sm.filter_datasources_accessible_by_user(
+        database,
+        [
+            DatasourceName("table1", "schema1", "catalog1"),
+            DatasourceName("table2", "schema2", "catalog1"),
+            DatasourceName("table3", "schema2", "catalog1"),
+            DatasourceName("table4", "schema1", "catalog2"),
+            DatasourceName("table5", "schema1", "catalog1"),
+        ],
+    ) == [
+        DatasourceName("table1", "schema1", "catalog1"),
+        DatasourceName("table3", "schema2", "catalog1"),
+        DatasourceName("table4", "schema1", "catalog2"),
+        DatasourceName("table5", "schema1", "catalog1"),
+    ]
+
+    query_datasources_by_permissions.assert_called_once()
+    # permissions are checked once per catalog and schema
+    assert can_access.call_count == 2
+
+
 def test_get_catalogs_accessible_by_user_schema_access(
     mocker: MockerFixture,
     app_context: None,
@@ -1169,3 +1224,28 @@ def test_get_catalogs_accessible_by_user_schema_access(
     catalogs = {"catalog1", "catalog2"}
 
     assert sm.get_catalogs_accessible_by_user(database, catalogs) == {"catalog2"}
+
+
+def test_get_rls_filters_cached(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that RLS filters are resolved once per roles and table in a request.
+    """
+    sm = RamaSecurityManager(appbuilder)
+    mocker.patch.object(
+        sm,
+        "get_user_roles",
+        return_value=[mocker.MagicMock(id=2), mocker.MagicMock(id=1)],
+    )
+    get_rls_filters = mocker.patch.object(
+        sm,
+        "_get_rls_filters",
+        return_value=[mocker.MagicMock(id=2), mocker.MagicMock(id=1)],
+    )
+    table = mocker.MagicMock(id=42)
+
+    with override_user(mocker.MagicMock()):
+        assert len(sm.get_rls_filters(table)) == 2
+        assert [f.id for f in sm.get_rls_sorted(table)] == [1, 2]
+        assert [f.id for f in sm.get_rls_filters(table)] == [2, 1]
+
+    get_rls_filters.assert_called_once_with([1, 2], 42)
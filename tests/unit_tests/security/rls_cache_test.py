@@ -0,0 +1,194 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel, unused-argument
+
+from unittest.mock import MagicMock
+
+from flask import current_app, g
+from freezegun import freeze_time
+from pytest_mock import MockerFixture
+from sqlalchemy.orm.session import Session
+
+from rama.security.rls_cache import RLSFiltersCache, RLSFiltersKey
+
+KEY = RLSFiltersKey((1, 2), 42)
+
+
+def test_request_scoped(mocker: MockerFixture) -> None:
+    """
+    Test that filters are loaded once per request when the shared layer is disabled.
+    """
+    mocker.patch.dict(current_app.config, {"RLS_FILTERS_CACHE_TIMEOUT": 0})
+    cache = RLSFiltersCache()
+    load = MagicMock(return_value=["filter"])
+
+    assert cache.get(KEY, load) == ["filter"]
+    assert cache.get(KEY, load) == ["filter"]
+    assert cache.get(RLSFiltersKey((1,), 42), load) == ["filter"]
+    assert load.call_count == 2
+
+    # new request
+    del g._rls_filters_cache
+    assert cache.get(KEY, load) == ["filter"]
+    assert load.call_count == 3
+
+
+def test_returns_copy(mocker: MockerFixture) -> None:
+    mocker.patch.dict(current_app.config, {"RLS_FILTERS_CACHE_TIMEOUT": 0})
+    cache = RLSFiltersCache()
+
+    filters = cache.get(KEY, lambda: ["b", "a"])
+    filters.sort()
+
+    assert cache.get(KEY, lambda: []) == ["b", "a"]
+
+
+def test_shared(mocker: MockerFixture) -> None:
+    """
+    Test that filters are shared across requests until they expire.
+    """
+    mocker.patch.dict(current_app.config, {"RLS_FILTERS_CACHE_TIMEOUT": 10})
+    cache = RLSFiltersCache()
+    load = MagicMock(return_value=["filter"])
+
+    with freeze_time("2024-01-01 00:00:00"):
+        assert cache.get(KEY, load) == ["filter"]
+        del g._rls_filters_cache
+        assert cache.get(KEY, load) == ["filter"]
+        assert load.call_count == 1
+
+    with freeze_time("2024-01-01 00:00:11"):
+        del g._rls_filters_cache
+        assert cache.get(KEY, load) == ["filter"]
+        assert load.call_count == 2
+
+
+def test_invalidate(mocker: MockerFixture) -> None:
+    mocker.patch.dict(current_app.config, {"RLS_FILTERS_CACHE_TIMEOUT": 10})
+    cache = RLSFiltersCache()
+    load = MagicMock(return_value=["filter"])
+
+    cache.get(KEY, load)
+    cache.invalidate()
+    cache.get(KEY, load)
+
+    assert load.call_count == 2
+
+
+def test_invalidate_on_change(session: Session) -> None:
+    """
+    Test that the cache is invalidated when RLS filters are modified.
+    """
+    from flask_appbuilder.security.sqla.models import Role
+
+    from rama.connectors.sqla.models import RowLevelSecurityFilter, SqlaTable
+    from rama.models.core import Database
+    from rama.security.rls_cache import rls_filters_cache
+    from rama.utils.core import RowLevelSecurityFilterType
+
+    engine = session.get_bind()
+    RowLevelSecurityFilter.metadata.create_all(engine)  # pylint: disable=no-member
+
+    generation = rls_filters_cache._generation
+    table = SqlaTable(
+        table_name="t",
+        database=Database(database_name="db", sqlalchemy_uri="sqlite://"),
+    )
+    rls = RowLevelSecurityFilter(
+        name="rls",
+        filter_type=RowLevelSecurityFilterType.REGULAR,
+        tables=[table],
+        roles=[Role(name="Gamma")],
+        clause="c > 5",
+    )
+    session.add(rls)
+    session.flush()
+    assert rls_filters_cache._generation > generation
+
+    generation = rls_filters_cache._generation
+    rls.roles.append(Role(name="Alpha"))
+    session.flush()
+    assert rls_filters_cache._generation > generation
+
+    generation = rls_filters_cache._generation
+    session.delete(rls)
+    session.flush()
+    assert rls_filters_cache._generation > generation
+
+
+def test_invalidate_on_role_delete(session: Session) -> None:
+    """
+    Test that the cache is invalidated when the roles or tables of a filter are
+    modified without modifying the filter.
+    """
+    from flask_appbuilder.security.sqla.models import Role
+
+    from rama.connectors.sqla.models import (
+        RLSFilterRoles,
+        RowLevelSecurityFilter,
+        SqlaTable,
+    )
+    from rama.models.core import Database
+    from rama.security.rls_cache import rls_filters_cache
+    from rama.utils.core import RowLevelSecurityFilterType
+
+    engine = session.get_bind()
+    RowLevelSecurityFilter.metadata.create_all(engine)  # pylint: disable=no-member
+
+    gamma = Role(name="Gamma")
+    alpha = Role(name="Alpha")
+    table = SqlaTable(
+        table_name="t",
+        database=Database(database_name="db", sqlalchemy_uri="sqlite://"),
+    )
+    rls = RowLevelSecurityFilter(
+        name="rls",
+        filter_type=RowLevelSecurityFilterType.REGULAR,
+        tables=[table],
+        roles=[gamma],
+        clause="c > 5",
+    )
+    session.add_all([rls, alpha])
+    session.commit()
+
+    # from the other side of the relationship
+    generation = rls_filters_cache._generation
+    alpha.row_level_security_filters.append(rls)
+    session.flush()
+    assert rls_filters_cache._generation > generation
+
+    # unrelated changes don't invalidate the cache
+    generation = rls_filters_cache._generation
+    alpha.name = "Beta"
+    session.flush()
+    assert rls_filters_cache._generation == generation
+
+    generation = rls_filters_cache._generation
+    session.delete(gamma)
+    session.flush()
+    assert rls_filters_cache._generation > generation
+    assert session.query(RLSFilterRoles).filter_by(role_id=gamma.id).count() == 0
+
+    generation = rls_filters_cache._generation
+    session.delete(table)
+    session.flush()
+    assert rls_filters_cache._generation > generation
+
+    # statements bypassing the ORM
+    generation = rls_filters_cache._generation
+    session.execute(RLSFilterRoles.insert().values(role_id=gamma.id, rls_filter_id=1))
+    assert rls_filters_cache._generation > generation
@@ -18,12 +18,16 @@
 
 
 import pytest
+from pytest_mock import MockerFixture
 from sqlglot import Dialects
 
 from rama.exceptions import RamaParseError
 from rama.sql.parse import (
     extract_tables_from_statement,
     KustoKQLStatement,
+    parse_cache,
+    ParseCache,
+    RLSMethod,
     split_kql,
     SQLGLOT_DIALECTS,
     SQLScript,
@@ -1114,6 +1118,95 @@ WHERE anon_1.a > 1
     assert SQLStatement(sql, "sqlite").optimize().format() == optimized
     assert SQLStatement(sql, "dremio").optimize().format() == not_optimized
 
+    # the optimization should not modify the statement in the parse cache
+    assert SQLStatement(sql, "sqlite").format() != optimized
+
+
+def test_parse_cache(mocker: MockerFixture) -> None:
+    """
+    Test the LRU parse cache.
+    """
+    cache = ParseCache(size=2)
+    parse = mocker.MagicMock(side_effect=lambda: [object()])
+
+    first = cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", parse)
+    assert cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", parse) is first
+    assert parse.call_count == 1
+
+    # the engine, the dialect and the parser are part of the key
+    cache.get_or_parse("sqlglot", "SELECT 1", "postgresql", parse)
+    cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", parse, dialect="other")
+    cache.get_or_parse("sqlparse", "SELECT 1", "sqlite", parse)
+    assert parse.call_count == 4
+    assert len(cache) == 2
+
+    # the least recently used entry is evicted
+    cache.get_or_parse("sqlparse", "SELECT 1", "sqlite", parse)
+    assert parse.call_count == 4
+    assert cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", parse) is not first
+    assert parse.call_count == 5
+
+
+def test_parse_cache_disabled(mocker: MockerFixture) -> None:
+    """
+    Test that the parse cache can be disabled.
+    """
+    cache = ParseCache(size=0)
+    parse = mocker.MagicMock(side_effect=lambda: [object()])
+
+    cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", parse)
+    cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", parse)
+    assert parse.call_count == 2
+    assert len(cache) == 0
+
+
+def test_parse_cache_metrics(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that the parse cache reports hits, misses and parse time.
+    """
+    stats_logger = mocker.MagicMock()
+    mocker.patch.dict(
+        "flask.current_app.config",
+        {"STATS_LOGGER": stats_logger, "SQL_PARSE_CACHE_SIZE": 10},
+    )
+    cache = ParseCache()
+
+    cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", lambda: [object()])
+    cache.get_or_parse("sqlglot", "SELECT 1", "sqlite", lambda: [object()])
+
+    assert [call.args[0] for call in stats_logger.incr.call_args_list] == [
+        "sql_parse_cache.sqlglot.miss",
+        "sql_parse_cache.sqlglot.hit",
+    ]
+    stats_logger.timing.assert_called_once()
+    assert stats_logger.timing.call_args.args[0] == "sql_parse_cache.sqlglot.parse_time"
+
+
+def test_format_does_not_modify_cached_ast() -> None:
+    """
+    Test that formatting a statement doesn't modify the AST in the parse cache.
+
+    The T-SQL generator rewrites boolean columns in `WHERE` as `<> 0`.
+    """
+    sql = "SELECT a FROM t WHERE b"
+    statement = SQLStatement(sql, "mssql")
+    cached = parse_cache.get_or_parse(
+        "sqlglot",
+        sql,
+        "mssql",
+        lambda: [],
+        dialect=SQLGLOT_DIALECTS["mssql"],
+    )
+    assert cached[0] is statement._parsed
+    before = cached[0].copy()
+
+    assert str(statement) == "SELECT\n  a\nFROM t\nWHERE\n  b <> 0"
+    SQLStatement(sql, "mssql").format()
+    SQLScript(sql, "mssql").format()
+
+    assert cached[0] == before
+    assert cached[0].sql() == sql
+
 
 def test_firebolt() -> None:
     """
@@ -1164,3 +1257,191 @@ def test_firebolt_old() -> None:
   *
 FROM t1 UNNEST(col1 AS foo)"""
     )
+
+
+@pytest.mark.parametrize(
+    "sql,method,expected",
+    [
+        (
+            "SELECT * FROM some_table WHERE 1=1",
+            RLSMethod.AS_SUBQUERY,
+            (
+                "SELECT * FROM (SELECT * FROM some_table WHERE some_table.id = 42) "
+                "AS some_table WHERE 1 = 1"
+            ),
+        ),
+        (
+            "SELECT * FROM some_table WHERE TRUE OR FALSE",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM some_table WHERE (TRUE OR FALSE) AND some_table.id = 42",
+        ),
+        (
+            "SELECT * FROM some_table ORDER BY id",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM some_table WHERE some_table.id = 42 ORDER BY id",
+        ),
+        # aliases are kept, and used to qualify the predicate
+        (
+            "SELECT a.* FROM some_table AS a",
+            RLSMethod.AS_SUBQUERY,
+            (
+                "SELECT a.* FROM (SELECT * FROM some_table WHERE some_table.id = 42) "
+                "AS a"
+            ),
+        ),
+        (
+            "SELECT a.* FROM some_table AS a",
+            RLSMethod.AS_PREDICATE,
+            "SELECT a.* FROM some_table AS a WHERE a.id = 42",
+        ),
+        # joins
+        (
+            (
+                "SELECT * FROM other_table JOIN some_table "
+                "ON other_table.id = some_table.id"
+            ),
+            RLSMethod.AS_PREDICATE,
+            (
+                "SELECT * FROM other_table JOIN some_table ON some_table.id = 42 "
+                "AND (other_table.id = some_table.id)"
+            ),
+        ),
+        (
+            "SELECT * FROM other_table, some_table",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM other_table, some_table WHERE some_table.id = 42",
+        ),
+        # subqueries, CTEs and unions
+        (
+            "SELECT * FROM (SELECT * FROM some_table)",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM (SELECT * FROM some_table WHERE some_table.id = 42)",
+        ),
+        (
+            "WITH cte AS (SELECT * FROM some_table) SELECT * FROM cte",
+            RLSMethod.AS_SUBQUERY,
+            (
+                "WITH cte AS (SELECT * FROM (SELECT * FROM some_table WHERE "
+                "some_table.id = 42) AS some_table) SELECT * FROM cte"
+            ),
+        ),
+        (
+            "SELECT * FROM other_table UNION ALL SELECT * FROM some_table",
+            RLSMethod.AS_PREDICATE,
+            (
+                "SELECT * FROM other_table UNION ALL "
+                "SELECT * FROM some_table WHERE some_table.id = 42"
+            ),
+        ),
+        # RLS is only applied to the table in the default schema
+        (
+            "SELECT * FROM other_schema.some_table",
+            RLSMethod.AS_PREDICATE,
+            "SELECT * FROM other_schema.some_table",
+        ),
+        # adhoc expressions
+        (
+            "SUM(x) + (SELECT MAX(a) FROM some_table)",
+            RLSMethod.AS_PREDICATE,
+            "SUM(x) + (SELECT MAX(a) FROM some_table WHERE some_table.id = 42)",
+        ),
+    ],
+)
+def test_apply_rls(sql: str, method: RLSMethod, expected: str) -> None:
+    """
+    Test applying RLS predicates to a statement.
+    """
+    predicates = {
+        Table("some_table", "public"): [
+            SQLStatement.parse_predicate("id=42", "postgresql"),
+        ],
+    }
+    statement = SQLStatement(sql, "postgresql")
+
+    assert (
+        statement.apply_rls(None, "public", predicates, method).format()
+        == SQLStatement(expected, "postgresql").format()
+    )
+
+    # the original statement is not modified
+    assert statement.format() == SQLStatement(sql, "postgresql").format()
+
+
+def test_apply_rls_as_predicate_unsupported() -> None:
+    """
+    Test that RLS predicates that can't be applied raise instead of being skipped.
+    """
+    predicates = {
+        Table("some_table", "public"): [
+            SQLStatement.parse_predicate("id=42", "postgresql"),
+        ],
+    }
+    statement = SQLStatement("SELECT * FROM (some_table)", "postgresql")
+
+    with pytest.raises(RamaParseError) as excinfo:
+        statement.apply_rls(None, "public", predicates, RLSMethod.AS_PREDICATE)
+    assert (
+        excinfo.value.error.message
+        == "Unable to apply RLS predicates to table some_table"
+    )
+
+    # the table can still be replaced with a subquery
+    assert (
+        statement.apply_rls(None, "public", predicates, RLSMethod.AS_SUBQUERY).format()
+        == SQLStatement(
+            "SELECT * FROM ((SELECT * FROM some_table WHERE some_table.id = 42) "
+            "AS some_table)",
+            "postgresql",
+        ).format()
+    )
+
+
+def test_apply_rls_multiple_predicates() -> None:
+    """
+    Test that multiple predicates, including ORs, are ANDed together safely.
+    """
+    predicates = {
+        Table("some_table", "public"): [
+            SQLStatement.parse_predicate("(a = 1) OR (b = 2)", "postgresql"),
+            SQLStatement.parse_predicate("c = 3", "postgresql"),
+        ],
+    }
+    statement = SQLStatement(
+        "SELECT * FROM some_table WHERE x = 1 OR y = 2",
+        "postgresql",
+    ).apply_rls(None, "public", predicates, RLSMethod.AS_PREDICATE)
+
+    expected = (
+        "SELECT * FROM some_table WHERE (x = 1 OR y = 2) AND "
+        "(((some_table.a = 1) OR (some_table.b = 2)) AND some_table.c = 3)"
+    )
+    assert statement.format() == SQLStatement(expected, "postgresql").format()
+
+
+def test_get_source_tables() -> None:
+    """
+    Test that the tables RLS is applied to are qualified and exclude CTEs.
+    """
+    statement = SQLStatement(
+        """
+WITH cte AS (SELECT * FROM a)
+SELECT * FROM cte JOIN other.b ON cte.id = b.id
+WHERE c IN (SELECT c FROM cat.other.c)
+        """,
+        "postgresql",
+    )
+    assert statement.get_source_tables("catalog", "public") == {
+        Table("a", "public", "catalog"),
+        Table("b", "other", "catalog"),
+        Table("c", "other", "cat"),
+    }
+
+
+def test_parse_predicate() -> None:
+    """
+    Test that predicates must have a single expression.
+    """
+    assert SQLStatement.parse_predicate("id = 42", "postgresql").sql() == "id = 42"
+
+    with pytest.raises(RamaParseError):
+        SQLStatement.parse_predicate("id = 42; id = 43", "postgresql")
@@ -21,7 +21,6 @@ from unittest import mock
 from uuid import UUID
 
 import pytest
-import sqlparse
 from freezegun import freeze_time
 from pytest_mock import MockerFixture
 from sqlalchemy.orm.session import Session
@@ -31,6 +30,7 @@ from rama.common.db_query_status import QueryStatus
 from rama.errors import ErrorLevel, RamaErrorType
 from rama.exceptions import OAuth2Error, RamaErrorException
 from rama.models.core import Database
+from rama.sql.parse import RLSMethod
 from rama.sql_lab import execute_sql_statements, get_sql_results
 from rama.utils.core import override_user
 from tests.unit_tests.models.core_test import oauth2_client_info
@@ -100,9 +100,9 @@ def test_execute_sql_statement_with_rls(
 
     cursor = mocker.MagicMock()
     RamaResultSet = mocker.patch("rama.sql_lab.RamaResultSet")  # noqa: N806
-    mocker.patch(
-        "rama.sql_lab.insert_rls_as_subquery",
-        return_value=sqlparse.parse("SELECT * FROM sales WHERE organization_id=42")[0],
+    apply_rls = mocker.patch(
+        "rama.sql_lab.apply_rls",
+        return_value="SELECT * FROM sales WHERE organization_id=42",
     )
     mocker.patch("rama.sql_lab.is_feature_enabled", return_value=True)
 
@@ -114,6 +114,13 @@ def test_execute_sql_statement_with_rls(
         apply_ctas=False,
     )
 
+    apply_rls.assert_called_with(
+        sql_statement,
+        database.id,
+        db_engine_spec.engine,
+        query.schema,
+        RLSMethod.AS_SUBQUERY,
+    )
     database.apply_limit_to_sql.assert_called_with(
         "SELECT * FROM sales WHERE organization_id=42",
         101,
@@ -127,6 +134,48 @@ def test_execute_sql_statement_with_rls(
     RamaResultSet.assert_called_with([(42,)], cursor.description, db_engine_spec)
 
 
+@mock.patch.dict("rama.sql_lab.config", {"FETCH_DATA_IN_BATCHES": True})
+def test_execute_sql_statement_fetch_data_in_batches(mocker: MockerFixture) -> None:
+    """
+    Test for `execute_sql_statement` when results are fetched in batches.
+    """
+    from rama.db_engine_specs.base import BaseEngineSpec
+    from rama.result_set import RamaResultSet
+    from rama.sql_lab import execute_sql_statement
+
+    query = mocker.MagicMock()
+    query.limit = 2
+    query.select_as_cta_used = False
+    database = query.database
+    database.allow_dml = False
+    database.mutate_sql_based_on_config.return_value = "SELECT 42 AS answer LIMIT 3"
+    db_engine_spec = database.db_engine_spec
+    db_engine_spec.is_select_query.return_value = True
+    db_engine_spec.fetch_data_batches.return_value = iter(
+        [
+            RamaResultSet.convert_rows([(1,), (2,)], ["answer"]),
+            RamaResultSet.convert_rows([(3,)], ["answer"]),
+        ]
+    )
+    db_engine_spec.get_datatype = BaseEngineSpec.get_datatype
+
+    cursor = mocker.MagicMock()
+    cursor.description = [("answer", "INTEGER")]
+
+    result_set = execute_sql_statement(
+        "SELECT 42 AS answer",
+        query,
+        cursor=cursor,
+        log_params={},
+        apply_ctas=False,
+    )
+
+    db_engine_spec.fetch_data_batches.assert_called_with(cursor, 3)
+    db_engine_spec.fetch_data.assert_not_called()
+    # the extra row is only used to know that the query was limited
+    assert result_set.to_pandas_df().to_dict(orient="list") == {"answer": [1, 2]}
+
+
 @mock.patch.dict(
     "rama.sql_lab.config",
     {"SQLLAB_PAYLOAD_MAX_MB": 50},  # Set the desired config value for testing
@@ -149,16 +198,14 @@ def test_execute_sql_statement_exceeds_payload_limit(mocker: MockerFixture) -> N
     # Mock get_query to return our mocked query object
     mocker.patch("rama.sql_lab.get_query", return_value=query)
 
-    # Mock sys.getsizeof to simulate a large payload size
-    mocker.patch("sys.getsizeof", return_value=100000000)  # 100 MB
+    # Shrink a MB to a byte to simulate a large payload size
+    mocker.patch("rama.sql_lab.BYTES_IN_MB", 1)
 
     # Mock _serialize_payload
     def mock_serialize_payload(payload, use_msgpack):
-        return "serialized_payload"
+        return "serialized_payload" * 10
 
-    mocker.patch(
-        "rama.sql_lab._serialize_payload", side_effect=mock_serialize_payload
-    )
+    mocker.patch("rama.sql_lab._serialize_payload", side_effect=mock_serialize_payload)
 
     # Mock db.session.refresh to avoid AttributeError during session refresh
     mocker.patch("rama.sql_lab.db.session.refresh", return_value=None)
@@ -202,16 +249,13 @@ def test_execute_sql_statement_within_payload_limit(mocker: MockerFixture) -> No
     # Mock get_query to return our mocked query object
     mocker.patch("rama.sql_lab.get_query", return_value=query)
 
-    # Mock sys.getsizeof to simulate a payload size that is within the limit
-    mocker.patch("sys.getsizeof", return_value=10000000)  # 10 MB (within limit)
+    query.to_dict.return_value = {"id": 1}
 
     # Mock _serialize_payload
     def mock_serialize_payload(payload, use_msgpack):
         return "serialized_payload"
 
-    mocker.patch(
-        "rama.sql_lab._serialize_payload", side_effect=mock_serialize_payload
-    )
+    mocker.patch("rama.sql_lab._serialize_payload", side_effect=mock_serialize_payload)
 
     # Mock db.session.refresh to avoid AttributeError during session refresh
     mocker.patch("rama.sql_lab.db.session.refresh", return_value=None)
@@ -241,7 +285,7 @@ def test_sql_lab_insert_rls_as_subquery(
     session: Session,
 ) -> None:
     """
-    Integration test for `insert_rls_as_subquery`.
+    Integration test for RLS applied as a subquery.
     """
     from flask_appbuilder.security.sqla.models import Role, User
 
@@ -346,48 +390,126 @@ def test_get_sql_results_oauth2(mocker: MockerFixture, app) -> None:
     """
     Test that `get_sql_results` works with OAuth2.
     """
-    app_context = app.test_request_context()
-    app_context.push()
+    with app.test_request_context():
+        mocker.patch(
+            "rama.db_engine_specs.base.uuid4",
+            return_value=UUID("fb11f528-6eba-4a8a-837e-6b0d39ee9187"),
+        )
 
-    mocker.patch(
-        "rama.db_engine_specs.base.uuid4",
-        return_value=UUID("fb11f528-6eba-4a8a-837e-6b0d39ee9187"),
-    )
+        g = mocker.patch("rama.db_engine_specs.base.g")
+        g.user = mocker.MagicMock()
+        g.user.id = 42
 
-    g = mocker.patch("rama.db_engine_specs.base.g")
-    g.user = mocker.MagicMock()
-    g.user.id = 42
+        database = Database(
+            id=1,
+            database_name="my_db",
+            sqlalchemy_uri="sqlite://",
+            encrypted_extra=json.dumps(oauth2_client_info),
+        )
+        database.db_engine_spec.oauth2_exception = OAuth2Error  # type: ignore
+        get_sqla_engine = mocker.patch.object(database, "get_sqla_engine")
+        get_sqla_engine().__enter__().raw_connection.side_effect = OAuth2Error(
+            "OAuth2 required"
+        )
 
-    database = Database(
-        id=1,
-        database_name="my_db",
-        sqlalchemy_uri="sqlite://",
-        encrypted_extra=json.dumps(oauth2_client_info),
-    )
-    database.db_engine_spec.oauth2_exception = OAuth2Error  # type: ignore
-    get_sqla_engine = mocker.patch.object(database, "get_sqla_engine")
-    get_sqla_engine().__enter__().raw_connection.side_effect = OAuth2Error(
-        "OAuth2 required"
-    )
+        query = mocker.MagicMock()
+        query.database = database
+        mocker.patch("rama.sql_lab.get_query", return_value=query)
+
+        payload = get_sql_results(query_id=1, rendered_query="SELECT 1")
+        assert payload == {
+            "status": QueryStatus.FAILED,
+            "error": "You don't have permission to access the data.",
+            "errors": [
+                {
+                    "message": "You don't have permission to access the data.",
+                    "error_type": RamaErrorType.OAUTH2_REDIRECT,
+                    "level": ErrorLevel.WARNING,
+                    "extra": {
+                        "url": "https://abcd1234.snowflakecomputing.com/oauth/authorize?scope=refresh_token+session%3Arole%3AUSERADMIN&access_type=offline&include_granted_scopes=false&response_type=code&state=eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9%252EeyJleHAiOjE2MTcyMzU1MDAsImRhdGFiYXNlX2lkIjoxLCJ1c2VyX2lkIjo0MiwiZGVmYXVsdF9yZWRpcmVjdF91cmkiOiJodHRwOi8vbG9jYWxob3N0L2FwaS92MS9kYXRhYmFzZS9vYXV0aDIvIiwidGFiX2lkIjoiZmIxMWY1MjgtNmViYS00YThhLTgzN2UtNmIwZDM5ZWU5MTg3In0%252E7nLkei6-V8sVk_Pgm8cFhk0tnKRKayRE1Vc7RxuM9mw&redirect_uri=http%3A%2F%2Flocalhost%2Fapi%2Fv1%2Fdatabase%2Foauth2%2F&client_id=my_client_id&prompt=consent",
+                        "tab_id": "fb11f528-6eba-4a8a-837e-6b0d39ee9187",
+                        "redirect_uri": "http://localhost/api/v1/database/oauth2/",
+                    },
+                }
+            ],
+        }
+
+
+@mock.patch.dict("rama.sql_lab.config", {"SQLLAB_RESULTS_CHUNK_SIZE": 2})
+def test_execute_sql_statements_chunked_results(mocker: MockerFixture) -> None:
+    """
+    Test for `execute_sql_statements` when the results are stored in chunks.
+    """
+    import msgpack
+    import pyarrow as pa
+
+    from rama.sqllab import chunked_results
+    from rama.utils.core import zlib_decompress
 
     query = mocker.MagicMock()
-    query.database = database
+    query.database.cache_timeout = 100
+    query.status = "RUNNING"
+    query.select_as_cta = False
+    query.database.allow_run_async = True
+    query.to_dict.return_value = {"id": 1}
     mocker.patch("rama.sql_lab.get_query", return_value=query)
+    mocker.patch("rama.sql_lab.db.session.refresh", return_value=None)
+    mocker.patch("rama.sql_lab.results_backend_use_msgpack", True)
+    results_backend = mocker.patch("rama.sql_lab.results_backend")
+
+    result_set = mocker.MagicMock()
+    result_set.pa_table = pa.table({"answer": [1, 2, 3, 4, 5]})
+    result_set.columns = [{"column_name": "answer", "name": "answer"}]
+    mocker.patch("rama.sql_lab.execute_sql_statement", return_value=result_set)
+    serialize_and_expand_data = mocker.patch("rama.sql_lab._serialize_and_expand_data")
+
+    execute_sql_statements(
+        query_id=1,
+        rendered_query="SELECT answer FROM t",
+        return_results=False,
+        store_results=True,
+        start_time=None,
+        expand_data=False,
+        log_params={},
+    )
+
+    serialize_and_expand_data.assert_not_called()
+    chunks = results_backend.set_many.call_args[0][0]
+    assert len(chunks) == 3
+    key, blob, _ = results_backend.set.call_args[0]
+    assert list(chunks) == [chunked_results.get_chunk_key(key, i) for i in range(3)]
+    payload = msgpack.loads(zlib_decompress(blob, decode=False), raw=False)
+    assert payload["data"] is None
+    assert payload[chunked_results.MANIFEST_KEY]["num_rows"] == 5
+
+
+@mock.patch("rama.sql_lab.JSON_SERIALIZATION_BATCH_SIZE", 2)
+def test_serialize_json_payload() -> None:
+    """
+    Test that `_serialize_json_payload` produces the same JSON as `json.dumps`.
+    """
+    from rama.sql_lab import _serialize_json_payload
+
+    for data in ([], [{"a": 1}], [{"a": i, "b": f"{i}"} for i in range(5)], None):
+        payload = {"status": "success", "data": data, "query": {"id": 1}}
+        assert json.loads(_serialize_json_payload(payload)) == payload
+
+
+@mock.patch.dict("rama.sql_lab.config", {"SQLLAB_PAYLOAD_MAX_MB": 1})
+@mock.patch("rama.sql_lab.JSON_SERIALIZATION_BATCH_SIZE", 10)
+@mock.patch("rama.sql_lab.BYTES_IN_MB", 100)
+def test_serialize_json_payload_exceeds_limit(mocker: MockerFixture) -> None:
+    """
+    Test that `_serialize_json_payload` stops encoding once the limit is exceeded.
+    """
+    from rama import sql_lab
+
+    dumps = mocker.spy(sql_lab.json, "dumps")
+    payload = {"status": "success", "data": [{"a": i} for i in range(1000)]}
+
+    with pytest.raises(RamaErrorException) as excinfo:
+        sql_lab._serialize_json_payload(payload, keep=False)
 
-    payload = get_sql_results(query_id=1, rendered_query="SELECT 1")
-    assert payload == {
-        "status": QueryStatus.FAILED,
-        "error": "You don't have permission to access the data.",
-        "errors": [
-            {
-                "message": "You don't have permission to access the data.",
-                "error_type": RamaErrorType.OAUTH2_REDIRECT,
-                "level": ErrorLevel.WARNING,
-                "extra": {
-                    "url": "https://abcd1234.snowflakecomputing.com/oauth/authorize?scope=refresh_token+session%3Arole%3AUSERADMIN&access_type=offline&include_granted_scopes=false&response_type=code&state=eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9%252EeyJleHAiOjE2MTcyMzU1MDAsImRhdGFiYXNlX2lkIjoxLCJ1c2VyX2lkIjo0MiwiZGVmYXVsdF9yZWRpcmVjdF91cmkiOiJodHRwOi8vbG9jYWxob3N0L2FwaS92MS9kYXRhYmFzZS9vYXV0aDIvIiwidGFiX2lkIjoiZmIxMWY1MjgtNmViYS00YThhLTgzN2UtNmIwZDM5ZWU5MTg3In0%252E7nLkei6-V8sVk_Pgm8cFhk0tnKRKayRE1Vc7RxuM9mw&redirect_uri=http%3A%2F%2Flocalhost%2Fapi%2Fv1%2Fdatabase%2Foauth2%2F&client_id=my_client_id&prompt=consent",
-                    "tab_id": "fb11f528-6eba-4a8a-837e-6b0d39ee9187",
-                    "redirect_uri": "http://localhost/api/v1/database/oauth2/",
-                },
-            }
-        ],
-    }
+    assert excinfo.value.error.error_type == RamaErrorType.RESULT_TOO_LARGE_ERROR
+    # the header and the first batch, out of 100 batches
+    assert dumps.call_count == 2
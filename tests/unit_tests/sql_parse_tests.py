@@ -16,6 +16,7 @@
 # under the License.
 # pylint: disable=invalid-name, redefined-outer-name, too-many-lines
 
+from collections.abc import Callable
 from typing import Optional
 from unittest import mock
 
@@ -30,13 +31,15 @@ from rama.exceptions import (
     QueryClauseValidationException,
     RamaSecurityException,
 )
-from rama.sql.parse import Table
+from rama.sql.parse import RLSMethod, SQLStatement, Table
 from rama.sql_parse import (
     add_table_name,
+    apply_rls,
     check_sql_functions_exist,
     extract_table_references,
     extract_tables_from_jinja_sql,
     get_rls_for_table,
+    get_rls_predicates,
     has_table_query,
     insert_rls_as_subquery,
     insert_rls_in_predicate,
@@ -1144,6 +1147,22 @@ def test_get_query_with_new_limit_upper() -> None:
     )
 
 
+def test_get_query_with_new_limit_shared_statement() -> None:
+    """
+    Test that updating the limit doesn't modify the statements in the parse cache.
+    """
+    sql = "SELECT * FROM birth_names LIMIT 2000"
+    assert ParsedQuery(sql).set_or_update_query_limit(1000) == (
+        "SELECT * FROM birth_names LIMIT 1000"
+    )
+
+    query = ParsedQuery(sql)
+    assert query.limit == 2000
+    assert query.set_or_update_query_limit(1500) == (
+        "SELECT * FROM birth_names LIMIT 1500"
+    )
+
+
 def test_basic_breakdown_statements() -> None:
     """
     Test that multiple statements are parsed correctly.
@@ -1783,6 +1802,128 @@ def test_get_rls_for_table(mocker: MockerFixture) -> None:
     assert get_rls_for_table(candidate, 1, "public") is None
 
 
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM some_table WHERE 1=1",
+        "SELECT * FROM some_table WHERE TRUE OR FALSE",
+        "SELECT * FROM other_table WHERE 1=1",
+        "SELECT * FROM some_table",
+        "SELECT * FROM some_table ORDER BY id",
+        "SELECT * FROM some_table WHERE 1=1 AND some_table.id=42",
+        "SELECT * FROM other_table JOIN some_table ON other_table.id = some_table.id",
+        (
+            "SELECT * FROM other_table JOIN some_table "
+            "ON other_table.id = some_table.id WHERE 1=1"
+        ),
+        "SELECT * FROM (SELECT * FROM some_table)",
+        "SELECT * FROM some_table UNION ALL SELECT * FROM other_table",
+        "SELECT * FROM other_table UNION ALL SELECT * FROM some_table",
+        "SELECT * FROM my_schema.some_table",
+    ],
+)
+@pytest.mark.parametrize(
+    "method,insert_rls",
+    [
+        (RLSMethod.AS_SUBQUERY, insert_rls_as_subquery),
+        (RLSMethod.AS_PREDICATE, insert_rls_in_predicate),
+    ],
+)
+def test_apply_rls_equivalence(
+    mocker: MockerFixture,
+    sql: str,
+    method: RLSMethod,
+    insert_rls: Callable[[TokenList, int, Optional[str]], TokenList],
+) -> None:
+    """
+    Test that the sqlglot RLS rewrite is equivalent to the sqlparse token walker.
+    """
+    mocker.patch(
+        "rama.sql_parse.get_rls_for_table",
+        side_effect=lambda candidate, database_id, default_schema: (
+            sqlparse.parse("some_table.id=42")[0]
+            if str(candidate).split(".")[-1] == "some_table"
+            else None
+        ),
+    )
+    expected = str(insert_rls(sqlparse.parse(sql)[0], 1, "my_schema"))
+
+    predicates = {
+        Table("some_table", "my_schema"): [
+            SQLStatement.parse_predicate("id=42", "postgresql")
+        ],
+    }
+    statement = SQLStatement(sql, "postgresql")
+
+    assert (
+        statement.apply_rls(None, "my_schema", predicates, method).format()
+        == SQLStatement(expected, "postgresql").format()
+    )
+
+
+def test_get_rls_predicates(mocker: MockerFixture) -> None:
+    """
+    Test that the datasets of all the tables are loaded in a single query.
+    """
+    some_table = mocker.MagicMock(schema="public", table_name="some_table")
+    some_table.get_sqla_row_level_filters.return_value = [
+        text("(organization_id = 1)"),
+        text("(foo = 'bar')"),
+    ]
+    other_table = mocker.MagicMock(schema="public", table_name="other_table")
+    other_table.get_sqla_row_level_filters.return_value = []
+    query = mocker.patch("rama.db").session.query
+    query.return_value.filter.return_value = [some_table, other_table]
+
+    predicates = get_rls_predicates(
+        {
+            Table("some_table", "public"),
+            Table("other_table", "public"),
+            Table("unknown_table", "public"),
+        },
+        1,
+        "postgresql",
+    )
+
+    query.return_value.filter.assert_called_once()
+    assert {
+        table: [predicate.sql() for predicate in table_predicates]
+        for table, table_predicates in predicates.items()
+    } == {Table("some_table", "public"): ["(organization_id = 1)", "(foo = 'bar')"]}
+
+    assert get_rls_predicates(set(), 1, "postgresql") == {}
+
+
+def test_apply_rls(mocker: MockerFixture) -> None:
+    """
+    Test applying RLS to a SQL script.
+    """
+    get_rls_predicates = mocker.patch(
+        "rama.sql_parse.get_rls_predicates",
+        return_value={},
+    )
+    sql = "select * from some_table"
+
+    # the SQL is returned unmodified without RLS
+    assert apply_rls(sql, 1, "postgresql", "public", RLSMethod.AS_SUBQUERY) == sql
+    get_rls_predicates.assert_called_once_with(
+        {Table("some_table", "public")},
+        1,
+        "postgresql",
+    )
+
+    get_rls_predicates.return_value = {
+        Table("some_table", "public"): [
+            SQLStatement.parse_predicate("id = 42", "postgresql")
+        ],
+    }
+    assert (
+        apply_rls(sql, 1, "postgresql", "public", RLSMethod.AS_SUBQUERY)
+        == "SELECT * FROM (SELECT * FROM some_table WHERE some_table.id = 42) "
+        "AS some_table"
+    )
+
+
 def test_extract_table_references(mocker: MockerFixture) -> None:
     """
     Test the ``extract_table_references`` helper function.
@@ -0,0 +1,112 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from typing import Optional
+
+import pyarrow as pa
+import pytest
+from flask_caching.backends.simplecache import SimpleCache
+from pytest_mock import MockerFixture
+
+from rama.exceptions import SerializationError
+from rama.sqllab.chunked_results import (
+    ChunkedResultsManifest,
+    get_chunk_key,
+    get_manifest,
+    MANIFEST_KEY,
+    read_table,
+    serialize_table,
+)
+
+
+def store(
+    cache: SimpleCache,
+    table: pa.Table,
+    chunk_size: int,
+) -> ChunkedResultsManifest:
+    manifest, chunks = serialize_table(table, "key", chunk_size, "lz4")
+    cache.set_many(chunks)
+    return manifest
+
+
+def test_serialize_table() -> None:
+    table = pa.table({"a": list(range(10)), "b": [str(i) for i in range(10)]})
+    manifest, chunks = serialize_table(table, "key", 4)
+
+    assert manifest == {
+        "version": 1,
+        "num_rows": 10,
+        "chunk_size": 4,
+        "num_chunks": 3,
+    }
+    assert list(chunks) == ["key__chunk_0", "key__chunk_1", "key__chunk_2"]
+
+
+def test_serialize_table_empty() -> None:
+    table = pa.table({"a": pa.array([], type=pa.int64())})
+    cache = SimpleCache()
+    manifest = store(cache, table, 4)
+
+    assert manifest["num_chunks"] == 1
+    assert read_table(cache, "key", manifest).equals(table)
+
+
+@pytest.mark.parametrize(
+    "offset,limit,expected",
+    [
+        (0, None, list(range(10))),
+        (0, 3, [0, 1, 2]),
+        (3, 3, [3, 4, 5]),
+        (2, 5, [2, 3, 4, 5, 6]),
+        (8, 10, [8, 9]),
+        (12, 5, []),
+        (4, 0, []),
+    ],
+)
+def test_read_table(offset: int, limit: Optional[int], expected: list[int]) -> None:
+    table = pa.table({"a": list(range(10))})
+    cache = SimpleCache()
+    manifest = store(cache, table, 3)
+
+    result = read_table(cache, "key", manifest, offset, limit)
+    assert result.column("a").to_pylist() == expected
+
+
+def test_read_table_only_fetches_needed_chunks(mocker: MockerFixture) -> None:
+    table = pa.table({"a": list(range(10))})
+    cache = SimpleCache()
+    manifest = store(cache, table, 3)
+    get_many = mocker.spy(cache, "get_many")
+
+    read_table(cache, "key", manifest, 4, 4)
+    get_many.assert_called_once_with(get_chunk_key("key", 1), get_chunk_key("key", 2))
+
+
+def test_read_table_missing_chunk() -> None:
+    table = pa.table({"a": list(range(10))})
+    cache = SimpleCache()
+    manifest = store(cache, table, 3)
+    cache.delete(get_chunk_key("key", 1))
+
+    with pytest.raises(SerializationError):
+        read_table(cache, "key", manifest)
+
+
+def test_get_manifest() -> None:
+    manifest = serialize_table(pa.table({"a": [1]}), "key", 3)[0]
+
+    assert get_manifest({"data": None, MANIFEST_KEY: manifest}) == manifest
+    assert get_manifest({"data": b""}) is None
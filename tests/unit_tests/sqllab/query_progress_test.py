@@ -0,0 +1,169 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from rama.common.db_query_status import QueryStatus
+from rama.models.sql_lab import Query
+from rama.sqllab.query_progress import (
+    CHANNEL_ID_KEY,
+    get_progress,
+    QueryProgressTracker,
+)
+
+
+@pytest.fixture
+def query() -> Query:
+    query = Query(id=1, client_id="abc", user_id=2, progress=0)
+    query.status = QueryStatus.RUNNING
+    query.set_extra_json_key(CHANNEL_ID_KEY, "channel")
+    return query
+
+
+@pytest.fixture
+def channel(mocker: MockerFixture) -> MagicMock:
+    mocker.patch("rama.sqllab.query_progress.is_enabled", return_value=True)
+    return mocker.patch(
+        "rama.sqllab.query_progress.async_query_manager", new=MagicMock()
+    )
+
+
+def test_tracker_channel(
+    mocker: MockerFixture,
+    query: Query,
+    channel: MagicMock,
+) -> None:
+    """
+    Test that the progress is published to the channel without touching the query.
+    """
+    db = mocker.patch("rama.sqllab.query_progress.db")
+    channel.is_query_stopped.return_value = False
+    tracker = QueryProgressTracker(query)
+
+    assert not tracker.is_stopped()
+    tracker.set_progress(50)
+    tracker.set_progress(40)
+
+    channel.is_query_stopped.assert_called_once_with("abc")
+    channel.set_query_progress.assert_called_once_with(
+        "abc",
+        50,
+        {
+            "channel_id": "channel",
+            "job_id": "abc",
+            "user_id": 2,
+            "status": None,
+            "errors": [],
+            "result_url": None,
+        },
+    )
+    assert query.progress == 0
+    db.session.refresh.assert_not_called()
+    db.session.commit.assert_not_called()
+
+
+def test_tracker_channel_stopped(query: Query, channel: MagicMock) -> None:
+    """
+    Test that a query stopped through the channel is reported as stopped.
+    """
+    channel.is_query_stopped.return_value = True
+
+    assert QueryProgressTracker(query).is_stopped()
+
+
+def test_tracker_channel_error(query: Query, channel: MagicMock) -> None:
+    """
+    Test that failing to publish the progress doesn't fail the query.
+    """
+    channel.set_query_progress.side_effect = Exception("Redis is down")
+
+    QueryProgressTracker(query).set_progress(50)
+
+
+def test_tracker_channel_stopped_error(query: Query, channel: MagicMock) -> None:
+    """
+    Test that failing to read whether the query was stopped doesn't stop it.
+    """
+    channel.is_query_stopped.side_effect = Exception("Redis is down")
+
+    assert not QueryProgressTracker(query).is_stopped()
+
+
+def test_tracker_metadata_db(mocker: MockerFixture, query: Query) -> None:
+    """
+    Test that without the channel the progress is written to the query.
+    """
+    mocker.patch("rama.sqllab.query_progress.is_enabled", return_value=False)
+    db = mocker.patch("rama.sqllab.query_progress.db")
+    tracker = QueryProgressTracker(query)
+
+    assert not tracker.is_stopped()
+    query.status = QueryStatus.STOPPED
+    assert tracker.is_stopped()
+    tracker.set_progress(50)
+    tracker.set_progress(40)
+
+    assert db.session.refresh.call_count == 2
+    assert query.progress == 50
+    db.session.commit.assert_called_once()
+
+
+def test_get_progress(channel: MagicMock) -> None:
+    """
+    Test that the progress is only read for running queries.
+    """
+    channel.get_queries_progress.return_value = {"abc": 50}
+    queries = [
+        Query(client_id="abc", status=QueryStatus.RUNNING),
+        Query(client_id="def", status=QueryStatus.SUCCESS),
+    ]
+
+    assert get_progress(queries) == {"abc": 50}
+    channel.get_queries_progress.assert_called_once_with(["abc"])
+
+
+def test_presto_handle_cursor(
+    mocker: MockerFixture,
+    query: Query,
+    channel: MagicMock,
+) -> None:
+    """
+    Test that Presto reports the progress and checks for cancellation through the
+    channel.
+    """
+    from rama.db_engine_specs.presto import PrestoEngineSpec
+
+    mocker.patch("rama.sqllab.query_progress.db")
+    mocker.patch("rama.db_engine_specs.presto.time")
+    mocker.patch.object(PrestoEngineSpec, "get_tracking_url", return_value=None)
+    query.database = MagicMock()
+    query.database.connect_args = {}
+    channel.is_query_stopped.side_effect = [False, True]
+    cursor = MagicMock()
+    cursor.poll.side_effect = [
+        {"stats": {"state": "RUNNING", "completedSplits": 1, "totalSplits": 4}},
+        {"stats": {"state": "RUNNING", "completedSplits": 2, "totalSplits": 4}},
+    ]
+
+    PrestoEngineSpec.handle_cursor(cursor, query)
+
+    channel.set_query_progress.assert_called_once()
+    assert channel.set_query_progress.call_args[0][:2] == ("abc", 25.0)
+    cursor.cancel.assert_called_once()
@@ -53,3 +53,36 @@ def test_load_chart_data_into_cache_with_error(
     mock_async_query_manager.update_job.assert_called_once_with(
         job_metadata, "error", errors=expected_errors
     )
+
+
+@mock.patch("rama.tasks.async_queries.security_manager")
+@mock.patch("rama.tasks.async_queries.ChartDataQueryContextSchema")
+def test_refresh_chart_data_cache(mock_query_context_schema_cls, mock_security_manager):
+    """Test that the query context is loaded again to refresh the cache key"""
+    from rama.tasks.async_queries import refresh_chart_data_cache
+
+    form_data = {"datasource": {"id": 1, "type": "table"}, "queries": [{}]}
+    query_context = mock_query_context_schema_cls.return_value.load.return_value
+
+    refresh_chart_data_cache({"user_id": 1}, form_data, "key")
+
+    mock_security_manager.get_user_by_id.assert_called_once_with(1)
+    mock_query_context_schema_cls.return_value.load.assert_called_once_with(form_data)
+    query_context.raise_for_access.assert_called_once()
+    query_context.refresh_query_result.assert_called_once_with("key")
+
+
+@mock.patch("rama.tasks.async_queries.security_manager")
+@mock.patch("rama.tasks.async_queries.ChartDataQueryContextSchema")
+def test_refresh_chart_data_cache_forbidden(
+    mock_query_context_schema_cls, mock_security_manager
+):
+    """Test that the cache key is not refreshed if the user lost access"""
+    from rama.tasks.async_queries import refresh_chart_data_cache
+
+    query_context = mock_query_context_schema_cls.return_value.load.return_value
+    query_context.raise_for_access.side_effect = Exception("Forbidden")
+
+    refresh_chart_data_cache({"user_id": 1}, {}, "key")
+
+    query_context.refresh_query_result.assert_not_called()
@@ -0,0 +1,43 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import importlib
+import sys
+
+from celery.signals import worker_process_shutdown
+from pytest_mock import MockerFixture
+
+from rama.utils.log import BufferedDBEventLogger
+
+
+def test_flush_event_logger_on_worker_process_shutdown(mocker: MockerFixture) -> None:
+    """
+    Test that the buffered event logger is flushed when a pool process exits.
+    """
+    mocker.patch("rama.create_app")
+    mocker.patch.dict(sys.modules)
+    sys.modules.pop("rama.tasks.celery_app", None)
+    celery_app = importlib.import_module("rama.tasks.celery_app")
+
+    event_logger = BufferedDBEventLogger()
+    shutdown = mocker.patch.object(event_logger, "shutdown")
+    mocker.patch.object(celery_app, "event_logger", event_logger)
+    mocker.patch.object(celery_app, "browser_pool")
+
+    worker_process_shutdown.send(sender=None, pid=1, exitcode=0)
+
+    shutdown.assert_called_once()
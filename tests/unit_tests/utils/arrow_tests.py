@@ -0,0 +1,81 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+from rama.utils import json
+from rama.utils.arrow import (
+    arrow_table_to_ipc_bytes,
+    df_to_arrow_table,
+    METADATA_KEY,
+    stream_arrow_table,
+)
+
+
+def test_df_to_arrow_table() -> None:
+    df = pd.DataFrame(
+        {
+            "a": [1, 2, 3],
+            "b": [1.5, None, 3.5],
+            "c": [datetime(2024, 1, 1), datetime(2024, 1, 2), None],
+            "d": ["x", None, "z"],
+        }
+    )
+    table = df_to_arrow_table(df)
+
+    assert table.column_names == ["a", "b", "c", "d"]
+    assert table.schema.field("a").type == pa.int64()
+    assert table.schema.field("c").type == pa.timestamp("ns")
+    assert table.to_pandas().equals(df)
+
+
+def test_df_to_arrow_table_mixed_types() -> None:
+    df = pd.DataFrame({"a": [1, "two", None]})
+    table = df_to_arrow_table(df)
+
+    assert table.schema.field("a").type == pa.string()
+    assert table.column("a").to_pylist() == ["1", "two", None]
+
+
+def test_df_to_arrow_table_index() -> None:
+    df = pd.DataFrame({"value": [1, 2]}, index=pd.Index(["a", "b"], name="name"))
+    table = df_to_arrow_table(df, index=True)
+
+    assert table.column_names == ["name", "value"]
+    assert table.column("name").to_pylist() == ["a", "b"]
+
+
+def test_stream_arrow_table() -> None:
+    table = pa.table({"a": list(range(10))})
+    chunks = list(stream_arrow_table(table, {"rowcount": 10}, batch_size=3))
+
+    # schema and 4 batches, then the end of stream marker
+    assert len(chunks) == 5
+    with pa.ipc.open_stream(b"".join(chunks)) as reader:
+        result = reader.read_all()
+    assert result.column("a").to_pylist() == list(range(10))
+    assert json.loads(result.schema.metadata[METADATA_KEY]) == {"rowcount": 10}
+
+
+def test_arrow_table_to_ipc_bytes() -> None:
+    table = pa.table({"a": [1, 2]})
+    with pa.ipc.open_stream(arrow_table_to_ipc_bytes(table)) as reader:
+        result = reader.read_all()
+    assert result.equals(table)
+    assert METADATA_KEY not in (result.schema.metadata or {})
@@ -0,0 +1,169 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from flask import current_app
+from pytest_mock import MockerFixture
+
+from rama.utils.browser_pool import BrowserPool, PooledBrowser
+
+
+def create_browser() -> PooledBrowser[MagicMock]:
+    browser = MagicMock()
+    return PooledBrowser(browser, browser.close, browser.is_connected)
+
+
+def test_lease_reuses_browser() -> None:
+    """
+    Test that the browser is kept alive between leases.
+    """
+    pool = BrowserPool()
+    create = MagicMock(side_effect=create_browser)
+
+    with pool.lease("playwright", create) as first:
+        first.pages += 1
+    with pool.lease("playwright", create) as second:
+        second.pages += 1
+
+    assert first is second
+    assert second.pages == 2
+    create.assert_called_once()
+    first.browser.close.assert_not_called()
+
+
+def test_lease_per_key_and_thread() -> None:
+    """
+    Test that browsers are not shared between kinds of browsers and threads.
+    """
+    pool = BrowserPool()
+    leased = []
+    app = current_app._get_current_object()
+
+    def lease(key: str) -> None:
+        with app.app_context():
+            with pool.lease(key, create_browser) as pooled:
+                leased.append(pooled)
+
+    lease("playwright")
+    lease("firefox")
+    thread = threading.Thread(target=lease, args=("playwright",))
+    thread.start()
+    thread.join()
+    lease("playwright")
+
+    assert len({id(pooled) for pooled in leased}) == 3
+    assert leased[0] is leased[3]
+
+
+def test_lease_recycles_after_max_pages() -> None:
+    """
+    Test that a browser is closed once it has loaded too many pages.
+    """
+    pool = BrowserPool()
+    current_app.config["WEBDRIVER_POOL_MAX_PAGES"] = 2
+
+    with pool.lease("playwright", create_browser) as first:
+        first.pages += 2
+    with pool.lease("playwright", create_browser) as second:
+        pass
+
+    assert first is not second
+    first.browser.close.assert_called_once()
+
+    current_app.config["WEBDRIVER_POOL_MAX_PAGES"] = 100
+
+
+def test_lease_recycles_on_memory(mocker: MockerFixture) -> None:
+    """
+    Test that a browser is closed when the browser processes use too much memory.
+    """
+    pool = BrowserPool()
+    current_app.config["WEBDRIVER_POOL_MAX_MEMORY_MB"] = 100
+    mocker.patch(
+        "rama.utils.browser_pool.get_browser_processes_memory",
+        return_value=200 * 1024 * 1024,
+    )
+
+    with pool.lease("playwright", create_browser) as first:
+        pass
+
+    first.browser.close.assert_called_once()
+
+    current_app.config["WEBDRIVER_POOL_MAX_MEMORY_MB"] = 0
+
+
+def test_lease_health_check() -> None:
+    """
+    Test that an idle browser which fails its health check is replaced.
+    """
+    pool = BrowserPool()
+
+    with pool.lease("playwright", create_browser) as first:
+        first.browser.is_connected.return_value = False
+    with pool.lease("playwright", create_browser) as second:
+        pass
+
+    assert first is not second
+    first.browser.close.assert_called_once()
+
+
+def test_lease_error() -> None:
+    """
+    Test that a browser is only kept after an error if it's still healthy.
+    """
+    pool = BrowserPool()
+    leased = []
+
+    def take_screenshot(crash: bool) -> None:
+        with pool.lease("playwright", create_browser) as pooled:
+            leased.append(pooled)
+            if crash:
+                pooled.browser.is_connected.side_effect = Exception("Browser crashed")
+            raise ValueError("Screenshot failed")
+
+    with pytest.raises(ValueError, match="Screenshot failed"):
+        take_screenshot(crash=False)
+    with pytest.raises(ValueError, match="Screenshot failed"):
+        take_screenshot(crash=True)
+    with pool.lease("playwright", create_browser) as pooled:
+        leased.append(pooled)
+
+    assert leased[0] is leased[1]
+    assert leased[2] is not leased[1]
+    leased[1].browser.close.assert_called_once()
+
+
+def test_close_all() -> None:
+    """
+    Test that all the browsers are closed.
+    """
+    pool = BrowserPool()
+    with pool.lease("playwright", create_browser) as first:
+        pass
+    with pool.lease("firefox", create_browser) as second:
+        pass
+
+    pool.close_all()
+
+    first.browser.close.assert_called_once()
+    second.browser.close.assert_called_once()
+    with pool.lease("playwright", create_browser) as third:
+        pass
+    assert third is not first
@@ -0,0 +1,119 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask, g, request
+
+from rama.utils import concurrency
+from rama.utils.concurrency import limit_concurrency, run_in_app_context
+
+
+def test_run_in_app_context() -> None:
+    """
+    Test that the wrapped function sees the `g` object of the caller.
+    """
+    g.some_value = "foo"
+
+    @run_in_app_context
+    def get_value() -> str:
+        return g.some_value
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(get_value).result() == "foo"
+
+
+def test_run_in_app_context_request(app: Flask) -> None:
+    """
+    Test that concurrent calls in a request each get their own request context, so
+    they can finish in any order.
+    """
+    first_started = threading.Event()
+    second_started = threading.Event()
+    first_done = threading.Event()
+
+    with app.test_request_context("/some/path"):
+
+        @run_in_app_context
+        def get_path(first: bool) -> str:
+            if first:
+                first_started.set()
+                second_started.wait(timeout=10)
+            else:
+                second_started.set()
+                first_done.wait()
+            return request.path
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # the first call exits its contexts while the second one is still running
+            first_future = executor.submit(get_path, True)
+            first_started.wait()
+            second_future = executor.submit(get_path, False)
+            try:
+                assert first_future.result() == "/some/path"
+            finally:
+                first_done.set()
+            assert second_future.result() == "/some/path"
+
+
+def test_limit_concurrency() -> None:
+    """
+    Test that at most `limit` threads run the block for the same key.
+    """
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def work() -> None:
+        nonlocal running, max_running
+        with limit_concurrency(("test", 1), 2):
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.01)
+            with lock:
+                running -= 1
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(work) for _ in range(16)]:
+            future.result()
+
+    assert max_running == 2
+
+
+def test_limit_concurrency_disabled() -> None:
+    """
+    Test that a limit lower than 1 doesn't create a semaphore.
+    """
+    with limit_concurrency(("test", 2), 0):
+        pass
+
+    assert all(key != ("test", 2) for key, _ in concurrency._semaphores)
+
+
+def test_limit_concurrency_changed_limit() -> None:
+    """
+    Test that a new limit for a key is enforced with a new semaphore.
+    """
+    with limit_concurrency(("test", 3), 1):
+        # the key is already held with a limit of 1, but the new limit allows 2
+        with limit_concurrency(("test", 3), 2):
+            pass
+
+    assert (("test", 3), 1) in concurrency._semaphores
+    assert (("test", 3), 2) in concurrency._semaphores
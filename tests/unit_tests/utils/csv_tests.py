@@ -95,3 +95,45 @@ def test_df_to_escaped_csv():
 
     df = pa.array([1, None]).to_pandas(integer_object_nulls=True).to_frame()
     assert csv.df_to_escaped_csv(df, encoding="utf8", index=False) == '0\n1\n""\n'
+
+
+def test_escape_values():
+    values = [
+        "a",
+        "=func()",
+        "-10",
+        "=cmd|' /C calc'!A0",
+        '""=b',
+        " =a",
+        None,
+        1,
+        b"=bytes",
+    ]
+    series = pd.Series(values, dtype=object)
+
+    assert csv.escape_values(series).tolist() == [
+        csv.escape_value(v) if isinstance(v, str) else v for v in values
+    ]
+    # the original column is left untouched
+    assert series.tolist() == values
+
+    numbers = pd.Series([1, 2])
+    assert csv.escape_values(numbers) is numbers
+    no_strings = pd.Series([1, None], dtype=object)
+    assert csv.escape_values(no_strings) is no_strings
+
+
+def test_df_to_escaped_csv_index():
+    df = pd.DataFrame({"value": ["=a", "b"]}, index=[3, 4])
+    assert csv.df_to_escaped_csv(df, index=False) == "value\n'=a\nb\n"
+
+
+def test_iter_escaped_csv():
+    dfs = [
+        pd.DataFrame({"=a": ["=1", "2"]}),
+        pd.DataFrame({"=a": ["3"]}),
+    ]
+
+    chunks = list(csv.iter_escaped_csv(dfs, index=False))
+
+    assert chunks == ["'=a\n'=1\n2\n", "3\n"]
@@ -0,0 +1,186 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=unused-argument
+
+from datetime import datetime
+from typing import Any
+
+import pytest
+from flask import current_app
+from pytest_mock import MockerFixture
+
+from rama.utils import hashing
+from rama.utils.hashing import (
+    canonical_json,
+    hash_from_bytes,
+    hash_from_dict,
+    md5_sha_from_dict,
+    md5_sha_from_str,
+)
+from rama.utils.json import json_int_dttm_ser
+
+FORM_DATA: dict[str, Any] = {
+    "datasource": "12__table",
+    "viz_type": "echarts_timeseries_line",
+    "columns": [{"label": "country", "sqlExpression": "country"}],
+    "metrics": [
+        {
+            "aggregate": "SUM",
+            "column": {"column_name": "num", "type": "BIGINT", "id": 10},
+            "expressionType": "SIMPLE",
+            "label": "SUM(num)",
+            "hasCustomLabel": False,
+        },
+    ],
+    "filter": [
+        {"col": "gender", "op": "IN", "val": ["boy", "girl"]},
+        {"col": "ds", "op": "TEMPORAL_RANGE", "val": "Last year"},
+    ],
+    "extras": {"having": "", "where": "", "time_grain_sqla": "P1D"},
+    "row_limit": 10000,
+    "order_desc": True,
+    "orderby": [[{"label": "SUM(num)"}, False]],
+    "post_processing": [
+        {
+            "operation": "pivot",
+            "options": {
+                "index": ["__timestamp"],
+                "columns": ["country"],
+                "aggregates": {"SUM(num)": {"operator": "mean"}},
+            },
+        },
+        {"operation": "flatten"},
+    ],
+    "time_range": "Last year",
+    "rls": ["gender = 'boy'-gender"],
+    "changed_on": datetime(2024, 1, 1),
+    "annotation_layers": [],
+}
+
+
+def test_hash_from_dict_legacy(mocker: MockerFixture) -> None:
+    """
+    Test that the legacy format produces the same keys as before.
+    """
+    mocker.patch.dict(current_app.config, {"CACHE_KEY_LEGACY_FORMAT": True})
+
+    assert hash_from_dict(FORM_DATA, default=json_int_dttm_ser) == md5_sha_from_dict(
+        FORM_DATA,
+        default=json_int_dttm_ser,
+    )
+
+
+@pytest.mark.parametrize("algorithm", ["md5", "blake2b", "xxhash"])
+def test_hash_from_dict(mocker: MockerFixture, algorithm: str) -> None:
+    mocker.patch.dict(
+        current_app.config,
+        {"CACHE_KEY_LEGACY_FORMAT": False, "CACHE_KEY_HASH_ALGORITHM": algorithm},
+    )
+
+    key = hash_from_dict(FORM_DATA, default=json_int_dttm_ser)
+
+    assert len(key) == 32
+    assert key != md5_sha_from_dict(FORM_DATA, default=json_int_dttm_ser)
+    # keys don't depend on the order of the dictionary
+    assert key == hash_from_dict(
+        dict(reversed(FORM_DATA.items())),
+        default=json_int_dttm_ser,
+    )
+    assert key != hash_from_dict(
+        {**FORM_DATA, "row_limit": 100},
+        default=json_int_dttm_ser,
+    )
+
+
+def test_hash_from_bytes() -> None:
+    assert hash_from_bytes(b"rama") == md5_sha_from_str("rama")
+    assert hash_from_bytes(b"rama", "blake2b") == hash_from_bytes(b"rama", "blake2b")
+    assert hash_from_bytes(b"rama", "blake2b") != hash_from_bytes(b"rama")
+
+
+def test_hash_from_bytes_xxhash_not_installed(mocker: MockerFixture) -> None:
+    mocker.patch.object(hashing, "xxhash", None)
+
+    assert hash_from_bytes(b"rama", "xxhash") == hash_from_bytes(b"rama", "blake2b")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_canonical_json(mocker: MockerFixture, use_orjson: bool) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        mocker.patch.object(hashing, "orjson", None)
+
+    assert (
+        canonical_json(
+            {"b": [1, "é"], "a": {2: datetime(2024, 1, 1)}},
+            default=json_int_dttm_ser,
+        )
+        == '{"a":{"2":1704067200000.0},"b":[1,"é"]}'.encode()
+    )
+    # integers that don't fit in 64 bits are supported
+    assert canonical_json({"a": 2**70}) == b'{"a":1180591620717411303424}'
+
+
+@pytest.mark.parametrize(
+    "use_orjson, expected",
+    [(True, b'{"a":null}'), (False, b'{"a":NaN}')],
+)
+def test_canonical_json_nan(
+    mocker: MockerFixture,
+    use_orjson: bool,
+    expected: bytes,
+) -> None:
+    """
+    Test that NaN is serialized differently by `orjson` and the standard library.
+    """
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        mocker.patch.object(hashing, "orjson", None)
+
+    assert canonical_json({"a": float("nan")}) == expected
+
+
+@pytest.mark.parametrize(
+    "algorithm, key",
+    [
+        ("md5", "67df5932e97113ac2c373dec02252118"),
+        ("blake2b", "4202ab9c0dc85015e1418d816a481773"),
+    ],
+)
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_hash_from_dict_stable(
+    mocker: MockerFixture,
+    algorithm: str,
+    key: str,
+    use_orjson: bool,
+) -> None:
+    """
+    Test that the keys of form data are the same with and without `orjson`, and
+    don't change between releases, since a new key invalidates the cached results.
+    """
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        mocker.patch.object(hashing, "orjson", None)
+    mocker.patch.dict(
+        current_app.config,
+        {"CACHE_KEY_LEGACY_FORMAT": False, "CACHE_KEY_HASH_ALGORITHM": algorithm},
+    )
+
+    assert hash_from_dict(FORM_DATA, default=json_int_dttm_ser) == key
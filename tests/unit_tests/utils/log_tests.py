@@ -15,8 +15,14 @@
 # specific language governing permissions and limitations
 # under the License.
 
+# pylint: disable=protected-access, unused-argument
 
-from rama.utils.log import get_logger_from_status
+import os
+
+from flask import current_app
+from pytest_mock import MockerFixture
+
+from rama.utils.log import BufferedDBEventLogger, get_logger_from_status
 
 
 def test_log_from_status_exception() -> None:
@@ -35,3 +41,75 @@ def test_log_from_status_info() -> None:
     (func, log_level) = get_logger_from_status(300)
     assert func.__name__ == "info"
     assert log_level == "info"
+
+
+def test_buffered_db_event_logger(mocker: MockerFixture, app_context: None) -> None:
+    """
+    Test that records are written in batches by the background thread.
+    """
+    write = mocker.patch.object(BufferedDBEventLogger, "_write")
+    event_logger = BufferedDBEventLogger(batch_size=2, flush_interval=0.01)
+
+    event_logger.log(1, "action", None, 10, None, None, records=[{"a": 1}] * 3)
+    event_logger.shutdown()
+
+    batches = [call[0][0] for call in write.call_args_list]
+    assert sum(len(batch) for batch in batches) == 3
+    assert all(len(batch) <= 2 for batch in batches)
+    assert batches[0][0]["action"] == "action"
+    assert batches[0][0]["json"] == '{"a": 1}'
+    assert batches[0][0]["user_id"] == 1
+    assert batches[0][0]["duration_ms"] == 10
+
+
+def test_buffered_db_event_logger_full_queue(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that records are dropped when the queue is full.
+    """
+    mocker.patch.object(BufferedDBEventLogger, "_start")
+    write = mocker.patch.object(BufferedDBEventLogger, "_write")
+    stats_logger = mocker.patch("rama.utils.log.stats_logger_manager")
+    event_logger = BufferedDBEventLogger(max_queue_size=2)
+    event_logger._app = current_app
+
+    event_logger.log(1, "action", None, 10, None, None, records=[{"a": 1}] * 3)
+    stats_logger.instance.incr.assert_called_once_with("event_logger.dropped")
+
+    event_logger.flush()
+    assert len(write.call_args[0][0]) == 2
+
+
+def test_buffered_db_event_logger_write(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    db = mocker.patch("rama.db")
+    event_logger = BufferedDBEventLogger()
+    event_logger._app = current_app
+    batch = [{"action": "action"}]
+
+    event_logger._write(batch)
+
+    connection = db.engine.begin.return_value.__enter__.return_value
+    assert connection.execute.call_args[0][1] == batch
+
+
+def test_buffered_db_event_logger_shutdown_forked(
+    mocker: MockerFixture,
+    app_context: None,
+) -> None:
+    """
+    Test that a forked process doesn't write the records queued by its parent.
+    """
+    write = mocker.patch.object(BufferedDBEventLogger, "_write")
+    event_logger = BufferedDBEventLogger()
+    event_logger._app = current_app
+    event_logger._pid = os.getpid() + 1
+    event_logger._queue.put({"action": "action"})
+
+    event_logger.shutdown()
+
+    write.assert_not_called()
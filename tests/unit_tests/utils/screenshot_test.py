@@ -72,6 +72,26 @@ def test_get_screenshot(mocker: MockerFixture, screenshot_obj):
     assert screenshot_data == fake_bytes
 
 
+def test_get_screenshots(mocker: MockerFixture):
+    """Get screenshots should take all the screenshots with a single driver"""
+    driver = mocker.patch(BASE_SCREENSHOT_PATH + ".driver")
+    driver.return_value.get_screenshots.return_value = [b"first", None]
+    screenshots = [
+        BaseScreenshot("http://example.com/1", "digest"),
+        BaseScreenshot("http://example.com/2", "digest"),
+    ]
+
+    images = BaseScreenshot.get_screenshots(screenshots, mock_user)
+
+    assert images == [b"first", None]
+    driver.assert_called_once()
+    driver.return_value.get_screenshots.assert_called_once_with(
+        ["http://example.com/1", "http://example.com/2"], "", mock_user
+    )
+    assert screenshots[0].screenshot == b"first"
+    assert screenshots[1].screenshot is None
+
+
 def test_get_cache_key(screenshot_obj):
     """Test get_cache_key method"""
     expected_cache_key = md5_sha_from_dict(
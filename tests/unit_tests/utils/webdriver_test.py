@@ -0,0 +1,127 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from unittest.mock import MagicMock
+
+from flask import current_app
+from pytest_mock import MockerFixture
+
+from rama.utils.webdriver import CHART_STATUSES_POLL_INTERVAL, WebDriverSelenium
+
+
+def test_wait_for_charts_rendered() -> None:
+    """
+    Test that the render time of each chart is recorded once it's done loading.
+    """
+    webdriver = WebDriverSelenium("firefox")
+    get_statuses = MagicMock(
+        side_effect=[
+            {
+                "elapsed": 100,
+                "expected": 2,
+                "charts": [["1", "loading"], ["2", "rendered"]],
+            },
+            {
+                "elapsed": 250,
+                "expected": 2,
+                "charts": [["1", "success"], ["2", "rendered"]],
+            },
+            {
+                "elapsed": 400,
+                "expected": 2,
+                "charts": [["1", "rendered"], ["2", "rendered"]],
+            },
+        ]
+    )
+    wait = MagicMock()
+
+    assert webdriver.wait_for_charts_rendered(get_statuses, wait)
+
+    assert webdriver.chart_render_times == {"1": 0.4, "2": 0.1}
+    assert get_statuses.call_count == 3
+    wait.assert_called_with(CHART_STATUSES_POLL_INTERVAL)
+
+
+def test_wait_for_charts_rendered_failed() -> None:
+    """
+    Test that charts which failed are done loading.
+    """
+    webdriver = WebDriverSelenium("firefox")
+    get_statuses = MagicMock(
+        return_value={
+            "elapsed": 1500,
+            "expected": 2,
+            "charts": [["1", "failed"], ["2", "stopped"]],
+        }
+    )
+
+    assert webdriver.wait_for_charts_rendered(get_statuses, MagicMock())
+    assert webdriver.chart_render_times == {"1": 1.5, "2": 1.5}
+
+
+def test_wait_for_charts_rendered_expected() -> None:
+    """
+    Test that the page is not done loading until all the charts are mounted.
+    """
+    webdriver = WebDriverSelenium("firefox")
+    get_statuses = MagicMock(
+        side_effect=[
+            # the dashboard grid isn't rendered yet
+            {"elapsed": 100, "expected": 1, "charts": []},
+            {"elapsed": 200, "expected": 2, "charts": [["1", "rendered"]]},
+            {
+                "elapsed": 300,
+                "expected": 2,
+                "charts": [["1", "rendered"], ["2", "failed"]],
+            },
+        ]
+    )
+
+    assert webdriver.wait_for_charts_rendered(get_statuses, MagicMock())
+    assert get_statuses.call_count == 3
+    assert webdriver.chart_render_times == {"1": 0.2, "2": 0.3}
+
+
+def test_wait_for_charts_rendered_no_charts() -> None:
+    """
+    Test that a dashboard without charts is done loading once its grid is rendered.
+    """
+    webdriver = WebDriverSelenium("firefox")
+    get_statuses = MagicMock(return_value={"elapsed": 100, "expected": 0, "charts": []})
+
+    assert webdriver.wait_for_charts_rendered(get_statuses, MagicMock())
+    assert webdriver.chart_render_times == {}
+
+
+def test_wait_for_charts_rendered_timeout(mocker: MockerFixture) -> None:
+    """
+    Test that charts which didn't render in time are recorded without a time.
+    """
+    mocker.patch.dict(current_app.config, {"SCREENSHOT_LOAD_WAIT": 0})
+    webdriver = WebDriverSelenium("firefox")
+    get_statuses = MagicMock(
+        return_value={
+            "elapsed": 100,
+            "expected": 2,
+            "charts": [["1", "loading"], ["2", "rendered"]],
+        }
+    )
+    wait = MagicMock()
+
+    assert not webdriver.wait_for_charts_rendered(get_statuses, wait)
+    assert webdriver.chart_render_times == {"1": None, "2": 0.1}
+    wait.assert_not_called()